@@ -0,0 +1,28 @@
+"""
+Cache backends with hit/miss instrumentation.
+
+Drop-in replacement for Django's RedisCache that reports every lookup to
+the metrics service, so /metrics and the slow-request log show cache hits.
+"""
+from django.core.cache.backends.redis import RedisCache
+
+from survey_api.services.metrics_service import record_cache_access
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """RedisCache that counts hits and misses per lookup."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        record_cache_access(hit)
+        return value if hit else default
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        for key in keys:
+            record_cache_access(key in found)
+        return found
@@ -0,0 +1,37 @@
+"""
+Compute pool worker bootstrap (see survey_api.services.compute_pool).
+
+Kept outside survey_api.services: a spawned worker unpickles its initializer
+before Django is set up, and importing the services package loads models.
+"""
+import importlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Imported in every worker before the first task so tasks don't pay for it
+PRELOAD_MODULES = (
+    'numpy', 'welleng', 'welleng.survey',
+    'matplotlib.figure', 'matplotlib.backends.backend_agg', 'mpl_toolkits.mplot3d',
+)
+
+# True inside pool workers: nested compute_pool.run() calls execute inline
+in_worker = False
+
+
+def initialize():
+    """Pool worker initializer: configure Django and warm heavy imports."""
+    global in_worker
+    in_worker = True
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        import django
+        django.setup()
+
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Compute worker could not preload {module}: {e}")
@@ -99,6 +99,36 @@ class DeltaCalculationError(Exception):
     pass
 
 
+class ComputeCapacityError(Exception):
+    """
+    Raised when the compute pool has no free slot for a new task.
+
+    This exception should be raised by admission control when too many
+    CPU-bound calculations are already queued on this worker.
+    """
+    pass
+
+
+class ComputeTimeoutError(Exception):
+    """
+    Raised when a compute pool task does not complete.
+
+    This exception should be raised when a calculation exceeds its timeout
+    or its worker process dies.
+    """
+    pass
+
+
+class ArrayStoreIntegrityError(Exception):
+    """
+    Raised when an on-disk survey array does not match its stored reference.
+
+    This exception should be raised when a column file is missing or its
+    checksum or length differs from the reference held on the model row.
+    """
+    pass
+
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler for DRF.
@@ -251,6 +281,27 @@ def custom_exception_handler(exc, context):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    # Handle compute pool exceptions
+    if isinstance(exc, ComputeCapacityError):
+        response = Response(
+            {
+                'error': 'ComputeCapacityError',
+                'message': str(exc),
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        response['Retry-After'] = '5'
+        return response
+
+    if isinstance(exc, ComputeTimeoutError):
+        return Response(
+            {
+                'error': 'ComputeTimeoutError',
+                'message': str(exc),
+            },
+            status=status.HTTP_504_GATEWAY_TIMEOUT
+        )
+
     # For unhandled exceptions, return 500
     return Response(
         {
@@ -0,0 +1,27 @@
+"""
+Management command to expire abandoned GTL QA uploads and delete orphaned temporary QA files.
+
+Intended to run periodically (e.g. hourly from cron).
+"""
+from django.core.management.base import BaseCommand
+
+from survey_api.services.qa_temp_files import qa_temp_files
+
+
+class Command(BaseCommand):
+    help = 'Delete pending QA uploads and unreferenced temporary QA files older than QA_TEMP_FILE_TTL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=None,
+            help='Minimum upload and file age in seconds (defaults to QA_TEMP_FILE_TTL)',
+        )
+
+    def handle(self, *args, **options):
+        result = qa_temp_files.sweep(max_age=options['max_age'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {result['expired']} pending QA uploads; "
+            f"deleted {result['deleted']} temporary QA files ({result['bytes']} bytes)"
+        ))
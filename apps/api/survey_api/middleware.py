@@ -0,0 +1,145 @@
+"""
+Request instrumentation middleware.
+
+Records per-request wall time, DB query count/time, cache hits and peak
+memory growth into the metrics registry (exposed on /metrics), and logs
+slow requests together with their most expensive SQL statements.
+"""
+import logging
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows development machines
+    resource = None
+
+from django.conf import settings
+from django.db import connections
+
+from survey_api.services.metrics_service import (
+    metrics,
+    start_request,
+    end_request,
+    current_request_stats,
+)
+
+logger = logging.getLogger('survey_api.performance')
+
+# ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+_MAXRSS_TO_BYTES = 1 if sys.platform == 'darwin' else 1024
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_TO_BYTES
+
+
+class _QueryTimer:
+    """Database execute wrapper that feeds the current request's stats."""
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats = current_request_stats()
+            if stats is not None:
+                stats.record_query(sql, time.perf_counter() - start)
+
+
+class RequestMetricsMiddleware:
+    """
+    Collect request-level performance metrics.
+
+    Settings:
+        SLOW_REQUEST_THRESHOLD_MS: Log requests slower than this (default 1000)
+        SLOW_REQUEST_TOP_QUERIES: Number of SQL statements to log (default 5)
+
+    The metrics endpoint itself is excluded so scrapes don't skew the data.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 1000) / 1000.0
+        self.top_queries = getattr(settings, 'SLOW_REQUEST_TOP_QUERIES', 5)
+        self.query_timer = _QueryTimer()
+
+    def __call__(self, request):
+        if request.path == '/metrics':
+            return self.get_response(request)
+
+        token = start_request()
+        rss_before = _peak_rss_bytes()
+        start = time.perf_counter()
+        wrappers = [conn.execute_wrapper(self.query_timer) for conn in connections.all()]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+            duration = time.perf_counter() - start
+            stats = current_request_stats()
+            end_request(token)
+
+        rss_growth = max(0, _peak_rss_bytes() - rss_before)
+        self._record(request, response, duration, stats, rss_growth)
+        return response
+
+    @staticmethod
+    def _view_label(request) -> str:
+        """Bounded-cardinality label: the URL route pattern, never the raw path."""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched'
+        if match.route:
+            # Router (regex) patterns carry their anchors: api/v1/runs/$ -> api/v1/runs/
+            return match.route.replace('^', '').replace('$', '')
+        return match.view_name or 'unknown'
+
+    def _record(self, request, response, duration, stats, rss_growth):
+        view = self._view_label(request)
+        labels = {'view': view, 'method': request.method}
+
+        metrics.observe(
+            'survey_api_request_duration_seconds', duration, labels,
+            help_text='Request wall time by view'
+        )
+        metrics.observe(
+            'survey_api_request_db_seconds', stats.query_time, labels,
+            help_text='Time spent in database queries per request'
+        )
+        metrics.observe(
+            'survey_api_request_db_queries', stats.query_count, labels,
+            help_text='Database queries per request',
+            buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+        )
+        metrics.observe(
+            'survey_api_request_peak_memory_growth_bytes', rss_growth, labels,
+            help_text='Growth of process peak RSS during the request',
+            buckets=(0, 1 << 20, 8 << 20, 32 << 20, 128 << 20, 512 << 20, 1 << 30)
+        )
+        metrics.inc(
+            'survey_api_requests_total',
+            labels={**labels, 'status': str(response.status_code)},
+            help_text='Requests by view, method and status'
+        )
+
+        if duration >= self.slow_threshold:
+            top_sql = '\n'.join(
+                f'    {query_time * 1000:8.1f} ms  {sql[:500]}'
+                for query_time, sql in stats.top_queries(self.top_queries)
+            )
+            spans = ', '.join(f'{name}={span_time * 1000:.0f}ms' for name, span_time in stats.spans)
+            logger.warning(
+                f"Slow request: {request.method} {request.path} ({view}) "
+                f"status={response.status_code} time={duration * 1000:.0f}ms "
+                f"db={stats.query_count} queries/{stats.query_time * 1000:.0f}ms "
+                f"cache={stats.cache_hits} hits/{stats.cache_misses} misses "
+                f"peak_rss_growth={rss_growth / (1 << 20):.1f}MB"
+                + (f"\n  spans: {spans}" if spans else '')
+                + (f"\n  top SQL:\n{top_sql}" if top_sql else '')
+            )
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey_api", "0042_alter_minimumidmaster_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calculatedsurvey",
+            name="array_ref",
+            field=models.JSONField(
+                blank=True,
+                help_text="On-disk array store reference (files and checksums) when array columns are offloaded",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="interpolatedsurvey",
+            name="array_ref",
+            field=models.JSONField(
+                blank=True,
+                help_text="On-disk array store reference (files and checksums) when array columns are offloaded",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="surveydata",
+            name="array_ref",
+            field=models.JSONField(
+                blank=True,
+                help_text="On-disk array store reference (files and checksums) when array columns are offloaded",
+                null=True,
+            ),
+        ),
+    ]
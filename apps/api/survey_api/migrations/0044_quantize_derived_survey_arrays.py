@@ -0,0 +1,73 @@
+# Rewrites existing derived survey arrays at the storage precision defined in
+# survey_api.utils.array_precision (copied here so the migration stays fixed)
+
+import math
+
+from django.db import migrations
+
+BATCH_SIZE = 200
+
+POSITION, ANGLE, RATE = 3, 4, 4
+
+CALCULATED_DECIMALS = {
+    'easting': POSITION,
+    'northing': POSITION,
+    'tvd': POSITION,
+    'vertical_section': POSITION,
+    'closure_distance': POSITION,
+    'closure_direction': ANGLE,
+    'dls': RATE,
+    'build_rate': RATE,
+    'turn_rate': RATE,
+}
+
+INTERPOLATED_DECIMALS = {
+    'md_interpolated': POSITION,
+    'inc_interpolated': ANGLE,
+    'azi_interpolated': ANGLE,
+    'easting_interpolated': POSITION,
+    'northing_interpolated': POSITION,
+    'tvd_interpolated': POSITION,
+    'dls_interpolated': RATE,
+    'vertical_section_interpolated': POSITION,
+    'closure_distance_interpolated': POSITION,
+    'closure_direction_interpolated': ANGLE,
+}
+
+
+def _quantize(values, decimals):
+    if not values:
+        return values
+    return [
+        round(v, decimals) if isinstance(v, (int, float)) and math.isfinite(v) else v
+        for v in values
+    ]
+
+
+def _rewrite(model, decimals):
+    """Round every inline row in batches; offloaded rows are requantized on their next save."""
+    fields = list(decimals)
+    pks = list(model.objects.filter(array_ref__isnull=True).values_list('pk', flat=True))
+    for start in range(0, len(pks), BATCH_SIZE):
+        rows = list(model.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).only('pk', *fields))
+        for row in rows:
+            for field, places in decimals.items():
+                setattr(row, field, _quantize(getattr(row, field), places))
+        model.objects.bulk_update(rows, fields)
+
+
+def quantize_derived_arrays(apps, schema_editor):
+    _rewrite(apps.get_model('survey_api', 'CalculatedSurvey'), CALCULATED_DECIMALS)
+    _rewrite(apps.get_model('survey_api', 'InterpolatedSurvey'), INTERPOLATED_DECIMALS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0043_survey_array_store_refs'),
+    ]
+
+    operations = [
+        # Lossy by design; the original float64 values cannot be restored
+        migrations.RunPython(quantize_derived_arrays, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,109 @@
+# Replaces the five per-station QA result arrays of QualityCheck with one
+# status byte per station (see survey_api.utils.qa_station_codes, copied here
+# so the migration stays fixed) plus the location reference the differences
+# are recomputed from.
+
+import statistics
+
+from django.db import migrations, models
+
+BATCH_SIZE = 200
+
+STATUS_CODES = {'n/c': 0, 'low': 1, 'good': 2, 'high': 3}
+W_T_SHIFT = 2
+PASS_BIT = 0x10
+
+
+def _location(values, others, differences, reference=None):
+    """
+    Reference value the stored differences were computed against.
+
+    Stored differences are round(location - value, 2), so every scored station
+    (both readings present) bounds the reference to a 0.01 wide window. The
+    well's current Location value is kept when it reproduces every stored
+    difference, otherwise the middle of the windows' intersection, which does
+    too. Only a check whose windows do not intersect (stations scored against
+    different references) falls back to the median estimate; its recomputed
+    differences can then be 0.01 off the stored ones.
+    """
+    pairs = [(value, diff) for value, other, diff in zip(values, others, differences)
+             if value is not None and other is not None]
+    reference = float(reference) if reference is not None else None
+    if not pairs:
+        return reference if reference is not None else 0.0
+
+    samples = [value + diff for value, diff in pairs]
+    candidates = [reference] if reference is not None else []
+    # Middle of the intersection [max - 0.005, min + 0.005]
+    candidates.append((max(samples) + min(samples)) / 2)
+    for candidate in candidates:
+        if all(round(candidate - value, 2) == diff for value, diff in pairs):
+            return candidate
+    return statistics.median(samples)
+
+
+def encode_quality_checks(apps, schema_editor):
+    QualityCheck = apps.get_model('survey_api', 'QualityCheck')
+    Location = apps.get_model('survey_api', 'Location')
+    Run = apps.get_model('survey_api', 'Run')
+    pks = list(QualityCheck.objects.values_list('pk', flat=True))
+    fields = ['station_codes', 'kept_mask', 'location_g_t', 'location_w_t']
+    for start in range(0, len(pks), BATCH_SIZE):
+        rows = list(QualityCheck.objects.filter(pk__in=pks[start:start + BATCH_SIZE]))
+        # QA scores against the run's well location (upload_gtl_for_qa)
+        wells = dict(Run.objects.filter(id__in={row.run_id for row in rows}).values_list('id', 'well_id'))
+        references = {
+            location['well_id']: location
+            for location in Location.objects.filter(well_id__in={well for well in wells.values() if well})
+            .values('well_id', 'g_t', 'w_t')
+        }
+        for row in rows:
+            reference = references.get(wells.get(row.run_id), {})
+            row.station_codes = bytes(
+                STATUS_CODES.get(g, 0) | (STATUS_CODES.get(w, 0) << W_T_SHIFT) | (PASS_BIT if overall == 'PASS' else 0)
+                for g, w, overall in zip(row.g_t_status_data, row.w_t_status_data, row.overall_status_data)
+            )
+            row.location_g_t = _location(row.gt_data, row.wt_data, row.g_t_difference_data, reference.get('g_t'))
+            row.location_w_t = _location(row.wt_data, row.gt_data, row.w_t_difference_data, reference.get('w_t'))
+            # Approved rows already hold only their kept stations
+            if row.status == 'approved':
+                count = len(row.md_data)
+                row.kept_mask = bytes([0xFF] * (count // 8)) + (bytes([(0xFF << (8 - count % 8)) & 0xFF]) if count % 8 else b'')
+        QualityCheck.objects.bulk_update(rows, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0044_quantize_derived_survey_arrays'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qualitycheck',
+            name='station_codes',
+            field=models.BinaryField(default=bytes, help_text='Packed G(t)/W(t)/overall status per station'),
+        ),
+        migrations.AddField(
+            model_name='qualitycheck',
+            name='kept_mask',
+            field=models.BinaryField(blank=True, help_text='Bitmask of stations kept on approval (null while pending)', null=True),
+        ),
+        migrations.AddField(
+            model_name='qualitycheck',
+            name='location_g_t',
+            field=models.FloatField(default=0.0, help_text='Location G(t) the stations were scored against'),
+        ),
+        migrations.AddField(
+            model_name='qualitycheck',
+            name='location_w_t',
+            field=models.FloatField(default=0.0, help_text='Location W(t) the stations were scored against'),
+        ),
+        # The result arrays are dropped below, so this cannot be reversed
+        migrations.RunPython(encode_quality_checks, migrations.RunPython.noop),
+        migrations.RemoveField(model_name='qualitycheck', name='g_t_difference_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='w_t_difference_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='g_t_status_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='w_t_status_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='overall_status_data'),
+    ]
@@ -0,0 +1,34 @@
+# Flags derived results whose run inputs (location, depth, tie-on) changed
+# after they were computed (see survey_api.services.recalculation_service)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0045_quality_check_station_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calculatedsurvey',
+            name='is_stale',
+            field=models.BooleanField(default=False, help_text='Run inputs changed since this calculation; recalculated on next read'),
+        ),
+        migrations.AddField(
+            model_name='interpolatedsurvey',
+            name='is_stale',
+            field=models.BooleanField(default=False, help_text='Source calculation changed since this interpolation was computed'),
+        ),
+        migrations.AddField(
+            model_name='comparisonresult',
+            name='is_stale',
+            field=models.BooleanField(default=False, help_text='Run inputs of a compared survey changed; re-run the comparison'),
+        ),
+        migrations.AddField(
+            model_name='extrapolation',
+            name='is_stale',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Per-station grid and geographic coordinates derived from the well location
+# (see survey_api.services.survey_calculation_service)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0046_stale_derived_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calculatedsurvey',
+            name='geographic_data',
+            field=models.BinaryField(editable=False, help_text='Grid easting/northing and latitude/longitude per station', null=True),
+        ),
+        migrations.AddField(
+            model_name='calculatedsurvey',
+            name='geographic_version',
+            field=models.CharField(blank=True, default='', help_text='Calculation and location versions the geographic data was derived from', max_length=128),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Per-station positional uncertainty for the survey tool's error model
+# (see survey_api.services.uncertainty_service)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0047_calculated_survey_geographic_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calculatedsurvey',
+            name='uncertainty_data',
+            field=models.BinaryField(editable=False, help_text='Error ellipse and covariance terms per station', null=True),
+        ),
+        migrations.AddField(
+            model_name='calculatedsurvey',
+            name='uncertainty_version',
+            field=models.CharField(blank=True, default='', help_text='Error model and calculation version the uncertainty data was derived from', max_length=128),
+        ),
+    ]
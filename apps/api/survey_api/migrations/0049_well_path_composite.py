@@ -0,0 +1,43 @@
+# Definitive well path per well, merged from the surveys of its runs
+# (see survey_api.services.well_path_service)
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0048_calculated_survey_uncertainty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WellPathComposite',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('array_ref', models.JSONField(blank=True, help_text='On-disk array store reference (files and checksums) when array columns are offloaded', null=True)),
+                ('md', models.JSONField(help_text='Measured Depth (meters)')),
+                ('inc', models.JSONField(help_text='Inclination (degrees)')),
+                ('azi', models.JSONField(help_text='Azimuth (degrees)')),
+                ('easting', models.JSONField(help_text='Easting offset from the wellhead (meters)')),
+                ('northing', models.JSONField(help_text='Northing offset from the wellhead (meters)')),
+                ('tvd', models.JSONField(help_text='True Vertical Depth (meters)')),
+                ('dls', models.JSONField(help_text='Dog Leg Severity (degrees/30m)')),
+                ('sources', models.JSONField(default=list, help_text='Surveys considered: id, run, survey type, version and MD range')),
+                ('segments', models.JSONField(default=list, help_text='Contiguous station ranges taken from each survey, shallowest first')),
+                ('build_key', models.CharField(blank=True, default='', help_text='Source priority and tie-on version the path was built with', max_length=255)),
+                ('station_count', models.IntegerField(default=0)),
+                ('recomputed_from_md', models.FloatField(blank=True, help_text='MD the last update recalculated from (null for a full rebuild)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('well', models.OneToOneField(help_text='Well this composite path belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='composite_path', to='survey_api.well')),
+            ],
+            options={
+                'verbose_name': 'Well Path Composite',
+                'verbose_name_plural': 'Well Path Composites',
+                'db_table': 'well_path_composites',
+            },
+        ),
+    ]
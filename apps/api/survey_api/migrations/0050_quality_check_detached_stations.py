@@ -0,0 +1,68 @@
+# Drops the copy of the uploaded stations kept on QualityCheck. Stations are
+# read from the linked SurveyData; only the ones SurveyData no longer holds
+# (removed on approval, or all of them when the check has no SurveyData) are
+# kept in detached_stations.
+
+from django.db import migrations, models
+
+BATCH_SIZE = 200
+
+STATION_COLUMNS = ('md_data', 'inc_data', 'azi_data', 'gt_data', 'wt_data')
+
+
+def _kept_indices(mask, count):
+    if mask is None:
+        return list(range(count))
+    mask = bytes(mask)
+    return [i for i in range(count) if mask[i >> 3] & (0x80 >> (i & 7))]
+
+
+def detach_stations(apps, schema_editor):
+    QualityCheck = apps.get_model('survey_api', 'QualityCheck')
+    pks = list(QualityCheck.objects.values_list('pk', flat=True))
+    for start in range(0, len(pks), BATCH_SIZE):
+        rows = list(
+            QualityCheck.objects.filter(pk__in=pks[start:start + BATCH_SIZE])
+            .select_related('survey_data').defer(
+                *(f'survey_data__{name}' for name in STATION_COLUMNS)
+            )
+        )
+        for row in rows:
+            count = len(row.md_data)
+            survey_data = row.survey_data
+            if survey_data is None:
+                row.detached_stations = {name: list(getattr(row, name)) for name in STATION_COLUMNS}
+                continue
+            # row_count holds even when the arrays are offloaded to the array store
+            held = survey_data.row_count - (0 if survey_data.validation_status == 'pending_qa' else 1)
+            if held >= count:
+                row.detached_stations = None
+                continue
+            kept = set(_kept_indices(row.kept_mask, count))
+            row.detached_stations = {
+                name: [value for i, value in enumerate(getattr(row, name)) if i not in kept]
+                for name in STATION_COLUMNS
+            }
+        QualityCheck.objects.bulk_update(rows, ['detached_stations'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survey_api', '0049_well_path_composite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qualitycheck',
+            name='detached_stations',
+            field=models.JSONField(blank=True, help_text='Uploaded stations SurveyData does not hold, one list per station column (the stations removed on approval); null while SurveyData holds every station', null=True),
+        ),
+        # The station arrays are dropped below, so this cannot be reversed
+        migrations.RunPython(detach_stations, migrations.RunPython.noop),
+        migrations.RemoveField(model_name='qualitycheck', name='md_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='inc_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='azi_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='gt_data'),
+        migrations.RemoveField(model_name='qualitycheck', name='wt_data'),
+    ]
@@ -16,6 +16,7 @@ from .survey_file import SurveyFile
 from .survey_calculation import SurveyCalculation
 from .survey_data import SurveyData
 from .calculated_survey import CalculatedSurvey
+from .well_path_composite import WellPathComposite
 from .interpolated_survey import InterpolatedSurvey
 from .comparison_result import ComparisonResult
 from .hole_section_master import HoleSectionMaster
@@ -45,6 +46,7 @@ __all__ = [
     'SurveyCalculation',
     'SurveyData',
     'CalculatedSurvey',
+    'WellPathComposite',
     'InterpolatedSurvey',
     'ComparisonResult',
     'HoleSectionMaster',
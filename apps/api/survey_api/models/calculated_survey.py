@@ -5,9 +5,15 @@ Stores welleng calculation results including positions and trajectory metrics.
 """
 import uuid
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 
+from survey_api.utils.array_precision import ANGLE, POSITION, RATE
 
-class CalculatedSurvey(models.Model):
+from .stored_arrays import StoredArraysModel
+
+
+class CalculatedSurvey(StoredArraysModel):
     """
     Stores calculated survey trajectory results from welleng library.
 
@@ -119,9 +125,63 @@ class CalculatedSurvey(models.Model):
         help_text="Location, Depth, TieOn data used for calculation"
     )
 
+    # Set when the run's location, depth or tie-on changed after the calculation
+    # (see survey_api.services.recalculation_service)
+    is_stale = models.BooleanField(
+        default=False,
+        help_text="Run inputs changed since this calculation; recalculated on next read"
+    )
+
+    # Per-station map grid and geographic coordinates, packed float64 columns
+    # (see survey_api.services.survey_calculation_service.GEOGRAPHIC_COLUMNS)
+    geographic_data = models.BinaryField(
+        null=True,
+        editable=False,
+        help_text="Grid easting/northing and latitude/longitude per station"
+    )
+    geographic_version = models.CharField(
+        max_length=128,
+        blank=True,
+        default='',
+        help_text="Calculation and location versions the geographic data was derived from"
+    )
+
+    # Per-station positional uncertainty for the survey tool's error model, packed float64 columns
+    # (see survey_api.services.uncertainty_service.UNCERTAINTY_COLUMNS)
+    uncertainty_data = models.BinaryField(
+        null=True,
+        editable=False,
+        help_text="Error ellipse and covariance terms per station"
+    )
+    uncertainty_version = models.CharField(
+        max_length=128,
+        blank=True,
+        default='',
+        help_text="Error model and calculation version the uncertainty data was derived from"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Per-station array columns (deferred when only metadata is needed)
+    ARRAY_FIELDS = (
+        'easting', 'northing', 'tvd', 'dls', 'build_rate', 'turn_rate',
+        'vertical_section', 'closure_distance', 'closure_direction',
+    )
+
+    # Derived columns are stored quantized (tolerances in survey_api.utils.array_precision)
+    ARRAY_PRECISION = {
+        'easting': POSITION,
+        'northing': POSITION,
+        'tvd': POSITION,
+        'vertical_section': POSITION,
+        'closure_distance': POSITION,
+        'closure_direction': ANGLE,
+        'dls': RATE,
+        'build_rate': RATE,
+        'turn_rate': RATE,
+    }
+
     class Meta:
         db_table = 'calculated_surveys'
         indexes = [
@@ -133,3 +193,21 @@ class CalculatedSurvey(models.Model):
 
     def __str__(self):
         return f"CalculatedSurvey({self.survey_data.survey_file.run.run_number}) - {self.calculation_status}"
+
+
+@receiver(post_save, sender=CalculatedSurvey)
+def pregenerate_survey_report(sender, instance, **kwargs):
+    """
+    Pre-generate the survey calculation report once a calculation completes,
+    so the first download is served from the report artifact store.
+
+    Rendering runs in the compute pool after a quiet period, so a burst of
+    recalculations of the same survey renders it once.
+    """
+    if instance.calculation_status != 'calculated':
+        return
+
+    from survey_api.services.report_artifact_store import report_artifacts
+    from survey_api.services.survey_calculation_report_service import get_survey_calculation_report_artifact
+
+    report_artifacts.pregenerate(get_survey_calculation_report_artifact, str(instance.survey_data_id))
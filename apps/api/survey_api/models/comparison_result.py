@@ -149,9 +149,23 @@ class ComparisonResult(models.Model):
         help_text="Statistical summary of deltas (max, avg, std, etc.)"
     )
 
+    # Set when either survey's run inputs changed after the comparison was computed
+    is_stale = models.BooleanField(
+        default=False,
+        help_text="Run inputs of a compared survey changed; re-run the comparison"
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Per-station array columns, all parallel to md_data
+    ARRAY_FIELDS = (
+        'md_data', 'delta_x', 'delta_y', 'delta_z', 'delta_horizontal', 'delta_total',
+        'delta_inc', 'delta_azi', 'reference_inc', 'reference_azi', 'reference_northing',
+        'reference_easting', 'reference_tvd', 'comparison_inc', 'comparison_azi',
+        'comparison_northing', 'comparison_easting', 'comparison_tvd',
+    )
+
     class Meta:
         db_table = 'comparison_results'
         ordering = ['-created_at']
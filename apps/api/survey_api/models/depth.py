@@ -4,6 +4,8 @@ Depth model for storing elevation and reference datum data for runs and wells.
 import uuid
 from decimal import Decimal
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 
 
@@ -125,3 +127,17 @@ class Depth(models.Model):
         elif self.well:
             return f"Depth for Well {self.well.well_name}"
         return f"Depth {self.id}"
+
+
+@receiver([post_save, post_delete], sender=Depth)
+def invalidate_run_results_on_depth_change(sender, instance, **kwargs):
+    """
+    Flag the run's calculations (and results derived from them) whose
+    depth input changed; they are recalculated lazily or in the background.
+    """
+    if instance.run_id is None:
+        return
+
+    from survey_api.services.recalculation_service import recalculation
+
+    recalculation.inputs_changed(instance.run_id)
@@ -95,10 +95,17 @@ class Extrapolation(models.Model):
     final_tvd = models.FloatField(null=True, blank=True)
     final_horizontal_displacement = models.FloatField(null=True, blank=True)
 
+    # Set when the survey's run inputs changed after the extrapolation was computed
+    is_stale = models.BooleanField(default=False)
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Per-station array groups; each group's arrays are parallel to its own MD column
+    ARRAY_GROUPS = ('original', 'interpolated', 'extrapolated', 'combined')
+    ARRAY_SUFFIXES = ('md', 'inc', 'azi', 'north', 'east', 'tvd')
+
     class Meta:
         db_table = 'extrapolations'
         ordering = ['-created_at']
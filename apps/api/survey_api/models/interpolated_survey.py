@@ -7,8 +7,12 @@ allowing smooth trajectory visualization and analysis.
 import uuid
 from django.db import models
 
+from survey_api.utils.array_precision import ANGLE, POSITION, RATE
 
-class InterpolatedSurvey(models.Model):
+from .stored_arrays import StoredArraysModel
+
+
+class InterpolatedSurvey(StoredArraysModel):
     """
     Stores interpolated survey data at a specific resolution.
 
@@ -94,10 +98,39 @@ class InterpolatedSurvey(models.Model):
         help_text="Error message if interpolation failed"
     )
 
+    # Set when the source calculation is invalidated; recomputed on next request
+    is_stale = models.BooleanField(
+        default=False,
+        help_text="Source calculation changed since this interpolation was computed"
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Per-station array columns (deferred when only metadata is needed)
+    ARRAY_FIELDS = (
+        'md_interpolated', 'inc_interpolated', 'azi_interpolated',
+        'easting_interpolated', 'northing_interpolated', 'tvd_interpolated',
+        'dls_interpolated', 'vertical_section_interpolated',
+        'closure_distance_interpolated', 'closure_direction_interpolated',
+    )
+
+    # Every interpolated column is derived and stored quantized
+    # (tolerances in survey_api.utils.array_precision)
+    ARRAY_PRECISION = {
+        'md_interpolated': POSITION,
+        'inc_interpolated': ANGLE,
+        'azi_interpolated': ANGLE,
+        'easting_interpolated': POSITION,
+        'northing_interpolated': POSITION,
+        'tvd_interpolated': POSITION,
+        'dls_interpolated': RATE,
+        'vertical_section_interpolated': POSITION,
+        'closure_distance_interpolated': POSITION,
+        'closure_direction_interpolated': ANGLE,
+    }
+
     class Meta:
         db_table = 'interpolated_surveys'
         unique_together = [['calculated_survey', 'resolution']]
@@ -4,6 +4,8 @@ Location model for storing geographic positioning data for runs and wells.
 import uuid
 from decimal import Decimal
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 
@@ -326,3 +328,17 @@ class Location(models.Model):
 
         east_coordinate = self.longitude_degrees + minutes / 60 + seconds / 3600
         return float(f"{east_coordinate:.8f}")
+
+
+@receiver([post_save, post_delete], sender=Location)
+def invalidate_run_results_on_location_change(sender, instance, **kwargs):
+    """
+    Flag the run's calculations (and results derived from them) whose
+    location input changed; they are recalculated lazily or in the background.
+    """
+    if instance.run_id is None:
+        return
+
+    from survey_api.services.recalculation_service import recalculation
+
+    recalculation.inputs_changed(instance.run_id)
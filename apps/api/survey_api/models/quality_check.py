@@ -2,8 +2,19 @@
 Quality Check model for GTL survey QA.
 """
 import uuid
+from typing import Dict, List, Optional, Tuple
+
 from django.db import models
-from django.contrib.postgres.fields import ArrayField
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from survey_api.utils.qa_station_codes import decode_stations, station_differences, unpack_mask
+
+STATION_COLUMNS = ('md_data', 'inc_data', 'azi_data', 'gt_data', 'wt_data')
+RESULT_COLUMNS = (
+    'g_t_difference_data', 'w_t_difference_data',
+    'g_t_status_data', 'w_t_status_data', 'overall_status_data',
+)
 
 
 class QualityCheck(models.Model):
@@ -12,6 +23,16 @@ class QualityCheck(models.Model):
 
     This model stores temporary QA results before the user approves
     and saves the survey data to the database.
+
+    Per-station results are a status code array and approval only sets the
+    kept-station mask; differences, statuses and the kept stations are derived
+    lazily. The mask indexes the uploaded stations.
+
+    The check holds no copy of the stations (see stations()): SurveyData holds
+    the upload while QA is pending. Approval replaces SurveyData with the
+    tie-on row plus the kept stations, since that is the calculation input
+    CalculatedSurvey's arrays are parallel to, and moves the removed stations
+    to ``detached_stations``. Each uploaded station is stored once.
     """
 
     id = models.UUIDField(
@@ -148,56 +169,33 @@ class QualityCheck(models.Model):
         help_text='Total number of rows in the survey - saved after approval'
     )
 
-    # Raw data arrays
-    md_data = ArrayField(
-        models.FloatField(),
-        help_text='Measured Depth data'
-    )
-
-    inc_data = ArrayField(
-        models.FloatField(),
-        help_text='Inclination data'
-    )
-
-    azi_data = ArrayField(
-        models.FloatField(),
-        help_text='Azimuth data'
-    )
-
-    gt_data = ArrayField(
-        models.FloatField(),
-        help_text='G(t) data from file'
-    )
-
-    wt_data = ArrayField(
-        models.FloatField(),
-        help_text='W(t) data from file'
-    )
-
-    # QA results arrays
-    g_t_difference_data = ArrayField(
-        models.FloatField(),
-        help_text='G(t) difference for each station'
+    detached_stations = models.JSONField(
+        null=True,
+        blank=True,
+        help_text='Uploaded stations SurveyData does not hold, one list per station column '
+                  '(the stations removed on approval); null while SurveyData holds every station'
     )
 
-    w_t_difference_data = ArrayField(
-        models.FloatField(),
-        help_text='W(t) difference for each station'
+    # QA results: one status byte per station (survey_api.utils.qa_station_codes)
+    station_codes = models.BinaryField(
+        default=bytes,
+        help_text='Packed G(t)/W(t)/overall status per station'
     )
 
-    g_t_status_data = ArrayField(
-        models.CharField(max_length=10),
-        help_text='G(t) status for each station (high/good/low/n/c)'
+    kept_mask = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text='Bitmask of stations kept on approval (null while pending)'
     )
 
-    w_t_status_data = ArrayField(
-        models.CharField(max_length=10),
-        help_text='W(t) status for each station (high/good/low/n/c)'
+    location_g_t = models.FloatField(
+        default=0.0,
+        help_text='Location G(t) the stations were scored against'
     )
 
-    overall_status_data = ArrayField(
-        models.CharField(max_length=10),
-        help_text='Overall status for each station (PASS/REMOVE)'
+    location_w_t = models.FloatField(
+        default=0.0,
+        help_text='Location W(t) the stations were scored against'
     )
 
     # Metadata
@@ -225,3 +223,123 @@ class QualityCheck(models.Model):
 
     def __str__(self):
         return f"QA Check {self.id} - {self.file_name} ({self.status})"
+
+    @property
+    def _statuses(self):
+        # Decoded once per codes value (BinaryField reads back as memoryview)
+        codes = bytes(self.station_codes or b'')
+        cached = self.__dict__.get('_decoded_statuses')
+        if cached is None or cached[0] != codes:
+            cached = self.__dict__['_decoded_statuses'] = (codes, decode_stations(codes))
+        return cached[1]
+
+    @property
+    def g_t_status_data(self) -> List[str]:
+        """G(t) status for each station (high/good/low/n/c)."""
+        return self._statuses[0]
+
+    @property
+    def w_t_status_data(self) -> List[str]:
+        """W(t) status for each station (high/good/low/n/c)."""
+        return self._statuses[1]
+
+    @property
+    def overall_status_data(self) -> List[str]:
+        """Overall status for each station (PASS/REMOVE)."""
+        return self._statuses[2]
+
+    @property
+    def g_t_difference_data(self) -> List[float]:
+        """Location G(t) minus station G(t) for each station (0.0 where a reading is missing)."""
+        return self._differences()[0]
+
+    @property
+    def w_t_difference_data(self) -> List[float]:
+        """Location W(t) minus station W(t) for each station (0.0 where a reading is missing)."""
+        return self._differences()[1]
+
+    @property
+    def station_count(self) -> int:
+        """Number of uploaded stations."""
+        return len(self.station_codes or b'')
+
+    @property
+    def kept_indices(self) -> List[int]:
+        """Indices of the kept stations (every station while no mask is set)."""
+        count = self.station_count
+        if self.kept_mask is None:
+            return list(range(count))
+        return unpack_mask(self.kept_mask, count)
+
+    def stations(self) -> Dict[str, list]:
+        """
+        The uploaded stations, one list per STATION_COLUMNS entry.
+
+        Stations come from SurveyData (after its tie-on row once approved),
+        except those in ``detached_stations``. Stations of a check whose
+        SurveyData was deleted after approval are None, apart from the removed
+        ones.
+        """
+        count = self.station_count
+        survey_data = self.survey_data
+        held: Dict[str, list] = {}
+        if survey_data is not None:
+            offset = 0 if survey_data.validation_status == 'pending_qa' else 1
+            held = {name: list(getattr(survey_data, name) or [])[offset:] for name in STATION_COLUMNS}
+
+        detached = self.detached_stations
+        if detached is None:
+            # SurveyData holds every station
+            held_indices, detached_indices = list(range(count)), []
+        else:
+            held_indices = self.kept_indices if survey_data is not None else []
+            held_set = set(held_indices)
+            detached_indices = [index for index in range(count) if index not in held_set]
+
+        columns = {name: [None] * count for name in STATION_COLUMNS}
+        for name, values in columns.items():
+            for indices, source in ((held_indices, held), (detached_indices, detached or {})):
+                for index, value in zip(indices, source.get(name) or []):
+                    values[index] = value
+        return columns
+
+    def _differences(self, stations: Optional[Dict[str, list]] = None) -> Tuple[List[float], List[float]]:
+        stations = stations or self.stations()
+        return station_differences(self.location_g_t, self.location_w_t, stations['gt_data'], stations['wt_data'])
+
+    def reviewed_stations(self) -> Dict[str, list]:
+        """
+        Station and result columns restricted to the kept stations.
+
+        Returns:
+            Dictionary with 'index' (original station index) and one list per
+            station and result column
+        """
+        stations = self.stations()
+        g_t_differences, w_t_differences = self._differences(stations)
+        g_t_status, w_t_status, overall_status = self._statuses
+        values = {
+            **stations,
+            'g_t_difference_data': g_t_differences,
+            'w_t_difference_data': w_t_differences,
+            'g_t_status_data': g_t_status,
+            'w_t_status_data': w_t_status,
+            'overall_status_data': overall_status,
+        }
+        indices = self.kept_indices
+        columns = {'index': indices}
+        for name in (*STATION_COLUMNS, *RESULT_COLUMNS):
+            columns[name] = [values[name][i] for i in indices]
+        return columns
+
+
+@receiver(post_save, sender=QualityCheck)
+def pregenerate_qc_report(sender, instance, **kwargs):
+    """Pre-generate the QC report when an approved QA check is saved (debounced per check)."""
+    if instance.status != 'approved':
+        return
+
+    from survey_api.services.qc_report_service import QCReportService
+    from survey_api.services.report_artifact_store import report_artifacts
+
+    report_artifacts.pregenerate(QCReportService.get_report_artifact, str(instance.id))
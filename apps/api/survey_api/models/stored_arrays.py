@@ -0,0 +1,201 @@
+"""
+Abstract base for models whose per-station arrays can live in the array store.
+
+When SURVEY_ARRAY_STORE_ENABLED is on, large rows (at least
+SURVEY_ARRAY_STORE_MIN_POINTS stations) are written to
+survey_api.utils.array_store when they are saved. The JSON columns then hold
+[] (or null) and ``array_ref`` keeps the file names and checksums. Once a row
+is offloaded it stays offloaded, so later saves keep the files current.
+
+Reading ``instance.md_data`` still returns the full list: it is loaded from
+disk on first access. Windowed readers should use ``column_array(name)``
+instead, which returns a read-only memmap.
+
+Derived columns are quantized on save according to ``ARRAY_PRECISION`` (see
+survey_api.utils.array_precision); columns not listed are stored as-is.
+
+Bulk paths that bypass ``save()`` (``QuerySet.update``, ``bulk_create``) and
+``values()`` queries on array columns only see the JSON columns, unless
+``prepare_bulk_write()`` is called on each instance before
+``bulk_create``/``bulk_update``.
+"""
+import functools
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.signals import class_prepared, post_delete
+
+from survey_api.utils.array_precision import RAW, ColumnPrecision, quantize
+from survey_api.utils.array_store import array_store, to_array
+
+logger = logging.getLogger(__name__)
+
+
+class StoredArrayAttribute(DeferredAttribute):
+    """Field descriptor that loads an offloaded column from the array store on first access."""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if not value:
+            name = self.field.attname
+            ref = instance.array_ref
+            if array_store.has(ref, name):
+                value = array_store.read_list(ref, name)
+                instance.__dict__[name] = value
+        return value
+
+    def __set__(self, instance, value):
+        # A data descriptor, so the placeholder set by Model.__init__ does not
+        # shadow __get__ in the instance dict
+        instance.__dict__[self.field.attname] = value
+
+
+class StoredArraysModel(models.Model):
+    """Model with ARRAY_FIELDS that can be offloaded to the on-disk array store."""
+
+    ARRAY_FIELDS: tuple = ()
+    # Column name -> ColumnPrecision; unlisted columns are RAW
+    ARRAY_PRECISION: Dict[str, ColumnPrecision] = {}
+
+    array_ref = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="On-disk array store reference (files and checksums) when array columns are offloaded"
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        self._quantize_arrays(update_fields)
+        if self._offload_arrays(update_fields) and update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'array_ref'}
+        super().save(*args, **kwargs)
+
+    def column_array(self, name: str):
+        """
+        Column as a numpy array (read-only memmap in its stored dtype when offloaded, NaN for missing values).
+
+        Args:
+            name: One of ARRAY_FIELDS
+        """
+        ref = self.array_ref
+        if array_store.has(ref, name) and not self.__dict__.get(name):
+            return array_store.open(ref, name)
+        return to_array(getattr(self, name))
+
+    def column_slice(self, name: str, window: slice, length: int) -> Optional[list]:
+        """
+        ``window`` of a column parallel to an MD column of ``length`` stations.
+
+        Offloaded columns are sliced from the memmap, so only the window is read.
+        Columns of a different length (or None) are returned whole.
+        """
+        ref = self.array_ref
+        if array_store.has(ref, name) and not self.__dict__.get(name):
+            if ref['columns'][name]['length'] != length:
+                return array_store.read_list(ref, name)
+            return array_store.read_window(ref, name, window)
+        values = getattr(self, name)
+        if values is None or len(values) != length:
+            return values
+        return values[window]
+
+    def prepare_bulk_write(self) -> bool:
+        """
+        Quantize and offload loaded array columns ahead of bulk_create/bulk_update.
+
+        Returns:
+            True when ``array_ref`` changed and must be included in bulk_update fields
+        """
+        self._quantize_arrays()
+        return self._offload_arrays()
+
+    @property
+    def arrays_offloaded(self) -> bool:
+        return bool(self.array_ref)
+
+    def _loaded_arrays(self, update_fields: Optional[Iterable[str]] = None) -> Dict:
+        """Array columns present on the instance (and in ``update_fields`` when given)."""
+        names = [name for name in self.ARRAY_FIELDS if name in self.__dict__]
+        if update_fields is not None:
+            names = [name for name in names if name in set(update_fields)]
+        return {name: self.__dict__[name] for name in names}
+
+    def _quantize_arrays(self, update_fields: Optional[Iterable[str]] = None):
+        """Round loaded derived columns to their ARRAY_PRECISION."""
+        for name, values in self._loaded_arrays(update_fields).items():
+            precision = self.ARRAY_PRECISION.get(name, RAW)
+            if values and precision is not RAW:
+                self.__dict__[name] = quantize(values, precision)
+
+    def _should_offload(self, columns: Dict) -> bool:
+        if not getattr(settings, 'SURVEY_ARRAY_STORE_ENABLED', False):
+            return False
+        longest = max((len(values) for values in columns.values() if values), default=0)
+        return longest >= getattr(settings, 'SURVEY_ARRAY_STORE_MIN_POINTS', 5000)
+
+    def _offload_arrays(self, update_fields: Optional[Iterable[str]] = None) -> bool:
+        """
+        Write loaded array columns to the store and leave placeholders for the DB row.
+
+        Returns:
+            True when ``array_ref`` changed and must be saved
+        """
+        loaded = self._loaded_arrays(update_fields)
+
+        ref = self.array_ref
+        if not ref and not self._should_offload(loaded):
+            return False
+
+        # Columns still holding the placeholder are unchanged on disk
+        changed = {
+            name: values for name, values in loaded.items()
+            if values or not array_store.has(ref, name)
+        }
+        new_ref = ref
+        if changed:
+            new_ref = array_store.write(self._meta.db_table, self.pk, changed, ref, self.ARRAY_PRECISION)
+
+        for name in loaded:
+            self.__dict__[name] = [] if array_store.has(new_ref, name) else None
+        if new_ref == ref:
+            return False
+
+        self.array_ref = new_ref
+        table, pk = self._meta.db_table, self.pk
+        transaction.on_commit(lambda: array_store.prune(table, pk, new_ref))
+        return True
+
+
+def _delete_arrays(sender, instance, **kwargs):
+    if instance.__dict__.get('array_ref'):
+        table, pk = sender._meta.db_table, instance.pk
+        transaction.on_commit(lambda: array_store.delete(table, pk))
+
+
+def _stored_value(attname, model_instance, add):
+    """Field.pre_save for array columns: the value in the instance dict, without loading from disk."""
+    return model_instance.__dict__.get(attname)
+
+
+def _install_descriptors(sender, **kwargs):
+    """Swap in StoredArrayAttribute for the array columns of concrete subclasses."""
+    if not issubclass(sender, StoredArraysModel) or sender._meta.abstract:
+        return
+    for name in sender.ARRAY_FIELDS:
+        field = sender._meta.get_field(name)
+        setattr(sender, name, StoredArrayAttribute(field))
+        # Saves must write the placeholder, not the column read back through the descriptor
+        field.pre_save = functools.partial(_stored_value, field.attname)
+    post_delete.connect(_delete_arrays, sender=sender, weak=False,
+                        dispatch_uid=f'stored_arrays_delete_{sender._meta.label}')
+
+
+class_prepared.connect(_install_descriptors)
@@ -7,10 +7,12 @@ from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from .stored_arrays import StoredArraysModel
+
 logger = logging.getLogger(__name__)
 
 
-class SurveyData(models.Model):
+class SurveyData(StoredArraysModel):
     """
     Store raw parsed survey measurements from uploaded Excel/CSV files.
 
@@ -79,6 +81,9 @@ class SurveyData(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Per-station array columns (deferred when only metadata is needed)
+    ARRAY_FIELDS = ('md_data', 'inc_data', 'azi_data', 'wt_data', 'gt_data')
+
     class Meta:
         db_table = 'survey_data'
         verbose_name = 'Survey Data'
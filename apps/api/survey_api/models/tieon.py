@@ -4,6 +4,8 @@ TieOn model for storing survey starting point and hole section details.
 import uuid
 from decimal import Decimal
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 
@@ -210,3 +212,17 @@ class TieOn(models.Model):
         self.full_clean()
 
         super().save(*args, **kwargs)
+
+
+@receiver([post_save, post_delete], sender=TieOn)
+def invalidate_run_results_on_tieon_change(sender, instance, **kwargs):
+    """
+    Flag the run's calculations (and results derived from them) whose
+    tie-on input changed; they are recalculated lazily or in the background.
+    """
+    if instance.run_id is None:
+        return
+
+    from survey_api.services.recalculation_service import recalculation
+
+    recalculation.inputs_changed(instance.run_id)
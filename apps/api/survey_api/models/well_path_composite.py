@@ -0,0 +1,91 @@
+"""
+WellPathComposite Model
+
+Definitive well path of a Well, merged by MD from the surveys of its runs
+(see survey_api.services.well_path_service).
+"""
+import uuid
+from django.db import models
+
+from survey_api.utils.array_precision import POSITION, RATE
+
+from .stored_arrays import StoredArraysModel
+
+
+class WellPathComposite(StoredArraysModel):
+    """
+    Composite trajectory of a well assembled from several runs.
+
+    Stations come from the highest-priority survey covering each MD; positions
+    are recalculated by minimum curvature along the merged stations from the
+    tie-on of the shallowest run. ``sources`` records the version and MD range
+    of every survey considered, so an update only recalculates from the first
+    changed survey downward.
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+
+    well = models.OneToOneField(
+        'Well',
+        on_delete=models.CASCADE,
+        related_name='composite_path',
+        help_text="Well this composite path belongs to"
+    )
+
+    # Merged stations
+    md = models.JSONField(help_text="Measured Depth (meters)")
+    inc = models.JSONField(help_text="Inclination (degrees)")
+    azi = models.JSONField(help_text="Azimuth (degrees)")
+
+    # Recalculated positions and dogleg severity
+    easting = models.JSONField(help_text="Easting offset from the wellhead (meters)")
+    northing = models.JSONField(help_text="Northing offset from the wellhead (meters)")
+    tvd = models.JSONField(help_text="True Vertical Depth (meters)")
+    dls = models.JSONField(help_text="Dog Leg Severity (degrees/30m)")
+
+    sources = models.JSONField(
+        default=list,
+        help_text="Surveys considered: id, run, survey type, version and MD range"
+    )
+    segments = models.JSONField(
+        default=list,
+        help_text="Contiguous station ranges taken from each survey, shallowest first"
+    )
+    build_key = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text="Source priority and tie-on version the path was built with"
+    )
+    station_count = models.IntegerField(default=0)
+    recomputed_from_md = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="MD the last update recalculated from (null for a full rebuild)"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Per-station array columns (deferred when only metadata is needed)
+    ARRAY_FIELDS = ('md', 'inc', 'azi', 'easting', 'northing', 'tvd', 'dls')
+
+    # Derived columns are stored quantized (tolerances in survey_api.utils.array_precision)
+    ARRAY_PRECISION = {
+        'easting': POSITION,
+        'northing': POSITION,
+        'tvd': POSITION,
+        'dls': RATE,
+    }
+
+    class Meta:
+        db_table = 'well_path_composites'
+        verbose_name = 'Well Path Composite'
+        verbose_name_plural = 'Well Path Composites'
+
+    def __str__(self):
+        return f"WellPathComposite({self.well_id}) - {self.station_count} stations"
@@ -21,9 +21,12 @@ from .tieon_serializers import (
 )
 from .survey_data_serializers import SurveyDataSerializer
 from .upload_serializers import FileUploadSerializer
+from .qa_serializers import QARescoreRequestSerializer
 from .calculated_survey_serializers import (
     CalculatedSurveySerializer,
     CalculationStatusSerializer,
+    BatchCalculationRequestSerializer,
+    ClearanceRequestSerializer,
 )
 from .interpolated_survey_serializers import (
     InterpolatedSurveySerializer,
@@ -74,8 +77,11 @@ __all__ = [
     'UpdateTieOnSerializer',
     'SurveyDataSerializer',
     'FileUploadSerializer',
+    'QARescoreRequestSerializer',
     'CalculatedSurveySerializer',
     'CalculationStatusSerializer',
+    'BatchCalculationRequestSerializer',
+    'ClearanceRequestSerializer',
     'InterpolatedSurveySerializer',
     'InterpolationRequestSerializer',
     'InterpolationResponseSerializer',
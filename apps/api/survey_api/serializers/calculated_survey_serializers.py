@@ -31,6 +31,7 @@ class CalculatedSurveySerializer(serializers.ModelSerializer):
             'calculation_duration',
             'error_message',
             'calculation_context',
+            'is_stale',
             'created_at',
             'updated_at',
         ]
@@ -63,3 +64,51 @@ class CalculationStatusSerializer(serializers.Serializer):
             'error_message',
             'created_at',
         ]
+
+
+class BatchCalculationRequestSerializer(serializers.Serializer):
+    """
+    Serializer for batch recalculation requests.
+
+    Exactly one of job_id, well_id or survey_data_ids selects the surveys.
+    """
+
+    job_id = serializers.UUIDField(required=False, help_text="Recalculate every survey of the job's runs")
+    well_id = serializers.UUIDField(required=False, help_text="Recalculate every survey of the well's runs")
+    survey_data_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        help_text="Recalculate these SurveyData records"
+    )
+
+    def validate(self, attrs):
+        if len(attrs) != 1:
+            raise serializers.ValidationError("Provide exactly one of job_id, well_id or survey_data_ids")
+        return attrs
+
+
+class ClearanceRequestSerializer(serializers.Serializer):
+    """
+    Serializer for clearance scan requests.
+
+    Without offset_survey_data_ids every other wellbore in the reference's
+    projection frame is scanned.
+    """
+
+    offset_survey_data_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        help_text="Offset SurveyData records to scan against"
+    )
+    md_from = serializers.FloatField(required=False, help_text="First reference MD")
+    md_to = serializers.FloatField(required=False, help_text="Last reference MD")
+    screening_distance = serializers.FloatField(
+        required=False, min_value=0.0, help_text="Bounding-box screening distance in metres"
+    )
+
+    def validate(self, attrs):
+        if 'md_from' in attrs and 'md_to' in attrs and attrs['md_from'] > attrs['md_to']:
+            raise serializers.ValidationError({'md_from': 'Must be less than or equal to md_to.'})
+        return attrs
@@ -30,12 +30,12 @@ class ComparisonResultSerializer(serializers.ModelSerializer):
             'comparison_inc', 'comparison_azi', 'comparison_northing',
             'comparison_easting', 'comparison_tvd',
             # Metadata
-            'statistics', 'created_at', 'created_by',
+            'statistics', 'is_stale', 'created_at', 'created_by',
             'primary_survey_info', 'reference_survey_info', 'run_info',
             'created_by_username'
         )
         read_only_fields = (
-            'id', 'created_at', 'created_by', 'primary_survey_info',
+            'id', 'is_stale', 'created_at', 'created_by', 'primary_survey_info',
             'reference_survey_info', 'run_info', 'created_by_username'
         )
 
@@ -98,11 +98,11 @@ class ComparisonResultListSerializer(serializers.ModelSerializer):
         model = ComparisonResult
         fields = (
             'id', 'run', 'primary_survey', 'reference_survey', 'ratio_factor',
-            'created_at', 'created_by_username',
+            'is_stale', 'created_at', 'created_by_username',
             'primary_survey_info', 'reference_survey_info',
             'max_deviation', 'point_count'
         )
-        read_only_fields = ('id', 'created_at')
+        read_only_fields = ('id', 'is_stale', 'created_at')
 
     def get_primary_survey_info(self, obj):
         """Get primary survey metadata."""
@@ -99,10 +99,11 @@ class ExtrapolationSerializer(serializers.ModelSerializer):
             'final_tvd',
             'final_horizontal_displacement',
             # Metadata
+            'is_stale',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'is_stale', 'created_at', 'updated_at']
 
 
 class ExtrapolationListSerializer(serializers.ModelSerializer):
@@ -129,6 +130,7 @@ class ExtrapolationListSerializer(serializers.ModelSerializer):
             'extrapolated_point_count',
             'final_md',
             'final_tvd',
+            'is_stale',
             'created_at',
         ]
         read_only_fields = fields
@@ -30,6 +30,7 @@ class InterpolatedSurveySerializer(serializers.ModelSerializer):
             'point_count',
             'interpolation_duration',
             'error_message',
+            'is_stale',
             'created_at',
             'updated_at',
         ]
@@ -50,6 +51,7 @@ class InterpolatedSurveySerializer(serializers.ModelSerializer):
             'point_count',
             'interpolation_duration',
             'error_message',
+            'is_stale',
             'created_at',
             'updated_at',
         ]
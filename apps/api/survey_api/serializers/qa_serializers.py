@@ -0,0 +1,30 @@
+"""
+Serializers for GTL QA review requests.
+"""
+from rest_framework import serializers
+
+
+class QARescoreRequestSerializer(serializers.Serializer):
+    """
+    Serializer for QA re-scoring requests.
+
+    Lists only the stations toggled since the previous request.
+    """
+
+    keep = serializers.ListField(
+        child=serializers.IntegerField(min_value=0),
+        required=False,
+        default=list,
+        help_text="Station indices the reviewer kept"
+    )
+    drop = serializers.ListField(
+        child=serializers.IntegerField(min_value=0),
+        required=False,
+        default=list,
+        help_text="Station indices the reviewer dropped"
+    )
+    reset = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Restart from the initial selection before applying the toggles"
+    )
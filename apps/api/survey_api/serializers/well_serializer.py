@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from survey_api.models import Well, Run
+from survey_api.models import Well, Run, WellPathComposite
 
 
 class RunSummarySerializer(serializers.ModelSerializer):
@@ -94,3 +94,19 @@ class WellListSerializer(serializers.ModelSerializer):
         # Count runs through jobs
         from django.db.models import Count
         return obj.jobs.aggregate(total_runs=Count('runs'))['total_runs'] or 0
+
+
+class WellPathCompositeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the composite well path of a well.
+
+    Used for reading the merged stations, positions and source segments.
+    """
+
+    class Meta:
+        model = WellPathComposite
+        fields = (
+            'id', 'well', 'md', 'inc', 'azi', 'easting', 'northing', 'tvd', 'dls',
+            'segments', 'station_count', 'recomputed_from_md', 'created_at', 'updated_at',
+        )
+        read_only_fields = fields
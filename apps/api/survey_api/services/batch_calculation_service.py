@@ -0,0 +1,298 @@
+"""
+Batch Calculation Service
+
+Recalculates many surveys at once, e.g. every run of a job or well after a
+location or tie-on correction:
+1. Survey data and run context (location, depth, tie-on) for the whole batch
+   are loaded in one query
+2. Trajectories (with BHC iteration) are computed in parallel in the compute pool
+3. All CalculatedSurvey rows, survey file statuses and BHC proposal directions
+   are written in one transaction with bulk_create/bulk_update; interpolations
+   of rewritten calculations are flagged stale in the same transaction
+4. The eager derived-data stages (geographic coordinates, uncertainty) run
+   for each successful calculation, as after a single calculation
+5. Per-survey status and timings are returned
+
+Usage:
+    ids = BatchCalculationService.survey_data_ids(request.user, job_id=job_id)
+    summary = BatchCalculationService.calculate_many(ids)
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from survey_api.exceptions import (
+    ComputeCapacityError,
+    ComputeTimeoutError,
+    InsufficientDataError,
+    ValidationError,
+    WellengCalculationError,
+)
+from survey_api.models import CalculatedSurvey, InterpolatedSurvey, Run, SurveyData, SurveyFile
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+
+logger = logging.getLogger(__name__)
+
+# Columns rewritten on existing CalculatedSurvey rows
+WRITE_FIELDS = (
+    *CalculatedSurvey.ARRAY_FIELDS,
+    'vertical_section_azimuth',
+    'calculation_status',
+    'calculation_duration',
+    'calculation_context',
+    'error_message',
+    'is_stale',
+    'updated_at',
+)
+
+
+class BatchCalculationService:
+    """Recalculates a set of surveys with shared context loading and a single write."""
+
+    @staticmethod
+    def survey_data_ids(user, job_id=None, well_id=None, survey_data_ids=None) -> List:
+        """
+        Resolve the user's calculable SurveyData ids for a job, a well or an explicit list.
+
+        Surveys pending QA approval and surveys of deleted runs are excluded.
+
+        Args:
+            user: Owner of the runs
+            job_id: Select every survey of the job's runs
+            well_id: Select every survey of the well's runs
+            survey_data_ids: Select these surveys (those not owned by ``user`` are dropped)
+
+        Returns:
+            SurveyData ids ordered by creation time
+        """
+        queryset = SurveyData.objects.filter(
+            survey_file__run__user=user,
+            survey_file__run__deleted=False,
+        ).exclude(validation_status='pending_qa')
+
+        if job_id is not None:
+            queryset = queryset.filter(survey_file__run__job_id=job_id)
+        elif well_id is not None:
+            queryset = queryset.filter(
+                Q(survey_file__run__job__well_id=well_id) | Q(survey_file__run__well_id=well_id)
+            )
+        else:
+            queryset = queryset.filter(id__in=list(survey_data_ids or []))
+
+        return list(queryset.order_by('created_at').values_list('id', flat=True).distinct())
+
+    @staticmethod
+    def calculate_many(survey_data_ids: Iterable) -> Dict:
+        """
+        Recalculate the given surveys and store the results.
+
+        Args:
+            survey_data_ids: SurveyData UUIDs (at most BATCH_CALCULATION_MAX_SURVEYS)
+
+        Returns:
+            Dictionary containing:
+                - count: int - Surveys in the batch
+                - calculated: int - Surveys calculated successfully
+                - failed: int - Surveys that produced an error record
+                - skipped: int - Surveys left unchanged because the compute pool was unavailable
+                - duration: float - Wall time of the batch (seconds)
+                - results: List[Dict] - Per survey: survey_data_id, run_id,
+                  calculated_survey_id, status, calculation_duration, error_message
+
+        Raises:
+            ValidationError: If the batch is larger than BATCH_CALCULATION_MAX_SURVEYS
+        """
+        ids = list(dict.fromkeys(survey_data_ids))
+        max_surveys = getattr(settings, 'BATCH_CALCULATION_MAX_SURVEYS', 200)
+        if len(ids) > max_surveys:
+            raise ValidationError(
+                f"Batch contains {len(ids)} surveys; at most {max_surveys} can be calculated at once",
+                field_errors={'survey_data_ids': [f'Ensure this list has at most {max_surveys} items.']}
+            )
+
+        with span('calculation.batch') as timer:
+            surveys = BatchCalculationService._load(ids)
+            outcomes = BatchCalculationService._compute_all(surveys)
+            records = BatchCalculationService._write(surveys, outcomes)
+            for record in records.values():
+                if record.calculation_status == 'calculated':
+                    SurveyCalculationService.derive_eager(record)
+
+        results = []
+        for survey_data in surveys:
+            outcome = outcomes[survey_data.id]
+            record = records.get(survey_data.id)
+            results.append({
+                'survey_data_id': str(survey_data.id),
+                'run_id': str(survey_data.survey_file.run_id),
+                'calculated_survey_id': str(record.id) if record else None,
+                'status': record.calculation_status if record else 'skipped',
+                'calculation_duration': round(outcome['duration'], 3) if outcome.get('duration') is not None else None,
+                'error_message': outcome.get('error'),
+            })
+
+        summary = {
+            'count': len(results),
+            'calculated': sum(1 for item in results if item['status'] == 'calculated'),
+            'failed': sum(1 for item in results if item['status'] == 'error'),
+            'skipped': sum(1 for item in results if item['status'] == 'skipped'),
+            'duration': round(timer.duration, 3),
+            'results': results,
+        }
+        logger.info(
+            f"Batch calculation finished: {summary['calculated']} calculated, {summary['failed']} failed, "
+            f"{summary['skipped']} skipped in {summary['duration']:.3f}s"
+        )
+        return summary
+
+    @staticmethod
+    def _load(ids: List) -> List[SurveyData]:
+        """Load the surveys with run context and existing calculation metadata in one query."""
+        surveys = SurveyData.objects.filter(id__in=ids).select_related(
+            'survey_file__run__location',
+            'survey_file__run__depth',
+            'survey_file__run__tieon',
+            'calculated_survey',
+        ).defer(*(f'calculated_survey__{name}' for name in CalculatedSurvey.ARRAY_FIELDS))
+
+        order = {survey_id: index for index, survey_id in enumerate(ids)}
+        return sorted(surveys, key=lambda survey_data: order.get(survey_data.id, len(order)))
+
+    @staticmethod
+    def _compute_all(surveys: List[SurveyData]) -> Dict:
+        """
+        Build contexts and compute every trajectory in the compute pool.
+
+        Returns:
+            SurveyData id -> outcome dict (``result`` or ``error``, ``duration``,
+            ``context``; ``skipped`` when the pool could not run it)
+        """
+        outcomes = {}
+        tasks = []
+        for survey_data in surveys:
+            try:
+                context = SurveyCalculationService._get_calculation_context(survey_data)
+            except InsufficientDataError as e:
+                outcomes[survey_data.id] = {'error': str(e), 'duration': None, 'context': {}}
+                continue
+            tasks.append((survey_data, context))
+
+        if not tasks:
+            return outcomes
+
+        SurveyFile.objects.filter(
+            id__in=[survey_data.survey_file_id for survey_data, _ in tasks]
+        ).update(processing_status='processing')
+
+        try:
+            for index, outcome in compute_pool.imap_unordered(
+                BatchCalculationService._compute,
+                [(survey_data.md_data, survey_data.inc_data, survey_data.azi_data, context)
+                 for survey_data, context in tasks],
+                timeout=getattr(settings, 'BATCH_CALCULATION_TIMEOUT', 600),
+            ):
+                survey_data, context = tasks[index]
+                outcomes[survey_data.id] = {**outcome, 'context': context}
+        except (ComputeCapacityError, ComputeTimeoutError) as e:
+            logger.warning(f"Batch calculation interrupted: {e}")
+            unfinished = [survey_data for survey_data, _ in tasks if survey_data.id not in outcomes]
+            for survey_data in unfinished:
+                outcomes[survey_data.id] = {'error': str(e), 'duration': None, 'skipped': True}
+            # Leave the previous results (and statuses) of unfinished surveys untouched
+            SurveyFile.objects.bulk_update([survey_data.survey_file for survey_data in unfinished], ['processing_status'])
+
+        return outcomes
+
+    @staticmethod
+    def _compute(md, inc, azi, context: Dict) -> Dict:
+        """Pool task: compute one trajectory, returning failures instead of raising them."""
+        started = time.perf_counter()
+        try:
+            result, proposal_direction = SurveyCalculationService.compute_trajectory(md, inc, azi, context)
+            return {'result': result, 'proposal_direction': proposal_direction, 'duration': time.perf_counter() - started}
+        except WellengCalculationError as e:
+            return {'error': str(e), 'duration': time.perf_counter() - started}
+        except Exception as e:
+            return {'error': f"Unexpected error: {e}", 'duration': time.perf_counter() - started}
+
+    @staticmethod
+    def _write(surveys: List[SurveyData], outcomes: Dict) -> Dict:
+        """
+        Store all outcomes in one transaction.
+
+        Returns:
+            SurveyData id -> CalculatedSurvey for every survey that was written
+        """
+        now = timezone.now()
+        records, created, updated, files, runs = {}, [], [], [], {}
+
+        with transaction.atomic():
+            for survey_data in surveys:
+                outcome = outcomes[survey_data.id]
+                if outcome.get('skipped'):
+                    continue
+
+                calculated_survey = getattr(survey_data, 'calculated_survey', None)
+                is_new = calculated_survey is None
+                if is_new:
+                    calculated_survey = CalculatedSurvey(survey_data=survey_data)
+                BatchCalculationService._apply(calculated_survey, outcome)
+                calculated_survey.updated_at = now
+                calculated_survey.prepare_bulk_write()
+                (created if is_new else updated).append(calculated_survey)
+                records[survey_data.id] = calculated_survey
+
+                survey_file = survey_data.survey_file
+                survey_file.processing_status = 'completed' if 'result' in outcome else 'failed'
+                files.append(survey_file)
+
+                if outcome.get('proposal_direction') is not None:
+                    run = survey_file.run
+                    run.proposal_direction = round(outcome['proposal_direction'], 6)
+                    runs[run.pk] = run
+
+            CalculatedSurvey.objects.bulk_create(created)
+            CalculatedSurvey.objects.bulk_update(updated, [*WRITE_FIELDS, 'array_ref'])
+            # Interpolated from the previous trajectory; recomputed on next request
+            InterpolatedSurvey.objects.filter(
+                calculated_survey__in=[record.pk for record in updated]
+            ).update(is_stale=True)
+            SurveyFile.objects.bulk_update(files, ['processing_status'])
+            Run.objects.bulk_update(list(runs.values()), ['proposal_direction'])
+
+            # bulk writes skip post_save, which pre-generates the calculation report
+            calculated_ids = [
+                str(survey_id) for survey_id, record in records.items()
+                if record.calculation_status == 'calculated'
+            ]
+            transaction.on_commit(lambda: BatchCalculationService._pregenerate_reports(calculated_ids))
+
+        return records
+
+    @staticmethod
+    def _apply(calculated_survey: CalculatedSurvey, outcome: Dict):
+        """Copy a computed result (or an error) onto a CalculatedSurvey."""
+        result: Optional[Dict] = outcome.get('result')
+        for name in CalculatedSurvey.ARRAY_FIELDS:
+            setattr(calculated_survey, name, result.get(name) if result else [])
+        calculated_survey.vertical_section_azimuth = result.get('vertical_section_azimuth') if result else None
+        calculated_survey.calculation_status = 'calculated' if result else 'error'
+        calculated_survey.calculation_duration = round(outcome['duration'], 3) if result else None
+        calculated_survey.calculation_context = outcome.get('context') or {}
+        calculated_survey.error_message = None if result else outcome.get('error')
+        calculated_survey.is_stale = False
+
+    @staticmethod
+    def _pregenerate_reports(survey_data_ids: List[str]):
+        from survey_api.services.report_artifact_store import report_artifacts
+        from survey_api.services.survey_calculation_report_service import get_survey_calculation_report_artifact
+
+        for survey_data_id in survey_data_ids:
+            report_artifacts.pregenerate(get_survey_calculation_report_artifact, survey_data_id)
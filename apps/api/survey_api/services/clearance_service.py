@@ -0,0 +1,338 @@
+"""
+Clearance Service - anti-collision scan of a reference well against its offsets.
+
+For every station of a reference survey and every offset wellbore the scan
+finds the closest point on the offset trajectory (center-to-center distance)
+and the separation factor there:
+
+    separation_factor = center_to_center / (k * sigma)
+
+sigma is the combined 1-sigma positional uncertainty of the two points along
+the line between them: each well's station covariance from its error model
+(UncertaintyService), interpolated to the point's MD and rotated into the grid
+frame, projected onto that line; the two wells' errors are independent, so
+their variances add. k is CLEARANCE_SIGMA_SCALE.
+
+1. Trajectories come from the spatial index, in its common grid frame
+2. A bounding-box pre-pass drops offsets that cannot come within the
+   screening distance of the reference stations
+3. The remaining offsets are split into groups of similar segment count and
+   scanned in parallel in the compute pool; each group is one vectorized pass
+   over all its offsets' segments (reference stations in blocks of at most
+   CLEARANCE_MAX_PAIRS station-segment pairs)
+
+Usage:
+    result = ClearanceService.scan(survey_data_id, md_from=500, md_to=2500)
+"""
+import logging
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from survey_api.exceptions import ValidationError
+from survey_api.models import CalculatedSurvey, SurveyData
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import metrics, span
+from survey_api.services.spatial_index_service import SpatialIndexService, spatial_index
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+from survey_api.services.uncertainty_service import UncertaintyService
+
+logger = logging.getLogger(__name__)
+
+_RUN = 'survey_data__survey_file__run'
+
+# Covariance terms of UncertaintyService.uncertainty_columns, as (row, column) in north/east/vertical
+COVARIANCE_TERMS = {
+    'cov_nn': (0, 0), 'cov_ne': (0, 1), 'cov_nv': (0, 2),
+    'cov_ee': (1, 1), 'cov_ev': (1, 2), 'cov_vv': (2, 2),
+}
+
+
+class ClearanceService:
+    """
+    Center-to-center distance and separation factor scans.
+
+    Settings:
+        CLEARANCE_SCREENING_DISTANCE: Default bounding-box screening distance in metres (default 1000)
+        CLEARANCE_SIGMA_SCALE: Standard deviations of combined uncertainty in the separation
+            factor denominator (default 3.5)
+        CLEARANCE_SF_STOP: Separation factor below which an offset is 'stop' (default 1.0)
+        CLEARANCE_SF_WARNING: Separation factor below which an offset is 'warning' (default 1.5)
+        CLEARANCE_MAX_PAIRS: Station-segment pairs evaluated per block (default 1,000,000)
+    """
+
+    @staticmethod
+    @span('clearance.scan')
+    def scan(survey_data_id, offset_survey_data_ids: Optional[Iterable] = None, md_from: Optional[float] = None,
+             md_to: Optional[float] = None, screening_distance: Optional[float] = None) -> Dict:
+        """
+        Scan a reference survey against offset wellbores.
+
+        Args:
+            survey_data_id: SurveyData UUID of the reference survey
+            offset_survey_data_ids: Offsets to scan (every other wellbore in the
+                reference's projection frame when omitted)
+            md_from: Optional first reference MD
+            md_to: Optional last reference MD
+            screening_distance: Offsets whose bounding box is further than this
+                from the reference stations are skipped (CLEARANCE_SCREENING_DISTANCE when omitted)
+
+        Returns:
+            Dictionary with md, min_separation_factor (per station, over all
+            offsets), screening_distance, scanned, pruned, missing (requested
+            offsets without a located trajectory in the frame) and offsets,
+            lowest separation factor first; each offset has survey_data_id,
+            run_id, run_number, well_id, status, min_center_to_center,
+            md_at_min_center_to_center, min_separation_factor,
+            md_at_min_separation_factor and per-station center_to_center,
+            separation_factor and offset_md lists
+
+        Raises:
+            InsufficientDataError: If the reference has no calculated trajectory with a location
+            ValidationError: If no reference station lies in the MD range
+        """
+        if screening_distance is None:
+            screening_distance = getattr(settings, 'CLEARANCE_SCREENING_DISTANCE', 1000.0)
+        screening_distance = float(screening_distance)
+
+        reference, candidates = spatial_index.offset_trajectories(survey_data_id)
+        missing = []
+        if offset_survey_data_ids is not None:
+            wanted = {uuid.UUID(str(survey_id)) for survey_id in offset_survey_data_ids}
+            candidates = [(survey_id, trajectory) for survey_id, trajectory in candidates if survey_id in wanted]
+            missing = sorted(str(survey_id) for survey_id in wanted - {survey_id for survey_id, _ in candidates})
+
+        selected = ~np.isnan(reference.points).any(axis=1)
+        if md_from is not None:
+            selected &= reference.md >= md_from
+        if md_to is not None:
+            selected &= reference.md <= md_to
+        md, points = reference.md[selected], reference.points[selected]
+        if not len(md):
+            raise ValidationError(
+                "No reference stations in the MD range",
+                field_errors={'md_from': ['No calculated stations between md_from and md_to.']}
+            )
+
+        # Bounding-box pre-pass: drop offsets that cannot come within the screening distance
+        low, high = points.min(axis=0) - screening_distance, points.max(axis=0) + screening_distance
+        offsets = []
+        for survey_id, trajectory in candidates:
+            segments = SpatialIndexService.segments(trajectory, np.inf)
+            if not len(segments[0]):
+                continue
+            box_low = np.minimum(segments[0].min(axis=0), segments[1].min(axis=0))
+            box_high = np.maximum(segments[0].max(axis=0), segments[1].max(axis=0))
+            if np.all(box_low <= high) and np.all(box_high >= low):
+                offsets.append((survey_id, trajectory, segments))
+        pruned = len(candidates) - len(offsets)
+
+        distance = np.empty((len(md), len(offsets)))
+        offset_md = np.empty((len(md), len(offsets)))
+        groups = ClearanceService._groups([len(segments[0]) for _, _, segments in offsets])
+        tasks = []
+        for members in groups:
+            parts = [offsets[index][2] for index in members]
+            sizes = [len(part[0]) for part in parts]
+            tasks.append((
+                points,
+                np.concatenate([part[0] for part in parts]),
+                np.concatenate([part[1] for part in parts]),
+                np.concatenate([part[2] for part in parts]),
+                np.concatenate([part[3] for part in parts]),
+                np.cumsum([0] + sizes[:-1]),
+                int(getattr(settings, 'CLEARANCE_MAX_PAIRS', 1_000_000)),
+            ))
+        scanned = compute_pool.run_many(ClearanceService.scan_offsets, tasks)
+        for members, (group_distance, group_md) in zip(groups, scanned):
+            distance[:, members] = group_distance
+            offset_md[:, members] = group_md
+
+        covariances = ClearanceService.grid_covariances([survey_data_id] + [offset[0] for offset in offsets])
+        reference_covariance = ClearanceService.covariance_at(md, *covariances[uuid.UUID(str(survey_data_id))])
+        sigma_scale = float(getattr(settings, 'CLEARANCE_SIGMA_SCALE', 3.5))
+        separation = np.empty((len(md), len(offsets)))
+        for column, (survey_id, trajectory, _) in enumerate(offsets):
+            closest = ClearanceService.position_at(trajectory, offset_md[:, column])
+            direction = (closest - points) / np.maximum(distance[:, column], 1e-9)[:, None]
+            covariance = reference_covariance + ClearanceService.covariance_at(
+                offset_md[:, column], *covariances[survey_id]
+            )
+            sigma = np.sqrt(np.maximum(np.einsum('ni,nij,nj->n', direction, covariance, direction), 0.0))
+            separation[:, column] = distance[:, column] / np.maximum(sigma_scale * sigma, 1e-9)
+
+        results = []
+        for column, (survey_id, trajectory, _) in enumerate(offsets):
+            closest = int(np.argmin(distance[:, column]))
+            lowest = int(np.argmin(separation[:, column]))
+            min_separation = float(separation[lowest, column])
+            results.append({
+                'survey_data_id': str(survey_id),
+                'run_id': str(trajectory.run_id),
+                'run_number': trajectory.run_number,
+                'well_id': str(trajectory.well_id) if trajectory.well_id else None,
+                'status': ClearanceService.status(min_separation),
+                'min_center_to_center': float(distance[closest, column]),
+                'md_at_min_center_to_center': float(md[closest]),
+                'min_separation_factor': min_separation,
+                'md_at_min_separation_factor': float(md[lowest]),
+                'center_to_center': distance[:, column].tolist(),
+                'separation_factor': separation[:, column].tolist(),
+                'offset_md': offset_md[:, column].tolist(),
+            })
+        results.sort(key=lambda offset: offset['min_separation_factor'])
+
+        metrics.inc('survey_api_clearance_offsets_total', amount=len(offsets), labels={'outcome': 'scanned'},
+                    help_text='Offset wellbores considered by clearance scans')
+        metrics.inc('survey_api_clearance_offsets_total', amount=pruned, labels={'outcome': 'pruned'},
+                    help_text='Offset wellbores considered by clearance scans')
+        logger.info(
+            f"Clearance scan of SurveyData {survey_data_id}: {len(md)} stations, "
+            f"{len(offsets)} offsets scanned, {pruned} pruned"
+        )
+        return {
+            'survey_data_id': str(survey_data_id),
+            'md': md.tolist(),
+            'min_separation_factor': separation.min(axis=1).tolist() if len(offsets) else [None] * len(md),
+            'screening_distance': screening_distance,
+            'scanned': len(offsets),
+            'pruned': pruned,
+            'missing': missing,
+            'offsets': results,
+        }
+
+    @staticmethod
+    def scan_offsets(points: np.ndarray, start: np.ndarray, end: np.ndarray, md_start: np.ndarray,
+                     md_end: np.ndarray, bounds: np.ndarray, max_pairs: int = 1_000_000):
+        """
+        Closest approach of every station to each of several offsets, in one pass.
+
+        The offsets' segments are concatenated; ``bounds`` holds the index of
+        each offset's first segment. Runs in a compute pool worker (plain
+        arrays only).
+
+        Args:
+            points: Reference stations (n, 3)
+            start: Segment start points (segments, 3)
+            end: Segment end points (segments, 3)
+            md_start: Offset MD at each segment start
+            md_end: Offset MD at each segment end
+            bounds: First segment index of each offset (offsets,)
+            max_pairs: Station-segment pairs evaluated per block
+
+        Returns:
+            Tuple of (center-to-center distance, offset MD of the closest
+            point), each of shape (n, offsets)
+        """
+        count, segment_count = len(points), len(start)
+        distance = np.empty((count, len(bounds)))
+        offset_md = np.empty((count, len(bounds)))
+
+        direction = end - start
+        length_sq = np.einsum('ij,ij->i', direction, direction)
+        length_sq = np.where(length_sq > 0, length_sq, 1.0)
+        sizes = np.diff(np.r_[bounds, segment_count])
+        columns = np.arange(segment_count)
+
+        block = max(1, max_pairs // max(segment_count, 1))
+        for first in range(0, count, block):
+            relative = points[first:first + block, None, :] - start[None, :, :]
+            t = np.clip(np.einsum('bsk,sk->bs', relative, direction) / length_sq, 0.0, 1.0)
+            gap = relative - t[..., None] * direction
+            gap = np.sqrt(np.einsum('bsk,bsk->bs', gap, gap))
+
+            # Per-offset minimum and the first segment attaining it
+            minimum = np.minimum.reduceat(gap, bounds, axis=1)
+            attaining = np.where(gap <= np.repeat(minimum, sizes, axis=1), columns, segment_count)
+            nearest = np.minimum.reduceat(attaining, bounds, axis=1)
+            along = np.take_along_axis(t, nearest, axis=1)
+
+            distance[first:first + block] = minimum
+            offset_md[first:first + block] = md_start[nearest] + along * (md_end[nearest] - md_start[nearest])
+        return distance, offset_md
+
+    @staticmethod
+    def grid_covariances(survey_data_ids: Iterable) -> Dict:
+        """
+        Station position covariances of calculated surveys in the grid frame.
+
+        The covariances of each survey's own error model (UncertaintyService,
+        north/east/vertical in the calculation's north reference) are rotated
+        by the grid convergence for true-north surveys and scaled by the
+        wellhead scale factor, as the stations are in geographic_columns.
+
+        Returns:
+            SurveyData UUID -> (MD per station, covariance array of shape
+            (stations, 3, 3) over grid easting, grid northing and elevation)
+        """
+        calculated_surveys = CalculatedSurvey.objects.filter(
+            survey_data_id__in=list(survey_data_ids)
+        ).select_related(
+            f'{_RUN}__location', f'{_RUN}__well__location', f'{_RUN}__job__well__location',
+        ).defer(
+            *(name for name in CalculatedSurvey.ARRAY_FIELDS if name not in ('northing', 'easting')),
+            *(f'survey_data__{name}' for name in SurveyData.ARRAY_FIELDS if name not in ('md_data', 'inc_data', 'azi_data')),
+        )
+
+        covariances = {}
+        for calculated_survey in calculated_surveys:
+            _, columns = UncertaintyService.uncertainty_columns(calculated_survey)
+            local = np.empty((len(columns['cov_nn']), 3, 3))
+            for name, (row, column) in COVARIANCE_TERMS.items():
+                local[:, row, column] = local[:, column, row] = columns[name]
+
+            derived = SurveyCalculationService.geographic_columns(calculated_survey)
+            angle, scale = 0.0, 1.0
+            if derived is not None:
+                frame = derived[1]
+                angle = 0.0 if frame['north_reference'] == 'Grid North' else np.radians(frame['convergence'])
+                scale = frame['scale_factor']
+            # Local north/east/down -> grid easting/northing/elevation
+            rotation = np.array([
+                [-scale * np.sin(angle), scale * np.cos(angle), 0.0],
+                [scale * np.cos(angle), scale * np.sin(angle), 0.0],
+                [0.0, 0.0, -1.0],
+            ])
+            md = np.nan_to_num(calculated_survey.survey_data.column_array('md_data'))[:len(local)]
+            covariances[calculated_survey.survey_data_id] = (md, rotation @ local @ rotation.T)
+        return covariances
+
+    @staticmethod
+    def covariance_at(md, station_md: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+        """Covariances linearly interpolated between stations, shape (len(md), 3, 3)."""
+        flat = covariance.reshape(len(covariance), 9)
+        return np.column_stack([
+            np.interp(md, station_md, flat[:, term]) for term in range(9)
+        ]).reshape(-1, 3, 3)
+
+    @staticmethod
+    def position_at(trajectory, md) -> np.ndarray:
+        """Grid-frame points of a trajectory at the given MDs (straight between stations), shape (len(md), 3)."""
+        valid = ~np.isnan(trajectory.points).any(axis=1) & ~np.isnan(trajectory.md)
+        return np.column_stack([
+            np.interp(md, trajectory.md[valid], trajectory.points[valid, axis]) for axis in range(3)
+        ])
+
+    @staticmethod
+    def status(separation_factor: float) -> str:
+        """'stop', 'warning' or 'ok' for a separation factor."""
+        if separation_factor < getattr(settings, 'CLEARANCE_SF_STOP', 1.0):
+            return 'stop'
+        if separation_factor < getattr(settings, 'CLEARANCE_SF_WARNING', 1.5):
+            return 'warning'
+        return 'ok'
+
+    @staticmethod
+    def _groups(segment_counts: List[int]) -> List[List[int]]:
+        """Offset indices split into one group per pool worker, balanced by segment count."""
+        if not segment_counts:
+            return []
+        count = min(len(segment_counts), compute_pool.max_workers if compute_pool.enabled else 1)
+        groups, loads = [[] for _ in range(count)], [0] * count
+        for index in sorted(range(len(segment_counts)), key=lambda i: -segment_counts[i]):
+            lightest = loads.index(min(loads))
+            groups[lightest].append(index)
+            loads[lightest] += segment_counts[index]
+        return [sorted(group) for group in groups]
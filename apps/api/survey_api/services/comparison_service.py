@@ -6,10 +6,12 @@ This service handles:
 - Calculation of deltas (INC, AZI, position)
 - 3D displacement calculations
 """
+from __future__ import annotations
+
 import numpy as np
-import welleng as we
 from typing import Dict, List, Tuple, Any
 import logging
+from survey_api.utils.lazy_imports import welleng as we
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,250 @@
+"""
+Compute Pool Service
+
+Bounded process pool for CPU-bound work (welleng trajectory maths, duplicate
+survey optimisation, matplotlib rendering):
+1. Created lazily on first use, one pool per web worker process
+2. Workers pre-import NumPy/welleng/matplotlib and set up Django once
+3. Admission control: at most COMPUTE_POOL_MAX_PENDING tasks queued or running;
+   further submissions wait COMPUTE_POOL_ADMISSION_TIMEOUT seconds, then fail
+4. Per-task timeout; a task that overruns is cancelled, or if already running
+   its executor is retired: new tasks go to a fresh pool, the other tasks in
+   flight on the old one finish, then its remaining workers are terminated
+
+Only plain data (lists, dicts, NumPy arrays, ids) may cross the process
+boundary - model instances are never pickled. Numerical callables must not
+touch the ORM; report builders (report_bundle_service) query by id on the
+worker's own database connection.
+
+Usage:
+    result = compute_pool.run(WellengService._calculate_survey, md, inc, azi, ...)
+"""
+import atexit
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait as wait_futures,
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from survey_api import compute_worker
+from survey_api.exceptions import ComputeCapacityError, ComputeTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class ComputePool:
+    """
+    Lazily created, bounded ProcessPoolExecutor.
+
+    Settings:
+        COMPUTE_POOL_ENABLED: Run tasks in the pool (False runs them inline)
+        COMPUTE_POOL_WORKERS: Worker processes per web worker (default 2)
+        COMPUTE_POOL_MAX_PENDING: Max tasks queued or running (default 2 x workers)
+        COMPUTE_POOL_ADMISSION_TIMEOUT: Seconds to wait for a free slot (default 5)
+        COMPUTE_POOL_TASK_TIMEOUT: Default per-task timeout in seconds (default 120)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        # Futures submitted and not yet collected, per executor
+        self._inflight: Dict[ProcessPoolExecutor, Set[Future]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'COMPUTE_POOL_ENABLED', True) and not compute_worker.in_worker
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, getattr(settings, 'COMPUTE_POOL_WORKERS', 2))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                max_pending = getattr(settings, 'COMPUTE_POOL_MAX_PENDING', None) or self.max_workers * 2
+                # spawn: never fork a web worker holding DB connections and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=compute_worker.initialize,
+                )
+                if self._slots is None:
+                    self._slots = threading.BoundedSemaphore(max_pending)
+                logger.info(f"Started compute pool: {self.max_workers} workers, {max_pending} max pending")
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor; the next task creates a fresh one."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _retire(self, executor: ProcessPoolExecutor, overrunning: Set[Future]):
+        """
+        Stop sending work to an executor with an overrunning task.
+
+        A running task cannot be cancelled through the executor API, so its
+        worker is terminated - but only once the other tasks in flight on the
+        executor have finished (or had COMPUTE_POOL_TASK_TIMEOUT to do so).
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            others = set(self._inflight.get(executor, ())) - overrunning
+
+        def reap():
+            wait_futures(others, timeout=getattr(settings, 'COMPUTE_POOL_TASK_TIMEOUT', 120))
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        threading.Thread(target=reap, name='compute-pool-reaper', daemon=True).start()
+
+    def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Execute ``func(*args, **kwargs)`` in the pool and return its result.
+
+        Runs inline when the pool is disabled or when already inside a worker.
+
+        Args:
+            func: Module-level function or staticmethod (must be picklable)
+            timeout: Seconds to wait for the result (default COMPUTE_POOL_TASK_TIMEOUT)
+
+        Returns:
+            The function's return value; exceptions raised by it propagate
+
+        Raises:
+            ComputeCapacityError: No slot became free within the admission timeout
+            ComputeTimeoutError: The task did not finish in time or its worker died
+        """
+        return self._execute(func, [(args, kwargs)], timeout)[0]
+
+    def run_many(self, func: Callable, arg_tuples: Iterable[Tuple], timeout: Optional[float] = None) -> List:
+        """
+        Execute ``func(*args)`` for each argument tuple concurrently.
+
+        The batch is admitted as a single task; the pool's workers then share
+        it. ``timeout`` applies to the whole batch.
+
+        Returns:
+            Results in the order of ``arg_tuples``
+
+        Raises:
+            ComputeCapacityError: No slot became free within the admission timeout
+            ComputeTimeoutError: The batch did not finish in time or a worker died
+        """
+        return self._execute(func, [(tuple(args), {}) for args in arg_tuples], timeout)
+
+    def imap_unordered(self, func: Callable, arg_tuples: Iterable[Tuple], timeout: Optional[float] = None,
+                       max_inflight: Optional[int] = None) -> Iterator[Tuple[int, object]]:
+        """
+        Execute ``func(*args)`` for each argument tuple, yielding results as they finish.
+
+        Admitted as a single task like run_many. Closing the generator early
+        cancels tasks that have not started.
+
+        Args:
+            max_inflight: Submit at most this many calls at a time (default all);
+                the next call is submitted as each one finishes
+
+        Yields:
+            (index into arg_tuples, result)
+
+        Raises:
+            ComputeCapacityError: No slot became free within the admission timeout
+            ComputeTimeoutError: The batch did not finish in time or a worker died
+        """
+        return self._iterate(func, [(tuple(args), {}) for args in arg_tuples], timeout, max_inflight)
+
+    def _execute(self, func: Callable, calls: List[Tuple[tuple, dict]], timeout: Optional[float]) -> List:
+        results = [None] * len(calls)
+        for index, result in self._iterate(func, calls, timeout):
+            results[index] = result
+        return results
+
+    def _iterate(self, func: Callable, calls: List[Tuple[tuple, dict]], timeout: Optional[float],
+                 max_inflight: Optional[int] = None) -> Iterator[Tuple[int, object]]:
+        if not self.enabled:
+            for index, (args, kwargs) in enumerate(calls):
+                yield index, func(*args, **kwargs)
+            return
+
+        executor = self._get_executor()
+        admission_timeout = getattr(settings, 'COMPUTE_POOL_ADMISSION_TIMEOUT', 5)
+        if not self._slots.acquire(timeout=admission_timeout):
+            raise ComputeCapacityError(
+                "The calculation service is busy. Please retry in a few seconds."
+            )
+
+        if timeout is None:
+            timeout = getattr(settings, 'COMPUTE_POOL_TASK_TIMEOUT', 120)
+        name = getattr(func, '__qualname__', repr(func))
+
+        futures: Dict[Future, int] = {}
+        queued = iter(enumerate(calls))
+        window = max(1, max_inflight or len(calls))
+        deadline = time.monotonic() + timeout
+        try:
+            running = self._submit(executor, func, itertools.islice(queued, window), futures)
+            while running:
+                done, running = wait_futures(
+                    running, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    raise FutureTimeoutError()
+                # Refill the window before handing results to the caller
+                running |= self._submit(executor, func, itertools.islice(queued, len(done)), futures)
+                for future in done:
+                    yield futures[future], future.result()
+        except FutureTimeoutError:
+            overrunning = {future for future in futures if not (future.cancel() or future.done())}
+            if overrunning:
+                logger.warning(f"Compute task {name} exceeded {timeout}s; retiring its pool")
+                self._retire(executor, overrunning)
+            raise ComputeTimeoutError(f"Calculation timed out after {timeout} seconds")
+        except BrokenProcessPool:
+            logger.error(f"Compute pool broke while running {name}; restarting")
+            self._discard(executor)
+            raise ComputeTimeoutError("Calculation worker terminated unexpectedly")
+        finally:
+            # Early exit (error or closed generator): drop tasks that have not started
+            for future in futures:
+                future.cancel()
+            with self._lock:
+                pending = self._inflight.get(executor)
+                if pending is not None:
+                    pending.difference_update(futures)
+                    if not pending:
+                        del self._inflight[executor]
+            self._slots.release()
+
+    def _submit(self, executor: ProcessPoolExecutor, func: Callable,
+                calls: Iterable[Tuple[int, Tuple[tuple, dict]]], futures: Dict[Future, int]) -> Set[Future]:
+        submitted = {executor.submit(func, *args, **kwargs): index for index, (args, kwargs) in calls}
+        futures.update(submitted)
+        with self._lock:
+            self._inflight.setdefault(executor, set()).update(submitted)
+        return set(submitted)
+
+    def shutdown(self):
+        """Stop the pool (registered at interpreter exit)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide pool
+compute_pool = ComputePool()
+atexit.register(compute_pool.shutdown)
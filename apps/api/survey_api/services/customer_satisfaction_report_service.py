@@ -14,12 +14,15 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 
 from survey_api.models import Run
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportArtifact, ReportInputs, report_artifacts
 
 
 class CustomerSatisfactionReportService:
     """Service for generating Customer Satisfaction PDF reports."""
 
     @staticmethod
+    @span('report.customer_satisfaction')
     def generate_customer_satisfaction_report(run: Run) -> io.BytesIO:
         """
         Generate a customer satisfaction report PDF for a given run.
@@ -89,6 +92,25 @@ class CustomerSatisfactionReportService:
             print(f"Error generating customer satisfaction report: {str(e)}")
             raise
 
+    @staticmethod
+    def get_report_artifact(run: Run) -> ReportArtifact:
+        """
+        Return the stored Customer Satisfaction Report for the run's current inputs,
+        generating it if needed.
+
+        Args:
+            run: Run model instance
+
+        Returns:
+            ReportArtifact
+        """
+        return report_artifacts.get_or_create(
+            'customer_satisfaction',
+            ReportInputs.collect(run_ids=[run.pk]),
+            lambda: CustomerSatisfactionReportService.generate_customer_satisfaction_report(run),
+            params=(str(run.pk),)
+        )
+
     @staticmethod
     def _create_header_table():
         """Create the header Type table matching prejob report style."""
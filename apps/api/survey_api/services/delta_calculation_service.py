@@ -7,10 +7,12 @@ Handles MD alignment, interpolation, and statistical analysis.
 import numpy as np
 from typing import Dict, List, Tuple
 import logging
-import time
 
 from survey_api.models import SurveyData, CalculatedSurvey, InterpolatedSurvey
 from survey_api.exceptions import InsufficientOverlapError, InvalidSurveyDataError, DeltaCalculationError
+from survey_api.services.metrics_service import span
+from survey_api.services.single_flight import single_flight
+from survey_api.utils.etags import compute_etag
 
 logger = logging.getLogger(__name__)
 
@@ -49,102 +51,119 @@ class DeltaCalculationService:
             InsufficientOverlapError: If surveys don't overlap
             InvalidSurveyDataError: If survey data is invalid
             DeltaCalculationError: If calculation fails
-        """
-        start_time = time.time()
-
-        try:
-            logger.info(f"Calculating deltas: comparison={comparison_survey_id}, reference={reference_survey_id}")
-
-            # Load surveys
-            comp_survey = SurveyData.objects.select_related('calculated_survey', 'survey_file__run__tieon', 'survey_file__run__well__location').get(id=comparison_survey_id)
-            ref_survey = SurveyData.objects.select_related('calculated_survey', 'survey_file__run__tieon', 'survey_file__run__well__location').get(id=reference_survey_id)
 
-            # Check if either survey needs coordinate calculation (GTL surveys without calculated data)
-            comp_calc = DeltaCalculationService._ensure_coordinates_calculated(comp_survey)
-            ref_calc = DeltaCalculationService._ensure_coordinates_calculated(ref_survey)
-
-            # Validate compatibility
-            DeltaCalculationService._validate_survey_compatibility(comp_survey, ref_survey)
-
-            # Align surveys by MD using ratio_factor as interpolation step
-            aligned_data = DeltaCalculationService._align_surveys_by_md(
-                comp_survey, comp_calc,
-                ref_survey, ref_calc,
-                step=ratio_factor
+        Concurrent calls for the same surveys (and versions) and ratio factor
+        share one computation (survey_api.services.single_flight).
+        """
+        versions = sorted(
+            SurveyData.objects.filter(id__in=[comparison_survey_id, reference_survey_id]).values_list(
+                'id', 'updated_at', 'calculated_survey__updated_at'
             )
+        )
+        key = compute_etag('deltas', comparison_survey_id, reference_survey_id, ratio_factor, versions).strip('"')
+        return single_flight.run(
+            f'deltas:{key}',
+            lambda: DeltaCalculationService._calculate_deltas(comparison_survey_id, reference_survey_id, ratio_factor),
+            operation='delta_comparison',
+        )
 
-            md_aligned = aligned_data['md']
-            comp_aligned = aligned_data['comparison']
-            ref_aligned = aligned_data['reference']
+    @staticmethod
+    def _calculate_deltas(comparison_survey_id: str, reference_survey_id: str, ratio_factor: int) -> Dict:
+        """Compute the deltas between two surveys (uncoalesced)."""
+        with span('comparison.calculate_deltas') as timer:
+            try:
+                logger.info(f"Calculating deltas: comparison={comparison_survey_id}, reference={reference_survey_id}")
+
+                # Load surveys
+                comp_survey = SurveyData.objects.select_related('calculated_survey', 'survey_file__run__tieon', 'survey_file__run__well__location').get(id=comparison_survey_id)
+                ref_survey = SurveyData.objects.select_related('calculated_survey', 'survey_file__run__tieon', 'survey_file__run__well__location').get(id=reference_survey_id)
+
+                # Check if either survey needs coordinate calculation (GTL surveys without calculated data)
+                comp_calc = DeltaCalculationService._ensure_coordinates_calculated(comp_survey)
+                ref_calc = DeltaCalculationService._ensure_coordinates_calculated(ref_survey)
+
+                # Validate compatibility
+                DeltaCalculationService._validate_survey_compatibility(comp_survey, ref_survey)
+
+                # Align surveys by MD using ratio_factor as interpolation step
+                aligned_data = DeltaCalculationService._align_surveys_by_md(
+                    comp_survey, comp_calc,
+                    ref_survey, ref_calc,
+                    step=ratio_factor
+                )
 
-            # Calculate position deltas
-            delta_x = DeltaCalculationService._calculate_position_delta(
-                comp_aligned['easting'], ref_aligned['easting']
-            )
-            delta_y = DeltaCalculationService._calculate_position_delta(
-                comp_aligned['northing'], ref_aligned['northing']
-            )
-            delta_z = DeltaCalculationService._calculate_position_delta(
-                comp_aligned['tvd'], ref_aligned['tvd']
-            )
+                md_aligned = aligned_data['md']
+                comp_aligned = aligned_data['comparison']
+                ref_aligned = aligned_data['reference']
 
-            # Calculate composite deltas
-            delta_horizontal = DeltaCalculationService._calculate_horizontal_delta(delta_x, delta_y)
-            delta_total = DeltaCalculationService._calculate_total_delta(delta_x, delta_y, delta_z)
+                # Calculate position deltas
+                delta_x = DeltaCalculationService._calculate_position_delta(
+                    comp_aligned['easting'], ref_aligned['easting']
+                )
+                delta_y = DeltaCalculationService._calculate_position_delta(
+                    comp_aligned['northing'], ref_aligned['northing']
+                )
+                delta_z = DeltaCalculationService._calculate_position_delta(
+                    comp_aligned['tvd'], ref_aligned['tvd']
+                )
 
-            # Calculate angular deltas
-            delta_inc = DeltaCalculationService._calculate_inclination_delta(
-                comp_aligned['inc'], ref_aligned['inc']
-            )
-            delta_azi = DeltaCalculationService._calculate_azimuth_delta(
-                comp_aligned['azi'], ref_aligned['azi']
-            )
+                # Calculate composite deltas
+                delta_horizontal = DeltaCalculationService._calculate_horizontal_delta(delta_x, delta_y)
+                delta_total = DeltaCalculationService._calculate_total_delta(delta_x, delta_y, delta_z)
 
-            # Calculate statistics
-            statistics = DeltaCalculationService._calculate_statistics(
-                md_aligned, delta_x, delta_y, delta_z,
-                delta_horizontal, delta_total,
-                delta_inc, delta_azi
-            )
+                # Calculate angular deltas
+                delta_inc = DeltaCalculationService._calculate_inclination_delta(
+                    comp_aligned['inc'], ref_aligned['inc']
+                )
+                delta_azi = DeltaCalculationService._calculate_azimuth_delta(
+                    comp_aligned['azi'], ref_aligned['azi']
+                )
 
-            elapsed_time = time.time() - start_time
-            logger.info(f"Delta calculation completed: {len(md_aligned)} aligned stations in {elapsed_time:.2f}s")
-
-            return {
-                'md_aligned': md_aligned.tolist(),
-                # Delta arrays
-                'delta_x': delta_x.tolist(),
-                'delta_y': delta_y.tolist(),
-                'delta_z': delta_z.tolist(),
-                'delta_horizontal': delta_horizontal.tolist(),
-                'delta_total': delta_total.tolist(),
-                'delta_inc': delta_inc.tolist(),
-                'delta_azi': delta_azi.tolist(),
-                # Reference survey full data
-                'reference_inc': ref_aligned['inc'].tolist(),
-                'reference_azi': ref_aligned['azi'].tolist(),
-                'reference_northing': ref_aligned['northing'].tolist(),
-                'reference_easting': ref_aligned['easting'].tolist(),
-                'reference_tvd': ref_aligned['tvd'].tolist(),
-                # Comparison survey full data
-                'comparison_inc': comp_aligned['inc'].tolist(),
-                'comparison_azi': comp_aligned['azi'].tolist(),
-                'comparison_northing': comp_aligned['northing'].tolist(),
-                'comparison_easting': comp_aligned['easting'].tolist(),
-                'comparison_tvd': comp_aligned['tvd'].tolist(),
-                # Metadata
-                'statistics': statistics,
-                'ratio_factor': ratio_factor,
-                'calculation_duration': elapsed_time
-            }
+                # Calculate statistics
+                statistics = DeltaCalculationService._calculate_statistics(
+                    md_aligned, delta_x, delta_y, delta_z,
+                    delta_horizontal, delta_total,
+                    delta_inc, delta_azi
+                )
 
-        except (SurveyData.DoesNotExist, CalculatedSurvey.DoesNotExist) as e:
-            logger.error(f"Survey not found: {str(e)}")
-            raise InvalidSurveyDataError(f"Survey not found: {str(e)}")
+                elapsed_time = timer.elapsed
+                logger.info(f"Delta calculation completed: {len(md_aligned)} aligned stations in {elapsed_time:.2f}s")
+
+                return {
+                    'md_aligned': md_aligned.tolist(),
+                    # Delta arrays
+                    'delta_x': delta_x.tolist(),
+                    'delta_y': delta_y.tolist(),
+                    'delta_z': delta_z.tolist(),
+                    'delta_horizontal': delta_horizontal.tolist(),
+                    'delta_total': delta_total.tolist(),
+                    'delta_inc': delta_inc.tolist(),
+                    'delta_azi': delta_azi.tolist(),
+                    # Reference survey full data
+                    'reference_inc': ref_aligned['inc'].tolist(),
+                    'reference_azi': ref_aligned['azi'].tolist(),
+                    'reference_northing': ref_aligned['northing'].tolist(),
+                    'reference_easting': ref_aligned['easting'].tolist(),
+                    'reference_tvd': ref_aligned['tvd'].tolist(),
+                    # Comparison survey full data
+                    'comparison_inc': comp_aligned['inc'].tolist(),
+                    'comparison_azi': comp_aligned['azi'].tolist(),
+                    'comparison_northing': comp_aligned['northing'].tolist(),
+                    'comparison_easting': comp_aligned['easting'].tolist(),
+                    'comparison_tvd': comp_aligned['tvd'].tolist(),
+                    # Metadata
+                    'statistics': statistics,
+                    'ratio_factor': ratio_factor,
+                    'calculation_duration': elapsed_time
+                }
 
-        except Exception as e:
-            logger.error(f"Delta calculation failed: {type(e).__name__}: {str(e)}")
-            raise DeltaCalculationError(f"Failed to calculate deltas: {str(e)}")
+            except (SurveyData.DoesNotExist, CalculatedSurvey.DoesNotExist) as e:
+                logger.error(f"Survey not found: {str(e)}")
+                raise InvalidSurveyDataError(f"Survey not found: {str(e)}")
+
+            except Exception as e:
+                logger.error(f"Delta calculation failed: {type(e).__name__}: {str(e)}")
+                raise DeltaCalculationError(f"Failed to calculate deltas: {str(e)}")
 
     @staticmethod
     def _ensure_coordinates_calculated(survey: SurveyData):
@@ -6,12 +6,17 @@ Handles duplicate survey calculations:
 - Inverse calculation (N/E/TVD → INC/AZI)
 - Comparison of results
 """
+from __future__ import annotations
+
 import logging
 import numpy as np
-import welleng as we
 import time
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from survey_api.models import SurveyData
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
+from survey_api.services.single_flight import single_flight
+from survey_api.utils.lazy_imports import welleng as we
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +174,10 @@ class DuplicateSurveyService:
         """
         Calculate duplicate survey with forward, inverse, and comparison.
 
+        The forward/inverse optimisation runs in the compute pool. Concurrent
+        calls for the same survey version and step share one computation
+        (survey_api.services.single_flight).
+
         Args:
             survey_data_id: UUID of the survey data
             interpolation_step: Step size for interpolation (meters)
@@ -176,121 +185,40 @@ class DuplicateSurveyService:
         Returns:
             Dictionary with forward, inverse, and comparison results (not saved to database)
         """
+        version = SurveyData.objects.filter(id=survey_data_id).values_list('updated_at', flat=True).first()
+        if version is None:
+            raise ValueError(f"Survey data {survey_data_id} not found")
+
+        return single_flight.run(
+            f'duplicate-survey:{survey_data_id}:{version.isoformat()}:{float(interpolation_step)}',
+            lambda: DuplicateSurveyService._calculate_duplicate_survey(survey_data_id, interpolation_step),
+            operation='duplicate_survey',
+        )
+
+    @staticmethod
+    @span('duplicate_survey.calculate')
+    def _calculate_duplicate_survey(survey_data_id: str, interpolation_step: float) -> Dict:
+        """Load the survey and run the duplicate survey computation (uncoalesced)."""
         start_time = time.time()
 
         try:
             # Get survey data
-            survey_data = SurveyData.objects.get(id=survey_data_id)
-
-            # Extract original data
-            original_md = np.array(survey_data.md_data)
-            original_inc = np.array(survey_data.inc_data)
-            original_azi = np.array(survey_data.azi_data)
-
-            logger.info(f"Duplicate survey calculation: {len(original_md)} points, MD range: {original_md[0]}-{original_md[-1]}")
-
-            # Ensure surface point
-            md, inc, azi = DuplicateSurveyService.ensure_surface_point(
-                original_md, original_inc, original_azi
-            )
-
-            # Forward calculation (MD/INC/AZI → positions)
-            forward_start = time.time()
-            survey_forward = DuplicateSurveyService.calculate_forward(md, inc, azi)
-
-            # Interpolate survey
-            survey_interp = DuplicateSurveyService.interpolate_survey(survey_forward, interpolation_step)
-            forward_time = time.time() - forward_start
-
-            # Extract interpolated data for inverse calculation
-            interp_md = survey_interp.md
-            interp_north = survey_interp.n
-            interp_east = survey_interp.e
-            interp_tvd = survey_interp.tvd
-            interp_inc = survey_interp.inc_deg
-            interp_azi = survey_interp.azi_grid_deg
-
-            # Inverse calculation (positions → INC/AZI)
-            inverse_start = time.time()
-            inverse_inc, inverse_azi = DuplicateSurveyService.calculate_inverse(
-                interp_md, interp_north, interp_east, interp_tvd, iterations=100
-            )
-            inverse_time = time.time() - inverse_start
-
-            # Calculate inverse survey positions for comparison
-            survey_inverse = DuplicateSurveyService.calculate_forward(
-                interp_md, inverse_inc, inverse_azi
+            survey_data = SurveyData.objects.select_related('survey_file').get(id=survey_data_id)
+
+            results = compute_pool.run(
+                DuplicateSurveyService._compute_duplicate_survey,
+                survey_data.md_data,
+                survey_data.inc_data,
+                survey_data.azi_data,
+                interpolation_step
             )
 
-            # Calculate comparison deltas
-            delta_inc = interp_inc - inverse_inc
-            delta_azi = interp_azi - inverse_azi
-
-            # Handle azimuth wrap-around (e.g., 359° vs 1°)
-            delta_azi = np.where(delta_azi > 180, delta_azi - 360, delta_azi)
-            delta_azi = np.where(delta_azi < -180, delta_azi + 360, delta_azi)
-
-            delta_north = interp_north - survey_inverse.n
-            delta_east = interp_east - survey_inverse.e
-            delta_tvd = interp_tvd - survey_inverse.tvd
-
-            # Calculate limit values (delta/MD)
-            limit_north = np.where(interp_md > 0, delta_north / interp_md, 0)
-            limit_east = np.where(interp_md > 0, delta_east / interp_md, 0)
-            limit_tvd = np.where(interp_md > 0, delta_tvd / interp_md, 0)
-
-            total_time = time.time() - start_time
-
-            # Return comprehensive results
             return {
                 'survey_data_id': survey_data_id,
                 'survey_file_name': survey_data.survey_file.file_name,
                 'interpolation_step': interpolation_step,
-
-                # Original data
-                'original_md': original_md.tolist(),
-                'original_inc': original_inc.tolist(),
-                'original_azi': original_azi.tolist(),
-
-                # Forward results (interpolated)
-                'forward_md': interp_md.tolist(),
-                'forward_inc': interp_inc.tolist(),
-                'forward_azi': interp_azi.tolist(),
-                'forward_north': interp_north.tolist(),
-                'forward_east': interp_east.tolist(),
-                'forward_tvd': interp_tvd.tolist(),
-
-                # Inverse results
-                'inverse_inc': inverse_inc.tolist(),
-                'inverse_azi': inverse_azi.tolist(),
-                'inverse_north': survey_inverse.n.tolist(),
-                'inverse_east': survey_inverse.e.tolist(),
-                'inverse_tvd': survey_inverse.tvd.tolist(),
-
-                # Comparison deltas
-                'delta_inc': delta_inc.tolist(),
-                'delta_azi': delta_azi.tolist(),
-                'delta_north': delta_north.tolist(),
-                'delta_east': delta_east.tolist(),
-                'delta_tvd': delta_tvd.tolist(),
-
-                # Limit values
-                'limit_north': limit_north.tolist(),
-                'limit_east': limit_east.tolist(),
-                'limit_tvd': limit_tvd.tolist(),
-
-                # Statistics
-                'point_count': len(interp_md),
-                'max_delta_inc': float(np.max(np.abs(delta_inc))),
-                'max_delta_azi': float(np.max(np.abs(delta_azi))),
-                'max_delta_north': float(np.max(np.abs(delta_north))),
-                'max_delta_east': float(np.max(np.abs(delta_east))),
-                'max_delta_tvd': float(np.max(np.abs(delta_tvd))),
-
-                # Processing time
-                'forward_calculation_time': forward_time,
-                'inverse_calculation_time': inverse_time,
-                'total_calculation_time': total_time,
+                **results,
+                'total_calculation_time': time.time() - start_time,
             }
 
         except SurveyData.DoesNotExist:
@@ -298,3 +226,118 @@ class DuplicateSurveyService:
         except Exception as e:
             logger.error(f"Duplicate survey calculation failed: {str(e)}")
             raise
+
+    @staticmethod
+    def _compute_duplicate_survey(
+        md_data: List[float],
+        inc_data: List[float],
+        azi_data: List[float],
+        interpolation_step: float
+    ) -> Dict:
+        """
+        Forward, inverse and comparison maths on plain arrays.
+
+        Executed in a compute pool worker; must not touch the ORM.
+        """
+        original_md = np.array(md_data)
+        original_inc = np.array(inc_data)
+        original_azi = np.array(azi_data)
+
+        logger.info(f"Duplicate survey calculation: {len(original_md)} points, MD range: {original_md[0]}-{original_md[-1]}")
+
+        # Ensure surface point
+        md, inc, azi = DuplicateSurveyService.ensure_surface_point(
+            original_md, original_inc, original_azi
+        )
+
+        # Forward calculation (MD/INC/AZI → positions)
+        forward_start = time.time()
+        survey_forward = DuplicateSurveyService.calculate_forward(md, inc, azi)
+
+        # Interpolate survey
+        survey_interp = DuplicateSurveyService.interpolate_survey(survey_forward, interpolation_step)
+        forward_time = time.time() - forward_start
+
+        # Extract interpolated data for inverse calculation
+        interp_md = survey_interp.md
+        interp_north = survey_interp.n
+        interp_east = survey_interp.e
+        interp_tvd = survey_interp.tvd
+        interp_inc = survey_interp.inc_deg
+        interp_azi = survey_interp.azi_grid_deg
+
+        # Inverse calculation (positions → INC/AZI)
+        inverse_start = time.time()
+        inverse_inc, inverse_azi = DuplicateSurveyService.calculate_inverse(
+            interp_md, interp_north, interp_east, interp_tvd, iterations=100
+        )
+        inverse_time = time.time() - inverse_start
+
+        # Calculate inverse survey positions for comparison
+        survey_inverse = DuplicateSurveyService.calculate_forward(
+            interp_md, inverse_inc, inverse_azi
+        )
+
+        # Calculate comparison deltas
+        delta_inc = interp_inc - inverse_inc
+        delta_azi = interp_azi - inverse_azi
+
+        # Handle azimuth wrap-around (e.g., 359° vs 1°)
+        delta_azi = np.where(delta_azi > 180, delta_azi - 360, delta_azi)
+        delta_azi = np.where(delta_azi < -180, delta_azi + 360, delta_azi)
+
+        delta_north = interp_north - survey_inverse.n
+        delta_east = interp_east - survey_inverse.e
+        delta_tvd = interp_tvd - survey_inverse.tvd
+
+        # Calculate limit values (delta/MD)
+        limit_north = np.where(interp_md > 0, delta_north / interp_md, 0)
+        limit_east = np.where(interp_md > 0, delta_east / interp_md, 0)
+        limit_tvd = np.where(interp_md > 0, delta_tvd / interp_md, 0)
+
+        # Return comprehensive results
+        return {
+            # Original data
+            'original_md': original_md.tolist(),
+            'original_inc': original_inc.tolist(),
+            'original_azi': original_azi.tolist(),
+
+            # Forward results (interpolated)
+            'forward_md': interp_md.tolist(),
+            'forward_inc': interp_inc.tolist(),
+            'forward_azi': interp_azi.tolist(),
+            'forward_north': interp_north.tolist(),
+            'forward_east': interp_east.tolist(),
+            'forward_tvd': interp_tvd.tolist(),
+
+            # Inverse results
+            'inverse_inc': inverse_inc.tolist(),
+            'inverse_azi': inverse_azi.tolist(),
+            'inverse_north': survey_inverse.n.tolist(),
+            'inverse_east': survey_inverse.e.tolist(),
+            'inverse_tvd': survey_inverse.tvd.tolist(),
+
+            # Comparison deltas
+            'delta_inc': delta_inc.tolist(),
+            'delta_azi': delta_azi.tolist(),
+            'delta_north': delta_north.tolist(),
+            'delta_east': delta_east.tolist(),
+            'delta_tvd': delta_tvd.tolist(),
+
+            # Limit values
+            'limit_north': limit_north.tolist(),
+            'limit_east': limit_east.tolist(),
+            'limit_tvd': limit_tvd.tolist(),
+
+            # Statistics
+            'point_count': len(interp_md),
+            'max_delta_inc': float(np.max(np.abs(delta_inc))),
+            'max_delta_azi': float(np.max(np.abs(delta_azi))),
+            'max_delta_north': float(np.max(np.abs(delta_north))),
+            'max_delta_east': float(np.max(np.abs(delta_east))),
+            'max_delta_tvd': float(np.max(np.abs(delta_tvd))),
+
+            # Processing time
+            'forward_calculation_time': forward_time,
+            'inverse_calculation_time': inverse_time,
+        }
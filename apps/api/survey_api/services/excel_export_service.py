@@ -6,11 +6,11 @@ and interpolated survey data, including proper formatting, metadata sheets,
 and file naming conventions.
 """
 import io
+import logging
 import re
 from datetime import datetime
 from typing import BinaryIO, Literal, Tuple
 
-import pandas as pd
 from django.core.exceptions import ObjectDoesNotExist
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
@@ -18,6 +18,11 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 
 from survey_api.models import CalculatedSurvey, InterpolatedSurvey, ComparisonResult
 from survey_api.services.welleng_service import WellengService
+from survey_api.services.metrics_service import span
+from survey_api.services.uncertainty_service import UncertaintyService
+from survey_api.utils.lazy_imports import pandas as pd
+
+logger = logging.getLogger(__name__)
 
 
 class ExcelExportService:
@@ -30,6 +35,15 @@ class ExcelExportService:
         'DLS (deg/30m)', 'Build Rate (deg/30m)', 'Turn Rate (deg/30m)'
     ]
 
+    # Column definitions for the positional uncertainty sheet (1-sigma)
+    UNCERTAINTY_SHEET_COLUMNS = [
+        ('MD (m)', None),
+        ('Semi-Major (m)', 'semi_major'),
+        ('Semi-Minor (m)', 'semi_minor'),
+        ('Ellipse Azimuth (deg)', 'ellipse_azimuth'),
+        ('Sigma Vertical (m)', 'sigma_vertical'),
+    ]
+
     # Column definitions for interpolated survey data
     INTERPOLATED_COLUMNS = [
         'MD (m)', 'Inc (deg)', 'Azi (deg)',
@@ -45,6 +59,7 @@ class ExcelExportService:
     METADATA_VALUE_ALIGNMENT = Alignment(horizontal='left', vertical='center')
 
     @classmethod
+    @span('export.calculated_survey')
     def export_calculated_survey(
         cls,
         calculated_survey_id: str,
@@ -97,6 +112,7 @@ class ExcelExportService:
             )
 
     @classmethod
+    @span('export.interpolated_survey')
     def export_interpolated_survey(
         cls,
         interpolated_survey_id: str,
@@ -147,6 +163,7 @@ class ExcelExportService:
             )
 
     @classmethod
+    @span('export.fresh_interpolation')
     def export_fresh_interpolation(
         cls,
         calculated_survey_id: str,
@@ -273,6 +290,14 @@ class ExcelExportService:
         ws_data = wb.create_sheet('Survey Data')
         cls._write_calculated_data(ws_data, calculated)
 
+        # Positional uncertainty sheet (the export still succeeds without it)
+        try:
+            cls._write_uncertainty_data(wb.create_sheet('Uncertainty'), calculated)
+        except Exception as e:
+            logger.warning(f"Uncertainty sheet skipped for CalculatedSurvey {calculated.id}: {e}")
+            if 'Uncertainty' in wb.sheetnames:
+                wb.remove(wb['Uncertainty'])
+
         # Generate filename
         filename = cls._generate_filename(run.run_name, 'calculated', 'excel')
 
@@ -420,6 +445,31 @@ class ExcelExportService:
         for col_num in range(1, len(cls.CALCULATED_COLUMNS) + 1):
             ws.column_dimensions[chr(64 + col_num)].width = 15
 
+    @classmethod
+    def _write_uncertainty_data(cls, ws, calculated: CalculatedSurvey) -> None:
+        """Write per-station error ellipses for the survey tool's error model to worksheet."""
+        error_model, columns = UncertaintyService.uncertainty_columns(calculated)
+        md = calculated.survey_data.column_array('md_data')
+
+        for col_num, (column_name, _) in enumerate(cls.UNCERTAINTY_SHEET_COLUMNS, 1):
+            cell = ws.cell(row=1, column=col_num, value=column_name)
+            cell.font = cls.HEADER_FONT
+            cell.fill = cls.HEADER_FILL
+            cell.alignment = cls.HEADER_ALIGNMENT
+
+        values = [md] + [columns[key] for _, key in cls.UNCERTAINTY_SHEET_COLUMNS[1:]]
+        for row_num, row_data in enumerate(zip(*values), 2):
+            for col_num, value in enumerate(row_data, 1):
+                cell = ws.cell(row=row_num, column=col_num, value=float(value))
+                cell.number_format = '0.00'
+                cell.alignment = Alignment(horizontal='right')
+
+        # Error model note below the table
+        ws.cell(row=len(md) + 3, column=1, value=f'Error model: {error_model} (1-sigma)')
+
+        for col_num in range(1, len(cls.UNCERTAINTY_SHEET_COLUMNS) + 1):
+            ws.column_dimensions[chr(64 + col_num)].width = 20
+
     @classmethod
     def _write_interpolated_data(cls, ws, interpolated: InterpolatedSurvey) -> None:
         """Write interpolated survey data to worksheet."""
@@ -750,6 +800,7 @@ class ExcelExportService:
         return filename
 
     @classmethod
+    @span('export.comparison_results')
     def export_comparison_results(
         cls,
         comparison_id: str,
@@ -3,11 +3,14 @@ Extrapolation Service
 
 Handles survey extrapolation using welleng library.
 """
+from __future__ import annotations
+
 import logging
 import numpy as np
-import welleng as we
 from typing import Dict, List, Tuple
 from survey_api.models import Extrapolation, SurveyData, Run
+from survey_api.services.metrics_service import span
+from survey_api.utils.lazy_imports import welleng as we
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,7 @@ class ExtrapolationService:
     """Service for extrapolating survey data beyond the last measured point."""
 
     @staticmethod
+    @span('extrapolation.calculate')
     def calculate_extrapolation(
         survey_data_id: str,
         run_id: str,
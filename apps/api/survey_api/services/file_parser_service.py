@@ -1,9 +1,9 @@
 """
 File parsing service for survey data files.
 """
-import pandas as pd
 import logging
 from typing import Dict, Any, Optional
+from survey_api.utils.lazy_imports import pandas as pd
 
 logger = logging.getLogger(__name__)
 
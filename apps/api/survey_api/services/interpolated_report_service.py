@@ -2,22 +2,27 @@
 Service for generating Interpolated Survey Calculation Reports.
 Uses the same template as calculated surveys but with interpolated data.
 """
-from io import BytesIO
 import logging
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 from survey_api.models import InterpolatedSurvey, CalculatedSurvey
 from survey_api.services.survey_calculation_report_service import SurveyCalculationReportService
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportInputs, report_artifacts
 
 logger = logging.getLogger(__name__)
 
+# Cover and plots pages; data pages use the fixed report table layout
+INTERPOLATED_REPORT_MARGINS = {
+    'rightMargin': 0.5*inch,
+    'leftMargin': 0.5*inch,
+    'topMargin': 0.4*inch,
+    'bottomMargin': 0.4*inch,
+}
 
+
+@span('report.interpolated_survey')
 def generate_interpolated_survey_report(calculated_survey_id: str, resolution: int = 5) -> bytes:
     """
     Generate an Interpolated Survey Calculation Report PDF.
@@ -72,18 +77,6 @@ def generate_interpolated_survey_report(calculated_survey_id: str, resolution: i
 
             interp_survey = TempInterpolatedData(interp_data)
 
-        # Create PDF buffer
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.4*inch,
-            bottomMargin=0.4*inch
-        )
-        elements = []
-
         # Get related data
         survey_data = calc_survey.survey_data
         survey_file = survey_data.survey_file
@@ -94,10 +87,9 @@ def generate_interpolated_survey_report(calculated_survey_id: str, resolution: i
 
         # Page 1: Cover Page (using calculated survey metadata but indicating interpolation)
         # Note: Date is now automatically pulled from survey_file.created_at in _create_cover_page
-        elements.extend(SurveyCalculationReportService._create_cover_page(
+        cover_elements = SurveyCalculationReportService._create_cover_page(
             survey_data, calc_survey, run, well, job, location, is_interpolated=True, resolution=resolution
-        ))
-        elements.append(PageBreak())
+        )
 
         # Pages 2+: Interpolated Data Tables (using same template as calculated)
         # Create a temporary object that mimics survey_data structure for data pages
@@ -118,16 +110,13 @@ def generate_interpolated_survey_report(calculated_survey_id: str, resolution: i
         temp_survey = TempSurveyData(interp_survey)
         temp_calc = TempCalculatedData(interp_survey)
 
-        # Reuse the exact same data pages generation from calculated report
-        # Pass the actual survey_file for date purposes
-        elements.extend(SurveyCalculationReportService._create_data_pages_for_interpolated(
-            temp_survey, temp_calc, run, resolution, survey_file=survey_file
-        ))
-
-        # Build PDF
-        doc.build(elements)
-        pdf = buffer.getvalue()
-        buffer.close()
+        # Reuse the exact same data table and plots pages from calculated report
+        # Pass the actual survey_file for date purposes; the trajectory plot is drawn
+        # from the calculated stations so it is shared with the calculation report
+        pdf = SurveyCalculationReportService._assemble_report(
+            cover_elements, temp_survey, temp_calc, run, survey_file, margins=INTERPOLATED_REPORT_MARGINS,
+            plot_data=(survey_data, calc_survey)
+        )
 
         logger.info(f"Interpolated report generated successfully: {len(pdf)} bytes")
         return pdf
@@ -138,3 +127,25 @@ def generate_interpolated_survey_report(calculated_survey_id: str, resolution: i
     except Exception as e:
         logger.error(f"Error generating interpolated report: {str(e)}")
         raise
+
+
+def get_interpolated_survey_report_artifact(calculated_survey_id: str, resolution: int = 5):
+    """
+    Return the stored interpolated report, generating it if its inputs changed.
+
+    Args:
+        calculated_survey_id: UUID of CalculatedSurvey
+        resolution: Resolution of interpolation (default: 5m)
+
+    Returns:
+        ReportArtifact
+    """
+    run_id = CalculatedSurvey.objects.filter(id=calculated_survey_id).values_list(
+        'survey_data__survey_file__run_id', flat=True
+    ).first()
+    return report_artifacts.get_or_create(
+        'interpolated_survey',
+        ReportInputs.collect(run_ids=[run_id]),
+        lambda: generate_interpolated_survey_report(calculated_survey_id, resolution),
+        params=(str(calculated_survey_id), resolution)
+    )
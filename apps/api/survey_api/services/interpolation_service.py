@@ -4,13 +4,14 @@ Service for interpolating calculated survey data.
 This service orchestrates the interpolation workflow, managing
 InterpolatedSurvey records and coordinating with WellengService.
 """
-import time
 import logging
 from typing import Optional
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 from survey_api.models import CalculatedSurvey, InterpolatedSurvey
 from survey_api.services.welleng_service import WellengService
+from survey_api.services.metrics_service import span
+from survey_api.services.single_flight import single_flight
 from survey_api.exceptions import InsufficientDataError, WellengCalculationError
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,14 @@ class InterpolationService:
         """
         Interpolate calculated survey at specified resolution.
 
+        Concurrent calls for the same survey, resolution and range are
+        coalesced (survey_api.services.single_flight): one caller
+        interpolates and saves, the others load the row it created.
+
+        A survey holds one interpolation per resolution, so the range only
+        applies when that row is created: an existing (non-stale) row is
+        returned whatever ``start_md``/``end_md`` are given.
+
         Args:
             calculated_survey_id: UUID of CalculatedSurvey
             resolution: Interpolation step size (1-100 meters)
@@ -44,6 +53,27 @@ class InterpolationService:
             InsufficientDataError: If CalculatedSurvey not found
             WellengCalculationError: If interpolation fails
         """
+        interp_id = single_flight.run(
+            f'interpolate:{calculated_survey_id}:{int(resolution)}:{start_md}:{end_md}',
+            lambda: InterpolationService._interpolate(calculated_survey_id, resolution, start_md, end_md).pk,
+            operation='interpolation',
+        )
+        interp_survey = InterpolatedSurvey.objects.filter(pk=interp_id).first()
+        if interp_survey is None:
+            # Created in a transaction this connection cannot see yet. Our own
+            # insert waits for that transaction and, once it commits, fails
+            # with IntegrityError; _interpolate then reads the committed row.
+            return InterpolationService._interpolate(calculated_survey_id, resolution, start_md, end_md)
+        return interp_survey
+
+    @staticmethod
+    def _interpolate(
+        calculated_survey_id: str,
+        resolution: int,
+        start_md: Optional[float],
+        end_md: Optional[float]
+    ) -> InterpolatedSurvey:
+        """Return the existing interpolation or compute and save it (uncoalesced)."""
         try:
             logger.info(f"Starting interpolation for CalculatedSurvey {calculated_survey_id} at resolution={resolution}m")
 
@@ -51,6 +81,7 @@ class InterpolationService:
             calc_survey = CalculatedSurvey.objects.select_related('survey_data').get(
                 id=calculated_survey_id
             )
+            InterpolationService._refresh_if_stale(calc_survey)
 
             # Validate calculated survey is in completed state
             if calc_survey.calculation_status != 'calculated':
@@ -68,7 +99,10 @@ class InterpolationService:
                 resolution=resolution
             ).first()
 
-            if existing:
+            if existing and existing.is_stale:
+                logger.info(f"Interpolation {existing.id} is stale - recomputing resolution {resolution}m")
+                existing.delete()
+            elif existing:
                 logger.info(f"Interpolation already exists (id={existing.id}) for resolution {resolution}m - returning existing")
                 return existing
 
@@ -86,39 +120,42 @@ class InterpolationService:
             logger.debug(f"Prepared data: {len(survey_data.md_data)} original points")
             logger.debug(f"Using vertical section azimuth: {vertical_section_azimuth}° from calculated survey")
 
-            # Measure interpolation time
-            start_time = time.time()
+            # Measure interpolation time (recorded on /metrics as a span)
+            timer = span('interpolation.interpolate')
 
             try:
                 # Call welleng interpolation with correct vertical section azimuth
-                result = WellengService.interpolate_survey(
-                    calculated_data,
-                    resolution,
-                    start_md=start_md,
-                    end_md=end_md,
-                    vertical_section_azimuth=vertical_section_azimuth
-                )
-
-                duration = time.time() - start_time
-
-                # Create InterpolatedSurvey record
-                interp_survey = InterpolatedSurvey.objects.create(
-                    calculated_survey=calc_survey,
-                    resolution=resolution,
-                    md_interpolated=result['md'],
-                    inc_interpolated=result['inc'],
-                    azi_interpolated=result['azi'],
-                    easting_interpolated=result['easting'],
-                    northing_interpolated=result['northing'],
-                    tvd_interpolated=result['tvd'],
-                    dls_interpolated=result['dls'],
-                    vertical_section_interpolated=result.get('vertical_section', []),
-                    closure_distance_interpolated=result.get('closure_distance', []),
-                    closure_direction_interpolated=result.get('closure_direction', []),
-                    point_count=result['point_count'],
-                    interpolation_status='completed',
-                    interpolation_duration=round(duration, 3)
-                )
+                with timer:
+                    result = WellengService.interpolate_survey(
+                        calculated_data,
+                        resolution,
+                        start_md=start_md,
+                        end_md=end_md,
+                        vertical_section_azimuth=vertical_section_azimuth
+                    )
+
+                duration = timer.duration
+
+                # Create InterpolatedSurvey record (in a savepoint, so a
+                # duplicate leaves the caller's transaction usable)
+                with transaction.atomic():
+                    interp_survey = InterpolatedSurvey.objects.create(
+                        calculated_survey=calc_survey,
+                        resolution=resolution,
+                        md_interpolated=result['md'],
+                        inc_interpolated=result['inc'],
+                        azi_interpolated=result['azi'],
+                        easting_interpolated=result['easting'],
+                        northing_interpolated=result['northing'],
+                        tvd_interpolated=result['tvd'],
+                        dls_interpolated=result['dls'],
+                        vertical_section_interpolated=result.get('vertical_section', []),
+                        closure_distance_interpolated=result.get('closure_distance', []),
+                        closure_direction_interpolated=result.get('closure_direction', []),
+                        point_count=result['point_count'],
+                        interpolation_status='completed',
+                        interpolation_duration=round(duration, 3)
+                    )
 
                 logger.info(
                     f"Interpolation completed successfully: "
@@ -130,23 +167,24 @@ class InterpolationService:
 
             except WellengCalculationError as e:
                 # Interpolation failed - create error record
-                duration = time.time() - start_time
-
-                error_survey = InterpolatedSurvey.objects.create(
-                    calculated_survey=calc_survey,
-                    resolution=resolution,
-                    md_interpolated=[],
-                    inc_interpolated=[],
-                    azi_interpolated=[],
-                    easting_interpolated=[],
-                    northing_interpolated=[],
-                    tvd_interpolated=[],
-                    dls_interpolated=[],
-                    point_count=0,
-                    interpolation_status='error',
-                    interpolation_duration=round(duration, 3),
-                    error_message=str(e)
-                )
+                duration = timer.duration
+
+                with transaction.atomic():
+                    error_survey = InterpolatedSurvey.objects.create(
+                        calculated_survey=calc_survey,
+                        resolution=resolution,
+                        md_interpolated=[],
+                        inc_interpolated=[],
+                        azi_interpolated=[],
+                        easting_interpolated=[],
+                        northing_interpolated=[],
+                        tvd_interpolated=[],
+                        dls_interpolated=[],
+                        point_count=0,
+                        interpolation_status='error',
+                        interpolation_duration=round(duration, 3),
+                        error_message=str(e)
+                    )
 
                 logger.error(f"Interpolation failed: {str(e)}")
                 raise
@@ -174,6 +212,75 @@ class InterpolationService:
             logger.error(f"Unexpected error in interpolation service: {type(e).__name__}: {str(e)}")
             raise
 
+    @staticmethod
+    def preview_interpolation(
+        calculated_survey_id: str,
+        resolution: int,
+        start_md: Optional[float] = None,
+        end_md: Optional[float] = None
+    ) -> dict:
+        """
+        Interpolate a calculated survey for display, with BHC support (not saved).
+
+        With BHC enabled the interpolation is run twice: first with a vertical
+        section azimuth of 0 degrees, then with the closure direction of the
+        last interpolated station. Otherwise the calculated survey's vertical
+        section azimuth is used.
+
+        Args:
+            calculated_survey_id: UUID of CalculatedSurvey
+            resolution: Interpolation step size (1-100 meters)
+            start_md: Optional start MD for custom range
+            end_md: Optional end MD for custom range
+
+        Returns:
+            WellengService.interpolate_survey result plus ``bhc_enabled``
+
+        Raises:
+            CalculatedSurvey.DoesNotExist: If CalculatedSurvey not found
+            WellengCalculationError: If interpolation fails
+        """
+        calc_survey = CalculatedSurvey.objects.select_related('survey_data').get(id=calculated_survey_id)
+        InterpolationService._refresh_if_stale(calc_survey)
+
+        context = calc_survey.calculation_context or {}
+        bhc_enabled = context.get('bhc_enabled', False)
+        vertical_section_azimuth = float(calc_survey.vertical_section_azimuth) if calc_survey.vertical_section_azimuth is not None else None
+
+        survey_data = calc_survey.survey_data
+        calculated_data = {
+            'md': survey_data.md_data,
+            'inc': survey_data.inc_data,
+            'azi': survey_data.azi_data,
+            'easting': calc_survey.easting,
+            'northing': calc_survey.northing,
+            'tvd': calc_survey.tvd,
+        }
+
+        with span('interpolation.preview'):
+            if bhc_enabled:
+                # Initial pass, then recalculate with the converged closure direction
+                initial_result = WellengService.interpolate_survey(
+                    calculated_data,
+                    int(resolution),
+                    start_md=start_md,
+                    end_md=end_md,
+                    vertical_section_azimuth=0.0
+                )
+                vertical_section_azimuth = initial_result['closure_direction'][-1]
+                logger.debug(f"[INTERPOLATION BHC] Recalculating with closure direction {vertical_section_azimuth:.6f}°")
+
+            result = WellengService.interpolate_survey(
+                calculated_data,
+                int(resolution),
+                start_md=start_md,
+                end_md=end_md,
+                vertical_section_azimuth=vertical_section_azimuth
+            )
+
+        result['bhc_enabled'] = bhc_enabled
+        return result
+
     @staticmethod
     def calculate_interpolation_data(
         calculated_survey_id: str,
@@ -207,6 +314,7 @@ class InterpolationService:
             calc_survey = CalculatedSurvey.objects.select_related('survey_data').get(
                 id=calculated_survey_id
             )
+            InterpolationService._refresh_if_stale(calc_survey)
 
             # Validate calculated survey is in completed state
             if calc_survey.calculation_status != 'calculated':
@@ -227,18 +335,16 @@ class InterpolationService:
 
             logger.debug(f"Prepared data: {len(survey_data.md_data)} original points")
 
-            # Measure interpolation time
-            start_time = time.time()
-
-            # Call welleng interpolation
-            result = WellengService.interpolate_survey(
-                calculated_data,
-                resolution,
-                start_md=start_md,
-                end_md=end_md
-            )
+            # Measure interpolation time (recorded on /metrics as a span)
+            with span('interpolation.preview') as timer:
+                result = WellengService.interpolate_survey(
+                    calculated_data,
+                    resolution,
+                    start_md=start_md,
+                    end_md=end_md
+                )
 
-            duration = time.time() - start_time
+            duration = timer.duration
 
             # Add metadata to result
             result['resolution'] = resolution
@@ -262,6 +368,16 @@ class InterpolationService:
             logger.error(f"Unexpected error calculating interpolation: {type(e).__name__}: {str(e)}")
             raise
 
+    @staticmethod
+    def _refresh_if_stale(calc_survey: CalculatedSurvey):
+        """Recalculate (in place) a calculation invalidated by a run input change."""
+        if not calc_survey.is_stale:
+            return
+        from survey_api.services.recalculation_service import recalculation
+
+        recalculation.refresh_if_stale(calc_survey.survey_data_id)
+        calc_survey.refresh_from_db()
+
     @staticmethod
     def get_interpolation(
         calculated_survey_id: str,
@@ -279,7 +395,8 @@ class InterpolationService:
         """
         try:
             query = InterpolatedSurvey.objects.filter(
-                calculated_survey_id=calculated_survey_id
+                calculated_survey_id=calculated_survey_id,
+                is_stale=False
             )
 
             if resolution is not None:
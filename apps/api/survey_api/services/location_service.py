@@ -2,9 +2,19 @@
 Location service for coordinate conversions and calculations.
 """
 from decimal import Decimal
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Optional, Sequence
 import logging
 
+import numpy as np
+
+from survey_api.utils.transverse_mercator import (
+    TransverseMercator,
+    central_meridian,
+    ellipsoid_for,
+    parse_zone,
+    utm_zone,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,9 +23,12 @@ class LocationService:
     Service class for location-related calculations and coordinate conversions.
 
     This service handles:
-    - UTM coordinate conversion from lat/lon
+    - UTM coordinate conversion from lat/lon (and back, for whole survey paths)
     - Grid correction calculations
     - Grid convergence (g_t) and scale factor (w_t) calculations
+
+    The per-location methods return Decimals for the model fields; the array
+    methods (derive_locations, grid_to_geographic) convert many points at once.
     """
 
     @staticmethod
@@ -28,48 +41,34 @@ class LocationService:
         """
         Calculate UTM coordinates (easting, northing) from latitude/longitude.
 
+        Uses the Transverse Mercator series in survey_api.utils.transverse_mercator
+        on the datum's ellipsoid. The zone is read from ``map_zone`` (its own
+        zone is computed when it names none); the hemisphere follows the latitude.
+
         Args:
             latitude: Latitude in decimal degrees
             longitude: Longitude in decimal degrees
-            geodetic_system: Geodetic datum system (e.g., WGS84)
-            map_zone: UTM zone identifier
+            geodetic_system: Geodetic datum or system (e.g., WGS84, PSD 93)
+            map_zone: UTM zone identifier (e.g., '15N', 'Zone 40N(54E to 60E)')
 
         Returns:
             Tuple of (easting, northing) as Decimals
 
-        Note:
-            This is a simplified implementation. Full implementation would use
-            welleng library or pyproj for accurate coordinate transformations.
+        Raises:
+            ValueError: If the coordinates are missing or invalid
         """
         try:
-            # Simplified UTM conversion (placeholder for welleng integration)
-            # Real implementation would use welleng.survey.transform_coordinates()
-            # or pyproj for accurate conversion
-
-            # For now, use simplified zone-based estimation
-            # UTM zone = (longitude + 180) / 6 + 1
-            zone_number = int((float(longitude) + 180) / 6) + 1
-
-            # Simplified calculation (replace with welleng in production)
-            # These are approximate values for demonstration
-            central_meridian = (zone_number - 1) * 6 - 180 + 3
-
-            # Simplified easting calculation
-            longitude_diff = float(longitude) - central_meridian
-            easting_value = 500000 + longitude_diff * 111320 * 0.9996
-            # Quantize to 3 decimal places (max_digits=12, decimal_places=3)
-            easting = Decimal(str(easting_value)).quantize(Decimal('0.001'))
-
-            # Simplified northing calculation
-            northing_value = float(latitude) * 110574 * 0.9996
-            if latitude < 0:
-                northing_value += 10000000  # Southern hemisphere
+            result = LocationService.derive_locations(
+                [float(latitude)], [float(longitude)],
+                map_zones=[map_zone], geodetic_datums=[geodetic_system]
+            )
             # Quantize to 3 decimal places (max_digits=12, decimal_places=3)
-            northing = Decimal(str(abs(northing_value))).quantize(Decimal('0.001'))
+            easting = Decimal(str(round(float(result['easting'][0]), 3))).quantize(Decimal('0.001'))
+            northing = Decimal(str(round(float(result['northing'][0]), 3))).quantize(Decimal('0.001'))
 
             logger.info(
                 f"Calculated UTM coordinates: E={easting}, N={northing} "
-                f"for lat={latitude}, lon={longitude}"
+                f"(zone {result['zone'][0]}) for lat={latitude}, lon={longitude}"
             )
 
             return (easting, northing)
@@ -98,15 +97,9 @@ class LocationService:
             Grid correction as Decimal (rounded to 7 decimal places)
         """
         try:
-            import math
-
-            central_meridian_val = float(central_meridian)
-            latitude_val = float(latitude)
-            longitude_val = float(longitude)
-
-            # grid_correction = (central_meridian - longitude) × sin(latitude)
-            lat_rad = math.radians(latitude_val)
-            grid_correction_value = (central_meridian_val - longitude_val) * math.sin(lat_rad)
+            grid_correction_value = float(LocationService.grid_correction_array(
+                float(central_meridian), float(latitude), float(longitude)
+            ))
 
             # Round to 6 decimal places to match model field precision
             grid_correction = Decimal(str(round(grid_correction_value, 6)))
@@ -142,60 +135,17 @@ class LocationService:
             longitude: Longitude in decimal degrees
             easting: UTM easting coordinate
             northing: UTM northing coordinate
-            ground_level_elevation: Ground level elevation (optional)
+            ground_level_elevation: Ground level elevation (optional, 0 when omitted)
 
         Returns:
             Dictionary with g_t, min_g_t, max_g_t, w_t, min_w_t, max_w_t values
         """
         try:
-            import math
-
-            latitude_val = float(latitude)
-            lat_rad = math.radians(latitude_val)
-
-            # Calculate W_t: 15.041 × cos(latitude_rad)
-            # Round to 1 decimal place for storage
-            w_t_value = 15.041 * math.cos(lat_rad)
-            w_t = Decimal(str(round(w_t_value, 1)))
-
-            # min_w_t = w_t - 3
-            min_w_t = Decimal(str(round(w_t_value - 3, 1)))
-
-            # max_w_t = w_t + 3
-            max_w_t = Decimal(str(round(w_t_value + 3, 1)))
-
-            # Calculate G_t if ground_level_elevation is provided
-            if ground_level_elevation is not None:
-                two_lat_rad = math.radians(2 * latitude_val)
-                elevation = float(ground_level_elevation)
-
-                g_t_value = (
-                    (9.780327 * (1 + (0.0053024 * (math.sin(lat_rad) ** 2)) -
-                    (0.0000058 * (math.sin(two_lat_rad) ** 2)))) -
-                    ((3.086 * 10 ** -6) * elevation)
-                ) * 102
-
-                # Round to 1 decimal place for storage
-                g_t = Decimal(str(round(g_t_value, 1)))
-                min_g_t = Decimal(str(round(g_t_value - 10, 1)))
-                max_g_t = Decimal(str(round(g_t_value + 10, 1)))
-            else:
-                # If no elevation provided, use simplified calculation
-                g_t_value = 9.780327 * (1 + (0.0053024 * (math.sin(lat_rad) ** 2)) -
-                                       (0.0000058 * (math.sin(math.radians(2 * latitude_val)) ** 2))) * 102
-                # Round to 1 decimal place for storage
-                g_t = Decimal(str(round(g_t_value, 1)))
-                min_g_t = Decimal(str(round(g_t_value - 10, 1)))
-                max_g_t = Decimal(str(round(g_t_value + 10, 1)))
-
-            result = {
-                'g_t': g_t,
-                'min_g_t': min_g_t,
-                'max_g_t': max_g_t,
-                'w_t': w_t,
-                'min_w_t': min_w_t,
-                'max_w_t': max_w_t
-            }
+            elevation = float(ground_level_elevation) if ground_level_elevation is not None else 0.0
+            g_t_values, w_t_values = LocationService.g_t_w_t_arrays(float(latitude), elevation)
+            g_t_value, w_t_value = float(g_t_values), float(w_t_values)
+
+            result = LocationService.g_t_w_t_fields(g_t_value, w_t_value)
 
             logger.info(f"Calculated g_t/w_t values: {result}")
 
@@ -205,6 +155,162 @@ class LocationService:
             logger.error(f"Error calculating g_t/w_t: {str(e)}")
             raise ValueError(f"Failed to calculate g_t/w_t: {str(e)}")
 
+    @staticmethod
+    def g_t_w_t_fields(g_t_value: float, w_t_value: float) -> Dict[str, Decimal]:
+        """
+        Stored G(t)/W(t) fields (rounded to 1 decimal place) with their acceptance ranges.
+
+        Returns:
+            Dictionary with g_t, min_g_t, max_g_t (± 10), w_t, min_w_t, max_w_t (± 3)
+        """
+        return {
+            'g_t': Decimal(str(round(g_t_value, 1))),
+            'min_g_t': Decimal(str(round(g_t_value - 10, 1))),
+            'max_g_t': Decimal(str(round(g_t_value + 10, 1))),
+            'w_t': Decimal(str(round(w_t_value, 1))),
+            'min_w_t': Decimal(str(round(w_t_value - 3, 1))),
+            'max_w_t': Decimal(str(round(w_t_value + 3, 1))),
+        }
+
+    @staticmethod
+    def grid_correction_array(central_meridian, latitude, longitude) -> np.ndarray:
+        """Vectorized grid correction: (central_meridian - longitude) × sin(latitude), degrees."""
+        latitude = np.asarray(latitude, dtype=float)
+        return (np.asarray(central_meridian, dtype=float) - np.asarray(longitude, dtype=float)) * np.sin(np.radians(latitude))
+
+    @staticmethod
+    def g_t_w_t_arrays(latitude, elevation=0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized expected G(t) and W(t) (unrounded; see calculate_g_t_w_t for the formulas).
+
+        Returns:
+            (g_t, w_t) arrays
+        """
+        lat_rad = np.radians(np.asarray(latitude, dtype=float))
+        elevation = np.nan_to_num(np.asarray(elevation, dtype=float))
+        g_t = (
+            9.780327 * (1 + 0.0053024 * np.sin(lat_rad) ** 2 - 0.0000058 * np.sin(2 * lat_rad) ** 2)
+            - 3.086e-6 * elevation
+        ) * 102
+        w_t = 15.041 * np.cos(lat_rad)
+        return g_t, w_t
+
+    @staticmethod
+    def derive_locations(
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        central_meridians: Optional[Sequence[float]] = None,
+        map_zones: Optional[Sequence[Optional[str]]] = None,
+        geodetic_datums: Optional[Sequence[Optional[str]]] = None,
+        elevations: Optional[Sequence[Optional[float]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Derive the grid and reference fields of many locations in one vectorized pass.
+
+        Locations are projected in their map zone (or their own UTM zone when
+        none is given) on their datum's ellipsoid; each distinct
+        (zone, hemisphere, ellipsoid) is one array call.
+
+        Args:
+            latitudes: Latitudes in decimal degrees
+            longitudes: Longitudes in decimal degrees
+            central_meridians: Per-location central meridians for grid_correction
+                (missing ones default to the UTM zone's central meridian)
+            map_zones: Per-location UTM zone identifiers
+            geodetic_datums: Per-location datum names (WGS84 when omitted)
+            elevations: Per-location ground level elevations for G(t) (0 when omitted)
+
+        Returns:
+            Dictionary of arrays: zone, south, easting, northing, convergence
+            (degrees, true to grid north), scale_factor, grid_correction, g_t, w_t
+        """
+        latitude = np.asarray(latitudes, dtype=float)
+        longitude = np.asarray(longitudes, dtype=float)
+        count = latitude.shape[0]
+        map_zones = list(map_zones) if map_zones is not None else [None] * count
+        datums = list(geodetic_datums) if geodetic_datums is not None else [None] * count
+
+        zone = utm_zone(latitude, longitude)
+        for index, map_zone in enumerate(map_zones):
+            parsed_zone, _ = parse_zone(map_zone)
+            if parsed_zone is not None:
+                zone[index] = parsed_zone
+        south = latitude < 0
+        ellipsoids = [ellipsoid_for(datum) for datum in datums]
+
+        easting, northing = np.empty(count), np.empty(count)
+        convergence, scale_factor = np.empty(count), np.empty(count)
+        groups: Dict[tuple, List[int]] = {}
+        for index in range(count):
+            groups.setdefault((int(zone[index]), bool(south[index]), ellipsoids[index]), []).append(index)
+        for (group_zone, group_south, ellipsoid), indices in groups.items():
+            projection = TransverseMercator.utm(group_zone, group_south, ellipsoid)
+            (easting[indices], northing[indices],
+             convergence[indices], scale_factor[indices]) = projection.forward(latitude[indices], longitude[indices])
+
+        meridians = central_meridian(zone)
+        if central_meridians is not None:
+            given = np.asarray([np.nan if cm is None else float(cm) for cm in central_meridians])
+            meridians = np.where(np.isnan(given), meridians, given)
+        if elevations is None:
+            elevation = 0.0
+        else:
+            elevation = np.asarray([np.nan if value is None else float(value) for value in elevations])
+        g_t, w_t = LocationService.g_t_w_t_arrays(latitude, elevation)
+
+        return {
+            'zone': zone,
+            'south': south,
+            'easting': easting,
+            'northing': northing,
+            'convergence': convergence,
+            'scale_factor': scale_factor,
+            'grid_correction': LocationService.grid_correction_array(meridians, latitude, longitude),
+            'g_t': g_t,
+            'w_t': w_t,
+        }
+
+    @staticmethod
+    def grid_to_geographic(
+        eastings: Sequence[float],
+        northings: Sequence[float],
+        map_zone: Optional[str],
+        geodetic_datum: Optional[str] = None,
+        latitude_hint: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Convert grid positions in one UTM zone (e.g. every station of a survey path) to geographic coordinates.
+
+        Args:
+            eastings: Grid eastings (m)
+            northings: Grid northings (m)
+            map_zone: UTM zone identifier of the grid
+            geodetic_datum: Datum name (WGS84 when omitted)
+            latitude_hint: A latitude in the area, used when ``map_zone`` does
+                not name the hemisphere
+
+        Returns:
+            Dictionary of arrays: latitude, longitude (degrees on the datum),
+            convergence (degrees) and scale_factor
+
+        Raises:
+            ValueError: If the map zone names no UTM zone
+        """
+        zone, south = parse_zone(map_zone)
+        if zone is None:
+            raise ValueError(f"Cannot determine the UTM zone from map zone '{map_zone}'")
+        if south is None:
+            south = latitude_hint is not None and latitude_hint < 0
+
+        projection = TransverseMercator.utm(zone, south, ellipsoid_for(geodetic_datum))
+        latitude, longitude, convergence, scale_factor = projection.inverse(eastings, northings)
+        return {
+            'latitude': latitude,
+            'longitude': longitude,
+            'convergence': convergence,
+            'scale_factor': scale_factor,
+        }
+
     @classmethod
     def create_location_with_calculations(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,442 @@
+"""
+Performance Metrics Service
+
+Metrics registry and request-scoped instrumentation:
+1. Histograms/counters rendered in Prometheus text exposition format
+2. Named spans around expensive operations (welleng, QA, reports, exports)
+3. Per-request collector for DB queries, cache hits and spans, used by
+   RequestMetricsMiddleware for the slow-request log
+
+Gunicorn runs several workers behind one port, so a scrape of /metrics
+reaches one of them at random. The process-wide registry therefore
+aggregates in Redis (settings.METRICS_REDIS_URL): each process adds its
+increments to shared hashes at most every METRICS_FLUSH_INTERVAL seconds
+(and before rendering), and /metrics renders the totals of every process.
+With METRICS_REDIS_URL empty, or while Redis is unreachable, each process
+reports only its own values.
+"""
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds) shared by request and span histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Keep at most this many SQL statements per request for the slow-request log
+MAX_TRACKED_QUERIES = 200
+
+
+class _Histogram:
+    """Cumulative-bucket histogram for a single label set."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: '_Histogram'):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.count += other.count
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters and histograms.
+
+    Metric names follow Prometheus conventions; labels are passed as dicts
+    and must have bounded cardinality (view routes, span names - never ids).
+
+    A ``shared`` registry also adds its values to the Redis store configured
+    by METRICS_REDIS_URL/METRICS_REDIS_PREFIX and renders the totals held
+    there, so every process reports the same aggregate. Otherwise values
+    are held in this process only.
+    """
+
+    def __init__(self, shared: bool = False):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple, _Histogram]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._shared = shared
+        # Increments not yet added to the shared store
+        self._pending_histograms: Dict[str, Dict[Tuple, _Histogram]] = {}
+        self._pending_counters: Dict[str, Dict[Tuple, float]] = {}
+        self._clients: Dict[Tuple[int, str], redis.Redis] = {}
+        self._flusher_pid: Optional[int] = None
+        self._store_down = False
+
+    @staticmethod
+    def _key(labels: Optional[Dict[str, str]]) -> Tuple:
+        return tuple(sorted((labels or {}).items()))
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None,
+                help_text: str = '', buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Record a histogram observation."""
+        key = self._key(labels)
+        with self._lock:
+            self._buckets.setdefault(name, buckets)
+            for histograms in (self._histograms, self._pending_histograms):
+                series = histograms.setdefault(name, {})
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = series[key] = _Histogram(buckets)
+                histogram.observe(value)
+            if help_text:
+                self._help.setdefault(name, help_text)
+        self._start_flusher()
+
+    def inc(self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None,
+            help_text: str = ''):
+        """Increment a counter."""
+        key = self._key(labels)
+        with self._lock:
+            for counters in (self._counters, self._pending_counters):
+                series = counters.setdefault(name, {})
+                series[key] = series.get(key, 0.0) + amount
+            if help_text:
+                self._help.setdefault(name, help_text)
+        self._start_flusher()
+
+    def reset(self):
+        """Clear all metrics, including the shared store (used by tests)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._pending_histograms.clear()
+            self._pending_counters.clear()
+        client = self._client()
+        if client is not None:
+            client.delete(*self._store_keys())
+
+    # Shared store
+
+    def _client(self) -> Optional[redis.Redis]:
+        """Redis client for the shared store (one per process), or None when not shared."""
+        url = getattr(settings, 'METRICS_REDIS_URL', '') if self._shared else ''
+        if not url:
+            return None
+        # Connections must not be shared across a fork
+        client_key = (os.getpid(), url)
+        client = self._clients.get(client_key)
+        if client is None:
+            timeout = getattr(settings, 'METRICS_REDIS_TIMEOUT', 1.0)
+            client = self._clients[client_key] = redis.Redis.from_url(
+                url, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+        return client
+
+    @staticmethod
+    def _store_keys() -> Tuple[str, str, str]:
+        prefix = getattr(settings, 'METRICS_REDIS_PREFIX', 'survey_api_metrics')
+        return f'{prefix}:counters', f'{prefix}:histograms', f'{prefix}:meta'
+
+    def _start_flusher(self):
+        """Start this process's background flush thread on first use (again after a fork)."""
+        if not self._shared or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0))
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Add the increments recorded since the last flush to the shared store.
+
+        Returns:
+            True when the store is up to date with this process
+        """
+        client = self._client()
+        if client is None:
+            return False
+        with self._lock:
+            counters, self._pending_counters = self._pending_counters, {}
+            histograms, self._pending_histograms = self._pending_histograms, {}
+            meta = {
+                name: json.dumps({'buckets': self._buckets[name], 'help': self._help.get(name, '')})
+                for name in histograms
+            }
+            meta.update(
+                (name, json.dumps({'help': self._help.get(name, '')}))
+                for name in counters if name not in meta
+            )
+        if not counters and not histograms:
+            return True
+
+        counters_key, histograms_key, meta_key = self._store_keys()
+        pipe = client.pipeline(transaction=False)
+        for name, series in counters.items():
+            for key, amount in series.items():
+                pipe.hincrbyfloat(counters_key, json.dumps([name, key]), amount)
+        for name, series in histograms.items():
+            for key, histogram in series.items():
+                for index, count in enumerate(histogram.counts):
+                    if count:
+                        pipe.hincrby(histograms_key, json.dumps([name, key, index]), count)
+                pipe.hincrbyfloat(histograms_key, json.dumps([name, key, 'sum']), histogram.total)
+                pipe.hincrby(histograms_key, json.dumps([name, key, 'count']), histogram.count)
+        pipe.hset(meta_key, mapping=meta)
+        try:
+            pipe.execute()
+        except redis.RedisError as exc:
+            self._requeue(counters, histograms)
+            if not self._store_down:
+                logger.warning('Metrics store unavailable, keeping values in this process: %s', exc)
+            self._store_down = True
+            return False
+        self._store_down = False
+        return True
+
+    def _requeue(self, counters: Dict, histograms: Dict):
+        """Put increments that could not be flushed back in front of newer ones."""
+        with self._lock:
+            for name, series in counters.items():
+                pending = self._pending_counters.setdefault(name, {})
+                for key, amount in series.items():
+                    pending[key] = pending.get(key, 0.0) + amount
+            for name, series in histograms.items():
+                pending = self._pending_histograms.setdefault(name, {})
+                for key, histogram in series.items():
+                    if key in pending:
+                        histogram.merge(pending[key])
+                    pending[key] = histogram
+
+    def _read_store(self, client: redis.Redis):
+        """Counters, histograms and help text totalled across processes."""
+        counters_key, histograms_key, meta_key = self._store_keys()
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(counters_key)
+        pipe.hgetall(histograms_key)
+        pipe.hgetall(meta_key)
+        raw_counters, raw_histograms, raw_meta = pipe.execute()
+
+        meta = {name.decode(): json.loads(value) for name, value in raw_meta.items()}
+        help_texts = {name: entry['help'] for name, entry in meta.items() if entry.get('help')}
+
+        counters: Dict[str, Dict[Tuple, float]] = {}
+        for field, value in raw_counters.items():
+            name, key = json.loads(field)
+            counters.setdefault(name, {})[tuple(map(tuple, key))] = float(value)
+
+        histograms: Dict[str, Dict[Tuple, _Histogram]] = {}
+        for field, value in raw_histograms.items():
+            name, key, slot = json.loads(field)
+            buckets = tuple(meta.get(name, {}).get('buckets') or ())
+            if not buckets:
+                continue
+            series = histograms.setdefault(name, {})
+            key = tuple(map(tuple, key))
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            if slot == 'sum':
+                histogram.total = float(value)
+            elif slot == 'count':
+                histogram.count = int(value)
+            else:
+                histogram.counts[slot] = int(value)
+        return counters, histograms, help_texts
+
+    # Exposition
+
+    @staticmethod
+    def _format_labels(key: Tuple, extra: Optional[Tuple] = None) -> str:
+        items = list(key) + list(extra or ())
+        if not items:
+            return ''
+        rendered = ','.join(
+            '{}="{}"'.format(
+                k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            )
+            for k, v in items
+        )
+        return '{' + rendered + '}'
+
+    def render(self) -> str:
+        """
+        Render all metrics in Prometheus text exposition format (0.0.4).
+
+        A shared registry flushes first and renders the totals of every
+        process; if the store is unreachable it renders this process only.
+        """
+        client = self._client()
+        if client is not None and self.flush():
+            try:
+                return self._render(*self._read_store(client))
+            except redis.RedisError as exc:
+                logger.warning('Metrics store unavailable, rendering this process only: %s', exc)
+        with self._lock:
+            return self._render(self._counters, self._histograms, dict(self._help))
+
+    def _render(self, counters: Dict, histograms: Dict, help_texts: Dict[str, str]) -> str:
+        lines: List[str] = []
+        for name in sorted(counters):
+            if name in help_texts:
+                lines.append(f'# HELP {name} {help_texts[name]}')
+            lines.append(f'# TYPE {name} counter')
+            for key, value in sorted(counters[name].items()):
+                lines.append(f'{name}{self._format_labels(key)} {value}')
+
+        for name in sorted(histograms):
+            if name in help_texts:
+                lines.append(f'# HELP {name} {help_texts[name]}')
+            lines.append(f'# TYPE {name} histogram')
+            for key, histogram in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{self._format_labels(key, (("le", repr(float(bound))),))} {cumulative}'
+                    )
+                lines.append(
+                    f'{name}_bucket{self._format_labels(key, (("le", "+Inf"),))} {histogram.count}'
+                )
+                lines.append(f'{name}_sum{self._format_labels(key)} {histogram.total}')
+                lines.append(f'{name}_count{self._format_labels(key)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry, aggregated across workers through Redis
+metrics = MetricsRegistry(shared=True)
+
+
+class RequestStats:
+    """Per-request instrumentation collected by RequestMetricsMiddleware."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.queries: List[Tuple[float, str]] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.spans: List[Tuple[str, float]] = []
+
+    def record_query(self, sql: str, duration: float):
+        self.query_count += 1
+        self.query_time += duration
+        if len(self.queries) < MAX_TRACKED_QUERIES:
+            self.queries.append((duration, sql))
+
+    def top_queries(self, limit: int = 5) -> List[Tuple[float, str]]:
+        """Return the slowest tracked queries, longest first."""
+        return sorted(self.queries, key=lambda item: item[0], reverse=True)[:limit]
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    'survey_api_request_stats', default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    """Begin collecting stats for the current request."""
+    return _current_request.set(RequestStats())
+
+
+def end_request(token: contextvars.Token):
+    """Stop collecting stats for the current request."""
+    _current_request.reset(token)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats for the request being handled on this thread, if any."""
+    return _current_request.get()
+
+
+def record_cache_access(hit: bool):
+    """Count a cache lookup against the process metrics and current request."""
+    metrics.inc(
+        'survey_api_cache_requests_total',
+        labels={'result': 'hit' if hit else 'miss'},
+        help_text='Cache lookups by result'
+    )
+    stats = _current_request.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+class span:
+    """
+    Time a named operation.
+
+    Records into the ``survey_api_span_seconds`` histogram and attaches the
+    timing to the current request for the slow-request log. Usable as a
+    context manager (exposing ``duration`` afterwards) or as a decorator.
+
+    Usage:
+        with span('welleng.calculate_survey') as timer:
+            result = ...
+        calculation_duration = timer.duration
+
+        @span('qa.calculate_metrics')
+        def calculate_qa_metrics(...):
+            ...
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.duration = 0.0
+        self._start = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the span started (final duration once exited)."""
+        if self._start is None:
+            return 0.0
+        return self.duration or (time.perf_counter() - self._start)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        labels = {'span': self.name, 'outcome': 'error' if exc_type else 'ok'}
+        metrics.observe(
+            'survey_api_span_seconds', self.duration, labels,
+            help_text='Duration of named operations (welleng, QA, reports, exports)'
+        )
+        stats = _current_request.get()
+        if stats is not None:
+            stats.spans.append((self.name, self.duration))
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(self.name):
+                return func(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,181 @@
+"""
+Plot Service - cached trajectory figures for PDF reports.
+
+1. Figures are built with the object-oriented matplotlib ``Figure`` API on an
+   Agg canvas (no pyplot global state) in the compute pool
+2. Polylines are decimated to the pixel resolution of their axes before plotting
+3. Rendered PNGs are cached by (calculated survey id, updated_at, plot kind, size)
+   so every report generated from the same calculation reuses the image
+
+Usage:
+    png = PlotService.trajectory_png(md, tvd, ns, ew, vs,
+                                     source=(calculated_survey.id, calculated_survey.updated_at))
+"""
+import hashlib
+import logging
+from io import BytesIO
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
+
+logger = logging.getLogger(__name__)
+
+# (width in, height in, dpi) of the trajectory figure; placed at 7" x 5.25" in reports
+TRAJECTORY_SIZE = (10, 7.5, 150)
+TRAJECTORY_KIND = 'trajectory'
+
+
+def decimate_polyline(coords: Sequence[Sequence[float]], resolution: int) -> Tuple[np.ndarray, ...]:
+    """
+    Reduce a polyline to the points visible at the given resolution.
+
+    Each coordinate is quantised to ``resolution`` cells over its range; a point
+    is kept only where the path moves to a different cell, so straight or
+    densely sampled sections collapse to a few vertices. First and last points
+    are always kept.
+
+    Args:
+        coords: Equal-length coordinate sequences (x, y[, z])
+        resolution: Cells per axis, i.e. the axes' size in pixels
+
+    Returns:
+        Tuple of decimated coordinate arrays
+    """
+    arrays = [np.asarray(c, dtype=float) for c in coords]
+    count = len(arrays[0]) if arrays else 0
+    if count <= 2 or count <= resolution:
+        return tuple(arrays)
+
+    cells = []
+    for values in arrays:
+        low, high = np.nanmin(values), np.nanmax(values)
+        extent = (high - low) or 1.0
+        cells.append(np.floor((values - low) / extent * (resolution - 1)))
+    moved = np.any(np.diff(np.column_stack(cells), axis=0) != 0, axis=1)
+
+    keep = np.concatenate(([True], moved))
+    keep[-1] = True
+    return tuple(values[keep] for values in arrays)
+
+
+class PlotService:
+    """Service for rendering and caching report plot images."""
+
+    @staticmethod
+    def cache_key(source: Sequence, kind: str, size: Tuple) -> str:
+        """Cache key for a plot of ``kind`` and ``size`` rendered from ``source``."""
+        digest = hashlib.sha1()
+        for part in (*source, kind, *size):
+            if hasattr(part, 'isoformat'):
+                part = part.isoformat()
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return f"plot:{kind}:{digest.hexdigest()}"
+
+    @staticmethod
+    @span('plot.trajectory')
+    def trajectory_png(md_data, tvd_data, ns_data, ew_data, vs_data,
+                       source: Optional[Sequence] = None, size: Tuple = TRAJECTORY_SIZE) -> bytes:
+        """
+        Render the 3D/plan/section trajectory figure, using the cache when possible.
+
+        Args:
+            md_data, tvd_data, ns_data, ew_data, vs_data: Station arrays (vs may be empty)
+            source: (calculated survey id, updated_at) identifying the data; None disables caching
+            size: (width in, height in, dpi)
+
+        Returns:
+            bytes: PNG image
+        """
+        key = PlotService.cache_key(source, TRAJECTORY_KIND, size) if source else None
+        if key:
+            png = PlotService._cache_get(key)
+            if png is not None:
+                return png
+
+        png = compute_pool.run(
+            PlotService._render_trajectory_png,
+            list(md_data), list(tvd_data), list(ns_data), list(ew_data), list(vs_data or []), tuple(size)
+        )
+
+        if key:
+            PlotService._cache_set(key, png)
+        return png
+
+    @staticmethod
+    def _cache_get(key: str) -> Optional[bytes]:
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Plot cache unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _cache_set(key: str, png: bytes):
+        try:
+            cache.set(key, png, getattr(settings, 'PLOT_CACHE_TIMEOUT', 7 * 24 * 3600))
+        except Exception as e:
+            logger.warning(f"Could not cache plot {key}: {e}")
+
+    @staticmethod
+    def _render_trajectory_png(md_data, tvd_data, ns_data, ew_data, vs_data, size) -> bytes:
+        """Render the trajectory figure to PNG bytes (compute pool worker)."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        width, height, dpi = size
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+
+        # 3D graph gets more space (60% top, 40% bottom)
+        gs = fig.add_gridspec(2, 2, height_ratios=[1.8, 1])
+        full_width_px = int(width * dpi)
+        half_width_px = full_width_px // 2
+
+        # 3D Trajectory Plot (top row, spanning both columns)
+        ew, ns, tvd = decimate_polyline((ew_data, ns_data, tvd_data), full_width_px)
+        ax1 = fig.add_subplot(gs[0, :], projection='3d')
+        ax1.plot(ew, ns, tvd, 'b-', linewidth=2)
+        ax1.set_xlabel('Easting (m)', fontsize=10)
+        ax1.set_ylabel('Northing (m)', fontsize=10)
+        ax1.set_zlabel('TVD (m)', fontsize=10)
+        ax1.set_title('3D Trajectory View', fontsize=12, fontweight='bold')
+        ax1.invert_zaxis()  # Invert Z-axis for depth
+        ax1.grid(True, alpha=0.3)
+        ax1.tick_params(labelsize=9)
+
+        # 2D Plan View (bottom left)
+        ew, ns = decimate_polyline((ew_data, ns_data), half_width_px)
+        ax2 = fig.add_subplot(gs[1, 0])
+        ax2.plot(ew, ns, 'r-', linewidth=2)
+        ax2.set_xlabel('Easting (m)', fontsize=9)
+        ax2.set_ylabel('Northing (m)', fontsize=9)
+        ax2.set_title('2D Plan View', fontsize=10, fontweight='bold')
+        ax2.grid(True, alpha=0.3)
+        ax2.axis('equal')
+        ax2.tick_params(labelsize=8)
+
+        # 2D Vertical Section View (bottom right); MD when vertical section is unavailable
+        ax3 = fig.add_subplot(gs[1, 1])
+        if vs_data:
+            section, tvd = decimate_polyline((vs_data, tvd_data), half_width_px)
+            ax3.set_xlabel('Vertical Section (m)', fontsize=9)
+        else:
+            section, tvd = decimate_polyline((md_data, tvd_data), half_width_px)
+            ax3.set_xlabel('Measured Depth (m)', fontsize=9)
+        ax3.plot(section, tvd, 'g-', linewidth=2)
+        ax3.set_ylabel('TVD (m)', fontsize=9)
+        ax3.set_title('2D Vertical Section', fontsize=10, fontweight='bold')
+        ax3.invert_yaxis()  # Invert Y-axis for depth
+        ax3.grid(True, alpha=0.3)
+        ax3.tick_params(labelsize=8)
+
+        fig.tight_layout()
+        img_buffer = BytesIO()
+        fig.savefig(img_buffer, format='png', dpi=dpi)
+        return img_buffer.getvalue()
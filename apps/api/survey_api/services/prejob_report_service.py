@@ -12,12 +12,15 @@ from reportlab.lib.units import inch, cm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportInputs, report_artifacts
 
 
 class PrejobReportService:
     """Service for generating Pre-Survey Data Sheet PDF reports."""
 
     @staticmethod
+    @span('report.prejob')
     def generate_prejob_report(job, run=None):
         """
         Generate a Pre-Survey Data Sheet PDF for the given job.
@@ -476,3 +479,27 @@ class PrejobReportService:
         pdf = buffer.getvalue()
         buffer.close()
         return pdf
+
+    @staticmethod
+    def get_report_artifact(job, run=None):
+        """
+        Return the stored Prejob Report for the job (or run) inputs, generating it if needed.
+
+        Args:
+            job: Job model instance
+            run: Optional Run model instance for a run-specific report
+
+        Returns:
+            ReportArtifact
+        """
+        if run is not None:
+            report_type, inputs, params = 'prejob_run', ReportInputs.collect(run_ids=[run.pk]), (str(run.pk),)
+        else:
+            report_type, inputs, params = 'prejob', ReportInputs.collect(job_ids=[job.pk]), (str(job.pk),)
+
+        return report_artifacts.get_or_create(
+            report_type,
+            inputs,
+            lambda: PrejobReportService.generate_prejob_report(job, run),
+            params=params
+        )
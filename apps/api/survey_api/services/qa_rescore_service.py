@@ -0,0 +1,228 @@
+"""
+QA Rescore Service - live scores while a reviewer toggles GTL stations.
+
+The approval scores (pass/remove counts, G(t)/W(t) score points, delta
+scores and difference percentages) are sums of per-station contributions, so
+a review session keeps running totals and applies only the toggled stations:
+
+1. Per-station contributions (status code plus G(t)/W(t) differences in
+   hundredths) are built once per QualityCheck version and cached
+2. The session state - the kept-station mask and integer totals - is cached
+   per QualityCheck for QA_SESSION_TTL seconds
+3. Each request reads both entries in one cache round-trip, flips the bits of
+   the toggled stations and adjusts the totals in O(changed stations)
+
+Totals are integers (points in tenths, differences in hundredths), so long
+review sessions do not accumulate rounding drift and the summary equals
+QAService.calculate_qa_metrics over the kept stations.
+
+Usage:
+    summary = QARescoreService.rescore(qa_id, keep=[12], drop=[40, 41])
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from survey_api.exceptions import ValidationError
+from survey_api.models import QualityCheck
+from survey_api.services.metrics_service import span
+from survey_api.services.qa_service import QAService
+from survey_api.utils.qa_station_codes import (
+    PASS_BIT,
+    STATUS_MASK,
+    W_T_SHIFT,
+    pack_mask,
+    set_kept,
+    station_differences,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'qa-rescore'
+
+# Score points per status code (n/c, low, good, high) in tenths
+STATUS_POINTS = (0, 10, 12, 15)
+MAX_POINTS = 15
+
+TOTAL_FIELDS = (
+    'kept', 'pass_count', 'remove_count', 'g_points', 'w_points',
+    'g_diff', 'w_diff', 'g_diff_pass', 'w_diff_pass',
+)
+
+
+class QARescoreService:
+    """Incremental re-scoring of a QA review session."""
+
+    @staticmethod
+    @span('qa.rescore')
+    def rescore(quality_check_id, keep: Iterable[int] = (), drop: Iterable[int] = (),
+                reset: bool = False) -> Dict:
+        """
+        Apply station toggles to the review session and return the updated scores.
+
+        The session starts from the check's kept-station mask, or from the
+        default selection (PASS stations plus the final station) while pending.
+
+        Args:
+            quality_check_id: UUID of the QualityCheck
+            keep: Station indices to keep
+            drop: Station indices to drop
+            reset: Restart from the initial selection before applying the toggles
+
+        Returns:
+            Dictionary with qa_id, total_stations, changed (stations whose
+            state flipped) and summary (see _summary)
+
+        Raises:
+            QualityCheck.DoesNotExist: If the QA check does not exist
+            ValidationError: If an index is out of range or both kept and dropped
+        """
+        quality_check = QualityCheck.objects.only('id', 'updated_at', 'kept_mask').get(id=quality_check_id)
+        version = quality_check.updated_at.isoformat()
+        stations_key = f'{KEY_PREFIX}:{quality_check.id}:{version}:stations'
+        state_key = f'{KEY_PREFIX}:{quality_check.id}:{version}:state'
+
+        cached = cache.get_many([stations_key, state_key])
+        stations = cached.get(stations_key)
+        if stations is None:
+            stations = QARescoreService._build_stations(quality_check.id)
+            cache.set(stations_key, stations, QARescoreService._ttl())
+
+        count = len(stations['codes'])
+        keep = QARescoreService._validate(keep, count, 'keep')
+        drop = QARescoreService._validate(drop, count, 'drop')
+        both = sorted(set(keep) & set(drop))
+        if both:
+            raise ValidationError(
+                f"Stations {both[:10]} are both kept and dropped",
+                field_errors={'drop': ['Indices must not also be listed in keep.']}
+            )
+
+        state = None if reset else cached.get(state_key)
+        if state is None:
+            state = QARescoreService._initial_state(stations, quality_check.kept_mask)
+
+        mask = bytearray(state['mask'])
+        totals = dict(state['totals'])
+        changed = 0
+        for indices, kept, sign in ((keep, True, 1), (drop, False, -1)):
+            for index in indices:
+                if set_kept(mask, index, kept):
+                    QARescoreService._add(totals, stations, index, sign)
+                    changed += 1
+
+        cache.set(state_key, {'mask': bytes(mask), 'totals': totals}, QARescoreService._ttl())
+
+        return {
+            'qa_id': str(quality_check.id),
+            'total_stations': count,
+            'changed': changed,
+            'summary': QARescoreService._summary(totals),
+        }
+
+    @staticmethod
+    def _build_stations(quality_check_id) -> Dict[str, bytes]:
+        """Per-station status codes and differences (hundredths) of a QA check."""
+        quality_check = QualityCheck.objects.select_related('survey_data').get(id=quality_check_id)
+        stations = quality_check.stations()
+        g_diff, w_diff = station_differences(
+            quality_check.location_g_t, quality_check.location_w_t, stations['gt_data'], stations['wt_data']
+        )
+        return {
+            'codes': bytes(quality_check.station_codes),
+            'g_diff': QARescoreService._cents(g_diff),
+            'w_diff': QARescoreService._cents(w_diff),
+        }
+
+    @staticmethod
+    def _cents(differences: List[float]) -> bytes:
+        return np.array([round(diff * 100) for diff in differences], dtype='<i8').tobytes()
+
+    @staticmethod
+    def _initial_state(stations: Dict[str, bytes], kept_mask: Optional[bytes]) -> Dict:
+        """Session state for the check's mask, or the default selection while pending."""
+        codes = stations['codes']
+        count = len(codes)
+        if kept_mask is None:
+            overall = ['PASS' if code & PASS_BIT else 'REMOVE' for code in codes]
+            mask = pack_mask(QAService.select_kept_indices(overall), count)
+        else:
+            mask = bytes(kept_mask)
+
+        totals = dict.fromkeys(TOTAL_FIELDS, 0)
+        bits = np.unpackbits(np.frombuffer(mask, dtype=np.uint8), count=count)
+        for index in np.flatnonzero(bits).tolist():
+            QARescoreService._add(totals, stations, index, 1)
+        return {'mask': mask, 'totals': totals}
+
+    @staticmethod
+    def _add(totals: Dict[str, int], stations: Dict[str, bytes], index: int, sign: int):
+        """Add (sign=1) or remove (sign=-1) one station's contribution."""
+        code = stations['codes'][index]
+        g_diff = int.from_bytes(stations['g_diff'][index * 8:index * 8 + 8], 'little', signed=True)
+        w_diff = int.from_bytes(stations['w_diff'][index * 8:index * 8 + 8], 'little', signed=True)
+
+        totals['kept'] += sign
+        totals['g_points'] += sign * STATUS_POINTS[code & STATUS_MASK]
+        totals['w_points'] += sign * STATUS_POINTS[(code >> W_T_SHIFT) & STATUS_MASK]
+        totals['g_diff'] += sign * g_diff
+        totals['w_diff'] += sign * w_diff
+        if code & PASS_BIT:
+            totals['pass_count'] += sign
+            totals['g_diff_pass'] += sign * g_diff
+            totals['w_diff_pass'] += sign * w_diff
+        else:
+            totals['remove_count'] += sign
+
+    @staticmethod
+    def _summary(totals: Dict[str, int]) -> Dict:
+        """
+        Scores of the kept stations, as QAService.calculate_qa_metrics reports them.
+
+        Returns:
+            Dictionary with pass_count, remove_count, g_t_score, w_t_score,
+            g_t_percentage, w_t_percentage, delta_wt_score, delta_wt_percentage,
+            delta_gt_score, delta_gt_percentage, w_t_score_points,
+            g_t_score_points, max_score and total_rows
+        """
+        kept = totals['kept']
+        max_points = kept * MAX_POINTS
+        g_diff, w_diff = totals['g_diff'] / 100, totals['w_diff'] / 100
+        g_diff_pass, w_diff_pass = totals['g_diff_pass'] / 100, totals['w_diff_pass'] / 100
+        delta_wt_score = totals['w_points'] / max_points if max_points > 0 else 0
+        delta_gt_score = totals['g_points'] / max_points if max_points > 0 else 0
+
+        return {
+            'pass_count': totals['pass_count'],
+            'remove_count': totals['remove_count'],
+            'g_t_score': f"{g_diff_pass:.2f} / {g_diff:.2f}",
+            'w_t_score': f"{w_diff_pass:.2f} / {w_diff:.2f}",
+            'g_t_percentage': round(g_diff_pass / g_diff * 100, 2) if g_diff != 0 else 0,
+            'w_t_percentage': round(w_diff_pass / w_diff * 100, 2) if w_diff != 0 else 0,
+            'delta_wt_score': round(delta_wt_score, 4),
+            'delta_wt_percentage': round(delta_wt_score * 100, 2),
+            'delta_gt_score': round(delta_gt_score, 4),
+            'delta_gt_percentage': round(delta_gt_score * 100, 2),
+            'w_t_score_points': round(totals['w_points'] / 10, 2),
+            'g_t_score_points': round(totals['g_points'] / 10, 2),
+            'max_score': kept * 1.5,
+            'total_rows': kept,
+        }
+
+    @staticmethod
+    def _validate(indices: Iterable[int], count: int, field: str) -> List[int]:
+        indices = list(indices)
+        invalid = [i for i in indices if not 0 <= i < count]
+        if invalid:
+            raise ValidationError(
+                f"Station indices {invalid[:10]} are out of range (0-{count - 1})",
+                field_errors={field: [f'Indices must be between 0 and {count - 1}.']}
+            )
+        return indices
+
+    @staticmethod
+    def _ttl() -> int:
+        return getattr(settings, 'QA_SESSION_TTL', 24 * 3600)
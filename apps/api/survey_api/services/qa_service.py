@@ -2,8 +2,10 @@
 Quality Assurance service for GTL survey validation.
 """
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from decimal import Decimal
+from survey_api.services.metrics_service import span
+from survey_api.utils.qa_station_codes import encode_stations, pack_mask, station_difference
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,7 @@ class QAService:
     """Service for performing QA calculations on GTL survey data."""
 
     @staticmethod
+    @span('qa.calculate_metrics')
     def calculate_qa_metrics(
         md_data: List[float],
         inc_data: List[float],
@@ -97,8 +100,8 @@ class QAService:
                     continue
 
                 # Calculate differences (Location value - File value)
-                g_t_difference = round(location_g_t - g_t, 2)
-                w_t_difference = round(location_w_t - w_t, 2)
+                g_t_difference = station_difference(location_g_t, g_t)
+                w_t_difference = station_difference(location_w_t, w_t)
 
                 total_g_t_difference += g_t_difference
                 total_w_t_difference += w_t_difference
@@ -321,3 +324,148 @@ class QAService:
             'gt_data': filtered_gt,
             'wt_data': filtered_wt,
         }
+
+    @staticmethod
+    def quality_check_fields(
+        qa_results: Dict[str, Any],
+        location_g_t: float,
+        location_w_t: float
+    ) -> Dict[str, Any]:
+        """
+        Build the QualityCheck result fields for a calculate_qa_metrics result.
+
+        Per-station statuses are packed into ``station_codes``; differences are
+        not stored since they follow from the station values and the location.
+
+        Args:
+            qa_results: Result of calculate_qa_metrics for all uploaded stations
+            location_g_t: Location G(t) the stations were scored against
+            location_w_t: Location W(t) the stations were scored against
+
+        Returns:
+            Keyword arguments for QualityCheck
+        """
+        return {
+            'station_codes': encode_stations(
+                qa_results['g_t_status_data'],
+                qa_results['w_t_status_data'],
+                qa_results['overall_status_data'],
+            ),
+            'location_g_t': location_g_t,
+            'location_w_t': location_w_t,
+            'total_g_t_difference': qa_results['total_g_t_difference'],
+            'total_w_t_difference': qa_results['total_w_t_difference'],
+            'total_g_t_difference_pass': qa_results['total_g_t_difference_pass'],
+            'total_w_t_difference_pass': qa_results['total_w_t_difference_pass'],
+            'g_t_percentage': qa_results['g_t_percentage'],
+            'w_t_percentage': qa_results['w_t_percentage'],
+            'pass_count': qa_results['pass_count'],
+            'remove_count': qa_results['remove_count'],
+        }
+
+    @staticmethod
+    def select_kept_indices(
+        overall_status_data: List[str],
+        indices_to_keep: Optional[List[int]] = None
+    ) -> List[int]:
+        """
+        Resolve the stations kept on approval.
+
+        Without an explicit selection every PASS station is kept. The final
+        station (last MD) is always kept in that case, as in
+        filter_stations_by_status.
+
+        Args:
+            overall_status_data: Overall status array
+            indices_to_keep: Indices chosen by the reviewer (optional)
+
+        Returns:
+            Sorted, de-duplicated, in-range station indices
+        """
+        count = len(overall_status_data)
+        if indices_to_keep is not None:
+            return sorted({int(i) for i in indices_to_keep if 0 <= int(i) < count})
+
+        last_index = count - 1
+        return [i for i, status in enumerate(overall_status_data) if status == 'PASS' or i == last_index]
+
+    @staticmethod
+    def approve(quality_check, indices_to_keep: Optional[List[int]] = None) -> Dict[str, List[float]]:
+        """
+        Mark a QualityCheck approved by setting its kept-station mask.
+
+        The stations and status codes are left untouched; only the mask, the
+        status and the approval scores (computed over the kept stations) change.
+        The caller saves the instance.
+
+        Args:
+            quality_check: QualityCheck to approve
+            indices_to_keep: Indices chosen by the reviewer (optional, see select_kept_indices)
+
+        Returns:
+            Dictionary with the kept stations' md/inc/azi/gt/wt arrays
+        """
+        count = quality_check.station_count
+        kept = QAService.select_kept_indices(quality_check.overall_status_data, indices_to_keep)
+        stations = quality_check.stations()
+        quality_check.kept_mask = pack_mask(kept, count)
+        quality_check.status = 'approved'
+
+        kept_data = {name: [values[i] for i in kept] for name, values in stations.items()}
+
+        scores = QAService.calculate_qa_metrics(
+            **kept_data,
+            location_g_t=quality_check.location_g_t,
+            location_w_t=quality_check.location_w_t
+        )
+        for field in (
+            'pass_count', 'remove_count', 'delta_wt_score', 'delta_wt_percentage',
+            'delta_gt_score', 'delta_gt_percentage', 'w_t_score_points',
+            'g_t_score_points', 'max_score', 'total_rows',
+        ):
+            setattr(quality_check, field, scores[field])
+
+        logger.info(
+            f"Approved QA {quality_check.id}: kept {len(kept)} of {count} stations, "
+            f"Delta W(t): {quality_check.delta_wt_percentage}%, Delta G(t): {quality_check.delta_gt_percentage}%"
+        )
+        return kept_data
+
+    @staticmethod
+    def approve_pending_survey(quality_check, survey_data, tie_on,
+                               indices_to_keep: Optional[List[int]] = None) -> Dict[str, List[float]]:
+        """
+        Approve a pending GTL upload and turn its SurveyData into the calculation input.
+
+        SurveyData becomes the tie-on row plus the kept stations (tie-on G(t)
+        and W(t) are the location values the QA used) and its status 'valid';
+        the removed stations move to the check's ``detached_stations``, so
+        QualityCheck.stations() still returns the whole upload. The caller
+        saves both instances.
+
+        Args:
+            quality_check: Pending QualityCheck linked to ``survey_data``
+            survey_data: SurveyData with validation_status 'pending_qa'
+            tie_on: The run's TieOn
+            indices_to_keep: Indices chosen by the reviewer (optional, see select_kept_indices)
+
+        Returns:
+            Dictionary with the kept stations' md/inc/azi/gt/wt arrays
+        """
+        stations = quality_check.stations()
+        kept_data = QAService.approve(quality_check, indices_to_keep)
+
+        kept = set(quality_check.kept_indices)
+        removed = [i for i in range(quality_check.station_count) if i not in kept]
+        quality_check.detached_stations = {
+            name: [values[i] for i in removed] for name, values in stations.items()
+        }
+
+        survey_data.md_data = [float(tie_on.md)] + kept_data['md_data']
+        survey_data.inc_data = [float(tie_on.inc)] + kept_data['inc_data']
+        survey_data.azi_data = [float(tie_on.azi)] + kept_data['azi_data']
+        survey_data.gt_data = [quality_check.location_g_t] + kept_data['gt_data']
+        survey_data.wt_data = [quality_check.location_w_t] + kept_data['wt_data']
+        survey_data.row_count = len(survey_data.md_data)
+        survey_data.validation_status = 'valid'
+        return kept_data
@@ -0,0 +1,125 @@
+"""
+QA Temp Files - expiry of abandoned GTL QA uploads.
+
+upload_gtl_for_qa stores the uploaded file in survey_files/qa_temp and creates
+a SurveyFile, SurveyData and QualityCheck awaiting approval ('pending_qa').
+Uploads that are never approved, uploads whose request failed after the file
+was saved, and ``*_metadata.json`` files left by the former temporary QA
+session flow are otherwise never removed.
+
+sweep() deletes pending uploads older than QA_TEMP_FILE_TTL with their rows,
+then the files in survey_files/qa_temp of that age that no SurveyFile
+references - run it periodically with ``manage.py sweep_qa_temp_files``.
+
+Usage:
+    result = qa_temp_files.sweep()
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from survey_api.models import QualityCheck, SurveyFile
+from survey_api.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+TEMP_DIR = 'survey_files/qa_temp'
+
+
+class QATempFiles:
+    """
+    Sweeper for abandoned GTL QA uploads and orphaned temporary QA files.
+
+    Settings:
+        QA_TEMP_FILE_TTL: Seconds a pending upload or unreferenced file is kept (default 24 h)
+    """
+
+    @property
+    def ttl(self) -> int:
+        return getattr(settings, 'QA_TEMP_FILE_TTL', 24 * 3600)
+
+    def sweep(self, max_age: Optional[int] = None) -> Dict[str, int]:
+        """
+        Expire pending QA uploads and delete orphaned temporary QA files.
+
+        Uploads still awaiting QA approval that were created more than
+        ``max_age`` seconds ago (default QA_TEMP_FILE_TTL) are deleted with
+        their SurveyData and pending QualityCheck. Files in the QA temp
+        directory of that age are then deleted unless a SurveyFile still
+        points at them, which includes the files of the expired uploads.
+
+        Returns:
+            Dictionary with 'expired' (upload count), 'deleted' (file count)
+            and 'bytes' (size freed)
+        """
+        cutoff = timezone.now() - timedelta(seconds=self.ttl if max_age is None else max_age)
+        expired = self._expire_pending_uploads(cutoff)
+        try:
+            _, names = default_storage.listdir(TEMP_DIR)
+        except FileNotFoundError:
+            return {'expired': expired, 'deleted': 0, 'bytes': 0}
+
+        candidates = {}
+        for name in names:
+            path = f'{TEMP_DIR}/{name}'
+            try:
+                if default_storage.get_modified_time(path) >= cutoff:
+                    continue
+                candidates[path] = default_storage.size(path)
+            except OSError:
+                continue  # Removed concurrently
+
+        referenced = set(
+            SurveyFile.objects.filter(file_path__in=list(candidates)).values_list('file_path', flat=True)
+        )
+
+        deleted, freed = 0, 0
+        for path, size in candidates.items():
+            if path in referenced:
+                continue
+            try:
+                default_storage.delete(path)
+            except OSError as e:
+                logger.warning(f"Could not delete temporary QA file {path}: {e}")
+                continue
+            deleted += 1
+            freed += size
+
+        if deleted:
+            metrics.inc('survey_api_qa_temp_files_swept_total', amount=deleted,
+                        help_text='Orphaned temporary QA files deleted by the sweeper')
+        logger.info(f"Swept {expired} pending QA uploads and {deleted} temporary QA files ({freed} bytes)")
+        return {'expired': expired, 'deleted': deleted, 'bytes': freed}
+
+    def _expire_pending_uploads(self, cutoff) -> int:
+        """
+        Delete uploads created before ``cutoff`` that are still awaiting QA approval.
+
+        Returns:
+            Number of expired uploads
+        """
+        with transaction.atomic():
+            # Locked so an approval cannot complete while its upload is being deleted
+            ids = list(
+                SurveyFile.objects.select_for_update()
+                .filter(processing_status='pending_qa', created_at__lt=cutoff)
+                .values_list('id', flat=True)
+            )
+            if not ids:
+                return 0
+            # survey_data is SET_NULL on QualityCheck; pending checks go with their upload
+            QualityCheck.objects.filter(survey_data__survey_file_id__in=ids, status='pending').delete()
+            SurveyFile.objects.filter(id__in=ids).delete()
+
+        metrics.inc('survey_api_qa_uploads_expired_total', amount=len(ids),
+                    help_text='Pending QA uploads deleted after QA_TEMP_FILE_TTL')
+        return len(ids)
+
+
+# Global instance
+qa_temp_files = QATempFiles()
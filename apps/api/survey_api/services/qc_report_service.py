@@ -20,6 +20,8 @@ from reportlab.platypus import (
 from reportlab.pdfgen import canvas
 
 from survey_api.models import QualityCheck, Run
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportArtifact, ReportInputs, report_artifacts
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,7 @@ class QCReportService:
     WHITE = colors.white
 
     @staticmethod
+    @span('report.qc')
     def generate_qc_report(qa_id: str) -> io.BytesIO:
         """
         Generate QC report PDF for a given QA check.
@@ -106,6 +109,25 @@ class QCReportService:
             logger.error(f"Error generating QC report: {str(e)}")
             raise
 
+    @staticmethod
+    def get_report_artifact(qa_id: str) -> ReportArtifact:
+        """
+        Return the stored QC report for the QA check's current inputs, generating it if needed.
+
+        Args:
+            qa_id: UUID of the QualityCheck record
+
+        Returns:
+            ReportArtifact
+        """
+        run_id = QualityCheck.objects.filter(id=qa_id).values_list('run_id', flat=True).first()
+        return report_artifacts.get_or_create(
+            'qc',
+            ReportInputs.collect(run_ids=[run_id]),
+            lambda: QCReportService.generate_qc_report(qa_id),
+            params=(str(qa_id),)
+        )
+
     @staticmethod
     def _add_header_footer(canvas_obj: canvas.Canvas, doc, qa_check: QualityCheck, page_num: int):
         """Add header and footer to each page."""
@@ -264,8 +286,9 @@ class QCReportService:
         story.append(Spacer(1, 0.05*inch))
 
         # Survey information table - Unified 4-column layout for proper alignment
-        survey_md_range = f"{min(qa_check.md_data):.2f} to {max(qa_check.md_data):.2f} ft" if qa_check.md_data else "N/A"
-        max_inc = f"{max(qa_check.inc_data):.2f} °" if qa_check.inc_data else "N/A"
+        reviewed = qa_check.reviewed_stations()
+        survey_md_range = f"{min(reviewed['md_data']):.2f} to {max(reviewed['md_data']):.2f} ft" if reviewed['md_data'] else "N/A"
+        max_inc = f"{max(reviewed['inc_data']):.2f} °" if reviewed['inc_data'] else "N/A"
 
         survey_data = [
             ['Well Type', well.well_type if well and hasattr(well, 'well_type') else 'Deviated',
@@ -454,8 +477,9 @@ class QCReportService:
         story.append(Spacer(1, 0.05*inch))
 
         # Calculate overall confidence
-        total_stations = len(qa_check.md_data)
-        pass_count = sum(1 for status in qa_check.overall_status_data if status == 'PASS')
+        overall_status_data = qa_check.reviewed_stations()['overall_status_data']
+        total_stations = len(overall_status_data)
+        pass_count = sum(1 for status in overall_status_data if status == 'PASS')
         gyrocompass_confidence = (pass_count / total_stations * 100) if total_stations > 0 else 0
 
         # Overall weighted confidence
@@ -589,15 +613,16 @@ class QCReportService:
         ]]
 
         pass_count = 0
-        for i in range(len(qa_check.md_data)):
-            md = qa_check.md_data[i]
-            inc = qa_check.inc_data[i]
-            azi = qa_check.azi_data[i]
-            gt = qa_check.gt_data[i]
-            wt = qa_check.wt_data[i]
-            gt_diff = qa_check.g_t_difference_data[i]
-            wt_diff = qa_check.w_t_difference_data[i]
-            overall = qa_check.overall_status_data[i]
+        reviewed = qa_check.reviewed_stations()
+        for i in range(len(reviewed['md_data'])):
+            md = reviewed['md_data'][i]
+            inc = reviewed['inc_data'][i]
+            azi = reviewed['azi_data'][i]
+            gt = reviewed['gt_data'][i]
+            wt = reviewed['wt_data'][i]
+            gt_diff = reviewed['g_t_difference_data'][i]
+            wt_diff = reviewed['w_t_difference_data'][i]
+            overall = reviewed['overall_status_data'][i]
 
             if overall == 'PASS':
                 pass_count += 1
@@ -643,7 +668,7 @@ class QCReportService:
         story.append(Spacer(1, 0.1*inch))
 
         # Confidence score
-        total_stations = len(qa_check.md_data)
+        total_stations = len(reviewed['md_data'])
         confidence = (pass_count / total_stations * 100) if total_stations > 0 else 0
 
         confidence_data = [[
@@ -845,8 +870,9 @@ class QCReportService:
 
         # Calculate overall confidence
         # Gyrocompass QC confidence from page 2
-        total_stations = len(qa_check.md_data)
-        pass_count = sum(1 for status in qa_check.overall_status_data if status == 'PASS')
+        overall_status_data = qa_check.reviewed_stations()['overall_status_data']
+        total_stations = len(overall_status_data)
+        pass_count = sum(1 for status in overall_status_data if status == 'PASS')
         gyrocompass_confidence = (pass_count / total_stations * 100) if total_stations > 0 else 0
 
         # Overall weighted confidence
@@ -0,0 +1,255 @@
+"""
+Recalculation Service - keeps derived results in step with run inputs.
+
+Every CalculatedSurvey stores the location, tie-on and depth it was computed
+from (``calculation_context``). Results derived from it form a small
+dependency graph:
+
+    Location / TieOn / Depth (per run)
+        -> CalculatedSurvey (per SurveyData)
+            -> InterpolatedSurvey (per resolution)
+            -> ComparisonResult (as primary or reference survey)
+            -> Extrapolation
+
+1. Saving or deleting a run's Location, TieOn or Depth compares the stored
+   inputs of each of the run's calculations with the current ones after the
+   transaction commits; only calculations whose inputs actually differ, and
+   their descendants, are flagged ``is_stale``
+2. Stale calculations are recomputed in place (BatchCalculationService) on
+   next read, or eagerly by a bounded background executor
+   (RECALCULATION_WORKERS threads, each survey queued at most once)
+3. Stale interpolations are recomputed together with their calculation;
+   comparisons and extrapolations keep the flag until they are re-run
+
+Usage:
+    recalculation.inputs_changed(run_id)            # model signal receivers
+    recalculation.refresh_if_stale(survey_data_id)  # before serving results
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+
+from survey_api.exceptions import InsufficientDataError
+from survey_api.models import (
+    CalculatedSurvey,
+    ComparisonResult,
+    Extrapolation,
+    InterpolatedSurvey,
+    SurveyData,
+)
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.interpolation_service import InterpolationService
+from survey_api.services.metrics_service import metrics, span
+from survey_api.services.single_flight import single_flight
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+
+logger = logging.getLogger(__name__)
+
+# Calculation context sections derived from the run's Location, TieOn and Depth
+INPUT_KEYS = ('location', 'tieon', 'depth')
+
+
+class RecalculationService:
+    """
+    Invalidates and refreshes results derived from a run's inputs.
+
+    Settings:
+        RECALCULATION_EAGER: Recompute stale calculations in the background (default True)
+        RECALCULATION_WORKERS: Background recalculation threads (default 1)
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Set = set()
+
+    def inputs_changed(self, run_id):
+        """
+        Invalidate the run's results once the current transaction commits.
+
+        Args:
+            run_id: Run whose Location, TieOn or Depth was saved or deleted
+        """
+        transaction.on_commit(lambda: self._invalidate_after_commit(run_id))
+
+    def _invalidate_after_commit(self, run_id):
+        try:
+            stale = self.invalidate_run(run_id)
+        except Exception as e:
+            logger.warning(f"Invalidating results of Run {run_id} failed: {e}")
+            return
+        if stale and getattr(settings, 'RECALCULATION_EAGER', True):
+            self.schedule(stale)
+
+    @span('recalculation.invalidate')
+    def invalidate_run(self, run_id) -> List:
+        """
+        Flag the run's calculations whose inputs changed, and their descendants.
+
+        Args:
+            run_id: Run UUID
+
+        Returns:
+            SurveyData ids whose calculation became stale
+        """
+        surveys = SurveyData.objects.filter(
+            survey_file__run_id=run_id,
+            calculated_survey__isnull=False,
+            calculated_survey__is_stale=False,
+        ).select_related(
+            'survey_file__run__location',
+            'survey_file__run__depth',
+            'survey_file__run__tieon',
+            'calculated_survey',
+        ).defer(
+            *SurveyData.ARRAY_FIELDS,
+            *(f'calculated_survey__{name}' for name in CalculatedSurvey.ARRAY_FIELDS),
+        )
+
+        stale = [survey_data.id for survey_data in surveys if self._inputs_differ(survey_data)]
+        if stale:
+            self.mark_stale(stale)
+        logger.info(f"Run {run_id} inputs changed: {len(stale)} calculations stale")
+        return stale
+
+    @staticmethod
+    def _inputs_differ(survey_data: SurveyData) -> bool:
+        """True if the run's current inputs differ from those the calculation used."""
+        stored = survey_data.calculated_survey.calculation_context or {}
+        try:
+            current = SurveyCalculationService._get_calculation_context(survey_data)
+        except InsufficientDataError:
+            # Tie-on removed: the stored result no longer has valid inputs
+            return True
+        return any(stored.get(key) != current[key] for key in INPUT_KEYS)
+
+    @staticmethod
+    def mark_stale(survey_data_ids: Iterable) -> Dict[str, int]:
+        """
+        Flag the calculations of the given surveys and every result derived from them.
+
+        Returns:
+            Rows flagged per model: calculations, interpolations, comparisons, extrapolations
+        """
+        ids = list(survey_data_ids)
+        with transaction.atomic():
+            counts = {
+                'calculations': CalculatedSurvey.objects.filter(
+                    survey_data_id__in=ids
+                ).update(is_stale=True),
+                'interpolations': InterpolatedSurvey.objects.filter(
+                    calculated_survey__survey_data_id__in=ids
+                ).update(is_stale=True),
+                'comparisons': ComparisonResult.objects.filter(
+                    Q(primary_survey_id__in=ids) | Q(reference_survey_id__in=ids)
+                ).update(is_stale=True),
+                'extrapolations': Extrapolation.objects.filter(
+                    survey_data_id__in=ids
+                ).update(is_stale=True),
+            }
+
+        for kind, count in counts.items():
+            if count:
+                metrics.inc('survey_api_stale_results_total', amount=count, labels={'kind': kind},
+                            help_text='Derived results flagged stale after run input changes')
+        return counts
+
+    def refresh_if_stale(self, survey_data_id) -> bool:
+        """
+        Recompute the survey's calculation (and its interpolations) if it is stale.
+
+        Concurrent readers of the same survey share one recomputation.
+
+        Returns:
+            True if a refresh ran
+        """
+        if not CalculatedSurvey.objects.filter(survey_data_id=survey_data_id, is_stale=True).exists():
+            return False
+
+        single_flight.run(
+            f'recalculate:{survey_data_id}',
+            lambda: self.refresh([survey_data_id])['calculated'],
+            operation='recalculation',
+        )
+        return True
+
+    @staticmethod
+    @span('recalculation.refresh')
+    def refresh(survey_data_ids: Iterable) -> Dict[str, int]:
+        """
+        Recompute the stale calculations among the given surveys, then their stale interpolations.
+
+        Surveys the compute pool could not run stay stale.
+
+        Returns:
+            Dictionary with calculated, failed, skipped and interpolated counts
+        """
+        ids = list(
+            CalculatedSurvey.objects.filter(
+                survey_data_id__in=list(survey_data_ids), is_stale=True
+            ).values_list('survey_data_id', flat=True)
+        )
+        totals = {'calculated': 0, 'failed': 0, 'skipped': 0, 'interpolated': 0}
+        if not ids:
+            return totals
+
+        chunk = getattr(settings, 'BATCH_CALCULATION_MAX_SURVEYS', 200)
+        for start in range(0, len(ids), chunk):
+            summary = BatchCalculationService.calculate_many(ids[start:start + chunk])
+            for key in ('calculated', 'failed', 'skipped'):
+                totals[key] += summary[key]
+
+        stale_interpolations = InterpolatedSurvey.objects.filter(
+            calculated_survey__survey_data_id__in=ids,
+            calculated_survey__is_stale=False,
+            calculated_survey__calculation_status='calculated',
+            is_stale=True,
+        ).values_list('calculated_survey_id', 'resolution')
+        for calculated_survey_id, resolution in stale_interpolations:
+            try:
+                InterpolationService.interpolate(str(calculated_survey_id), resolution)
+                totals['interpolated'] += 1
+            except Exception as e:
+                logger.warning(f"Re-interpolating CalculatedSurvey {calculated_survey_id} at {resolution}m failed: {e}")
+
+        metrics.inc('survey_api_recalculations_total', amount=totals['calculated'],
+                    help_text='Stale calculations recomputed after run input changes')
+        logger.info(
+            f"Refreshed {len(ids)} stale calculations: {totals['calculated']} calculated, "
+            f"{totals['failed']} failed, {totals['skipped']} skipped, {totals['interpolated']} interpolations"
+        )
+        return totals
+
+    def schedule(self, survey_data_ids: Iterable):
+        """Queue a background refresh of the surveys not already queued."""
+        with self._lock:
+            ids = [survey_id for survey_id in survey_data_ids if survey_id not in self._pending]
+            if not ids:
+                return
+            self._pending.update(ids)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'RECALCULATION_WORKERS', 1),
+                    thread_name_prefix='recalculation',
+                )
+        self._executor.submit(self._run_refresh, ids)
+
+    def _run_refresh(self, survey_data_ids: List):
+        close_old_connections()
+        try:
+            self.refresh(survey_data_ids)
+        except Exception as e:
+            logger.warning(f"Background recalculation of {len(survey_data_ids)} surveys failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.difference_update(survey_data_ids)
+            connection.close()
+
+
+# Process-wide service
+recalculation = RecalculationService()
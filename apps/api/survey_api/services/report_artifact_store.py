@@ -0,0 +1,343 @@
+"""
+Report Artifact Store - generated PDF reports cached on local disk.
+
+1. Artifacts are keyed by report type, report parameters and the
+   (id, updated_at) of every row the report reads, so any edit to an input
+   produces a new key and stale PDFs are never served
+2. Repeated downloads of an unchanged report are a file read (served with
+   Range support by survey_api.utils.ranged_file_response)
+3. Least-recently-used artifacts are evicted once REPORT_ARTIFACT_MAX_BYTES
+   is exceeded (reads refresh the file's mtime)
+4. Reports can be pre-generated in the compute pool when their inputs
+   change (e.g. calculation finished, QA approved); repeated changes to the
+   same report within REPORT_PREGENERATE_DELAY produce one rendering
+
+Usage:
+    artifact = report_artifacts.get_or_create(
+        'service_ticket',
+        ReportInputs.collect(run_ids=[run.pk]),
+        lambda: ServiceTicketReportService.generate_service_ticket(run),
+    )
+    return ranged_file_response(request, artifact.open(), filename, etag=artifact.etag)
+"""
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+
+from survey_api.exceptions import ComputeCapacityError, ComputeTimeoutError
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import metrics, span
+
+logger = logging.getLogger(__name__)
+
+# Bump when report layouts change so previously stored PDFs are not reused
+ARTIFACT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ReportArtifact:
+    """A stored report file."""
+    report_type: str
+    key: str
+    path: Path
+    size: int
+    # Stores the report again if the file was evicted before it was opened
+    regenerate: Optional[Callable[[], 'ReportArtifact']] = field(
+        default=None, compare=False, repr=False
+    )
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key}"'
+
+    def open(self) -> BinaryIO:
+        """
+        Open the stored file for reading.
+
+        The open handle stays readable when the file is evicted afterwards; a
+        file evicted between the lookup and this call is generated again.
+
+        Raises:
+            FileNotFoundError: If the file is gone and cannot be regenerated
+        """
+        try:
+            return open(self.path, 'rb')
+        except FileNotFoundError:
+            if self.regenerate is None:
+                raise
+            logger.info(f"Report artifact {self.report_type}/{self.key} was evicted before reading; regenerating")
+            return open(self.regenerate().path, 'rb')
+
+
+class ReportInputs:
+    """Collects the version stamps of the rows a report is built from."""
+
+    @staticmethod
+    def collect(run_ids: Iterable = (), job_ids: Iterable = (), activity_logs: bool = False) -> List[tuple]:
+        """
+        Return (model, id, updated_at) for every row reachable from the runs and jobs.
+
+        Covers the runs (and all runs of the given jobs), their jobs, wells,
+        customers, clients, rigs, services, users, locations, depths, tie-ons,
+        survey files, survey data, calculations, interpolations and QA checks. Only ids and
+        timestamps are fetched. Survey files have no updated_at, so their
+        created_at and processing_status are used.
+
+        Args:
+            run_ids: Run primary keys
+            job_ids: Job primary keys
+            activity_logs: Also cover the runs' activity logs (id, created_at)
+
+        Returns:
+            List of version tuples, ordered deterministically
+        """
+        from survey_api.models import (
+            CalculatedSurvey, Client, Customer, Depth, InterpolatedSurvey, Job, Location,
+            QualityCheck, Rig, Run, RunActivityLog, Service, SurveyData, SurveyFile, TieOn, User, Well,
+        )
+
+        run_ids, job_ids = set(filter(None, run_ids)), set(filter(None, job_ids))
+        versions = []
+
+        def add(model, queryset, *stamps):
+            rows = queryset.order_by('pk').values_list('pk', *(stamps or ('updated_at',)))
+            versions.extend((model.__name__, str(pk), *values) for pk, *values in rows)
+
+        runs = list(
+            Run.objects.filter(Q(id__in=run_ids) | Q(job_id__in=job_ids))
+            .values_list('id', 'job_id', 'well_id', 'user_id')
+        )
+        run_ids = {run[0] for run in runs}
+        job_ids |= {run[1] for run in runs if run[1]}
+        well_ids = {run[2] for run in runs if run[2]}
+        user_ids = {run[3] for run in runs if run[3]}
+
+        jobs = list(
+            Job.objects.filter(id__in=job_ids)
+            .values_list('well_id', 'customer_id', 'client_id', 'rig_id', 'service_id', 'created_by_id')
+        )
+        well_ids |= {job[0] for job in jobs if job[0]}
+        user_ids |= {job[5] for job in jobs if job[5]}
+
+        add(Run, Run.objects.filter(id__in=run_ids))
+        add(Job, Job.objects.filter(id__in=job_ids))
+        add(Well, Well.objects.filter(id__in=well_ids))
+        add(Customer, Customer.objects.filter(id__in={job[1] for job in jobs}))
+        add(Client, Client.objects.filter(id__in={job[2] for job in jobs}))
+        add(Rig, Rig.objects.filter(id__in={job[3] for job in jobs}))
+        add(Service, Service.objects.filter(id__in={job[4] for job in jobs}))
+        add(User, User.objects.filter(id__in=user_ids))
+        add(Location, Location.objects.filter(Q(run_id__in=run_ids) | Q(well_id__in=well_ids)))
+        add(Depth, Depth.objects.filter(Q(run_id__in=run_ids) | Q(well_id__in=well_ids)))
+        add(TieOn, TieOn.objects.filter(run_id__in=run_ids))
+        add(SurveyFile, SurveyFile.objects.filter(run_id__in=run_ids), 'created_at', 'processing_status')
+        add(SurveyData, SurveyData.objects.filter(survey_file__run_id__in=run_ids))
+        add(CalculatedSurvey, CalculatedSurvey.objects.filter(survey_data__survey_file__run_id__in=run_ids))
+        add(InterpolatedSurvey, InterpolatedSurvey.objects.filter(
+            calculated_survey__survey_data__survey_file__run_id__in=run_ids
+        ))
+        add(QualityCheck, QualityCheck.objects.filter(run_id__in=run_ids))
+        if activity_logs:
+            add(RunActivityLog, RunActivityLog.objects.filter(run_id__in=run_ids), 'created_at')
+        return versions
+
+
+class ReportArtifactStore:
+    """
+    Content-addressed PDF store on local disk.
+
+    Settings:
+        REPORT_ARTIFACT_DIR: Storage directory
+        REPORT_ARTIFACT_MAX_BYTES: Total size before LRU eviction (default 2 GiB)
+        REPORT_PREGENERATE: Generate reports in the background when inputs change
+        REPORT_PREGENERATE_DELAY: Seconds a report waits for further changes before it is generated
+    """
+
+    def __init__(self):
+        self._evict_lock = threading.Lock()
+        # (func, args) -> (due time, func, args) for reports waiting to be pre-generated
+        self._pending: Dict[Tuple, Tuple[float, Callable, tuple]] = {}
+        self._pending_changed = threading.Condition()
+        self._scheduler: Optional[threading.Thread] = None
+
+    @property
+    def root(self) -> Path:
+        return Path(getattr(settings, 'REPORT_ARTIFACT_DIR', Path(tempfile.gettempdir()) / 'report_artifacts'))
+
+    @property
+    def max_bytes(self) -> int:
+        return getattr(settings, 'REPORT_ARTIFACT_MAX_BYTES', 2 * 1024 ** 3)
+
+    @staticmethod
+    def key(report_type: str, versions: Iterable, params: Sequence = ()) -> str:
+        """Content key for a report built from ``versions`` with ``params``."""
+        digest = hashlib.sha256()
+        for part in (ARTIFACT_FORMAT_VERSION, report_type, *params, *versions):
+            if isinstance(part, tuple):
+                part = '|'.join(p.isoformat() if hasattr(p, 'isoformat') else str(p) for p in part)
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+
+    def _path(self, report_type: str, key: str) -> Path:
+        return self.root / report_type / f"{key}.pdf"
+
+    def get(self, report_type: str, key: str) -> Optional[ReportArtifact]:
+        """Return the stored artifact, refreshing its LRU position, or None."""
+        path = self._path(report_type, key)
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        return ReportArtifact(report_type, key, path, size)
+
+    def put(self, report_type: str, key: str, content: bytes) -> ReportArtifact:
+        """Store ``content`` atomically and evict old artifacts if over the size limit."""
+        path = self._path(report_type, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+        return ReportArtifact(report_type, key, path, len(content))
+
+    def get_or_create(self, report_type: str, versions: Iterable, generate: Callable,
+                      params: Sequence = ()) -> ReportArtifact:
+        """
+        Return the stored report for these inputs, generating it on a miss.
+
+        Read it with ReportArtifact.open(), not through its path: the file can
+        be evicted by another request at any time.
+
+        Args:
+            report_type: Report name, also the storage sub-directory
+            versions: Input version stamps (see ReportInputs.collect)
+            generate: Callable returning the PDF as bytes or a BytesIO
+            params: Extra parameters that change the output (e.g. resolution)
+
+        Returns:
+            ReportArtifact
+        """
+        key = self.key(report_type, versions, params)
+        regenerate = functools.partial(self._generate, report_type, key, generate)
+        artifact = self.get(report_type, key)
+        self._record_lookup(report_type, artifact is not None)
+        if artifact is None:
+            artifact = regenerate()
+        return replace(artifact, regenerate=regenerate)
+
+    def _generate(self, report_type: str, key: str, generate: Callable) -> ReportArtifact:
+        with span(f'report.generate.{report_type}'):
+            content = generate()
+        if hasattr(content, 'getvalue'):
+            content = content.getvalue()
+        return self.put(report_type, key, content)
+
+    @staticmethod
+    def _record_lookup(report_type: str, hit: bool):
+        metrics.inc(
+            'survey_api_report_artifact_requests_total',
+            labels={'report': report_type, 'result': 'hit' if hit else 'miss'},
+            help_text='Report artifact store lookups by report type and result'
+        )
+
+    def evict(self):
+        """Delete least-recently-used artifacts until the store fits REPORT_ARTIFACT_MAX_BYTES."""
+        if not self._evict_lock.acquire(blocking=False):
+            return  # Another thread is already evicting
+        try:
+            files = []
+            for path in self.root.glob('*/*.pdf'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.debug(f"Evicted report artifact {path.name}")
+        finally:
+            self._evict_lock.release()
+
+    def pregenerate(self, func: Callable, *args):
+        """
+        Run ``func(*args)`` (typically an artifact getter) in the compute pool
+        once the current transaction commits and REPORT_PREGENERATE_DELAY
+        seconds pass without another request for the same call. No-op when
+        REPORT_PREGENERATE is off.
+
+        ``func`` must be picklable (a module-level function or staticmethod)
+        and ``args`` plain ids.
+        """
+        if not getattr(settings, 'REPORT_PREGENERATE', True):
+            return
+        transaction.on_commit(lambda: self._schedule(func, args))
+
+    def _schedule(self, func: Callable, args: tuple):
+        delay = getattr(settings, 'REPORT_PREGENERATE_DELAY', 30)
+        key = (getattr(func, '__module__', None), getattr(func, '__qualname__', repr(func)), args)
+        with self._pending_changed:
+            # A further change to the same report restarts its wait
+            self._pending[key] = (time.monotonic() + delay, func, args)
+            if self._scheduler is None or not self._scheduler.is_alive():
+                self._scheduler = threading.Thread(
+                    target=self._pregeneration_loop, name='report-pregen', daemon=True
+                )
+                self._scheduler.start()
+            self._pending_changed.notify()
+
+    def _pregeneration_loop(self):
+        """Generate due reports one at a time, so pre-generation holds at most one pool slot."""
+        while True:
+            with self._pending_changed:
+                now = time.monotonic()
+                due = [key for key, (at, _, _) in self._pending.items() if at <= now]
+                if not due:
+                    next_at = min((at for at, _, _ in self._pending.values()), default=None)
+                    self._pending_changed.wait(None if next_at is None else next_at - now)
+                    continue
+                ready = [self._pending.pop(key) for key in due]
+            for _, func, args in ready:
+                try:
+                    compute_pool.run(self._run_pregeneration, func, *args)
+                except (ComputeCapacityError, ComputeTimeoutError) as e:
+                    # The report is generated on its first download instead
+                    logger.warning(f"Report pre-generation skipped for {getattr(func, '__name__', func)}{args}: {e}")
+
+    @staticmethod
+    def _run_pregeneration(func: Callable, *args):
+        close_old_connections()
+        try:
+            func(*args)
+        except Exception as e:
+            logger.warning(f"Report pre-generation failed for {getattr(func, '__name__', func)}{args}: {e}")
+        finally:
+            connection.close()
+
+
+# Process-wide store
+report_artifacts = ReportArtifactStore()
@@ -0,0 +1,117 @@
+"""
+Report Asset Registry - templates, images and fonts loaded once per worker.
+
+1. PDF templates are parsed once; reports copy the shared pages into their
+   own writer (pypdf clones pages on ``add_page``), so the parsed template is
+   never modified and per-report parse cost is gone
+2. Images are decoded once into ReportLab ImageReaders
+3. TrueType fonts are parsed and registered with ReportLab once
+4. Each asset is reloaded when its file's mtime changes
+
+Usage:
+    template = report_assets.pdf_template(path)
+    template.append_to(writer)
+
+    canvas_obj.drawImage(report_assets.image(logo_path), x, y, width, height)
+    canvas_obj.setFont(report_assets.font('OpenSans', font_path), 10)
+"""
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+logger = logging.getLogger(__name__)
+
+
+class PdfTemplate:
+    """A parsed PDF template whose pages are shared between reports."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reader = PdfReader(path)
+        # Page objects resolve lazily from the reader's stream; serialise access
+        self._lock = threading.Lock()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.reader.pages)
+
+    def append_to(self, writer: PdfWriter):
+        """Copy the template pages into ``writer`` (the shared pages are not modified)."""
+        with self._lock:
+            for page in self.reader.pages:
+                writer.add_page(page)
+
+
+@dataclass
+class _Asset:
+    value: Any
+    mtime_ns: int
+
+
+class ReportAssetRegistry:
+    """Process-wide cache of report assets keyed by kind and file path."""
+
+    def __init__(self):
+        self._assets: Dict[Tuple[str, str], _Asset] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind: str, path, loader: Callable[[str], Any]) -> Any:
+        """
+        Return the loaded asset, (re)loading it when missing or its mtime changed.
+
+        Raises:
+            FileNotFoundError: The asset file does not exist
+        """
+        path = os.fspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        key = (kind, path)
+
+        asset = self._assets.get(key)
+        if asset is not None and asset.mtime_ns == mtime_ns:
+            return asset.value
+
+        with self._lock:
+            asset = self._assets.get(key)
+            if asset is None or asset.mtime_ns != mtime_ns:
+                logger.info(f"Loading report {kind} {path}")
+                asset = _Asset(loader(path), mtime_ns)
+                self._assets[key] = asset
+        return asset.value
+
+    def pdf_template(self, path) -> PdfTemplate:
+        """Parsed PDF template."""
+        return self._get('template', path, PdfTemplate)
+
+    def image(self, path) -> ImageReader:
+        """Decoded image for ``drawImage`` / platypus ``Image``."""
+        return self._get('image', path, ImageReader)
+
+    def font(self, name: str, path) -> str:
+        """
+        Register a TrueType font with ReportLab and return its name.
+
+        Args:
+            name: Font name used with setFont / ParagraphStyle(fontName=...)
+            path: Path of the .ttf file
+        """
+        def load(font_path):
+            pdfmetrics.registerFont(TTFont(name, font_path))
+            return name
+
+        return self._get(f'font:{name}', path, load)
+
+    def clear(self):
+        """Drop all cached assets (used by tests)."""
+        with self._lock:
+            self._assets.clear()
+
+
+# Process-wide registry
+report_assets = ReportAssetRegistry()
@@ -0,0 +1,268 @@
+"""
+Report Bundle Service - the whole deliverable pack for a job as one ZIP.
+
+1. The job's reports are planned up front: job prejob and SOE, plus per run
+   the service ticket, customer satisfaction and prejob reports, a
+   calculation report per calculated survey and a QC report per approved QA
+2. Parts are built across the compute pool, at most one per worker at a
+   time so a bundle leaves the pool's queue to other requests; each worker
+   stores its PDF in the report artifact store and returns only the path
+3. A part evicted from the store before the ZIP reads it is built again
+4. The ZIP is streamed as parts finish; progress is kept in the cache under
+   the bundle id for the status endpoint
+
+Usage:
+    bundle = ReportBundleService.plan(job)
+    response = StreamingHttpResponse(ReportBundleService.stream(bundle), content_type='application/zip')
+"""
+import logging
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+import zipfile
+
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'report_bundle:{}'
+
+
+@dataclass
+class BundlePart:
+    """One report in a bundle: where it goes in the ZIP and how to build it."""
+    arcname: str
+    kind: str
+    object_id: str
+
+
+@dataclass
+class ReportBundle:
+    """Planned bundle for a job."""
+    bundle_id: str
+    job_id: str
+    filename: str
+    parts: List[BundlePart] = field(default_factory=list)
+
+
+class _ZipStream:
+    """Write-only file object collecting ZIP output between yields."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+class ReportBundleService:
+    """Service for building job-level report bundles."""
+
+    @staticmethod
+    def plan(job, bundle_id: Optional[str] = None) -> ReportBundle:
+        """
+        List the reports that make up a job's deliverable pack.
+
+        Args:
+            job: Job model instance
+            bundle_id: Optional client-supplied id used for progress polling
+
+        Returns:
+            ReportBundle
+        """
+        from survey_api.models import QualityCheck, Run, SurveyData
+
+        bundle = ReportBundle(
+            bundle_id=bundle_id or str(uuid.uuid4()),
+            job_id=str(job.pk),
+            filename=f"Job_{job.job_number}_Reports.zip",
+        )
+        bundle.parts.append(BundlePart(f"Prejob_Report_{job.job_number}.pdf", 'prejob', str(job.pk)))
+        bundle.parts.append(BundlePart(f"SOE_Report_{job.job_number}.pdf", 'soe', str(job.pk)))
+
+        runs = Run.objects.filter(job=job).order_by('created_at').values_list('id', 'run_number')
+        for run_id, run_number in runs:
+            folder = f"Run_{run_number}"
+            bundle.parts.extend([
+                BundlePart(f"{folder}/Service_Ticket_{run_number}.pdf", 'service_ticket', str(run_id)),
+                BundlePart(f"{folder}/Customer_Satisfaction_Report_{run_number}.pdf", 'customer_satisfaction', str(run_id)),
+                BundlePart(f"{folder}/Prejob_Report_{run_number}.pdf", 'prejob_run', str(run_id)),
+            ])
+
+            calculated = SurveyData.objects.filter(
+                survey_file__run_id=run_id,
+                calculated_survey__calculation_status='calculated',
+            ).values_list('id', 'survey_file__file_name')
+            for survey_data_id, file_name in calculated:
+                stem = file_name.rsplit('.', 1)[0]
+                bundle.parts.append(BundlePart(
+                    f"{folder}/survey_calculation_report_{stem}.pdf", 'survey_calculation', str(survey_data_id)
+                ))
+
+            approved = QualityCheck.objects.filter(run_id=run_id, status='approved').values_list('id', 'file_name')
+            for qa_id, file_name in approved:
+                stem = file_name.replace('.xlsx', '').replace('.csv', '')
+                bundle.parts.append(BundlePart(f"{folder}/QC_Report_{stem}.pdf", 'qc', str(qa_id)))
+
+        return bundle
+
+    @staticmethod
+    def stream(bundle: ReportBundle) -> Iterator[bytes]:
+        """
+        Build the bundle's parts in the compute pool and yield the ZIP as they finish.
+
+        Parts that fail are listed in MANIFEST.txt instead of aborting the bundle.
+        """
+        ReportBundleService._save_progress(bundle, status='running', completed=0, failed=[])
+        output = _ZipStream()
+        failed: List[Tuple[str, str]] = []
+        completed = 0
+
+        try:
+            with span('report.bundle'):
+                # PDFs are already compressed; store them as-is
+                with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as archive:
+                    results = compute_pool.imap_unordered(
+                        ReportBundleService._build_part,
+                        [(part.kind, part.object_id) for part in bundle.parts],
+                        timeout=getattr(settings, 'REPORT_BUNDLE_TIMEOUT', 900),
+                        max_inflight=compute_pool.max_workers,
+                    )
+                    for index, (path, error) in results:
+                        part = bundle.parts[index]
+                        handle = None
+                        if not error:
+                            handle, error = ReportBundleService._open_part(part, path)
+                        if error:
+                            failed.append((part.arcname, error))
+                        else:
+                            with handle, archive.open(part.arcname, 'w') as entry:
+                                shutil.copyfileobj(handle, entry)
+                        completed += 1
+                        ReportBundleService._save_progress(
+                            bundle, status='running', completed=completed, failed=[name for name, _ in failed]
+                        )
+                        yield output.drain()
+
+                    archive.writestr('MANIFEST.txt', ReportBundleService._manifest(bundle, failed))
+                yield output.drain()
+        except Exception as e:
+            logger.error(f"Report bundle {bundle.bundle_id} for job {bundle.job_id} failed: {e}")
+            ReportBundleService._save_progress(
+                bundle, status='failed', completed=completed, failed=[name for name, _ in failed], error=str(e)
+            )
+            raise
+
+        ReportBundleService._save_progress(
+            bundle, status='completed', completed=completed, failed=[name for name, _ in failed]
+        )
+
+    @staticmethod
+    def get_progress(bundle_id: str) -> Optional[Dict]:
+        """Progress of a bundle, or None if unknown or expired."""
+        return cache.get(PROGRESS_KEY.format(bundle_id))
+
+    @staticmethod
+    def _save_progress(bundle: ReportBundle, status: str, completed: int, failed: List[str], error: str = None):
+        progress = {
+            'bundle_id': bundle.bundle_id,
+            'job_id': bundle.job_id,
+            'status': status,
+            'total': len(bundle.parts),
+            'completed': completed,
+            'failed': failed,
+            'updated_at': datetime.now().isoformat(),
+        }
+        if error:
+            progress['error'] = error
+        try:
+            cache.set(PROGRESS_KEY.format(bundle.bundle_id), progress, getattr(settings, 'REPORT_BUNDLE_PROGRESS_TTL', 3600))
+        except Exception as e:
+            logger.warning(f"Could not store report bundle progress: {e}")
+
+    @staticmethod
+    def _manifest(bundle: ReportBundle, failed: List[Tuple[str, str]]) -> str:
+        lines = [f"Job {bundle.job_id} report bundle", f"Generated: {datetime.now().isoformat()}", '']
+        failed_names = {name for name, _ in failed}
+        lines += [f"OK      {part.arcname}" for part in bundle.parts if part.arcname not in failed_names]
+        lines += [f"FAILED  {name}: {error}" for name, error in failed]
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _open_part(part: BundlePart, path: str) -> Tuple[Optional[BinaryIO], Optional[str]]:
+        """
+        Open a built part, building it again if it was evicted from the store.
+
+        Returns:
+            (open file, None) on success, (None, error message) on failure
+        """
+        try:
+            return open(path, 'rb'), None
+        except FileNotFoundError:
+            logger.info(f"Bundle part {part.kind} {part.object_id} was evicted before it was read; rebuilding")
+        path, error = ReportBundleService._build_part(part.kind, part.object_id)
+        if error:
+            return None, error
+        try:
+            return open(path, 'rb'), None
+        except FileNotFoundError as e:
+            return None, str(e)
+
+    @staticmethod
+    def _build_part(kind: str, object_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Build (or fetch from the artifact store) one report (compute pool worker).
+
+        Returns:
+            (artifact path, None) on success, (None, error message) on failure
+        """
+        from survey_api.models import Job, Run
+        from survey_api.services.customer_satisfaction_report_service import CustomerSatisfactionReportService
+        from survey_api.services.prejob_report_service import PrejobReportService
+        from survey_api.services.qc_report_service import QCReportService
+        from survey_api.services.service_ticket_report_service import ServiceTicketReportService
+        from survey_api.services.soe_report_service import SOEReportService
+        from survey_api.services.survey_calculation_report_service import get_survey_calculation_report_artifact
+
+        close_old_connections()
+        try:
+            if kind == 'prejob':
+                artifact = PrejobReportService.get_report_artifact(Job.objects.get(pk=object_id))
+            elif kind == 'soe':
+                artifact = SOEReportService.get_report_artifact(Job.objects.get(pk=object_id))
+            elif kind == 'service_ticket':
+                artifact = ServiceTicketReportService.get_report_artifact(Run.objects.get(pk=object_id))
+            elif kind == 'customer_satisfaction':
+                artifact = CustomerSatisfactionReportService.get_report_artifact(Run.objects.get(pk=object_id))
+            elif kind == 'prejob_run':
+                run = Run.objects.select_related('job').get(pk=object_id)
+                if run.job is None:
+                    return None, 'No job associated with this run'
+                artifact = PrejobReportService.get_report_artifact(run.job, run)
+            elif kind == 'survey_calculation':
+                artifact = get_survey_calculation_report_artifact(object_id)
+            elif kind == 'qc':
+                artifact = QCReportService.get_report_artifact(object_id)
+            else:
+                return None, f"Unknown report type {kind}"
+            return str(artifact.path), None
+        except Exception as e:
+            logger.error(f"Bundle part {kind} {object_id} failed: {e}")
+            return None, str(e)
+        finally:
+            close_old_connections()
@@ -12,9 +12,11 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from PyPDF2 import PdfReader, PdfWriter
+from pypdf import PdfReader, PdfWriter
 import logging
 
+from survey_api.services.report_assets import report_assets
+
 logger = logging.getLogger(__name__)
 
 
@@ -220,12 +222,10 @@ class SurveyReportGenerator:
         try:
             output = PdfWriter()
 
-            # Add template page(s) if exists
-            if os.path.exists(self.template_path):
-                template_pdf = PdfReader(self.template_path)
-                for page in template_pdf.pages:
-                    output.add_page(page)
-            else:
+            # Add template page(s) if exists (parsed once per worker)
+            try:
+                report_assets.pdf_template(self.template_path).append_to(output)
+            except FileNotFoundError:
                 logger.warning(f"Template not found at {self.template_path}")
 
             # Add calculated data pages
@@ -0,0 +1,244 @@
+"""
+Report Table Renderer - fast fixed-layout survey data tables for PDF reports.
+
+The survey data pages of the calculation and interpolated reports have a fixed
+layout (red header bar, grey two-line column header, 35 alternating rows), so
+they are drawn straight onto a ReportLab canvas instead of flowing through
+platypus Tables:
+1. Columns are formatted to '%.2f' text with NumPy in one pass per column
+2. Page geometry, colours and fonts are computed once at import
+3. Large reports are split into page ranges rendered in parallel in the
+   compute pool; the per-range PDFs are concatenated with pypdf
+
+Usage:
+    rows = ReportTableRenderer.build_rows(md, inc, azi, tvd, vs, ns, ew, dls)
+    parts = ReportTableRenderer.render(rows, ('Gyroscopic Survey Report', date, run_name))
+    pdf = merge_pdfs([cover_pdf, *parts, plots_pdf])
+"""
+import logging
+from io import BytesIO
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
+
+logger = logging.getLogger(__name__)
+
+COLUMN_HEADERS = (
+    ('MD', '(m)'), ('Inclination', '(degs)'), ('Azimuth', '(degs)'), ('TVD', '(m)'),
+    ('V.S.', '(m)'), ('+N/S', '(m)'), ('+E/-W', '(m)'), ('DLS', '(/30)'),
+)
+ROWS_PER_PAGE = 35
+# Pages per worker task; reports up to this size render inline
+PAGES_PER_CHUNK = 25
+
+# ===== Page geometry (points) =====
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 0.25 * inch
+TABLE_WIDTH = 7.77 * inch  # A4 width minus 0.25" margins
+COLUMN_WIDTH = TABLE_WIDTH / len(COLUMN_HEADERS)
+HEADER_BAR_HEIGHT = 0.45 * inch
+HEADER_BAR_COLUMNS = (4.52 * inch, 1.625 * inch, 1.625 * inch)
+HEADER_GAP = 0.1 * inch
+COLUMN_HEADER_HEIGHT = 25.2  # two 8pt lines + padding
+ROW_HEIGHT = 14.4  # one 7pt line + padding
+
+COLUMN_CENTRES = tuple(MARGIN + COLUMN_WIDTH * (i + 0.5) for i in range(len(COLUMN_HEADERS)))
+GRID_X = tuple(MARGIN + COLUMN_WIDTH * i for i in range(len(COLUMN_HEADERS) + 1))
+TABLE_TOP = PAGE_HEIGHT - MARGIN - HEADER_BAR_HEIGHT - HEADER_GAP
+FIRST_ROW_TOP = TABLE_TOP - COLUMN_HEADER_HEIGHT
+
+BRAND_RED = colors.HexColor('#c23c3e')
+HEADER_GREY = colors.HexColor('#808080')
+ALTERNATE_ROW = colors.HexColor('#F0F0F0')
+
+
+def format_column(values, length: int, missing: str = '', invalid: str = '') -> np.ndarray:
+    """
+    Format a numeric column as '%.2f' strings.
+
+    Args:
+        values: Sequence of numbers (may contain None or non-numeric entries)
+        length: Number of table rows; the column is truncated or padded to it
+        missing: Text for rows beyond the end of ``values``
+        invalid: Text for None/non-numeric entries
+
+    Returns:
+        Object array of ``length`` strings
+    """
+    column = np.full(length, missing, dtype=object)
+    if values is None or len(values) == 0 or length == 0:
+        return column
+
+    values = list(values[:length])
+    try:
+        numbers = np.asarray(values, dtype=float)  # None -> NaN
+        bad = np.isnan(numbers) & np.array([v is None for v in values])
+    except (TypeError, ValueError):
+        numbers = np.array([_to_float(v) for v in values])
+        bad = np.isnan(numbers) & np.array([not _is_nan(v) for v in values])
+
+    text = np.char.mod('%.2f', numbers).astype(object)
+    text[bad] = invalid
+    column[:len(values)] = text
+    return column
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _is_nan(value) -> bool:
+    """True for genuine float NaN values (formatted as 'nan', not as invalid)."""
+    return isinstance(value, float) and value != value
+
+
+def merge_pdfs(parts: Sequence[bytes]) -> bytes:
+    """Concatenate PDF documents in order."""
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(BytesIO(part)))
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def pdf_page_count(pdf: bytes) -> int:
+    """Number of pages in a PDF document."""
+    return len(PdfReader(BytesIO(pdf)).pages)
+
+
+class ReportTableRenderer:
+    """Draws survey data tables directly onto the canvas, in parallel for large reports."""
+
+    @staticmethod
+    def build_rows(md, inc, azi, tvd, vs, ns, ew, dls) -> np.ndarray:
+        """
+        Format survey columns into table rows.
+
+        Row count follows ``md``. V.S. is blank when no vertical section was
+        calculated and '0.00' for invalid entries; DLS shows 'None' when missing.
+
+        Returns:
+            (n, 8) object array of cell strings
+        """
+        length = len(md) if md is not None else 0
+        columns = [
+            format_column(md, length),
+            format_column(inc, length),
+            format_column(azi, length),
+            format_column(tvd, length),
+            format_column(vs, length, missing='', invalid='0.00'),
+            format_column(ns, length),
+            format_column(ew, length),
+            format_column([None if v == 'None' else v for v in (dls or [])], length, missing='None', invalid='None'),
+        ]
+        if length == 0:
+            return np.empty((0, len(COLUMN_HEADERS)), dtype=object)
+        return np.column_stack(columns)
+
+    @staticmethod
+    def page_count(row_count: int) -> int:
+        """Number of data pages needed for ``row_count`` rows."""
+        return (row_count + ROWS_PER_PAGE - 1) // ROWS_PER_PAGE
+
+    @staticmethod
+    @span('report.data_tables')
+    def render(rows: np.ndarray, header: Tuple[str, str, str], first_page_number: int = 1,
+               total_pages: Optional[int] = None, footer: Optional[Callable] = None) -> List[bytes]:
+        """
+        Render the data pages, one PDF per page range.
+
+        Args:
+            rows: Output of build_rows
+            header: (title, date, run name) shown in the header bar
+            first_page_number: Report page number of the first data page
+            total_pages: Report page count passed to ``footer``
+            footer: Optional picklable callable ``(canvas, doc, page_num, total_pages)``;
+                ``doc`` is always None
+
+        Returns:
+            List of PDF documents to concatenate in order (empty for no rows)
+        """
+        pages = ReportTableRenderer.page_count(len(rows))
+        rows_per_chunk = ROWS_PER_PAGE * PAGES_PER_CHUNK
+        tasks = [
+            (rows[start:start + rows_per_chunk].tolist(), header,
+             first_page_number + start // ROWS_PER_PAGE, total_pages, footer)
+            for start in range(0, len(rows), rows_per_chunk)
+        ]
+        if len(tasks) <= 1:
+            return [ReportTableRenderer._render_pages(*task) for task in tasks]
+
+        logger.debug(f"Rendering {pages} data pages in {len(tasks)} parallel chunks")
+        return compute_pool.run_many(ReportTableRenderer._render_pages, tasks)
+
+    @staticmethod
+    def _render_pages(rows: List[List[str]], header: Tuple[str, str, str], first_page_number: int,
+                      total_pages: Optional[int], footer: Optional[Callable]) -> bytes:
+        """Draw a contiguous range of data pages to a standalone PDF (compute pool worker)."""
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=A4)
+        for offset, start in enumerate(range(0, len(rows), ROWS_PER_PAGE)):
+            ReportTableRenderer._draw_page(pdf, rows[start:start + ROWS_PER_PAGE], header)
+            if footer is not None:
+                footer(pdf, None, first_page_number + offset, total_pages)
+            pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+    @staticmethod
+    def _draw_page(pdf: canvas.Canvas, rows: List[List[str]], header: Tuple[str, str, str]):
+        """Draw the header bar and one page of the data table."""
+        title, date, run_name = header
+
+        # Header bar: title on the left, date and run name centred in their cells
+        bar_bottom = PAGE_HEIGHT - MARGIN - HEADER_BAR_HEIGHT
+        pdf.setFillColor(BRAND_RED)
+        pdf.rect(MARGIN, bar_bottom, TABLE_WIDTH, HEADER_BAR_HEIGHT, stroke=0, fill=1)
+        pdf.setFillColor(colors.white)
+        pdf.setFont('Helvetica-Bold', 16)
+        pdf.drawString(MARGIN + 20, bar_bottom + (HEADER_BAR_HEIGHT - 11.5) / 2, title)
+        pdf.setFont('Helvetica', 14)
+        x = MARGIN + HEADER_BAR_COLUMNS[0]
+        for text, width in zip((date, run_name), HEADER_BAR_COLUMNS[1:]):
+            pdf.drawCentredString(x + width / 2, bar_bottom + (HEADER_BAR_HEIGHT - 10) / 2, str(text))
+            x += width
+
+        # Column header row
+        pdf.setFillColor(HEADER_GREY)
+        pdf.rect(MARGIN, FIRST_ROW_TOP, TABLE_WIDTH, COLUMN_HEADER_HEIGHT, stroke=0, fill=1)
+        pdf.setFillColor(colors.white)
+        pdf.setFont('Helvetica-Bold', 8)
+        for centre, (label, unit) in zip(COLUMN_CENTRES, COLUMN_HEADERS):
+            pdf.drawCentredString(centre, FIRST_ROW_TOP + 14.2, label)
+            pdf.drawCentredString(centre, FIRST_ROW_TOP + 4.6, unit)
+
+        # Alternating row backgrounds (white rows need no fill)
+        pdf.setFillColor(ALTERNATE_ROW)
+        for index in range(1, len(rows), 2):
+            pdf.rect(MARGIN, FIRST_ROW_TOP - ROW_HEIGHT * (index + 1), TABLE_WIDTH, ROW_HEIGHT, stroke=0, fill=1)
+
+        # Cell text
+        pdf.setFillColor(colors.black)
+        pdf.setFont('Helvetica', 7)
+        for index, row in enumerate(rows):
+            baseline = FIRST_ROW_TOP - ROW_HEIGHT * (index + 1) + 4.7
+            for centre, cell in zip(COLUMN_CENTRES, row):
+                pdf.drawCentredString(centre, baseline, cell)
+
+        # Grid
+        pdf.setStrokeColor(colors.grey)
+        pdf.setLineWidth(0.5)
+        grid_y = [TABLE_TOP] + [FIRST_ROW_TOP - ROW_HEIGHT * i for i in range(len(rows) + 1)]
+        pdf.grid(GRID_X, grid_y)
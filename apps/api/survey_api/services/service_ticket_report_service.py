@@ -13,12 +13,15 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.pdfgen import canvas
 
 from survey_api.models import Run
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportArtifact, ReportInputs, report_artifacts
 
 
 class ServiceTicketReportService:
     """Service for generating Service Ticket PDF reports."""
 
     @staticmethod
+    @span('report.service_ticket')
     def generate_service_ticket(run: Run) -> io.BytesIO:
         """
         Generate a service ticket PDF for a given run.
@@ -79,6 +82,24 @@ class ServiceTicketReportService:
             print(f"Error generating service ticket: {str(e)}")
             raise
 
+    @staticmethod
+    def get_report_artifact(run: Run) -> ReportArtifact:
+        """
+        Return the stored Service Ticket for the run's current inputs, generating it if needed.
+
+        Args:
+            run: Run model instance
+
+        Returns:
+            ReportArtifact
+        """
+        return report_artifacts.get_or_create(
+            'service_ticket',
+            ReportInputs.collect(run_ids=[run.pk]),
+            lambda: ServiceTicketReportService.generate_service_ticket(run),
+            params=(str(run.pk),)
+        )
+
     @staticmethod
     def _add_header_footer(canvas_obj: canvas.Canvas, doc, run: Run):
         """Add header and footer to each page."""
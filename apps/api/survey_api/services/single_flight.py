@@ -0,0 +1,226 @@
+"""
+Single-flight coalescing for expensive, deterministic computations.
+
+Identical concurrent requests (same calculation, interpolation, comparison
+or duplicate-survey inputs) are collapsed into one computation:
+
+1. Within a web worker, threads asking for a key that is already being
+   computed wait on the running call and share its outcome
+2. Across workers, the first caller takes a lock in the shared cache
+   (``cache.add`` - an atomic SET NX on Redis) and computes; the others poll
+   until the leader publishes its outcome, then read it from the cache
+3. Outcomes (results and exceptions) live under the leader's flight token
+   for SINGLE_FLIGHT_RESULT_TTL seconds and are only read by callers that
+   joined that flight, so a later request always recomputes
+4. Everything fails open: an unavailable cache, a leader that dies (its lock
+   expires after SINGLE_FLIGHT_LOCK_TTL) or a wait longer than
+   SINGLE_FLIGHT_WAIT_TIMEOUT means the caller computes on its own
+
+Keys must identify the inputs completely - include the ``updated_at`` stamps
+of the rows read (see survey_api.utils.etags). Shared values cross process
+boundaries through the cache, so they must be picklable, and threads of one
+worker receive the same object, so callers must not mutate it. Computations
+that create rows should return the primary key and let each caller load it.
+
+Usage:
+    result = single_flight.run(
+        f'interpolation-preview:{etag}',
+        lambda: InterpolationService.preview_interpolation(pk, resolution),
+        operation='interpolation_preview',
+    )
+"""
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from survey_api.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'single-flight'
+
+# Follower polling backs off from the first to the last interval (seconds)
+POLL_INITIAL = 0.02
+POLL_MAX = 0.5
+
+_OK = 'ok'
+_ERROR = 'error'
+
+
+class _Flight:
+    """A computation in progress in this process."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.outcome: Optional[Tuple[str, Any]] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def run(self, key: str, compute: Callable[[], Any], operation: str = 'default') -> Any:
+        """
+        Return ``compute()``, sharing one computation between concurrent callers.
+
+        Args:
+            key: Identifies the computation inputs
+            compute: Zero-argument callable producing the (picklable) result
+            operation: Label for metrics and logs
+
+        Returns:
+            The result of this caller's or the leader's ``compute()``
+
+        Raises:
+            Whatever ``compute()`` raised, for the leader and its followers
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(self._wait_timeout()) and flight.outcome is not None:
+                self._record(operation, 'shared')
+                return self._unwrap(flight.outcome)
+            self._record(operation, 'fallback')
+            return compute()
+
+        try:
+            flight.outcome = self._run_shared(key, compute, operation)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return self._unwrap(flight.outcome)
+
+    # ------------------------------------------------------------------
+    # Cross-process coordination
+    # ------------------------------------------------------------------
+
+    def _run_shared(self, key: str, compute: Callable[[], Any], operation: str) -> Tuple[str, Any]:
+        """Lead or join the cache-coordinated flight for ``key`` and return its outcome."""
+        lock_key = f'{KEY_PREFIX}:{key}:lock'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self._wait_timeout()
+
+        while True:
+            try:
+                acquired = cache.add(lock_key, token, self._lock_ttl())
+            except Exception as e:
+                logger.warning(f"Single-flight lock unavailable for {operation}: {e}")
+                self._record(operation, 'fallback')
+                return self._call(compute)
+
+            if acquired:
+                self._record(operation, 'leader')
+                outcome = self._call(compute)
+                self._publish(key, token, lock_key, outcome)
+                return outcome
+
+            outcome = self._await(key, lock_key, deadline)
+            if outcome is not None:
+                self._record(operation, 'shared')
+                return outcome
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for concurrent {operation}; computing independently")
+                self._record(operation, 'fallback')
+                return self._call(compute)
+            # The leader went away without publishing: try to take over
+
+    def _await(self, key: str, lock_key: str, deadline: float) -> Optional[Tuple[str, Any]]:
+        """
+        Poll until the current leader publishes or releases its lock.
+
+        Returns:
+            The leader's outcome, or None if the lock was released without one
+            (or the deadline passed)
+        """
+        delay = POLL_INITIAL
+        leader_token = None
+        while time.monotonic() < deadline:
+            try:
+                current = cache.get(lock_key)
+                if leader_token is None:
+                    leader_token = current
+                if leader_token is not None:
+                    outcome = cache.get(self._result_key(key, leader_token))
+                    if outcome is not None:
+                        return outcome
+                if current is None or current != leader_token:
+                    return None
+            except Exception as e:
+                logger.warning(f"Single-flight cache unavailable while waiting: {e}")
+                return None
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_MAX)
+        return None
+
+    def _publish(self, key: str, token: str, lock_key: str, outcome: Tuple[str, Any]):
+        """Store the outcome for this flight's followers, then release the lock."""
+        try:
+            cache.set(self._result_key(key, token), outcome, self._result_ttl())
+        except Exception as e:
+            # Unpicklable result or cache down: followers retry on their own
+            logger.warning(f"Could not share single-flight result for {key}: {e}")
+        try:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Could not release single-flight lock {lock_key}: {e}")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _call(compute: Callable[[], Any]) -> Tuple[str, Any]:
+        try:
+            return _OK, compute()
+        except Exception as e:
+            return _ERROR, e
+
+    @staticmethod
+    def _unwrap(outcome: Tuple[str, Any]) -> Any:
+        kind, value = outcome
+        if kind == _ERROR:
+            raise value
+        return value
+
+    @staticmethod
+    def _result_key(key: str, token: str) -> str:
+        return f'{KEY_PREFIX}:{key}:result:{token}'
+
+    @staticmethod
+    def _record(operation: str, role: str):
+        metrics.inc(
+            'survey_api_single_flight_total',
+            labels={'operation': operation, 'role': role},
+            help_text='Coalesced computations by operation and caller role (leader, shared, fallback)'
+        )
+
+    @staticmethod
+    def _lock_ttl() -> int:
+        return getattr(settings, 'SINGLE_FLIGHT_LOCK_TTL', 300)
+
+    @staticmethod
+    def _wait_timeout() -> float:
+        return getattr(settings, 'SINGLE_FLIGHT_WAIT_TIMEOUT', 150)
+
+    @staticmethod
+    def _result_ttl() -> int:
+        return getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', 30)
+
+
+# Global instance (one per web worker process)
+single_flight = SingleFlight()
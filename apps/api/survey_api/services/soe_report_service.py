@@ -19,6 +19,8 @@ from reportlab.platypus import (
 from reportlab.pdfgen import canvas
 
 from survey_api.models import Job
+from survey_api.services.metrics_service import span
+from survey_api.services.report_artifact_store import ReportArtifact, ReportInputs, report_artifacts
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,7 @@ class SOEReportService:
     WHITE = colors.white
 
     @staticmethod
+    @span('report.soe')
     def generate_soe_report(job_id: str) -> io.BytesIO:
         """
         Generate SOE report PDF for a given job.
@@ -97,6 +100,24 @@ class SOEReportService:
             logger.error(f"Error generating SOE report: {str(e)}")
             raise
 
+    @staticmethod
+    def get_report_artifact(job: Job) -> ReportArtifact:
+        """
+        Return the stored SOE Report for the job's current inputs, generating it if needed.
+
+        Args:
+            job: Job model instance
+
+        Returns:
+            ReportArtifact
+        """
+        return report_artifacts.get_or_create(
+            'soe',
+            ReportInputs.collect(job_ids=[job.pk], activity_logs=True),
+            lambda: SOEReportService.generate_soe_report(str(job.id)),
+            params=(str(job.pk),)
+        )
+
     @staticmethod
     def _add_header_footer(canvas_obj: canvas.Canvas, doc, job: Job):
         """Add header and footer to each page."""
@@ -0,0 +1,482 @@
+"""
+Spatial Index Service - field-wide proximity queries between well trajectories.
+
+Calculated surveys are placed in a common grid frame - map grid easting and
+northing (SurveyCalculationService.geographic_columns) and elevation
+(reference elevation minus TVD) - and indexed per projection frame (UTM zone,
+hemisphere and ellipsoid):
+
+1. Each survey contributes its trajectory as straight segments between
+   stations, split so no indexed segment is longer than
+   SPATIAL_INDEX_SEGMENT_LENGTH
+2. A KD-tree over segment midpoints prunes the candidates of every query
+   station; exact point-to-segment distances are then computed for all
+   stations and candidates in one vectorized pass
+3. The index is held per process and synchronised on each query against the
+   calculation and location versions: only surveys recalculated, added or
+   removed since the last query are (re)loaded, and only the trees of the
+   frames they belong to are rebuilt
+
+Surveys of the queried run (and of its well) are not reported as offsets.
+
+Usage:
+    spatial_index.nearest_offsets(survey_data_id, md_from=1000, md_to=2000)
+    spatial_index.within_distance(survey_data_id, distance=50)
+"""
+import itertools
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from survey_api.exceptions import InsufficientDataError, ValidationError
+from survey_api.models import CalculatedSurvey, SurveyData
+from survey_api.services.metrics_service import metrics, span
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+from survey_api.utils.lazy_imports import lazy_import
+from survey_api.utils.transverse_mercator import ellipsoid_for
+
+spatial = lazy_import('scipy.spatial')
+
+logger = logging.getLogger(__name__)
+
+_RUN = 'survey_data__survey_file__run'
+
+# Surveys loaded per query while synchronising
+LOAD_CHUNK = 100
+
+
+@dataclass(frozen=True)
+class _Trajectory:
+    """One survey's stations in the grid frame."""
+    version: str
+    frame: Optional[Tuple]
+    run_id: Any
+    run_number: str
+    well_id: Any
+    md: np.ndarray
+    points: np.ndarray
+
+
+@dataclass(frozen=True)
+class _Frame:
+    """Segments of every survey in one projection frame, with their KD-tree."""
+    survey_ids: List
+    run_ids: List
+    well_ids: List
+    owner: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    md_start: np.ndarray
+    md_end: np.ndarray
+    reach: float
+    tree: Any
+
+
+class SpatialIndexService:
+    """
+    Nearest-offset and within-distance queries over all calculated surveys.
+
+    Settings:
+        SPATIAL_INDEX_SEGMENT_LENGTH: Longest indexed segment in metres (default 30)
+        SPATIAL_INDEX_SEARCH_RADIUS: Default nearest-offset search radius in metres (default 500)
+        SPATIAL_INDEX_MAX_RADIUS: Largest accepted query distance in metres (default 5000)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trajectories: Dict[Any, _Trajectory] = {}
+        self._frames: Dict[Tuple, _Frame] = {}
+        self._dirty: set = set()
+
+    def nearest_offsets(self, survey_data_id, md_from: Optional[float] = None, md_to: Optional[float] = None,
+                        radius: Optional[float] = None) -> Dict:
+        """
+        Nearest offset wellbore of every station of a survey.
+
+        Args:
+            survey_data_id: SurveyData UUID of the reference survey
+            md_from: Optional first MD of the stations to query
+            md_to: Optional last MD of the stations to query
+            radius: Search radius in metres (SPATIAL_INDEX_SEARCH_RADIUS when omitted)
+
+        Returns:
+            Dictionary with md and parallel lists offset_survey_data_id,
+            distance and offset_md (None where no offset lies within the
+            radius), radius, and offsets (survey_data_id, run_id, run_number
+            and well_id of every offset referenced)
+
+        Raises:
+            InsufficientDataError: If the survey has no calculated trajectory with a location
+            ValidationError: If the radius is not positive or exceeds SPATIAL_INDEX_MAX_RADIUS
+        """
+        radius = self._radius(radius if radius is not None else
+                              getattr(settings, 'SPATIAL_INDEX_SEARCH_RADIUS', 500.0), 'radius')
+        with span('spatial_index.nearest'):
+            trajectory, frame, md, points = self._query_stations(survey_data_id, md_from, md_to)
+            station, owner, distance, offset_md = self._closest(frame, trajectory, points, radius)
+
+            count = len(md)
+            nearest_owner = np.full(count, -1)
+            nearest_distance = np.full(count, np.nan)
+            nearest_md = np.full(count, np.nan)
+            if len(station):
+                order = np.lexsort((distance, station))
+                first = order[np.r_[True, station[order][1:] != station[order][:-1]]]
+                nearest_owner[station[first]] = owner[first]
+                nearest_distance[station[first]] = distance[first]
+                nearest_md[station[first]] = offset_md[first]
+
+        survey_ids = [None if index < 0 else frame.survey_ids[index] for index in nearest_owner.tolist()]
+        return {
+            'survey_data_id': str(survey_data_id),
+            'radius': radius,
+            'md': md.tolist(),
+            'offset_survey_data_id': [None if value is None else str(value) for value in survey_ids],
+            'distance': self._nullable(nearest_distance),
+            'offset_md': self._nullable(nearest_md),
+            'offsets': self._describe(sorted({value for value in survey_ids if value is not None}, key=str)),
+        }
+
+    def within_distance(self, survey_data_id, distance: float, md_from: Optional[float] = None,
+                        md_to: Optional[float] = None) -> Dict:
+        """
+        Offset wellbores passing within a distance of a survey's stations.
+
+        Args:
+            survey_data_id: SurveyData UUID of the reference survey
+            distance: Distance in metres
+            md_from: Optional first MD of the stations to query
+            md_to: Optional last MD of the stations to query
+
+        Returns:
+            Dictionary with distance, stations (queried station count) and
+            offsets, closest first; each offset has survey_data_id, run_id,
+            run_number, well_id, min_distance, md and offset_md at the closest
+            approach, stations (reference stations within the distance) and
+            md_from/md_to of those stations
+
+        Raises:
+            InsufficientDataError: If the survey has no calculated trajectory with a location
+            ValidationError: If the distance is not positive or exceeds SPATIAL_INDEX_MAX_RADIUS
+        """
+        distance = self._radius(distance, 'distance')
+        with span('spatial_index.within'):
+            trajectory, frame, md, points = self._query_stations(survey_data_id, md_from, md_to)
+            station, owner, separation, offset_md = self._closest(frame, trajectory, points, distance)
+
+            offsets = []
+            for index in np.unique(owner).tolist():
+                selected = owner == index
+                closest = np.argmin(np.where(selected, separation, np.inf))
+                stations = np.unique(station[selected])
+                offsets.append({
+                    'survey_data_id': frame.survey_ids[index],
+                    'min_distance': float(separation[closest]),
+                    'md': float(md[station[closest]]),
+                    'offset_md': float(offset_md[closest]),
+                    'stations': int(len(stations)),
+                    'md_from': float(md[stations[0]]),
+                    'md_to': float(md[stations[-1]]),
+                })
+
+        offsets.sort(key=lambda offset: offset['min_distance'])
+        described = self._describe([offset['survey_data_id'] for offset in offsets])
+        return {
+            'survey_data_id': str(survey_data_id),
+            'distance': distance,
+            'stations': len(md),
+            'offsets': [{**offset, **entry} for offset, entry in zip(offsets, described)],
+        }
+
+    def offset_trajectories(self, survey_data_id) -> Tuple[_Trajectory, List[Tuple[Any, _Trajectory]]]:
+        """
+        A survey's trajectory and those of every other wellbore in its projection frame.
+
+        Returns:
+            Tuple of (trajectory, [(survey_data_id, trajectory), ...]) in the grid frame
+
+        Raises:
+            InsufficientDataError: If the survey has no calculated trajectory with a location
+        """
+        trajectory = self._trajectory(survey_data_id)
+        with self._lock:
+            members = list(self._trajectories.items())
+        return trajectory, [
+            (survey_id, other) for survey_id, other in members
+            if other.frame == trajectory.frame and not self._same_wellbore(trajectory, other)
+        ]
+
+    def _trajectory(self, survey_data_id) -> _Trajectory:
+        self.sync()
+        trajectory = self._trajectories.get(uuid.UUID(str(survey_data_id)))
+        if trajectory is None or trajectory.frame is None:
+            raise InsufficientDataError(
+                f"SurveyData {survey_data_id} has no calculated trajectory with a location"
+            )
+        return trajectory
+
+    @staticmethod
+    def _same_wellbore(trajectory: _Trajectory, other: _Trajectory) -> bool:
+        return other.run_id == trajectory.run_id or (
+            trajectory.well_id is not None and other.well_id == trajectory.well_id
+        )
+
+    def _query_stations(self, survey_data_id, md_from, md_to):
+        """The survey's trajectory, its frame and the stations within the MD range."""
+        trajectory = self._trajectory(survey_data_id)
+        frame = self._frame(trajectory.frame)
+
+        selected = ~np.isnan(trajectory.points).any(axis=1)
+        if md_from is not None:
+            selected &= trajectory.md >= md_from
+        if md_to is not None:
+            selected &= trajectory.md <= md_to
+        return trajectory, frame, trajectory.md[selected], trajectory.points[selected]
+
+    @staticmethod
+    def _closest(frame: _Frame, trajectory: _Trajectory, points: np.ndarray, radius: float):
+        """
+        Closest point on each offset survey within ``radius`` of every query station.
+
+        Returns:
+            Parallel arrays (station index, owner index, distance, offset MD),
+            one entry per (station, offset survey) pair
+        """
+        empty = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0), np.empty(0))
+        if not len(points) or frame.tree is None:
+            return empty
+
+        # Midpoints within radius + half the longest segment cover every segment within radius
+        candidates = frame.tree.query_ball_point(points, radius + frame.reach)
+        counts = np.fromiter((len(c) for c in candidates), dtype=np.intp, count=len(candidates))
+        station = np.repeat(np.arange(len(points)), counts)
+        segment = np.fromiter(itertools.chain.from_iterable(candidates), dtype=np.intp, count=int(counts.sum()))
+
+        # Segments of the queried wellbore (same run or well) are not offsets
+        excluded = np.array([
+            run_id == trajectory.run_id or (trajectory.well_id is not None and well_id == trajectory.well_id)
+            for run_id, well_id in zip(frame.run_ids, frame.well_ids)
+        ], dtype=bool)
+        offset = ~excluded[frame.owner[segment]]
+        station, segment = station[offset], segment[offset]
+
+        start = frame.start[segment]
+        direction = frame.end[segment] - start
+        relative = points[station] - start
+        length_sq = np.einsum('ij,ij->i', direction, direction)
+        t = np.clip(np.einsum('ij,ij->i', relative, direction) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0)
+        distance = np.linalg.norm(relative - t[:, None] * direction, axis=1)
+
+        within = distance <= radius
+        if not within.any():
+            return empty
+        station, segment, distance, t = station[within], segment[within], distance[within], t[within]
+        owner = frame.owner[segment]
+        offset_md = frame.md_start[segment] + t * (frame.md_end[segment] - frame.md_start[segment])
+
+        # Keep the closest segment per (station, offset survey)
+        order = np.lexsort((distance, owner, station))
+        station, owner = station[order], owner[order]
+        first = np.r_[True, (station[1:] != station[:-1]) | (owner[1:] != owner[:-1])]
+        return station[first], owner[first], distance[order][first], offset_md[order][first]
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the calculated surveys in the database.
+
+        Surveys whose calculation or location changed since they were indexed
+        are reloaded; surveys no longer calculated are dropped. Frames with
+        changes are rebuilt on their next query.
+
+        Returns:
+            Dictionary with loaded and removed counts
+        """
+        rows = CalculatedSurvey.objects.filter(
+            calculation_status='calculated', is_stale=False
+        ).values_list(
+            'id', 'survey_data_id', 'updated_at',
+            f'{_RUN}__location__updated_at',
+            f'{_RUN}__well__location__updated_at',
+            f'{_RUN}__job__well__location__updated_at',
+        )
+        current = {
+            survey_data_id: (calculated_id, ':'.join(stamp.isoformat() if stamp else '-' for stamp in stamps))
+            for calculated_id, survey_data_id, *stamps in rows
+        }
+
+        with self._lock:
+            removed = [survey_id for survey_id in self._trajectories if survey_id not in current]
+            changed = [
+                (calculated_id, version) for survey_id, (calculated_id, version) in current.items()
+                if survey_id not in self._trajectories or self._trajectories[survey_id].version != version
+            ]
+            for survey_id in removed:
+                self._dirty.add(self._trajectories.pop(survey_id).frame)
+
+        loaded = []
+        for start in range(0, len(changed), LOAD_CHUNK):
+            loaded.extend(self._load(dict(changed[start:start + LOAD_CHUNK])))
+
+        if loaded:
+            with self._lock:
+                for survey_id, trajectory in loaded:
+                    previous = self._trajectories.get(survey_id)
+                    if previous is not None:
+                        self._dirty.add(previous.frame)
+                    self._trajectories[survey_id] = trajectory
+                    self._dirty.add(trajectory.frame)
+            metrics.inc('survey_api_spatial_index_loads_total', amount=len(loaded),
+                        help_text='Survey trajectories (re)loaded into the spatial index')
+        if loaded or removed:
+            logger.info(f"Spatial index synced: {len(loaded)} loaded, {len(removed)} removed")
+        return {'loaded': len(loaded), 'removed': len(removed)}
+
+    @staticmethod
+    def _load(versions: Dict) -> List[Tuple[Any, _Trajectory]]:
+        """Grid-frame stations of the given CalculatedSurvey ids ({id: version})."""
+        calculated_surveys = CalculatedSurvey.objects.filter(id__in=list(versions)).select_related(
+            f'{_RUN}__location', f'{_RUN}__well__location', f'{_RUN}__job__well__location',
+        ).defer(
+            *(name for name in CalculatedSurvey.ARRAY_FIELDS if name not in ('northing', 'easting', 'tvd')),
+            *(f'survey_data__{name}' for name in SurveyData.ARRAY_FIELDS if name != 'md_data'),
+        )
+
+        loaded = []
+        for calculated_survey in calculated_surveys:
+            run = calculated_survey.survey_data.survey_file.run
+            md = calculated_survey.survey_data.column_array('md_data')
+            derived = None
+            try:
+                derived = SurveyCalculationService.geographic_columns(calculated_survey)
+            except Exception as e:
+                logger.warning(f"Geographic coordinates of CalculatedSurvey {calculated_survey.id} failed: {e}")
+
+            if derived is None:
+                # Kept (without a frame) so it is not retried until it changes
+                frame_key, points = None, np.empty((0, 3))
+            else:
+                columns, frame = derived
+                frame_key = (frame['zone'], frame['south'], ellipsoid_for(frame['datum']).name)
+                depth = (calculated_survey.calculation_context or {}).get('depth') or {}
+                elevation = float(depth.get('reference_elevation') or 0.0) - calculated_survey.column_array('tvd')
+                count = min(len(md), columns.shape[1], len(elevation))
+                md = md[:count]
+                points = np.column_stack([columns[0][:count], columns[1][:count], elevation[:count]])
+
+            loaded.append((calculated_survey.survey_data_id, _Trajectory(
+                version=versions[calculated_survey.id],
+                frame=frame_key,
+                run_id=run.id,
+                run_number=run.run_number,
+                well_id=run.well_id,
+                md=np.asarray(md, dtype=float),
+                points=points,
+            )))
+        return loaded
+
+    def _frame(self, key: Tuple) -> _Frame:
+        """The frame's segments and tree, rebuilt if any of its surveys changed."""
+        with self._lock:
+            if key in self._dirty or key not in self._frames:
+                members = [(survey_id, trajectory) for survey_id, trajectory in self._trajectories.items()
+                           if trajectory.frame == key]
+                self._frames[key] = self._build_frame(members)
+                self._dirty.discard(key)
+            return self._frames[key]
+
+    @staticmethod
+    @span('spatial_index.build')
+    def _build_frame(members: List[Tuple[Any, _Trajectory]]) -> _Frame:
+        max_length = float(getattr(settings, 'SPATIAL_INDEX_SEGMENT_LENGTH', 30.0))
+        parts = [SpatialIndexService.segments(trajectory, max_length) for _, trajectory in members]
+        sizes = [len(part[0]) for part in parts]
+
+        start = np.concatenate([part[0] for part in parts]) if parts else np.empty((0, 3))
+        end = np.concatenate([part[1] for part in parts]) if parts else np.empty((0, 3))
+        md_start = np.concatenate([part[2] for part in parts]) if parts else np.empty(0)
+        md_end = np.concatenate([part[3] for part in parts]) if parts else np.empty(0)
+        owner = np.repeat(np.arange(len(members)), sizes)
+
+        tree, reach = None, 0.0
+        if len(start):
+            reach = float(np.linalg.norm(end - start, axis=1).max()) / 2
+            tree = spatial.cKDTree((start + end) / 2)
+        return _Frame(
+            survey_ids=[survey_id for survey_id, _ in members],
+            run_ids=[trajectory.run_id for _, trajectory in members],
+            well_ids=[trajectory.well_id for _, trajectory in members],
+            owner=owner, start=start, end=end, md_start=md_start, md_end=md_end,
+            reach=reach, tree=tree,
+        )
+
+    @staticmethod
+    def segments(trajectory: _Trajectory, max_length: float):
+        """
+        Straight segments between consecutive stations, split to at most ``max_length``.
+
+        Returns:
+            Tuple of (start points, end points, start MD, end MD)
+        """
+        valid = ~np.isnan(trajectory.points).any(axis=1) & ~np.isnan(trajectory.md)
+        points, md = trajectory.points[valid], trajectory.md[valid]
+        if len(points) == 1:
+            # A single station is indexed as a zero-length segment
+            return points, points, md, md
+        if len(points) < 2:
+            return np.empty((0, 3)), np.empty((0, 3)), np.empty(0), np.empty(0)
+
+        direction = points[1:] - points[:-1]
+        md_step = md[1:] - md[:-1]
+        pieces = np.maximum(1, np.ceil(np.linalg.norm(direction, axis=1) / max_length)).astype(np.intp)
+        source = np.repeat(np.arange(len(direction)), pieces)
+        piece = np.arange(int(pieces.sum())) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        t0 = piece / pieces[source]
+        t1 = (piece + 1) / pieces[source]
+
+        base = points[:-1][source]
+        return (
+            base + t0[:, None] * direction[source],
+            base + t1[:, None] * direction[source],
+            md[:-1][source] + t0 * md_step[source],
+            md[:-1][source] + t1 * md_step[source],
+        )
+
+    def _describe(self, survey_ids: List) -> List[Dict]:
+        """Run and well of indexed surveys."""
+        described = []
+        for survey_id in survey_ids:
+            trajectory = self._trajectories.get(survey_id)
+            described.append({
+                'survey_data_id': str(survey_id),
+                'run_id': str(trajectory.run_id) if trajectory else None,
+                'run_number': trajectory.run_number if trajectory else None,
+                'well_id': str(trajectory.well_id) if trajectory and trajectory.well_id else None,
+            })
+        return described
+
+    @staticmethod
+    def _radius(value, field: str) -> float:
+        maximum = float(getattr(settings, 'SPATIAL_INDEX_MAX_RADIUS', 5000.0))
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError(f"{field} must be a number", field_errors={field: ['A valid number is required.']})
+        if not 0 < value <= maximum:
+            raise ValidationError(
+                f"{field} must be greater than 0 and at most {maximum:g} m",
+                field_errors={field: [f'Must be between 0 and {maximum:g}.']}
+            )
+        return value
+
+    @staticmethod
+    def _nullable(values: np.ndarray) -> List[Optional[float]]:
+        return [None if np.isnan(value) else value for value in values.tolist()]
+
+
+# Process-wide index
+spatial_index = SpatialIndexService()
@@ -13,15 +13,24 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.pdfgen import canvas
 import logging
 from reportlab.platypus import KeepTogether
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
+from survey_api.services.metrics_service import span
+from survey_api.services.plot_service import PlotService
+from survey_api.services.report_artifact_store import ReportInputs, report_artifacts
+from survey_api.services.report_table_renderer import ReportTableRenderer, merge_pdfs, pdf_page_count
 
 logger = logging.getLogger(__name__)
 
+DATA_PAGE_TITLE = 'Gyroscopic Survey Report'
+
+# A4 with increased bottom margin for the fixed footer at 0.9" from bottom
+REPORT_MARGINS = {
+    'rightMargin': 0.25*inch,
+    'leftMargin': 0.25*inch,
+    'topMargin': 0.25*inch,
+    'bottomMargin': 1.15*inch,
+}
+
 
 class SurveyCalculationReportService:
     """Service for generating Survey Calculation Reports matching TASK template."""
@@ -70,21 +79,6 @@ class SurveyCalculationReportService:
         Returns:
             BytesIO: PDF file as bytes
         """
-        buffer = BytesIO()
-
-        # Create the PDF with A4 size and increased bottom margin for fixed footer
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.25*inch,
-            leftMargin=0.25*inch,
-            topMargin=0.25*inch,
-            bottomMargin=1.15*inch  # Increased to accommodate fixed footer at 0.9" from bottom  
-        )
-
-        # Container for all flowable objects
-        elements = []
-
         # Get related data
         survey_file = survey_data.survey_file
         run = survey_file.run
@@ -93,38 +87,98 @@ class SurveyCalculationReportService:
         location = well.location if hasattr(well, 'location') else None
 
         # Page 1: Cover Page with all details
-        elements.extend(SurveyCalculationReportService._create_cover_page(
+        cover_elements = SurveyCalculationReportService._create_cover_page(
             survey_data, calculated_survey, run, well, job, location
-        ))
-
-        # Add page break before data pages
-        elements.append(PageBreak())
-
-        # Pages 2+: Gyroscopic Survey Report Data Tables
-        elements.extend(SurveyCalculationReportService._create_data_pages(
-            survey_data, calculated_survey, run
-        ))
-
-        # Calculate total pages for footer
-        # 1 cover page + data pages + 1 plots page
-        rows_per_page = 35
-        md_data = survey_data.md_data if hasattr(survey_data, 'md_data') else []
-        data_pages_count = ((len(md_data) - 1) // rows_per_page + 1) if len(md_data) > 0 else 0
-        total_pages = 1 + data_pages_count + 1
-
-        # Build the PDF with footer callback
-        doc.build(
-            elements,
-            onFirstPage=lambda c, d: SurveyCalculationReportService._draw_footer(c, d, 1, total_pages),
-            onLaterPages=lambda c, d: SurveyCalculationReportService._draw_footer(c, d, c.getPageNumber(), total_pages)
         )
 
-        # Get the PDF content
+        # Pages 2+: data tables, last page: trajectory plots; fixed footer on every page
+        return SurveyCalculationReportService._assemble_report(
+            cover_elements, survey_data, calculated_survey, run, survey_file,
+            margins=REPORT_MARGINS, footer=SurveyCalculationReportService._draw_footer
+        )
+
+    @staticmethod
+    def _assemble_report(cover_elements, survey_data, calculated_survey, run, survey_file, margins, footer=None,
+                         plot_data=None):
+        """
+        Build cover, data table and plots sections separately and concatenate them.
+
+        Args:
+            cover_elements: Platypus flowables for the cover page(s)
+            survey_data: Object with md_data/inc_data/azi_data
+            calculated_survey: Object with tvd/vertical_section/northing/easting/dls
+            run: Run model instance (run name for the page headers)
+            survey_file: SurveyFile model instance (survey date for the page headers)
+            margins: SimpleDocTemplate margin keyword arguments for the cover and plots pages
+            footer: Optional ``(canvas, doc, page_num, total_pages)`` callable drawn on every page
+            plot_data: Optional (survey_data, calculated_survey) for the trajectory plots;
+                defaults to the table data
+
+        Returns:
+            bytes: Complete PDF
+        """
+        survey_date = SurveyCalculationReportService._survey_date(survey_file)
+        run_name = run.run_name or 'RNS-40'
+
+        rows = ReportTableRenderer.build_rows(
+            survey_data.md_data if hasattr(survey_data, 'md_data') else [],
+            survey_data.inc_data if hasattr(survey_data, 'inc_data') else [],
+            survey_data.azi_data if hasattr(survey_data, 'azi_data') else [],
+            calculated_survey.tvd if hasattr(calculated_survey, 'tvd') else [],
+            calculated_survey.vertical_section if hasattr(calculated_survey, 'vertical_section') and calculated_survey.vertical_section else [],
+            calculated_survey.northing if hasattr(calculated_survey, 'northing') else [],
+            calculated_survey.easting if hasattr(calculated_survey, 'easting') else [],
+            calculated_survey.dls if hasattr(calculated_survey, 'dls') and calculated_survey.dls else [],
+        )
+        data_pages_count = ReportTableRenderer.page_count(len(rows))
+
+        # 1 cover page + data pages + 1 plots page (cover rarely overflows; re-counted below)
+        cover_pdf = SurveyCalculationReportService._build_section(
+            cover_elements, margins, footer, first_page_number=1, total_pages=1 + data_pages_count + 1
+        )
+        cover_pages = pdf_page_count(cover_pdf)
+        total_pages = cover_pages + data_pages_count + 1
+
+        table_pdfs = ReportTableRenderer.render(
+            rows, (DATA_PAGE_TITLE, survey_date, run_name),
+            first_page_number=cover_pages + 1, total_pages=total_pages, footer=footer
+        )
+
+        plot_survey_data, plot_calculated_survey = plot_data or (survey_data, calculated_survey)
+        plots_pdf = SurveyCalculationReportService._build_section(
+            SurveyCalculationReportService._create_plots_page(
+                plot_survey_data, plot_calculated_survey, survey_date, run_name
+            ),
+            margins, footer, first_page_number=total_pages, total_pages=total_pages
+        )
+
+        return merge_pdfs([cover_pdf, *table_pdfs, plots_pdf])
+
+    @staticmethod
+    def _build_section(elements, margins, footer, first_page_number, total_pages) -> bytes:
+        """Build flowables into a standalone A4 PDF, numbering footers from ``first_page_number``."""
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, **margins)
+
+        if footer is None:
+            doc.build(elements)
+        else:
+            def draw_footer(canvas_obj, doc):
+                footer(canvas_obj, doc, first_page_number + canvas_obj.getPageNumber() - 1, total_pages)
+
+            doc.build(elements, onFirstPage=draw_footer, onLaterPages=draw_footer)
+
         pdf = buffer.getvalue()
         buffer.close()
         return pdf
 
     @staticmethod
+    def _survey_date(survey_file):
+        """Survey date for page headers, taken from the file upload date."""
+        if survey_file is not None and getattr(survey_file, 'created_at', None):
+            return survey_file.created_at.strftime('%d-%b-%Y')
+        return datetime.now().strftime('%d-%b-%Y')
+    @staticmethod
     def _create_cover_page(survey_data, calculated_survey, run, well, job, location, is_interpolated=False, resolution=None):
         """Create the first page with all job and survey details."""
         elements = []
@@ -632,53 +686,12 @@ class SurveyCalculationReportService:
                 logger.warning("Insufficient data for trajectory plots")
                 return elements
 
-            # Create figure with 3 subplots (2 rows: 3D on top, 2D graphs below)
-            # Using GridSpec to give 3D graph more space (60% top, 40% bottom)
-            fig = plt.figure(figsize=(10, 7.5))
-            gs = GridSpec(2, 2, figure=fig, height_ratios=[1.8, 1])
-
-            # 3D Trajectory Plot (top row - larger size, spanning both columns)
-            ax1 = fig.add_subplot(gs[0, :], projection='3d')
-            ax1.plot(ew_data, ns_data, tvd_data, 'b-', linewidth=2)
-            ax1.set_xlabel('Easting (m)', fontsize=10)
-            ax1.set_ylabel('Northing (m)', fontsize=10)
-            ax1.set_zlabel('TVD (m)', fontsize=10)
-            ax1.set_title('3D Trajectory View', fontsize=12, fontweight='bold')
-            ax1.invert_zaxis()  # Invert Z-axis for depth
-            ax1.grid(True, alpha=0.3)
-            ax1.tick_params(labelsize=9)
-
-            # 2D Plan View (bottom left)
-            ax2 = fig.add_subplot(gs[1, 0])
-            ax2.plot(ew_data, ns_data, 'r-', linewidth=2)
-            ax2.set_xlabel('Easting (m)', fontsize=9)
-            ax2.set_ylabel('Northing (m)', fontsize=9)
-            ax2.set_title('2D Plan View', fontsize=10, fontweight='bold')
-            ax2.grid(True, alpha=0.3)
-            ax2.axis('equal')
-            ax2.tick_params(labelsize=8)
-
-            # 2D Vertical Section View (bottom right)
-            ax3 = fig.add_subplot(gs[1, 1])
-            if vs_data and len(vs_data) > 0:
-                ax3.plot(vs_data, tvd_data, 'g-', linewidth=2)
-                ax3.set_xlabel('Vertical Section (m)', fontsize=9)
-            else:
-                # If vertical section not available, use MD
-                ax3.plot(md_data, tvd_data, 'g-', linewidth=2)
-                ax3.set_xlabel('Measured Depth (m)', fontsize=9)
-            ax3.set_ylabel('TVD (m)', fontsize=9)
-            ax3.set_title('2D Vertical Section', fontsize=10, fontweight='bold')
-            ax3.invert_yaxis()  # Invert Y-axis for depth
-            ax3.grid(True, alpha=0.3)
-            ax3.tick_params(labelsize=8)
-
-            # Save plot to buffer
-            plt.tight_layout()
-            img_buffer = BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-            plt.close()
-            img_buffer.seek(0)
+            # Cached per calculation so every report of this survey reuses the image
+            source = None
+            if getattr(calculated_survey, 'pk', None) and getattr(calculated_survey, 'updated_at', None):
+                source = (calculated_survey.pk, calculated_survey.updated_at)
+            png_bytes = PlotService.trajectory_png(md_data, tvd_data, ns_data, ew_data, vs_data, source=source)
+            img_buffer = BytesIO(png_bytes)
 
             # Add plot image to PDF
             img = Image(img_buffer, width=7*inch, height=5.25*inch)
@@ -690,141 +703,10 @@ class SurveyCalculationReportService:
         return elements
 
     @staticmethod
-    def _create_data_pages(survey_data, calculated_survey, run):
-        """Create data pages with survey calculation table."""
+    def _create_plots_page(survey_data, calculated_survey, survey_date, run_name):
+        """Create the last page: report header bar and trajectory plots."""
         elements = []
 
-        # Get survey date from file upload date
-        survey_file = survey_data.survey_file
-        survey_date = survey_file.created_at.strftime('%d-%b-%Y') if hasattr(survey_file, 'created_at') and survey_file.created_at else datetime.now().strftime('%d-%b-%Y')
-        run_name = run.run_name or 'RNS-40'
-        
-
-        # Get survey data - MD, INC, AZI from survey_data; calculated values from calculated_survey
-        md_data = survey_data.md_data if hasattr(survey_data, 'md_data') else []
-        inc_data = survey_data.inc_data if hasattr(survey_data, 'inc_data') else []
-        azi_data = survey_data.azi_data if hasattr(survey_data, 'azi_data') else []
-        tvd_data = calculated_survey.tvd if hasattr(calculated_survey, 'tvd') else []
-        vs_data = calculated_survey.vertical_section if hasattr(calculated_survey, 'vertical_section') and calculated_survey.vertical_section else []
-        ns_data = calculated_survey.northing if hasattr(calculated_survey, 'northing') else []
-        ew_data = calculated_survey.easting if hasattr(calculated_survey, 'easting') else []
-        dls_data = calculated_survey.dls if hasattr(calculated_survey, 'dls') and calculated_survey.dls else []
-
-        # Prepare table data
-        table_data = [
-            ['MD\n(m)', 'Inclination\n(degs)', 'Azimuth\n(degs)', 'TVD\n(m)', 'V.S.\n(m)', '+N/S\n(m)', '+E/-W\n(m)', 'DLS\n(/30)']
-        ]
-
-        # Add data rows
-        for i in range(len(md_data)):
-            # Handle vertical section - might be None or empty
-            vs_val = ""
-            if vs_data and i < len(vs_data):
-                try:
-                    vs_val = f"{float(vs_data[i]):.2f}"
-                except (TypeError, ValueError):
-                    vs_val = "0.00"
-
-            # Handle DLS - might be None or empty
-            dls_val = "None"
-            if dls_data and i < len(dls_data):
-                try:
-                    if dls_data[i] is not None and dls_data[i] != 'None':
-                        dls_val = f"{float(dls_data[i]):.2f}"
-                except (TypeError, ValueError):
-                    dls_val = "None"
-
-            row = [
-                f"{float(md_data[i]):.2f}" if i < len(md_data) else "",
-                f"{float(inc_data[i]):.2f}" if i < len(inc_data) else "",
-                f"{float(azi_data[i]):.2f}" if i < len(azi_data) else "",
-                f"{float(tvd_data[i]):.2f}" if i < len(tvd_data) else "",
-                vs_val,
-                f"{float(ns_data[i]):.2f}" if i < len(ns_data) else "",
-                f"{float(ew_data[i]):.2f}" if i < len(ew_data) else "",
-                dls_val
-            ]
-            table_data.append(row)
-
-        # Create table with alternating row colors
-        # A4 width = 8.27 inches, with 0.25" margins on each side = 7.77" available
-        # Match header width exactly (7.77 inches total) with equal column distribution
-        col_widths = [0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch]
-        # Total = 7.77 inches (8 columns × 0.97125)
-
-        # Split table into pages (approximately 35 rows per page to fit with header/footer)
-        rows_per_page = 35
-        total_rows = len(table_data) - 1  # Exclude header
-
-        for page_start in range(0, total_rows, rows_per_page):
-            if page_start > 0:
-                elements.append(PageBreak())
-
-            # Add header for each page
-            # Page header with date and run name
-            header_style = ParagraphStyle(
-                'DataPageHeader',
-                fontName='Helvetica-Bold',
-                fontSize=16,
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                leftIndent=10,
-                spaceAfter=10
-            )
-
-            header_data = [[Paragraph('Gyroscopic Survey Report', header_style), survey_date, run_name]]
-            header_table = Table(header_data, colWidths=[4.52*inch, 1.625*inch, 1.625*inch])
-            header_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#c23c3e')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (0, 0), 16),
-                ('FONTSIZE', (1, 0), (-1, -1), 14),
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (0, 0), 10),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            elements.append(header_table)
-            elements.append(Spacer(1, 0.1*inch))
-
-            # Get page data
-            page_end = min(page_start + rows_per_page, total_rows)
-            page_data = [table_data[0]] + table_data[page_start + 1:page_end + 1]
-
-            # Create table
-            data_table = Table(page_data, colWidths=col_widths, repeatRows=1)
-            data_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#808080')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-                # Data rows
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
-                # Grid
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('TOPPADDING', (0, 0), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F0F0')]),
-            ]))
-            elements.append(data_table)
-
-            # Footer will be drawn at fixed position by page template
-
-        # Add trajectory plots on last page with header
-        elements.append(PageBreak())
-
-        # Add header for plots page
         header_style = ParagraphStyle(
             'DataPageHeader',
             fontName='Helvetica-Bold',
@@ -835,185 +717,7 @@ class SurveyCalculationReportService:
             spaceAfter=10
         )
 
-        header_data = [[Paragraph('Gyroscopic Survey Report', header_style), survey_date, run_name]]
-        header_table = Table(header_data, colWidths=[4.52*inch, 1.625*inch, 1.625*inch])
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#c23c3e')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (0, 0), 16),
-            ('FONTSIZE', (1, 0), (-1, -1), 14),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (0, 0), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.1*inch))
-
-        # Add trajectory plots
-        elements.extend(SurveyCalculationReportService._create_trajectory_plots(survey_data, calculated_survey))
-
-        # Footer will be drawn at fixed position by page template
-
-        return elements
-
-    @staticmethod
-    def _create_data_pages_for_interpolated(survey_data, calculated_survey, run, resolution, survey_file=None):
-        """Create data pages with survey calculation table for interpolated data."""
-        elements = []
-
-        # Get survey date from file upload date
-        if survey_file and hasattr(survey_file, 'created_at') and survey_file.created_at:
-            survey_date = survey_file.created_at.strftime('%d-%b-%Y')
-        elif hasattr(survey_data, 'survey_file'):
-            survey_date = survey_data.survey_file.created_at.strftime('%d-%b-%Y')
-        else:
-            survey_date = datetime.now().strftime('%d-%b-%Y')
-
-        run_name = run.run_name or 'RNS-40'
-
-        # Get survey data - MD, INC, AZI from survey_data; calculated values from calculated_survey
-        md_data = survey_data.md_data if hasattr(survey_data, 'md_data') else []
-        inc_data = survey_data.inc_data if hasattr(survey_data, 'inc_data') else []
-        azi_data = survey_data.azi_data if hasattr(survey_data, 'azi_data') else []
-        tvd_data = calculated_survey.tvd if hasattr(calculated_survey, 'tvd') else []
-        vs_data = calculated_survey.vertical_section if hasattr(calculated_survey, 'vertical_section') and calculated_survey.vertical_section else []
-        ns_data = calculated_survey.northing if hasattr(calculated_survey, 'northing') else []
-        ew_data = calculated_survey.easting if hasattr(calculated_survey, 'easting') else []
-        dls_data = calculated_survey.dls if hasattr(calculated_survey, 'dls') and calculated_survey.dls else []
-
-        # Prepare table data
-        table_data = [
-            ['MD\n(m)', 'Inclination\n(degs)', 'Azimuth\n(degs)', 'TVD\n(m)', 'V.S.\n(m)', '+N/S\n(m)', '+E/-W\n(m)', 'DLS\n(/30)']
-        ]
-
-        # Add data rows
-        for i in range(len(md_data)):
-            # Handle vertical section - might be None or empty
-            vs_val = ""
-            if vs_data and i < len(vs_data):
-                try:
-                    vs_val = f"{float(vs_data[i]):.2f}"
-                except (TypeError, ValueError):
-                    vs_val = "0.00"
-
-            # Handle DLS - might be None or empty
-            dls_val = "None"
-            if dls_data and i < len(dls_data):
-                try:
-                    if dls_data[i] is not None and dls_data[i] != 'None':
-                        dls_val = f"{float(dls_data[i]):.2f}"
-                except (TypeError, ValueError):
-                    dls_val = "None"
-
-            row = [
-                f"{float(md_data[i]):.2f}" if i < len(md_data) else "",
-                f"{float(inc_data[i]):.2f}" if i < len(inc_data) else "",
-                f"{float(azi_data[i]):.2f}" if i < len(azi_data) else "",
-                f"{float(tvd_data[i]):.2f}" if i < len(tvd_data) else "",
-                vs_val,
-                f"{float(ns_data[i]):.2f}" if i < len(ns_data) else "",
-                f"{float(ew_data[i]):.2f}" if i < len(ew_data) else "",
-                dls_val
-            ]
-            table_data.append(row)
-
-        # Create table with alternating row colors
-        # A4 width = 8.27 inches, with 0.25" margins on each side = 7.77" available
-        # Match header width exactly (7.77 inches total) with equal column distribution
-        col_widths = [0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch, 0.97125*inch]
-        # Total = 7.77 inches (8 columns × 0.97125)
-
-        # Split table into pages (approximately 35 rows per page to fit with header/footer)
-        rows_per_page = 35
-        total_rows = len(table_data) - 1  # Exclude header
-
-        for page_start in range(0, total_rows, rows_per_page):
-            if page_start > 0:
-                elements.append(PageBreak())
-
-            # Add header for each page
-            # Page header with date and run name (indicate interpolated)
-            header_style = ParagraphStyle(
-                'DataPageHeader',
-                fontName='Helvetica-Bold',
-                fontSize=16,
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                leftIndent=10,
-                spaceAfter=10
-            )
-
-            # Header for data pages (same as calculated report)
-            header_text = 'Gyroscopic Survey Report'
-            header_data = [[Paragraph(header_text, header_style), survey_date, run_name]]
-            header_table = Table(header_data, colWidths=[4.52*inch, 1.625*inch, 1.625*inch])
-            header_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#c23c3e')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (0, 0), 16),
-                ('FONTSIZE', (1, 0), (-1, -1), 14),
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (0, 0), 10),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            elements.append(header_table)
-            elements.append(Spacer(1, 0.1*inch))
-
-            # Get page data
-            page_end = min(page_start + rows_per_page, total_rows)
-            page_data = [table_data[0]] + table_data[page_start + 1:page_end + 1]
-
-            # Create table
-            data_table = Table(page_data, colWidths=col_widths, repeatRows=1)
-            data_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#808080')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-                # Data rows
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
-                # Grid
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('TOPPADDING', (0, 0), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F0F0')]),
-            ]))
-            elements.append(data_table)
-
-            # Footer will be drawn at fixed position by page template
-
-        # Add trajectory plots on last page with header
-        elements.append(PageBreak())
-
-        # Add header for plots page
-        header_style = ParagraphStyle(
-            'DataPageHeader',
-            fontName='Helvetica-Bold',
-            fontSize=16,
-            textColor=colors.white,
-            alignment=TA_LEFT,
-            leftIndent=10,
-            spaceAfter=10
-        )
-
-        header_data = [[Paragraph('Gyroscopic Survey Report', header_style), survey_date, run_name]]
+        header_data = [[Paragraph(DATA_PAGE_TITLE, header_style), survey_date, run_name]]
         header_table = Table(header_data, colWidths=[4.52*inch, 1.625*inch, 1.625*inch])
         header_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#c23c3e')),
@@ -1040,6 +744,7 @@ class SurveyCalculationReportService:
         return elements
 
 
+@span('report.survey_calculation')
 def generate_survey_calculation_report(survey_data_id):
     """
     Generate survey calculation report for given survey data ID.
@@ -1062,6 +767,27 @@ def generate_survey_calculation_report(survey_data_id):
         raise
 
 
+def get_survey_calculation_report_artifact(survey_data_id):
+    """
+    Return the stored survey calculation report, generating it if its inputs changed.
+
+    Args:
+        survey_data_id: UUID of the SurveyData instance
+
+    Returns:
+        ReportArtifact
+    """
+    from survey_api.models import SurveyData
+
+    run_id = SurveyData.objects.filter(id=survey_data_id).values_list('survey_file__run_id', flat=True).first()
+    return report_artifacts.get_or_create(
+        'survey_calculation',
+        ReportInputs.collect(run_ids=[run_id]),
+        lambda: generate_survey_calculation_report(survey_data_id),
+        params=(str(survey_data_id),)
+    )
+
+
 
 
 
@@ -7,17 +7,25 @@ Coordinates the full calculation workflow:
 3. Store results in CalculatedSurvey model
 4. Update calculation status and handle errors
 """
-import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
 from django.db import transaction
 
 from survey_api.models import SurveyData, CalculatedSurvey, SurveyFile
+from survey_api.services.location_service import LocationService
 from survey_api.services.welleng_service import WellengService
+from survey_api.services.metrics_service import span
+from survey_api.services.single_flight import single_flight
 from survey_api.exceptions import WellengCalculationError, InsufficientDataError
 
 logger = logging.getLogger(__name__)
 
+# Per-station derived coordinates, in storage order (CalculatedSurvey.geographic_data)
+GEOGRAPHIC_COLUMNS = ('grid_easting', 'grid_northing', 'latitude', 'longitude')
+
 
 class SurveyCalculationService:
     """Orchestrates survey trajectory calculations using welleng."""
@@ -48,13 +56,45 @@ class SurveyCalculationService:
 
         Performance:
             Uses select_related to avoid N+1 queries.
-            Target: < 3 seconds for 10,000 points.
+            Target: < 3 seconds for 10,000 points (checked per well
+            profile by tests/test_benchmarks.py).
 
         Decision:
             DECISION: Using synchronous processing for Epic 4
             Benchmark shows < 3 seconds for 10,000 points
             If performance degrades, consider Celery in future epic
+
+        Concurrency:
+            Concurrent calls for the same version of the SurveyData and its
+            run's tie-on, location and depth are coalesced
+            (survey_api.services.single_flight): one caller calculates, the
+            others load the CalculatedSurvey it created.
         """
+        # The survey and every run input the calculation reads (see _get_calculation_context)
+        version = SurveyData.objects.filter(id=survey_data_id).values_list(
+            'updated_at',
+            'survey_file__run__tieon__updated_at',
+            'survey_file__run__location__updated_at',
+            'survey_file__run__depth__updated_at',
+        ).first()
+        if version is None:
+            return SurveyCalculationService._calculate(survey_data_id)
+
+        stamps = ':'.join(stamp.isoformat() if stamp else '-' for stamp in version)
+        calculated_id = single_flight.run(
+            f'calculate:{survey_data_id}:{stamps}',
+            lambda: SurveyCalculationService._calculate(survey_data_id).pk,
+            operation='calculation',
+        )
+        calculated_survey = CalculatedSurvey.objects.filter(pk=calculated_id).first()
+        if calculated_survey is None:
+            # Created in a transaction this connection cannot see yet
+            return SurveyCalculationService._calculate(survey_data_id)
+        return calculated_survey
+
+    @staticmethod
+    def _calculate(survey_data_id: str) -> CalculatedSurvey:
+        """Calculate and save the trajectory for one SurveyData (uncoalesced)."""
         try:
             logger.info(f"Starting calculation for SurveyData: {survey_data_id}")
 
@@ -78,72 +118,17 @@ class SurveyCalculationService:
 
             logger.info("Processing status updated to 'processing'")
 
-            # Start timing calculation
-            start_time = time.time()
-
-            # Implement BHC (Bottom Hole Convergence) iterative calculation
-            bhc_enabled = context.get('bhc_enabled', False)
-            proposal_direction = context.get('proposal_direction')
-            updated_proposal_direction = None  # Track updated value for BHC
-
-            if bhc_enabled:
-                logger.info("BHC enabled - performing iterative calculation")
-
-                # Initial calculation with proposal_direction = 0
-                initial_proposal_direction = 0.0
-                logger.info(f"BHC Step 1: Initial calculation with proposal_direction = {initial_proposal_direction}°")
-
-                result = WellengService.calculate_survey(
-                    md=survey_data.md_data,
-                    inc=survey_data.inc_data,
-                    azi=survey_data.azi_data,
-                    tie_on_data=context['tieon'],
-                    location_data=context['location'],
-                    survey_type=context['survey_type'],
-                    vertical_section_azimuth=initial_proposal_direction
-                )
-
-                # Get closure direction from last row
-                closure_direction_last = result['closure_direction'][-1]
-                logger.info(f"BHC Step 2: Closure direction from last point = {closure_direction_last:.6f}°")
-
-                # Recalculate with proposal_direction = closure_direction
-                logger.info(f"BHC Step 3: Recalculating with proposal_direction = {closure_direction_last:.6f}°")
-
-                result = WellengService.calculate_survey(
-                    md=survey_data.md_data,
-                    inc=survey_data.inc_data,
-                    azi=survey_data.azi_data,
-                    tie_on_data=context['tieon'],
-                    location_data=context['location'],
-                    survey_type=context['survey_type'],
-                    vertical_section_azimuth=closure_direction_last
-                )
-
-                # Store the updated proposal direction for BHC
-                updated_proposal_direction = closure_direction_last
-                logger.info(f"BHC calculation completed - converged to {closure_direction_last:.6f}°")
-
-                print(f"\n{'='*80}")
-                print(f"[BHC CALCULATION] Converged closure direction: {closure_direction_last:.6f}°")
-                print(f"[BHC CALCULATION] This will be stored as vertical_section_azimuth in CalculatedSurvey")
-                print(f"[BHC CALCULATION] Result vertical_section_azimuth: {result.get('vertical_section_azimuth')}°")
-                print(f"{'='*80}\n")
-            else:
-                # Normal calculation (non-BHC)
-                # Call WellengService to perform calculation
-                result = WellengService.calculate_survey(
-                    md=survey_data.md_data,
-                    inc=survey_data.inc_data,
-                    azi=survey_data.azi_data,
-                    tie_on_data=context['tieon'],
-                    location_data=context['location'],
-                    survey_type=context['survey_type'],
-                    vertical_section_azimuth=proposal_direction
+            # Time the trajectory calculation (recorded on /metrics as a span)
+            with span('calculation.trajectory') as timer:
+                result, updated_proposal_direction = SurveyCalculationService.compute_trajectory(
+                    survey_data.md_data,
+                    survey_data.inc_data,
+                    survey_data.azi_data,
+                    context
                 )
+            bhc_enabled = context.get('bhc_enabled', False)
 
-            # Calculate duration
-            calculation_duration = time.time() - start_time
+            calculation_duration = timer.duration
 
             logger.info(f"Calculation completed in {calculation_duration:.3f} seconds")
 
@@ -239,6 +224,8 @@ class SurveyCalculationService:
 
             logger.info(f"CalculatedSurvey created: {calculated_survey.id}")
 
+            SurveyCalculationService.derive_eager(calculated_survey)
+
             # NOTE: Automatic interpolation has been disabled
             # Interpolation is now calculated on-demand when user requests it
             # User must explicitly save interpolation to database via "Save to Database" button
@@ -339,6 +326,50 @@ class SurveyCalculationService:
                 # If we can't even create error record, re-raise original exception
                 raise
 
+    @staticmethod
+    def compute_trajectory(md, inc, azi, context: Dict) -> Tuple[Dict, Optional[float]]:
+        """
+        Run the welleng calculation for one survey, with BHC iteration when enabled.
+
+        With BHC (Bottom Hole Convergence) the survey is calculated with a
+        proposal direction of 0 degrees, then recalculated with the closure
+        direction of the last station. Safe to call inside a compute pool
+        worker (the nested pool call runs inline).
+
+        Args:
+            md, inc, azi: Survey station arrays
+            context: Calculation context from _get_calculation_context
+
+        Returns:
+            (WellengService.calculate_survey result, converged proposal
+            direction or None when BHC is disabled)
+
+        Raises:
+            WellengCalculationError: If the calculation fails
+        """
+        def calculate(vertical_section_azimuth):
+            return WellengService.calculate_survey(
+                md=md,
+                inc=inc,
+                azi=azi,
+                tie_on_data=context['tieon'],
+                location_data=context['location'],
+                survey_type=context['survey_type'],
+                vertical_section_azimuth=vertical_section_azimuth
+            )
+
+        if not context.get('bhc_enabled', False):
+            return calculate(context.get('proposal_direction')), None
+
+        logger.info("BHC enabled - performing iterative calculation")
+        initial = calculate(0.0)
+        closure_direction_last = initial['closure_direction'][-1]
+        logger.info(f"BHC: recalculating with proposal_direction = {closure_direction_last:.6f}°")
+
+        result = calculate(closure_direction_last)
+        logger.info(f"BHC calculation completed - converged to {closure_direction_last:.6f}°")
+        return result, closure_direction_last
+
     @staticmethod
     def _get_calculation_context(survey_data: SurveyData) -> Dict:
         """
@@ -443,3 +474,166 @@ class SurveyCalculationService:
             'bhc_enabled': bhc_enabled,
             'proposal_direction': proposal_direction,
         }
+
+    @staticmethod
+    def derive_eager(calculated_survey: CalculatedSurvey):
+        """
+        Optional derived-data stages run right after a calculation is stored.
+
+        Geographic coordinates (GEOGRAPHIC_COORDINATES_EAGER) and positional
+        uncertainty (UNCERTAINTY_EAGER) are otherwise derived on first request.
+        Failures are logged; the calculation itself stands.
+
+        Args:
+            calculated_survey: Calculated survey with survey_data__survey_file__run loaded
+        """
+        if getattr(settings, 'GEOGRAPHIC_COORDINATES_EAGER', False):
+            try:
+                SurveyCalculationService.geographic_coordinates(calculated_survey)
+            except Exception as e:
+                logger.warning(f"Deriving geographic coordinates failed for {calculated_survey.id}: {e}")
+        if getattr(settings, 'UNCERTAINTY_EAGER', False):
+            try:
+                from survey_api.services.uncertainty_service import UncertaintyService
+                UncertaintyService.uncertainty_columns(calculated_survey)
+            except Exception as e:
+                logger.warning(f"Computing positional uncertainty failed for {calculated_survey.id}: {e}")
+
+    @staticmethod
+    def geographic_coordinates(calculated_survey: CalculatedSurvey) -> Optional[Dict]:
+        """
+        Map grid and geographic position of every station of a calculated survey.
+
+        Args:
+            calculated_survey: CalculatedSurvey with survey_data__survey_file__run loaded
+
+        Returns:
+            Dictionary with grid_easting, grid_northing, latitude and longitude
+            lists (None for missing stations) plus the frame: zone, hemisphere,
+            datum, north_reference, convergence and scale_factor; None when the
+            run has no location or the calculation has no results
+        """
+        derived = SurveyCalculationService.geographic_columns(calculated_survey)
+        if derived is None:
+            return None
+        columns, frame = derived
+
+        result = {
+            name: [None if np.isnan(value) else value for value in column.tolist()]
+            for name, column in zip(GEOGRAPHIC_COLUMNS, columns)
+        }
+        result.update({
+            'zone': frame['zone'],
+            'hemisphere': 'S' if frame['south'] else 'N',
+            'datum': frame['datum'],
+            'north_reference': frame['north_reference'],
+            'convergence': frame['convergence'],
+            'scale_factor': frame['scale_factor'],
+        })
+        return result
+
+    @staticmethod
+    def geographic_columns(calculated_survey: CalculatedSurvey) -> Optional[Tuple[np.ndarray, Dict]]:
+        """
+        Derived coordinate columns of a calculated survey, as arrays.
+
+        The local northing/easting (relative to the well location, referenced
+        to the location's north reference) are rotated by the grid convergence
+        and scaled by the point scale factor at the wellhead, offset by the
+        wellhead grid coordinates and converted to latitude/longitude, all in
+        one vectorized pass. The result is stored on the CalculatedSurvey
+        (packed float64) and reused until the calculation or the location
+        changes.
+
+        Args:
+            calculated_survey: CalculatedSurvey with survey_data__survey_file__run loaded
+
+        Returns:
+            Tuple of (array of shape (4, stations) in GEOGRAPHIC_COLUMNS order,
+            wellhead frame from _geographic_frame), or None when the run has no
+            location or the calculation has no results
+        """
+        location = SurveyCalculationService._wellhead_location(calculated_survey.survey_data.survey_file.run)
+        if location is None or calculated_survey.calculation_status != 'calculated':
+            return None
+
+        frame = SurveyCalculationService._geographic_frame(location)
+        version = f'{calculated_survey.updated_at.isoformat()}:{location.pk}:{location.updated_at.isoformat()}'
+
+        data = calculated_survey.geographic_data
+        if calculated_survey.geographic_version == version and data:
+            columns = np.frombuffer(bytes(data), dtype='<f8').reshape(len(GEOGRAPHIC_COLUMNS), -1)
+        else:
+            with span('calculation.geographic'):
+                columns = SurveyCalculationService.compute_geographic_coordinates(
+                    calculated_survey.column_array('easting'),
+                    calculated_survey.column_array('northing'),
+                    frame,
+                )
+            packed = np.ascontiguousarray(columns, dtype='<f8').tobytes()
+            # Stored without touching updated_at (the calculation itself is unchanged)
+            CalculatedSurvey.objects.filter(
+                pk=calculated_survey.pk, updated_at=calculated_survey.updated_at
+            ).update(geographic_data=packed, geographic_version=version)
+            calculated_survey.geographic_data, calculated_survey.geographic_version = packed, version
+
+        return columns, frame
+
+    @staticmethod
+    def compute_geographic_coordinates(easting, northing, frame: Dict) -> np.ndarray:
+        """
+        Convert local station offsets to grid and geographic coordinates.
+
+        Args:
+            easting: Local easting per station (m, NaN for missing)
+            northing: Local northing per station (m, NaN for missing)
+            frame: Wellhead frame from _geographic_frame
+
+        Returns:
+            Array of shape (4, stations): GEOGRAPHIC_COLUMNS
+        """
+        easting = np.asarray(easting, dtype=float)
+        northing = np.asarray(northing, dtype=float)
+
+        # True-north offsets are turned to grid north; grid-north offsets are already aligned
+        angle = 0.0 if frame['north_reference'] == 'Grid North' else np.radians(frame['convergence'])
+        cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+        scale = frame['scale_factor']
+        grid_easting = frame['easting'] + scale * (easting * cos_angle - northing * sin_angle)
+        grid_northing = frame['northing'] + scale * (northing * cos_angle + easting * sin_angle)
+
+        geographic = LocationService.grid_to_geographic(
+            grid_easting, grid_northing, f"{frame['zone']}{'S' if frame['south'] else 'N'}", frame['datum']
+        )
+        return np.vstack([grid_easting, grid_northing, geographic['latitude'], geographic['longitude']])
+
+    @staticmethod
+    def _geographic_frame(location) -> Dict:
+        """Wellhead grid position, zone, convergence and scale factor of a Location."""
+        latitude = float(location.latitude or 0)
+        longitude = float(location.longitude or 0)
+        wellhead = LocationService.derive_locations(
+            [latitude], [longitude],
+            map_zones=[location.map_zone], geodetic_datums=[location.geodetic_datum]
+        )
+        return {
+            'zone': int(wellhead['zone'][0]),
+            'south': bool(wellhead['south'][0]),
+            'datum': location.geodetic_datum or 'WGS84',
+            'north_reference': location.north_reference or 'True North',
+            # Surveyed wellhead grid coordinates take precedence over the projected ones
+            'easting': float(location.easting) if location.easting else float(wellhead['easting'][0]),
+            'northing': float(location.northing) if location.northing else float(wellhead['northing'][0]),
+            'convergence': float(wellhead['convergence'][0]),
+            'scale_factor': float(wellhead['scale_factor'][0]),
+        }
+
+    @staticmethod
+    def _wellhead_location(run):
+        """The run's Location, else the location of its well (or its job's well)."""
+        if hasattr(run, 'location') and run.location is not None:
+            return run.location
+        for well in (run.well, run.job.well if run.job_id else None):
+            if well is not None and hasattr(well, 'location'):
+                return well.location
+        return None
@@ -0,0 +1,248 @@
+"""
+Uncertainty Service - positional uncertainty (error ellipses) per survey station.
+
+Each survey tool type maps to an error model: a set of error sources, each a
+1-sigma magnitude, the measurement it perturbs (MD, inclination or azimuth),
+a weighting function of the station attitude, and whether it is systematic
+(fully correlated along the survey) or random (independent per station).
+
+Following the ISCWSA formulation, an error at station k moves station K >= k
+by the derivative of the survey legs either side of k with respect to that
+measurement (balanced tangential legs); the position error of station K is
+the sum over stations 1..K. Every source is propagated for all stations at once:
+
+    systematic: e_K = cumsum(sigma * w * c)[K-1] + sigma * w_K * b_K,  cov_K = e_K e_K^T
+    random:     cov_K = cumsum((sigma * w)^2 c c^T)[K-1] + (sigma * w_K)^2 b_K b_K^T
+
+where c is the effect on the following stations and b the effect on the
+station itself. Covariances are in the north/east/vertical frame of the
+calculation; results are 1-sigma.
+
+Results for the survey's own error model are stored packed on the
+CalculatedSurvey; other models are cached per (calculation, model).
+
+Usage:
+    columns = UncertaintyService.uncertainty_columns(calculated_survey)
+    columns['semi_major'], columns['sigma_vertical'], ...
+"""
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from survey_api.exceptions import ValidationError
+from survey_api.models import CalculatedSurvey
+from survey_api.services.metrics_service import span
+
+logger = logging.getLogger(__name__)
+
+# Per-station result columns, in storage order (CalculatedSurvey.uncertainty_data)
+UNCERTAINTY_COLUMNS = (
+    'semi_major', 'semi_minor', 'ellipse_azimuth', 'sigma_vertical',
+    'cov_nn', 'cov_ne', 'cov_nv', 'cov_ee', 'cov_ev', 'cov_vv',
+)
+
+
+class ErrorSource(NamedTuple):
+    """One error term of a tool error model (1-sigma)."""
+    code: str
+    measurement: str   # 'md', 'inc' or 'azi'
+    magnitude: float   # metres, scale factor (md) or degrees (inc/azi)
+    weighting: str     # 'const', 'md', 'sin_inc' or 'sin_inc_sin_azi'
+    systematic: bool
+
+
+# Simplified ISCWSA-style tool models
+ERROR_MODELS = {
+    'MWD': (
+        ErrorSource('DRFR', 'md', 0.35, 'const', False),
+        ErrorSource('DSFS', 'md', 5.6e-4, 'md', True),
+        ErrorSource('SAG', 'inc', 0.2, 'sin_inc', True),
+        ErrorSource('MSIN', 'inc', 0.1, 'const', True),
+        ErrorSource('DEC', 'azi', 0.36, 'const', True),
+        ErrorSource('AMIL', 'azi', 0.25, 'sin_inc_sin_azi', True),
+        ErrorSource('INCR', 'inc', 0.05, 'const', False),
+        ErrorSource('AZIR', 'azi', 0.1, 'const', False),
+    ),
+    'Gyro': (
+        ErrorSource('DRFR', 'md', 0.35, 'const', False),
+        ErrorSource('DSFS', 'md', 5.6e-4, 'md', True),
+        ErrorSource('SAG', 'inc', 0.2, 'sin_inc', True),
+        ErrorSource('MSIN', 'inc', 0.05, 'const', True),
+        ErrorSource('GYRO', 'azi', 0.1, 'const', True),
+        ErrorSource('INCR', 'inc', 0.03, 'const', False),
+        ErrorSource('AZIR', 'azi', 0.05, 'const', False),
+    ),
+}
+
+# Error model used for each survey tool type
+TOOL_ERROR_MODELS = {
+    'MWD': 'MWD',
+    'Gyro': 'Gyro',
+    'GTL': 'Gyro',
+    'Unknown': 'MWD',
+}
+
+
+class UncertaintyService:
+    """
+    Vectorized positional uncertainty of calculated surveys.
+
+    Settings:
+        UNCERTAINTY_CACHE_TIMEOUT: Seconds results for other error models stay cached (default 24h)
+    """
+
+    @staticmethod
+    def error_model_for(survey_type: Optional[str]) -> str:
+        """Error model name of a survey tool type (MWD for unknown types)."""
+        return TOOL_ERROR_MODELS.get(survey_type or 'Unknown', 'MWD')
+
+    @staticmethod
+    def uncertainty_columns(calculated_survey: CalculatedSurvey,
+                            error_model: Optional[str] = None) -> Tuple[str, Dict[str, np.ndarray]]:
+        """
+        Error ellipse and covariance arrays of a calculated survey.
+
+        Args:
+            calculated_survey: CalculatedSurvey with survey_data loaded
+            error_model: One of ERROR_MODELS (the survey tool's model when omitted)
+
+        Returns:
+            Tuple of (error model name, {column: array} for UNCERTAINTY_COLUMNS)
+
+        Raises:
+            ValidationError: If the error model is unknown
+        """
+        own_model = UncertaintyService.error_model_for(
+            (calculated_survey.calculation_context or {}).get('survey_type')
+        )
+        error_model = error_model or own_model
+        if error_model not in ERROR_MODELS:
+            raise ValidationError(
+                f"Unknown error model '{error_model}'",
+                field_errors={'error_model': [f"Must be one of {', '.join(ERROR_MODELS)}."]}
+            )
+
+        version = f'{error_model}:{calculated_survey.updated_at.isoformat()}'
+        stored = error_model == own_model
+        if stored:
+            packed = bytes(calculated_survey.uncertainty_data or b'') \
+                if calculated_survey.uncertainty_version == version else None
+        else:
+            key = f'uncertainty:{calculated_survey.id}:{version}'
+            packed = UncertaintyService._cache_get(key)
+
+        if not packed:
+            survey_data = calculated_survey.survey_data
+            with span('calculation.uncertainty'):
+                columns = UncertaintyService.compute(
+                    survey_data.column_array('md_data'),
+                    survey_data.column_array('inc_data'),
+                    survey_data.column_array('azi_data'),
+                    ERROR_MODELS[error_model],
+                )
+            packed = np.ascontiguousarray(columns, dtype='<f8').tobytes()
+            if stored:
+                # Stored without touching updated_at (the calculation itself is unchanged)
+                CalculatedSurvey.objects.filter(
+                    pk=calculated_survey.pk, updated_at=calculated_survey.updated_at
+                ).update(uncertainty_data=packed, uncertainty_version=version)
+                calculated_survey.uncertainty_data, calculated_survey.uncertainty_version = packed, version
+            else:
+                UncertaintyService._cache_set(key, packed)
+
+        columns = np.frombuffer(packed, dtype='<f8').reshape(len(UNCERTAINTY_COLUMNS), -1)
+        return error_model, dict(zip(UNCERTAINTY_COLUMNS, columns))
+
+    @staticmethod
+    def compute(md, inc, azi, sources) -> np.ndarray:
+        """
+        Propagate an error model along a survey.
+
+        Args:
+            md: Measured depth per station (m)
+            inc: Inclination per station (degrees)
+            azi: Azimuth per station (degrees)
+            sources: Sequence of ErrorSource
+
+        Returns:
+            Array of shape (len(UNCERTAINTY_COLUMNS), stations)
+        """
+        md = np.nan_to_num(np.asarray(md, dtype=float))
+        inc = np.radians(np.nan_to_num(np.asarray(inc, dtype=float)))
+        azi = np.radians(np.nan_to_num(np.asarray(azi, dtype=float)))
+        count = len(md)
+
+        sin_inc, cos_inc = np.sin(inc), np.cos(inc)
+        sin_azi, cos_azi = np.sin(azi), np.cos(azi)
+        tangent = np.column_stack([sin_inc * cos_azi, sin_inc * sin_azi, cos_inc])
+        d_inc = np.column_stack([cos_inc * cos_azi, cos_inc * sin_azi, -sin_inc])
+        d_azi = np.column_stack([-sin_inc * sin_azi, sin_inc * cos_azi, np.zeros(count)])
+
+        # Course lengths of the leg ending at each station and of the leg after it
+        # (the first station is the fixed tie-on: no leg before it)
+        before = np.diff(md, prepend=md[:1])
+        after = np.append(before[1:], 0.0)
+        previous = np.vstack([tangent[:1], tangent[:-1]])
+        following = np.vstack([tangent[1:], tangent[-1:]])
+        has_before = (np.arange(count) > 0)[:, None]
+        md_own = has_before * (previous + tangent) / 2
+
+        # Effect of a unit error at station k on later stations (c) and on station k itself (b)
+        effects = {
+            'md': (md_own - (tangent + following) / 2, md_own),
+            'inc': (((before + after) / 2)[:, None] * d_inc, (before / 2)[:, None] * d_inc),
+            'azi': (((before + after) / 2)[:, None] * d_azi, (before / 2)[:, None] * d_azi),
+        }
+        weights = {
+            'const': np.ones(count),
+            'md': md,
+            'sin_inc': sin_inc,
+            'sin_inc_sin_azi': sin_inc * sin_azi,
+        }
+
+        covariance = np.zeros((count, 3, 3))
+        for source in sources:
+            scale = source.magnitude if source.measurement == 'md' else np.radians(source.magnitude)
+            weight = (scale * weights[source.weighting])[:, None]
+            later, own = effects[source.measurement]
+            later, own = weight * later, weight * own
+            if source.systematic:
+                error = np.cumsum(later, axis=0) - later + own
+                covariance += error[:, :, None] * error[:, None, :]
+            else:
+                accumulated = np.cumsum(later[:, :, None] * later[:, None, :], axis=0)
+                covariance += accumulated - later[:, :, None] * later[:, None, :] + own[:, :, None] * own[:, None, :]
+
+        return UncertaintyService._ellipses(covariance)
+
+    @staticmethod
+    def _ellipses(covariance: np.ndarray) -> np.ndarray:
+        """Horizontal error ellipse, vertical sigma and covariance terms per station."""
+        nn, ne, ee = covariance[:, 0, 0], covariance[:, 0, 1], covariance[:, 1, 1]
+        mean = (nn + ee) / 2
+        radius = np.hypot((nn - ee) / 2, ne)
+        return np.vstack([
+            np.sqrt(mean + radius),
+            np.sqrt(np.maximum(mean - radius, 0.0)),
+            np.degrees(0.5 * np.arctan2(2 * ne, nn - ee)) % 180.0,
+            np.sqrt(covariance[:, 2, 2]),
+            nn, ne, covariance[:, 0, 2], ee, covariance[:, 1, 2], covariance[:, 2, 2],
+        ])
+
+    @staticmethod
+    def _cache_get(key: str) -> Optional[bytes]:
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Uncertainty cache unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _cache_set(key: str, packed: bytes):
+        try:
+            cache.set(key, packed, getattr(settings, 'UNCERTAINTY_CACHE_TIMEOUT', 24 * 3600))
+        except Exception as e:
+            logger.warning(f"Could not cache uncertainty {key}: {e}")
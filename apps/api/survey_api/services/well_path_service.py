@@ -0,0 +1,338 @@
+"""
+Well Path Service - definitive composite well path per Well.
+
+A well drilled in several runs has one SurveyData per run, each tied on to
+the run before. The composite merges their stations by MD into a single
+path:
+
+1. Every successfully calculated primary survey of the well's runs is a
+   source with an MD range
+2. Where ranges overlap, the station comes from the highest-priority source:
+   survey type order from WELL_PATH_SOURCE_PRIORITY (e.g. gyro over MWD),
+   then the most recently uploaded survey
+3. Positions are recalculated by minimum curvature along the merged stations,
+   starting from the tie-on of the shallowest run
+
+The result is stored as a WellPathComposite with the version and MD range of
+each source. When a run is added, replaced or removed, only stations from the
+shallowest MD touched by a changed source downward are merged and
+recalculated; the path above it (and the surveys contributing only there) is
+reused as stored.
+
+Usage:
+    composite = WellPathService.composite(well_id)
+    composite.column_array('md'), composite.column_array('tvd'), ...
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from survey_api.exceptions import InsufficientDataError
+from survey_api.models import SurveyData, TieOn, WellPathComposite
+from survey_api.services.metrics_service import metrics, span
+from survey_api.services.single_flight import single_flight
+from survey_api.utils.etags import compute_etag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORITY = ('Gyro', 'GTL', 'MWD', 'Unknown')
+
+
+class WellPathService:
+    """
+    Incrementally maintained composite well paths.
+
+    Settings:
+        WELL_PATH_SOURCE_PRIORITY: Survey types, highest priority first (default Gyro, GTL, MWD, Unknown)
+    """
+
+    @staticmethod
+    def composite(well_id) -> WellPathComposite:
+        """
+        Up-to-date composite path of a well, updated first when its surveys changed.
+
+        Args:
+            well_id: Well UUID
+
+        Returns:
+            WellPathComposite (array columns loaded on access)
+
+        Raises:
+            InsufficientDataError: If the well has no calculated primary surveys or
+                the shallowest run has no tie-on
+        """
+        rows = WellPathService._source_rows(well_id)
+        if not rows:
+            raise InsufficientDataError(f"Well {well_id} has no calculated primary surveys to build a well path from")
+
+        composite = WellPathComposite.objects.defer(*WellPathComposite.ARRAY_FIELDS).filter(well_id=well_id).first()
+        if composite is not None and WellPathService._is_current(composite, rows):
+            return composite
+
+        # Concurrent readers of a changed well share one update
+        key = compute_etag('well-path', well_id, WellPathService.priority(), rows).strip('"')
+        pk = single_flight.run(
+            f'well-path:{key}',
+            lambda: WellPathService._update(well_id, rows).pk,
+            operation='well_path',
+        )
+        return WellPathComposite.objects.get(pk=pk)
+
+    @staticmethod
+    def priority() -> List[str]:
+        """Survey types, highest priority first."""
+        priority = getattr(settings, 'WELL_PATH_SOURCE_PRIORITY', DEFAULT_PRIORITY)
+        if isinstance(priority, str):
+            priority = priority.split(',')
+        return [survey_type.strip() for survey_type in priority if survey_type.strip()]
+
+    @staticmethod
+    def minimum_curvature(md, inc, azi, start=(0.0, 0.0, 0.0)) -> Tuple[np.ndarray, ...]:
+        """
+        Minimum curvature positions along a station sequence.
+
+        Args:
+            md: Measured depth per station (m), increasing
+            inc: Inclination per station (degrees)
+            azi: Azimuth per station (degrees)
+            start: (northing, easting, tvd) of the first station
+
+        Returns:
+            Tuple of (northing, easting, tvd, dls) arrays; dls (deg/30m) is
+            that of the leg ending at each station (0 at the first)
+        """
+        md = np.asarray(md, dtype=float)
+        inc = np.radians(np.asarray(inc, dtype=float))
+        azi = np.radians(np.asarray(azi, dtype=float))
+
+        inc1, inc2, azi1, azi2 = inc[:-1], inc[1:], azi[:-1], azi[1:]
+        cos_dogleg = np.cos(inc2 - inc1) - np.sin(inc1) * np.sin(inc2) * (1 - np.cos(azi2 - azi1))
+        dogleg = np.arccos(np.clip(cos_dogleg, -1.0, 1.0))
+        ratio = np.ones_like(dogleg)
+        curved = dogleg > 1e-9
+        ratio[curved] = 2 / dogleg[curved] * np.tan(dogleg[curved] / 2)
+
+        half = np.diff(md) / 2 * ratio
+        legs = np.column_stack([
+            half * (np.sin(inc1) * np.cos(azi1) + np.sin(inc2) * np.cos(azi2)),
+            half * (np.sin(inc1) * np.sin(azi1) + np.sin(inc2) * np.sin(azi2)),
+            half * (np.cos(inc1) + np.cos(inc2)),
+        ])
+        positions = np.vstack([np.zeros((1, 3)), np.cumsum(legs, axis=0)]) + np.asarray(start, dtype=float)
+
+        course = np.diff(md)
+        dls = np.zeros(len(md))
+        dls[1:] = np.divide(np.degrees(dogleg) * 30.0, course, out=np.zeros_like(course), where=course > 0)
+        return positions[:, 0], positions[:, 1], positions[:, 2], dls
+
+    @staticmethod
+    def _source_rows(well_id) -> List[Tuple]:
+        """(survey_data_id, version, created_at, survey_type, run_id, run_number, tie-on version) per source."""
+        rows = SurveyData.objects.filter(
+            Q(survey_file__run__well_id=well_id) | Q(survey_file__run__job__well_id=well_id),
+            survey_file__run__deleted=False,
+            survey_file__survey_role='primary',
+            calculated_survey__calculation_status='calculated',
+        ).order_by('id').values_list(
+            'id', 'updated_at', 'created_at', 'survey_file__survey_type',
+            'survey_file__run_id', 'survey_file__run__run_number', 'survey_file__run__tieon__updated_at',
+        )
+        return [
+            (str(survey_id), updated_at.isoformat(), created_at.isoformat(), survey_type,
+             str(run_id), run_number, tieon_updated_at.isoformat() if tieon_updated_at else '')
+            for survey_id, updated_at, created_at, survey_type, run_id, run_number, tieon_updated_at in rows
+        ]
+
+    @staticmethod
+    def _is_current(composite: WellPathComposite, rows: List[Tuple]) -> bool:
+        """Whether the stored path was built from exactly these source versions, priority and tie-on."""
+        stored = {source['survey_data_id']: source['version'] for source in composite.sources}
+        if stored != {row[0]: row[1] for row in rows}:
+            return False
+        shallowest = min(composite.sources, key=lambda source: source['md_min'])
+        tieon = next(row[6] for row in rows if row[0] == shallowest['survey_data_id'])
+        return composite.build_key == WellPathService._build_key(shallowest['run_id'], tieon)
+
+    @staticmethod
+    def _build_key(run_id: str, tieon_version: str) -> str:
+        return f"{','.join(WellPathService.priority())}|{run_id}|{tieon_version}"
+
+    @staticmethod
+    @span('well_path.update')
+    def _update(well_id, rows: List[Tuple]) -> WellPathComposite:
+        """Merge and recalculate the path from the first changed source downward."""
+        with transaction.atomic():
+            composite = WellPathComposite.objects.select_for_update().filter(well_id=well_id).first()
+            stored = {source['survey_data_id']: source for source in composite.sources} if composite else {}
+
+            arrays: Dict[str, Tuple[np.ndarray, ...]] = {}
+            entries = []
+            for survey_id, version, created_at, survey_type, run_id, run_number, tieon_version in rows:
+                entry = {
+                    'survey_data_id': survey_id, 'version': version, 'created_at': created_at,
+                    'survey_type': survey_type, 'run_id': run_id, 'run_number': run_number,
+                }
+                previous = stored.get(survey_id)
+                if previous is not None and previous['version'] == version:
+                    entry['md_min'], entry['md_max'] = previous['md_min'], previous['md_max']
+                else:
+                    arrays[survey_id] = WellPathService._stations(survey_id)
+                    if not len(arrays[survey_id][0]):
+                        continue
+                    entry['md_min'], entry['md_max'] = float(arrays[survey_id][0][0]), float(arrays[survey_id][0][-1])
+                entry['tieon_version'] = tieon_version
+                entries.append(entry)
+            if not entries:
+                raise InsufficientDataError(f"Well {well_id} has no survey stations to build a well path from")
+
+            shallowest = min(entries, key=lambda entry: entry['md_min'])
+            build_key = WellPathService._build_key(shallowest['run_id'], shallowest['tieon_version'])
+            for entry in entries:
+                del entry['tieon_version']
+
+            # Shallowest MD whose stations may differ: any range of an added, replaced or removed source
+            change_md = None
+            if composite is not None and composite.build_key == build_key:
+                current = {entry['survey_data_id']: entry for entry in entries}
+                touched = [
+                    source['md_min'] for source in (*entries, *stored.values())
+                    if current.get(source['survey_data_id'], {}).get('version')
+                    != stored.get(source['survey_data_id'], {}).get('version')
+                ]
+                if not touched:
+                    return composite
+                change_md = min(touched)
+
+            prefix = 0
+            if change_md is not None:
+                prefix = int(np.searchsorted(composite.column_array('md'), change_md, side='left'))
+
+            md, inc, azi, source_ids = WellPathService._merge(entries, arrays, change_md if prefix else None)
+            if prefix:
+                kept = {name: composite.column_array(name)[:prefix] for name in WellPathComposite.ARRAY_FIELDS}
+                anchor = prefix - 1
+                northing, easting, tvd, dls = WellPathService.minimum_curvature(
+                    np.r_[kept['md'][anchor], md], np.r_[kept['inc'][anchor], inc], np.r_[kept['azi'][anchor], azi],
+                    (kept['northing'][anchor], kept['easting'][anchor], kept['tvd'][anchor]),
+                )
+                columns = {
+                    'md': np.r_[kept['md'], md], 'inc': np.r_[kept['inc'], inc], 'azi': np.r_[kept['azi'], azi],
+                    'northing': np.r_[kept['northing'], northing[1:]], 'easting': np.r_[kept['easting'], easting[1:]],
+                    'tvd': np.r_[kept['tvd'], tvd[1:]], 'dls': np.r_[kept['dls'], dls[1:]],
+                }
+                source_ids = WellPathService._station_sources(composite.segments, prefix) + source_ids
+            else:
+                tieon = TieOn.objects.filter(run_id=shallowest['run_id']).first()
+                if tieon is None:
+                    raise InsufficientDataError(
+                        f"Tie-on data is required for Run {shallowest['run_number']} to build the well path"
+                    )
+                start = (float(tieon.latitude or 0.0), float(tieon.departure or 0.0), float(tieon.tvd or 0.0))
+                northing, easting, tvd, dls = WellPathService.minimum_curvature(md, inc, azi, start)
+                columns = {
+                    'md': md, 'inc': inc, 'azi': azi, 'northing': northing, 'easting': easting, 'tvd': tvd, 'dls': dls,
+                }
+
+            if composite is None:
+                composite = WellPathComposite(well_id=well_id)
+            for name, values in columns.items():
+                setattr(composite, name, np.asarray(values, dtype=float).tolist())
+            composite.sources = entries
+            composite.segments = WellPathService._segments(source_ids, columns['md'], entries)
+            composite.build_key = build_key
+            composite.station_count = len(columns['md'])
+            composite.recomputed_from_md = change_md if prefix else None
+            composite.save()
+
+        mode = 'incremental' if prefix else 'full'
+        metrics.inc('survey_api_well_path_updates_total', labels={'mode': mode},
+                    help_text='Composite well path updates')
+        logger.info(
+            f"Well path of Well {well_id}: {composite.station_count} stations from {len(entries)} surveys "
+            f"({mode}, {composite.station_count - prefix} stations recalculated)"
+        )
+        return composite
+
+    @staticmethod
+    def _merge(entries: List[Dict], arrays: Dict, change_md: Optional[float]) -> Tuple:
+        """Stations at or below ``change_md`` from the highest-priority source covering each MD."""
+        priority = WellPathService.priority()
+        # Highest priority first; the most recent upload wins between surveys of the same type
+        ranked = sorted(entries, key=lambda entry: entry['created_at'], reverse=True)
+        ranked.sort(key=lambda entry: priority.index(entry['survey_type'])
+                    if entry['survey_type'] in priority else len(priority))
+        if change_md is not None:
+            ranked = [entry for entry in ranked if entry['md_max'] >= change_md]
+
+        parts = []
+        for position, entry in enumerate(ranked):
+            survey_id = entry['survey_data_id']
+            if survey_id not in arrays:
+                arrays[survey_id] = WellPathService._stations(survey_id)
+            md, inc, azi = arrays[survey_id]
+            keep = np.ones(len(md), dtype=bool) if change_md is None else md >= change_md
+            for higher in ranked[:position]:
+                keep &= (md < higher['md_min']) | (md > higher['md_max'])
+            parts.append((md[keep], inc[keep], azi[keep], [survey_id] * int(keep.sum())))
+
+        if not parts:
+            return np.empty(0), np.empty(0), np.empty(0), []
+        md = np.concatenate([part[0] for part in parts])
+        order = np.argsort(md, kind='stable')
+        source_ids = [survey_id for part in parts for survey_id in part[3]]
+        return (
+            md[order],
+            np.concatenate([part[1] for part in parts])[order],
+            np.concatenate([part[2] for part in parts])[order],
+            [source_ids[index] for index in order],
+        )
+
+    @staticmethod
+    def _stations(survey_data_id: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finite (md, inc, azi) stations of a survey, sorted by MD."""
+        survey_data = SurveyData.objects.only('id', 'md_data', 'inc_data', 'azi_data', 'array_ref').get(
+            id=survey_data_id
+        )
+        md = np.asarray(survey_data.column_array('md_data'), dtype=float)
+        inc = np.asarray(survey_data.column_array('inc_data'), dtype=float)
+        azi = np.asarray(survey_data.column_array('azi_data'), dtype=float)
+        count = min(len(md), len(inc), len(azi))
+        md, inc, azi = md[:count], inc[:count], azi[:count]
+        finite = np.isfinite(md) & np.isfinite(inc) & np.isfinite(azi)
+        order = np.argsort(md[finite], kind='stable')
+        return md[finite][order], inc[finite][order], azi[finite][order]
+
+    @staticmethod
+    def _station_sources(segments: List[Dict], count: int) -> List[str]:
+        """Source survey id of each of the first ``count`` stored stations."""
+        source_ids = []
+        for segment in segments:
+            source_ids.extend([segment['survey_data_id']] * (segment['stop_index'] - segment['start_index']))
+        return source_ids[:count]
+
+    @staticmethod
+    def _segments(source_ids: List[str], md: np.ndarray, entries: List[Dict]) -> List[Dict]:
+        """Contiguous station ranges per source survey."""
+        described = {entry['survey_data_id']: entry for entry in entries}
+        segments = []
+        for index, survey_id in enumerate(source_ids):
+            if segments and segments[-1]['survey_data_id'] == survey_id:
+                segments[-1]['stop_index'] = index + 1
+                segments[-1]['md_to'] = float(md[index])
+                continue
+            entry = described[survey_id]
+            segments.append({
+                'survey_data_id': survey_id,
+                'run_id': entry['run_id'],
+                'run_number': entry['run_number'],
+                'survey_type': entry['survey_type'],
+                'start_index': index,
+                'stop_index': index + 1,
+                'md_from': float(md[index]),
+                'md_to': float(md[index]),
+            })
+        return segments
@@ -9,6 +9,8 @@ from typing import Dict, List, Optional
 import logging
 
 from survey_api.exceptions import WellengCalculationError
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.metrics_service import span
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,7 @@ class WellengService:
     """Service for performing welleng calculations on survey data."""
 
     @staticmethod
+    @span('welleng.calculate_survey')
     def calculate_survey(
         md: List[float],
         inc: List[float],
@@ -28,7 +31,30 @@ class WellengService:
     ) -> Dict:
         """
         Calculate survey trajectory using welleng library.
+
+        Runs in the compute pool so the web worker stays responsive.
+
+        Raises:
+            WellengCalculationError: If the calculation fails
+            ComputeCapacityError: If the compute pool is saturated
+            ComputeTimeoutError: If the calculation does not finish in time
         """
+        return compute_pool.run(
+            WellengService._calculate_survey,
+            md, inc, azi, tie_on_data, location_data, survey_type, vertical_section_azimuth
+        )
+
+    @staticmethod
+    def _calculate_survey(
+        md: List[float],
+        inc: List[float],
+        azi: List[float],
+        tie_on_data: Dict,
+        location_data: Dict,
+        survey_type: str = 'MWD',
+        vertical_section_azimuth: float = None
+    ) -> Dict:
+        """Welleng trajectory calculation (executed in a compute pool worker)."""
         try:
             from welleng.survey import Survey, SurveyHeader
 
@@ -141,13 +167,13 @@ class WellengService:
                 f"Direction={closure_direction_list[-1]:.2f}°"
             )
 
-            northing = [None if np.isnan(x) else round(float(x), 2) for x in northing_array]
-            easting = [None if np.isnan(x) else round(float(x), 2) for x in easting_array]
-            tvd = [None if np.isnan(x) else float(x) for x in tvd_array]
-            dls = [None if np.isnan(x) else float(x) for x in dls_array]
-            build_rate = [None if np.isnan(x) else float(x) for x in build_rate_array]
-            turn_rate = [None if np.isnan(x) else float(x) for x in turn_rate_array]
-            vertical_section = [None if np.isnan(x) else float(x) for x in vertical_section_array]
+            northing = [None if not np.isfinite(x) else round(float(x), 2) for x in northing_array]
+            easting = [None if not np.isfinite(x) else round(float(x), 2) for x in easting_array]
+            tvd = [None if not np.isfinite(x) else float(x) for x in tvd_array]
+            dls = [None if not np.isfinite(x) else float(x) for x in dls_array]
+            build_rate = [None if not np.isfinite(x) else float(x) for x in build_rate_array]
+            turn_rate = [None if not np.isfinite(x) else float(x) for x in turn_rate_array]
+            vertical_section = [None if not np.isfinite(x) else float(x) for x in vertical_section_array]
 
             logger.info(f"Welleng calculation completed successfully for {len(md)} points")
 
@@ -279,6 +305,7 @@ class WellengService:
         return inc_new, azi_new_deg
 
     @staticmethod
+    @span('welleng.interpolate_survey')
     def interpolate_survey(
         calculated_data: Dict,
         resolution: int = 5,
@@ -288,7 +315,28 @@ class WellengService:
     ) -> Dict:
         """
         Interpolate calculated survey to specified resolution using welleng's interpolate_survey.
+
+        Runs in the compute pool so the web worker stays responsive.
+
+        Raises:
+            WellengCalculationError: If the interpolation fails
+            ComputeCapacityError: If the compute pool is saturated
+            ComputeTimeoutError: If the interpolation does not finish in time
         """
+        return compute_pool.run(
+            WellengService._interpolate_survey,
+            calculated_data, resolution, start_md, end_md, vertical_section_azimuth
+        )
+
+    @staticmethod
+    def _interpolate_survey(
+        calculated_data: Dict,
+        resolution: int = 5,
+        start_md: Optional[float] = None,
+        end_md: Optional[float] = None,
+        vertical_section_azimuth: Optional[float] = None
+    ) -> Dict:
+        """Welleng interpolation (executed in a compute pool worker)."""
         try:
             from welleng.survey import Survey, SurveyHeader
 
@@ -56,6 +56,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "survey_api.middleware.RequestMetricsMiddleware",
 ]
 
 ROOT_URLCONF = "survey_api.urls"
@@ -156,10 +157,11 @@ REST_FRAMEWORK = {
 }
 
 # Redis Configuration
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
-        "LOCATION": config('REDIS_URL', default='redis://localhost:6379/0'),
+        "BACKEND": "survey_api.cache_backends.InstrumentedRedisCache",
+        "LOCATION": REDIS_URL,
     }
 }
 
@@ -185,3 +187,78 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
+
+# Performance instrumentation (see survey_api.middleware.RequestMetricsMiddleware)
+SLOW_REQUEST_THRESHOLD_MS = config('SLOW_REQUEST_THRESHOLD_MS', default=1000, cast=int)
+SLOW_REQUEST_TOP_QUERIES = config('SLOW_REQUEST_TOP_QUERIES', default=5, cast=int)
+# Optional bearer token required to scrape /metrics
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# Metrics are totalled across gunicorn workers in Redis; empty keeps them per process
+METRICS_REDIS_URL = config('METRICS_REDIS_URL', default=REDIS_URL)
+METRICS_REDIS_PREFIX = config('METRICS_REDIS_PREFIX', default='survey_api_metrics')
+METRICS_REDIS_TIMEOUT = config('METRICS_REDIS_TIMEOUT', default=1.0, cast=float)
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5.0, cast=float)
+
+# Compute pool for CPU-bound welleng/matplotlib work (see survey_api.services.compute_pool)
+COMPUTE_POOL_ENABLED = config('COMPUTE_POOL_ENABLED', default=True, cast=bool)
+COMPUTE_POOL_WORKERS = config('COMPUTE_POOL_WORKERS', default=2, cast=int)
+COMPUTE_POOL_MAX_PENDING = config('COMPUTE_POOL_MAX_PENDING', default=4, cast=int)
+COMPUTE_POOL_ADMISSION_TIMEOUT = config('COMPUTE_POOL_ADMISSION_TIMEOUT', default=5, cast=float)
+COMPUTE_POOL_TASK_TIMEOUT = config('COMPUTE_POOL_TASK_TIMEOUT', default=120, cast=float)
+
+# Rendered report plot images (see survey_api.services.plot_service); keys include updated_at
+PLOT_CACHE_TIMEOUT = config('PLOT_CACHE_TIMEOUT', default=7 * 24 * 3600, cast=int)
+
+# Generated PDF reports (see survey_api.services.report_artifact_store)
+REPORT_ARTIFACT_DIR = config('REPORT_ARTIFACT_DIR', default=str(BASE_DIR.parent / 'report_artifacts'))
+REPORT_ARTIFACT_MAX_BYTES = config('REPORT_ARTIFACT_MAX_BYTES', default=2 * 1024 ** 3, cast=int)
+REPORT_PREGENERATE = config('REPORT_PREGENERATE', default=True, cast=bool)
+# Quiet period before a changed report is pre-generated, so bursts of saves render it once
+REPORT_PREGENERATE_DELAY = config('REPORT_PREGENERATE_DELAY', default=30, cast=float)
+
+# Job report bundles (see survey_api.services.report_bundle_service)
+REPORT_BUNDLE_TIMEOUT = config('REPORT_BUNDLE_TIMEOUT', default=900, cast=float)
+REPORT_BUNDLE_PROGRESS_TTL = config('REPORT_BUNDLE_PROGRESS_TTL', default=3600, cast=int)
+
+# Coalescing of concurrent identical computations (see survey_api.services.single_flight)
+SINGLE_FLIGHT_LOCK_TTL = config('SINGLE_FLIGHT_LOCK_TTL', default=300, cast=int)
+SINGLE_FLIGHT_WAIT_TIMEOUT = config('SINGLE_FLIGHT_WAIT_TIMEOUT', default=150, cast=float)
+SINGLE_FLIGHT_RESULT_TTL = config('SINGLE_FLIGHT_RESULT_TTL', default=30, cast=int)
+
+# Batch recalculation of a job's or well's surveys (see survey_api.services.batch_calculation_service)
+BATCH_CALCULATION_MAX_SURVEYS = config('BATCH_CALCULATION_MAX_SURVEYS', default=200, cast=int)
+BATCH_CALCULATION_TIMEOUT = config('BATCH_CALCULATION_TIMEOUT', default=600, cast=float)
+
+# Large survey arrays as memory-mapped .npy files (see survey_api.utils.array_store)
+SURVEY_ARRAY_STORE_ENABLED = config('SURVEY_ARRAY_STORE_ENABLED', default=False, cast=bool)
+SURVEY_ARRAY_STORE_MIN_POINTS = config('SURVEY_ARRAY_STORE_MIN_POINTS', default=5000, cast=int)
+SURVEY_ARRAY_STORE_DIR = config('SURVEY_ARRAY_STORE_DIR', default='') or None
+
+# Abandoned GTL QA uploads and temp files (see survey_api.services.qa_temp_files)
+QA_TEMP_FILE_TTL = config('QA_TEMP_FILE_TTL', default=24 * 3600, cast=int)
+
+# Recalculation after run input changes (see survey_api.services.recalculation_service)
+RECALCULATION_EAGER = config('RECALCULATION_EAGER', default=True, cast=bool)
+RECALCULATION_WORKERS = config('RECALCULATION_WORKERS', default=1, cast=int)
+
+# Per-station geographic coordinates (see survey_api.services.survey_calculation_service)
+GEOGRAPHIC_COORDINATES_EAGER = config('GEOGRAPHIC_COORDINATES_EAGER', default=False, cast=bool)
+
+# Trajectory proximity index (see survey_api.services.spatial_index_service)
+SPATIAL_INDEX_SEGMENT_LENGTH = config('SPATIAL_INDEX_SEGMENT_LENGTH', default=30.0, cast=float)
+SPATIAL_INDEX_SEARCH_RADIUS = config('SPATIAL_INDEX_SEARCH_RADIUS', default=500.0, cast=float)
+SPATIAL_INDEX_MAX_RADIUS = config('SPATIAL_INDEX_MAX_RADIUS', default=5000.0, cast=float)
+
+# Anti-collision clearance scans (see survey_api.services.clearance_service)
+CLEARANCE_SCREENING_DISTANCE = config('CLEARANCE_SCREENING_DISTANCE', default=1000.0, cast=float)
+CLEARANCE_SIGMA_SCALE = config('CLEARANCE_SIGMA_SCALE', default=3.5, cast=float)
+CLEARANCE_SF_STOP = config('CLEARANCE_SF_STOP', default=1.0, cast=float)
+CLEARANCE_SF_WARNING = config('CLEARANCE_SF_WARNING', default=1.5, cast=float)
+CLEARANCE_MAX_PAIRS = config('CLEARANCE_MAX_PAIRS', default=1000000, cast=int)
+
+# Positional uncertainty / error ellipses (see survey_api.services.uncertainty_service)
+UNCERTAINTY_EAGER = config('UNCERTAINTY_EAGER', default=False, cast=bool)
+UNCERTAINTY_CACHE_TIMEOUT = config('UNCERTAINTY_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Composite well paths (see survey_api.services.well_path_service)
+WELL_PATH_SOURCE_PRIORITY = config('WELL_PATH_SOURCE_PRIORITY', default='Gyro,GTL,MWD,Unknown').split(',')
@@ -38,7 +38,7 @@ from survey_api.views.depth_viewset import DepthViewSet
 from survey_api.views.survey_viewset import SurveyViewSet
 from survey_api.views.tieon_viewset import TieOnViewSet
 from survey_api.views.upload_viewset import upload_survey_file, delete_survey_file
-from survey_api.views.qa_viewset import upload_gtl_for_qa, save_qa_approved, delete_qa_record, approve_gtl_qa_temp, download_qc_report
+from survey_api.views.qa_viewset import upload_gtl_for_qa, save_qa_approved, delete_qa_record, rescore_qa, download_qc_report
 from survey_api.views.status_viewset import get_survey_status
 from survey_api.views.survey_data_viewset import get_survey_data_detail, generate_survey_report_view, approve_qa_and_calculate
 from survey_api.views.calculation_viewset import CalculationViewSet
@@ -78,6 +78,7 @@ from survey_api.views.master_data_viewset import (
 from survey_api.views.extrapolation_viewset import ExtrapolationViewSet
 from survey_api.views.duplicate_survey_viewset import DuplicateSurveyViewSet
 from survey_api.views.activity_log_viewset import RunActivityLogViewSet
+from survey_api.views.metrics_views import metrics_view
 
 # Initialize DRF router
 router = DefaultRouter()
@@ -99,6 +100,9 @@ router.register(r'activity-logs', RunActivityLogViewSet, basename='activity-log'
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # Prometheus metrics endpoint
+    path("metrics", metrics_view, name="metrics"),
+
     # Authentication endpoints
     path("api/v1/auth/register", register_view, name="auth_register"),
     path("api/v1/auth/login", login_view, name="auth_login"),
@@ -128,9 +132,9 @@ urlpatterns = [
 
     # GTL QA endpoints
     path("api/v1/surveys/gtl/qa/upload/", upload_gtl_for_qa, name="upload_gtl_for_qa"),
-    path("api/v1/surveys/gtl/qa/temp/<str:temp_qa_id>/approve/", approve_gtl_qa_temp, name="approve_gtl_qa_temp"),
     path("api/v1/surveys/gtl/qa/<uuid:qa_id>/save/", save_qa_approved, name="save_qa_approved"),
     path("api/v1/surveys/gtl/qa/<uuid:qa_id>/delete/", delete_qa_record, name="delete_qa_record"),
+    path("api/v1/surveys/gtl/qa/<uuid:qa_id>/rescore/", rescore_qa, name="rescore_qa"),
     path("api/v1/surveys/qa/<uuid:qa_id>/report/", download_qc_report, name="download_qc_report"),
 
     # Survey file delete endpoint
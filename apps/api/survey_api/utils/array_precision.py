@@ -0,0 +1,79 @@
+"""
+Per-column storage precision for survey arrays.
+
+Raw inputs (MD, Inc, Azi, G(t), W(t)) are kept exactly as parsed. Derived
+columns (positions, angles and rates computed from them) are stored quantized:
+
+- JSON columns are rounded to a fixed number of decimals, i.e. scaled-integer
+  quantization with a step of 10^-decimals. This roughly halves the stored
+  text of the largest tables.
+- Offloaded columns (survey_api.utils.array_store) are written as float32
+  instead of float64. They are rounded back to the same decimals when read.
+
+Tolerances (maximum absolute error introduced):
+
+    POSITION  decimals=3  +/- 0.0005 m        (reports and exports show 0.01 m)
+    ANGLE     decimals=4  +/- 0.00005 deg     (reports show 0.01 deg)
+    RATE      decimals=4  +/- 0.00005 deg/30m
+
+float32 keeps those steps exact below 16,384 m / deg. Larger values are stored
+as float64 regardless of the policy.
+
+Usage:
+    values = quantize(values, POSITION)
+"""
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Largest magnitude at which float32 still resolves a 0.001 step
+FLOAT32_SAFE_LIMIT = 2 ** 14
+
+
+@dataclass(frozen=True)
+class ColumnPrecision:
+    """Storage precision of one array column."""
+    dtype: str
+    decimals: Optional[int] = None
+
+    @property
+    def tolerance(self) -> float:
+        """Maximum absolute error introduced by quantization."""
+        return 0.0 if self.decimals is None else 0.5 * 10 ** -self.decimals
+
+
+RAW = ColumnPrecision('<f8')
+POSITION = ColumnPrecision('<f4', decimals=3)
+ANGLE = ColumnPrecision('<f4', decimals=4)
+RATE = ColumnPrecision('<f4', decimals=4)
+
+
+def quantize(values: Optional[Sequence], precision: ColumnPrecision) -> Optional[List]:
+    """
+    Round a JSON column to its precision (None and non-finite values are kept).
+
+    Args:
+        values: Column values
+        precision: Column precision policy
+
+    Returns:
+        New list, or ``values`` unchanged for RAW columns and None
+    """
+    if values is None or precision.decimals is None:
+        return values
+    decimals = precision.decimals
+    return [
+        round(v, decimals) if isinstance(v, (int, float)) and math.isfinite(v) else v
+        for v in values
+    ]
+
+
+def storage_dtype(array: np.ndarray, precision: ColumnPrecision) -> str:
+    """On-disk dtype for a column: the policy dtype unless values exceed float32's safe range."""
+    if precision.dtype == '<f4':
+        finite = np.abs(array[np.isfinite(array)])
+        if finite.max(initial=0.0) >= FLOAT32_SAFE_LIMIT:
+            return '<f8'
+    return precision.dtype
@@ -0,0 +1,220 @@
+"""
+On-disk array store for large survey datasets.
+
+Per-station columns are written as ``.npy`` files under
+``survey_files/arrays/<table>/<pk>/<column>-<checksum>.npy``. The model row
+keeps only a reference: file name, length and checksum for each column. Reads go through
+``np.load(mmap_mode='r')``, so slicing an MD window copies nothing and reads
+only the pages it needs.
+
+Missing values (JSON null) are stored as NaN. They come back as None when a
+column is read as a list.
+
+Derived columns can be written as float32 under a precision policy (see
+survey_api.utils.array_precision). Each column's dtype and decimals are kept
+in the reference, and reads round back to those decimals.
+
+Usage:
+    ref = array_store.write('survey_data', pk, {'md_data': md, 'inc_data': inc})
+    md = array_store.open(ref, 'md_data')       # read-only memmap
+    window = md[start:stop]
+    values = array_store.read_list(ref, 'inc_data')
+"""
+import hashlib
+import logging
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from survey_api.exceptions import ArrayStoreIntegrityError
+from survey_api.utils.array_precision import RAW, ColumnPrecision, storage_dtype
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DTYPE = '<f8'
+
+
+def to_array(values: Optional[Sequence]) -> np.ndarray:
+    """Convert a JSON column (floats with None for missing) to a float64 array."""
+    if values is None:
+        return np.empty(0, dtype=DTYPE)
+    try:
+        return np.asarray(values, dtype=DTYPE)
+    except (TypeError, ValueError):
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=DTYPE)
+
+
+def to_list(array: np.ndarray, decimals: Optional[int] = None) -> List[Optional[float]]:
+    """Convert a stored column back to its JSON form (NaN -> None, rounded to ``decimals``)."""
+    array = np.asarray(array, dtype=DTYPE)
+    if decimals is not None:
+        array = np.round(array, decimals)
+    values = array.tolist()
+    if np.isnan(array).any():
+        return [None if math.isnan(v) else v for v in values]
+    return values
+
+
+def checksum(array: np.ndarray) -> str:
+    """SHA-256 of the column's raw data as stored (dtype included)."""
+    digest = hashlib.sha256(array.dtype.str.encode('ascii'))
+    digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class ArrayStore:
+    """
+    Column files on local disk keyed by table, row id and column name.
+
+    Settings:
+        SURVEY_ARRAY_STORE_DIR: Root directory (default ``survey_files/arrays`` in default storage)
+    """
+
+    @property
+    def root(self) -> Path:
+        configured = getattr(settings, 'SURVEY_ARRAY_STORE_DIR', None)
+        return Path(configured) if configured else Path(default_storage.path('survey_files/arrays'))
+
+    def _dir(self, table: str, pk) -> Path:
+        return self.root / table / str(pk)
+
+    def write(self, table: str, pk, columns: Dict[str, Optional[Sequence]],
+              ref: Optional[Dict] = None, precision: Optional[Dict[str, ColumnPrecision]] = None) -> Dict:
+        """
+        Write columns for one row and return the updated reference.
+
+        Columns whose data matches the existing reference are not rewritten.
+        A None value removes the column from the reference.
+
+        Args:
+            table: Model table name
+            pk: Row primary key
+            columns: Column name -> values (list or array)
+            ref: Existing reference to update
+            precision: Column name -> precision policy (default RAW float64)
+
+        Returns:
+            Reference dict for the model's ``array_ref`` field
+        """
+        directory = self._dir(table, pk)
+        ref = {
+            'version': FORMAT_VERSION,
+            'table': table,
+            'pk': str(pk),
+            'columns': dict((ref or {}).get('columns', {})),
+        }
+
+        for name, values in columns.items():
+            if values is None:
+                ref['columns'].pop(name, None)
+                continue
+
+            policy = (precision or {}).get(name, RAW)
+            array = to_array(values)
+            array = array.astype(storage_dtype(array, policy), copy=False)
+            digest = checksum(array)
+            existing = ref['columns'].get(name)
+            if existing and existing['checksum'] == digest and (directory / existing['file']).exists():
+                continue
+
+            directory.mkdir(parents=True, exist_ok=True)
+            # Content-addressed, so a rolled-back save never clobbers the committed file
+            file_name = f"{name}-{digest[:16]}.npy"
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    np.save(tmp, array, allow_pickle=False)
+                os.replace(tmp_path, directory / file_name)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+            ref['columns'][name] = {
+                'file': file_name,
+                'length': int(array.size),
+                'checksum': digest,
+                'dtype': array.dtype.str,
+                'decimals': policy.decimals,
+            }
+            logger.debug(f"Wrote {table}/{pk}/{file_name} ({array.size} values)")
+
+        return ref
+
+    def _column_path(self, ref: Dict, name: str) -> Path:
+        try:
+            entry = ref['columns'][name]
+        except KeyError:
+            raise ArrayStoreIntegrityError(f"Column {name} is not in the array store reference")
+        return self._dir(ref['table'], ref['pk']) / entry['file']
+
+    def has(self, ref: Optional[Dict], name: str) -> bool:
+        """Whether ``ref`` holds column ``name``."""
+        return bool(ref) and name in ref.get('columns', {})
+
+    def open(self, ref: Dict, name: str) -> np.ndarray:
+        """
+        Memory-map a column read-only.
+
+        The checksum is not verified here (that would read the whole file);
+        use ``verify`` or ``read_list`` when integrity matters more than I/O.
+
+        Raises:
+            ArrayStoreIntegrityError: File missing or of the wrong length
+        """
+        path = self._column_path(ref, name)
+        try:
+            array = np.load(path, mmap_mode='r', allow_pickle=False)
+        except FileNotFoundError:
+            raise ArrayStoreIntegrityError(f"Array file missing: {path}")
+        if array.shape != (ref['columns'][name]['length'],):
+            raise ArrayStoreIntegrityError(f"Array file {path} has shape {array.shape}")
+        return array
+
+    def read_list(self, ref: Dict, name: str) -> List[Optional[float]]:
+        """
+        Read a whole column as a JSON-style list, verifying its checksum.
+
+        Raises:
+            ArrayStoreIntegrityError: File missing, truncated or modified
+        """
+        array = np.asarray(self.open(ref, name))
+        if checksum(array) != ref['columns'][name]['checksum']:
+            raise ArrayStoreIntegrityError(f"Checksum mismatch for {ref['table']}/{ref['pk']}/{name}")
+        return to_list(array, ref['columns'][name].get('decimals'))
+
+    def read_window(self, ref: Dict, name: str, window: slice) -> List[Optional[float]]:
+        """Read ``window`` of a column as a list; only the window's pages are touched."""
+        return to_list(self.open(ref, name)[window], ref['columns'][name].get('decimals'))
+
+    def verify(self, ref: Dict) -> List[str]:
+        """Return the names of columns that are missing or fail their checksum."""
+        bad = []
+        for name in ref.get('columns', {}):
+            try:
+                self.read_list(ref, name)
+            except ArrayStoreIntegrityError:
+                bad.append(name)
+        return bad
+
+    def prune(self, table: str, pk, ref: Dict):
+        """Remove column files of a row that ``ref`` no longer points to."""
+        keep = {entry['file'] for entry in ref.get('columns', {}).values()}
+        for path in self._dir(table, pk).glob('*.npy'):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
+
+    def delete(self, table: str, pk):
+        """Remove every column file of a row."""
+        shutil.rmtree(self._dir(table, pk), ignore_errors=True)
+
+
+# Process-wide store
+array_store = ArrayStore()
@@ -0,0 +1,301 @@
+"""
+Conditional GET helpers for heavy survey resources.
+
+ETags are derived from row identifiers and ``updated_at`` stamps fetched with
+``values_list`` so a revalidation request can be answered with 304 Not Modified
+before any of the large JSON array columns are loaded.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from rest_framework import status
+from rest_framework.response import Response
+
+# Clients may reuse the cached body but must revalidate on every use.
+REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def compute_etag(*parts) -> str:
+    """
+    Build a strong ETag from an ordered sequence of version parts.
+
+    Args:
+        *parts: Values identifying the representation (ids, timestamps,
+            query parameters). Nested lists/tuples are flattened.
+
+    Returns:
+        Quoted ETag string, e.g. '"3f2a..."'
+    """
+    digest = hashlib.sha1()
+    for part in _flatten(parts):
+        if hasattr(part, 'isoformat'):
+            part = part.isoformat()
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x1f')
+    return f'"{digest.hexdigest()}"'
+
+
+def _flatten(parts: Iterable):
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            yield from _flatten(part)
+        else:
+            yield part
+
+
+def etag_matches(request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches the ETag.
+
+    Weak comparison is used as required by RFC 9110 for If-None-Match.
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Build an empty 304 response carrying the current validators."""
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    return set_etag_headers(response, etag)
+
+
+def set_etag_headers(response, etag: Optional[str]):
+    """
+    Attach ETag and revalidation Cache-Control headers to a response.
+
+    Args:
+        response: DRF Response or Django HttpResponse
+        etag: Quoted ETag string (no-op if None)
+
+    Returns:
+        The same response instance
+    """
+    if etag:
+        response['ETag'] = etag
+        response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
+
+
+def conditional_response(request, etag: Optional[str]) -> Optional[Response]:
+    """
+    Return a 304 response if the client already holds the current version.
+
+    Usage in a view:
+        etag = ...
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+        ...build full response...
+        return set_etag_headers(response, etag)
+    """
+    if etag and request.method in ('GET', 'HEAD') and etag_matches(request, etag):
+        return not_modified_response(etag)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Resource-specific ETag builders. Each issues only narrow values() queries.
+# ---------------------------------------------------------------------------
+
+def survey_data_detail_etag(survey_data_id) -> Optional[str]:
+    """
+    ETag for the survey data detail endpoint.
+
+    Covers SurveyData, its CalculatedSurvey, QualityCheck and the well
+    Location whose G(t)/W(t) feed the QA summary.
+    """
+    from survey_api.models import SurveyData, CalculatedSurvey, QualityCheck
+
+    row = SurveyData.objects.filter(id=survey_data_id).values_list(
+        'id',
+        'updated_at',
+        'validation_status',
+        'survey_file_id',
+        'survey_file__file_name',
+        'survey_file__run__well__location__updated_at',
+    ).first()
+    if row is None:
+        return None
+
+    calculated = CalculatedSurvey.objects.filter(
+        survey_data_id=survey_data_id
+    ).values_list('id', 'updated_at').first()
+    quality_check = QualityCheck.objects.filter(
+        survey_data_id=survey_data_id
+    ).values_list('id', 'updated_at', 'status').first()
+
+    return compute_etag('survey-data', row, calculated or '-', quality_check or '-')
+
+
+def calculated_survey_etag(calculated_survey_id, *extra) -> Optional[str]:
+    """
+    ETag for a CalculatedSurvey representation.
+
+    Includes the source SurveyData stamp because MD/Inc/Azi are served
+    from there alongside the calculated arrays.
+    """
+    from survey_api.models import CalculatedSurvey
+
+    row = CalculatedSurvey.objects.filter(id=calculated_survey_id).values_list(
+        'id', 'updated_at', 'survey_data_id', 'survey_data__updated_at'
+    ).first()
+    if row is None:
+        return None
+    return compute_etag('calculated-survey', row, extra)
+
+
+def calculation_results_etag(survey_data_id) -> Optional[str]:
+    """ETag for calculation results looked up by SurveyData id."""
+    from survey_api.models import CalculatedSurvey
+
+    row = CalculatedSurvey.objects.filter(survey_data_id=survey_data_id).values_list(
+        'id', 'updated_at'
+    ).first()
+    if row is None:
+        return None
+    return compute_etag('calculation-results', row)
+
+
+def geographic_coordinates_etag(survey_data_id) -> Optional[str]:
+    """ETag for per-station geographic coordinates (calculation plus well location versions)."""
+    from django.db.models import Q
+    from survey_api.models import CalculatedSurvey, Location
+
+    row = CalculatedSurvey.objects.filter(survey_data_id=survey_data_id).values_list(
+        'id', 'updated_at', 'survey_data__survey_file__run_id',
+        'survey_data__survey_file__run__well_id', 'survey_data__survey_file__run__job__well_id'
+    ).first()
+    if row is None:
+        return None
+    calculated_id, updated_at, run_id, well_id, job_well_id = row
+    locations = list(
+        Location.objects.filter(
+            Q(run_id=run_id) | Q(well_id__in=[well for well in (well_id, job_well_id) if well])
+        ).order_by('id').values_list('id', 'updated_at')
+    )
+    return compute_etag('geographic-coordinates', (calculated_id, updated_at), locations)
+
+
+def uncertainty_etag(survey_data_id, error_model: Optional[str] = None) -> Optional[str]:
+    """ETag for per-station positional uncertainty (calculation version plus error model)."""
+    from survey_api.models import CalculatedSurvey
+
+    row = CalculatedSurvey.objects.filter(survey_data_id=survey_data_id).values_list(
+        'id', 'updated_at'
+    ).first()
+    if row is None:
+        return None
+    return compute_etag('uncertainty', row, error_model or '')
+
+
+def well_path_etag(well_id) -> Optional[str]:
+    """ETag for the composite well path of a well."""
+    from survey_api.models import WellPathComposite
+
+    row = WellPathComposite.objects.filter(well_id=well_id).values_list('id', 'updated_at').first()
+    if row is None:
+        return None
+    return compute_etag('well-path', row)
+
+
+def interpolation_list_etag(calculated_survey_id) -> str:
+    """ETag for the list of saved interpolations of a calculated survey."""
+    from survey_api.models import InterpolatedSurvey
+
+    rows = list(
+        InterpolatedSurvey.objects.filter(
+            calculated_survey_id=calculated_survey_id
+        ).order_by('resolution').values_list('id', 'updated_at')
+    )
+    return compute_etag('interpolations', str(calculated_survey_id), rows)
+
+
+def interpolation_preview_etag(calculated_survey_id, resolution, start_md=None, end_md=None) -> Optional[str]:
+    """
+    ETag for the on-demand interpolation endpoint.
+
+    The fresh interpolation is a pure function of the calculated survey,
+    its source stations and the request parameters, so those (plus the
+    saved-state flag reported in the body) fully identify the response.
+    """
+    from survey_api.models import InterpolatedSurvey
+
+    saved = InterpolatedSurvey.objects.filter(
+        calculated_survey_id=calculated_survey_id,
+        resolution=int(resolution)
+    ).values_list('id', 'updated_at').first()
+    return calculated_survey_etag(
+        calculated_survey_id,
+        'interpolation', int(resolution), start_md, end_md, saved or '-'
+    )
+
+
+def comparison_etag(comparison_id) -> Optional[str]:
+    """
+    ETag for a ComparisonResult.
+
+    Comparisons are immutable once created (recomputation deletes and
+    recreates the row), so id and created_at identify the version. The
+    source surveys' stamps are included to follow coordinate refreshes.
+    """
+    from survey_api.models import ComparisonResult
+
+    row = ComparisonResult.objects.filter(id=comparison_id).values_list(
+        'id',
+        'created_at',
+        'primary_survey__updated_at',
+        'reference_survey__updated_at',
+    ).first()
+    if row is None:
+        return None
+    return compute_etag('comparison', row)
+
+
+def run_detail_etag(run_id) -> Optional[str]:
+    """
+    ETag for the run detail endpoint.
+
+    Covers the run, its nested well/location/depth/tie-on/job/user records,
+    the runs listed under the nested well and each survey file's processing
+    state and calculation stamp.
+    """
+    from survey_api.models import Run, SurveyFile
+
+    row = Run.objects.filter(id=run_id).values_list(
+        'id',
+        'updated_at',
+        'well_id',
+        'well__updated_at',
+        'location__updated_at',
+        'depth__updated_at',
+        'tieon__updated_at',
+        'job_id',
+        'job__job_number',
+        'user__updated_at',
+    ).first()
+    if row is None:
+        return None
+
+    # WellSerializer lists (and counts) every run of the well's jobs
+    well_runs = []
+    if row[2] is not None:
+        well_runs = list(
+            Run.objects.filter(job__well_id=row[2]).order_by('id').values_list('id', 'updated_at')
+        )
+
+    files = list(
+        SurveyFile.objects.filter(run_id=run_id).order_by('id').values_list(
+            'id',
+            'processing_status',
+            'survey_role',
+            'reference_for_survey_id',
+            'survey_data__updated_at',
+            'survey_data__calculated_survey__updated_at',
+        )
+    )
+    return compute_etag('run', row, well_runs, files)
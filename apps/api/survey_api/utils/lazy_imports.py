@@ -0,0 +1,77 @@
+"""
+Lazy module proxies for heavy scientific dependencies.
+
+matplotlib, welleng (which pulls in scipy) and pandas add seconds to every
+worker boot, management command and test run when imported at module load.
+Service modules bind them through ``lazy_import`` instead; the real module
+is imported on first attribute access, i.e. only when a request needs it.
+
+Usage:
+    from survey_api.utils.lazy_imports import lazy_import
+
+    we = lazy_import('welleng')
+    pd = lazy_import('pandas')
+
+    def calculate(...):
+        survey = we.survey.Survey(...)   # welleng imported here
+
+Modules using a proxy in annotations need ``from __future__ import annotations``
+so signatures don't trigger the import at definition time.
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str, before_import: Optional[Callable[[], None]] = None):
+        super().__init__(name)
+        self.__dict__['_lazy_before_import'] = before_import
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    before_import = self.__dict__['_lazy_before_import']
+                    if before_import is not None:
+                        before_import()
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, before_import: Optional[Callable[[], None]] = None) -> ModuleType:
+    """
+    Return a proxy for module ``name`` that imports it on first use.
+
+    Args:
+        name: Dotted module name, e.g. 'matplotlib.pyplot'
+        before_import: Optional hook run once just before the import
+            (e.g. selecting the matplotlib backend)
+
+    Returns:
+        LazyModule proxy
+    """
+    return LazyModule(name, before_import)
+
+
+# Shared proxies for the heavy dependencies
+welleng = lazy_import('welleng')
+pandas = lazy_import('pandas')
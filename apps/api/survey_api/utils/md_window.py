@@ -0,0 +1,152 @@
+"""
+MD-window (range) selection for survey array responses.
+
+Array endpoints accept ``md_from``, ``md_to`` and ``stride`` query parameters.
+The window is found by binary search over the sorted MD column. Every
+parallel array is then sliced with the same ``start:stop:stride`` slice, so
+zoomed charts only receive the stations they show.
+
+With the on-disk array store (StoredArraysModel) ``take_columns`` slices the
+memory-mapped files directly; only the window is read from disk.
+
+Usage:
+    window = MDWindow.from_request(request)      # raises ValidationError
+    etag = window.vary(etag)
+    ...
+    data = serializer.data
+    window.apply(data, 'md_data', ['delta_x', 'delta_y'])
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from survey_api.exceptions import ValidationError
+from survey_api.utils.array_store import to_list
+from survey_api.utils.etags import compute_etag
+
+
+def _parse_float(request, name: str) -> Optional[float]:
+    raw = request.query_params.get(name)
+    if raw in (None, ''):
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValidationError(f"{name} must be a number", field_errors={name: ['A valid number is required.']})
+    if not np.isfinite(value):
+        raise ValidationError(f"{name} must be finite", field_errors={name: ['A finite number is required.']})
+    return value
+
+
+@dataclass(frozen=True)
+class MDWindow:
+    """Inclusive MD range plus a point stride."""
+    md_from: Optional[float] = None
+    md_to: Optional[float] = None
+    stride: int = 1
+
+    @classmethod
+    def from_request(cls, request) -> 'MDWindow':
+        """
+        Read ``md_from``, ``md_to`` and ``stride`` from the query string.
+
+        Raises:
+            ValidationError: Non-numeric values, md_from > md_to or stride < 1
+        """
+        md_from = _parse_float(request, 'md_from')
+        md_to = _parse_float(request, 'md_to')
+        if md_from is not None and md_to is not None and md_from > md_to:
+            raise ValidationError(
+                "md_from must not exceed md_to",
+                field_errors={'md_from': ['Must be less than or equal to md_to.']}
+            )
+
+        raw_stride = request.query_params.get('stride')
+        try:
+            stride = int(raw_stride) if raw_stride not in (None, '') else 1
+        except ValueError:
+            stride = 0
+        if stride < 1:
+            raise ValidationError("stride must be a positive integer", field_errors={'stride': ['Must be >= 1.']})
+
+        return cls(md_from, md_to, stride)
+
+    @property
+    def is_full(self) -> bool:
+        return self.md_from is None and self.md_to is None and self.stride == 1
+
+    def vary(self, etag: Optional[str]) -> Optional[str]:
+        """ETag for the windowed representation of a resource."""
+        if etag is None or self.is_full:
+            return etag
+        return compute_etag(etag, 'md-window', self.md_from, self.md_to, self.stride)
+
+    def locate(self, md: Sequence) -> slice:
+        """
+        Slice of the stations inside the window (MD must be increasing).
+
+        Args:
+            md: MD values as a list or numpy array (a memmap is searched in place)
+        """
+        if self.is_full or md is None:
+            return slice(None)
+        md = md if isinstance(md, np.ndarray) else np.asarray(md, dtype=float)
+        start = 0 if self.md_from is None else int(np.searchsorted(md, self.md_from, side='left'))
+        stop = len(md) if self.md_to is None else int(np.searchsorted(md, self.md_to, side='right'))
+        return slice(start, max(start, stop), self.stride)
+
+    def take(self, values: Optional[Sequence], window: slice, length: int):
+        """Slice one parallel array; values of another length (or None) are returned unchanged."""
+        if window == slice(None) or values is None or len(values) != length:
+            return values
+        values = values[window]
+        return to_list(values) if isinstance(values, np.ndarray) else values
+
+    def take_columns(self, instance, md: Sequence, names: Iterable[str]) -> Dict[str, Optional[List]]:
+        """
+        Windowed columns of a model instance, sliced from the array store when offloaded.
+
+        Args:
+            instance: Model instance holding the columns
+            md: The MD column the columns are parallel to
+            names: Column attribute names
+        """
+        window = self.locate(md)
+        length = len(md)
+        columns = {}
+        for name in names:
+            if window != slice(None) and hasattr(instance, 'column_slice'):
+                columns[name] = instance.column_slice(name, window, length)
+            else:
+                columns[name] = self.take(getattr(instance, name), window, length)
+        return columns
+
+    def apply(self, data: Dict, md_key: str, keys: Iterable[str]) -> Dict:
+        """
+        Slice ``data[md_key]`` and every parallel list in ``data`` in place.
+
+        Adds a ``window`` entry describing the selection when one is active.
+        """
+        md = data.get(md_key)
+        if self.is_full or md is None:
+            return data
+        window = self.locate(md)
+        length = len(md)
+        for key in (md_key, *keys):
+            if key in data:
+                data[key] = self.take(data[key], window, length)
+        data['window'] = self.describe(window, length)
+        return data
+
+    def describe(self, window: slice, length: int) -> Dict:
+        """Window metadata returned alongside sliced arrays."""
+        start, stop, _ = window.indices(length)
+        return {
+            'md_from': self.md_from,
+            'md_to': self.md_to,
+            'stride': self.stride,
+            'start_index': start,
+            'stop_index': stop,
+            'total_points': length,
+        }
@@ -0,0 +1,122 @@
+"""
+Compact per-station QA result encoding.
+
+A GTL quality check stores one status byte per station instead of five
+parallel result arrays:
+
+    bits 0-1  G(t) status   (0 = n/c, 1 = low, 2 = good, 3 = high)
+    bits 2-3  W(t) status
+    bit  4    overall PASS (clear = REMOVE)
+
+The G(t)/W(t) differences are not stored at all: they are recomputed from the
+station values and the location reference the check was scored against
+(station_differences).
+
+Stations kept on approval are stored as a bitmask (numpy.packbits order, one
+bit per station) over the original station arrays.
+
+Usage:
+    codes = encode_stations(g_status, w_status, overall_status)
+    g_status, w_status, overall_status = decode_stations(codes)
+    mask = pack_mask(kept_indices, station_count)
+    set_kept(bytearray(mask), index, False)
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STATUS_NAMES = ('n/c', 'low', 'good', 'high')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+W_T_SHIFT = 2
+PASS_BIT = 0x10
+STATUS_MASK = 0x03
+
+
+def station_difference(location_value: float, value: Optional[float]) -> float:
+    """Location reference minus station value, rounded as QA reports it (0.0 for missing values)."""
+    if value is None:
+        return 0.0
+    return round(location_value - value, 2)
+
+
+def station_differences(
+    location_g_t: float,
+    location_w_t: float,
+    gt_data: Sequence[Optional[float]],
+    wt_data: Sequence[Optional[float]]
+) -> Tuple[List[float], List[float]]:
+    """
+    Per-station G(t) and W(t) differences as QAService.calculate_qa_metrics reports them.
+
+    A station missing either reading is not scored, so both of its differences are 0.0.
+
+    Returns:
+        (G(t) differences, W(t) differences)
+    """
+    g_t_differences, w_t_differences = [], []
+    for g_t, w_t in zip(gt_data, wt_data):
+        scored = g_t is not None and w_t is not None
+        g_t_differences.append(station_difference(location_g_t, g_t) if scored else 0.0)
+        w_t_differences.append(station_difference(location_w_t, w_t) if scored else 0.0)
+    return g_t_differences, w_t_differences
+
+
+def encode_stations(
+    g_t_status: Sequence[str],
+    w_t_status: Sequence[str],
+    overall_status: Sequence[str]
+) -> bytes:
+    """
+    Pack per-station statuses into one byte per station.
+
+    Raises:
+        KeyError: If a status is not one of STATUS_NAMES
+    """
+    return bytes(
+        STATUS_CODES[g] | (STATUS_CODES[w] << W_T_SHIFT) | (PASS_BIT if overall == 'PASS' else 0)
+        for g, w, overall in zip(g_t_status, w_t_status, overall_status)
+    )
+
+
+def decode_stations(codes: bytes) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Unpack status bytes.
+
+    Returns:
+        (G(t) statuses, W(t) statuses, overall statuses) as lists of names
+    """
+    codes = bytes(codes or b'')
+    return (
+        [STATUS_NAMES[code & STATUS_MASK] for code in codes],
+        [STATUS_NAMES[(code >> W_T_SHIFT) & STATUS_MASK] for code in codes],
+        ['PASS' if code & PASS_BIT else 'REMOVE' for code in codes],
+    )
+
+
+def pack_mask(indices: Iterable[int], count: int) -> bytes:
+    """Bitmask of ``count`` stations with the given indices set (out-of-range indices are ignored)."""
+    bits = np.zeros(count, dtype=np.uint8)
+    kept = [i for i in indices if 0 <= i < count]
+    bits[kept] = 1
+    return np.packbits(bits).tobytes()
+
+
+def unpack_mask(mask: bytes, count: int) -> List[int]:
+    """Indices of the stations set in ``mask``."""
+    bits = np.unpackbits(np.frombuffer(bytes(mask), dtype=np.uint8), count=count)
+    return np.flatnonzero(bits).tolist()
+
+
+def set_kept(mask: bytearray, index: int, kept: bool) -> bool:
+    """
+    Set or clear station ``index`` in a packed mask in place.
+
+    Returns:
+        True if the bit changed
+    """
+    bit = 0x80 >> (index & 7)
+    if bool(mask[index >> 3] & bit) == kept:
+        return False
+    mask[index >> 3] ^= bit
+    return True
@@ -0,0 +1,138 @@
+"""
+File responses with HTTP Range support.
+
+Django's FileResponse always streams the whole file. Stored report artifacts
+are served through ``ranged_file_response`` so download managers and PDF
+viewers can resume or fetch byte ranges (RFC 9110 section 14), and unchanged
+artifacts revalidate with 304 Not Modified.
+"""
+import os
+import re
+from typing import Optional, Tuple
+
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+
+from survey_api.utils.etags import REVALIDATE_CACHE_CONTROL, etag_matches
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Marker returned by parse_range for ranges outside the file
+UNSATISFIABLE = (-1, -1)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: Header value, e.g. 'bytes=0-1023', 'bytes=1024-' or 'bytes=-500'
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, UNSATISFIABLE, or None when the
+        header is absent, malformed or multi-range (serve the whole file)
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return UNSATISFIABLE
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return UNSATISFIABLE
+    return start, end
+
+
+class _RangeReader:
+    """Read at most ``length`` bytes from an open file."""
+
+    def __init__(self, handle, length: int):
+        self._handle = handle
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._handle.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._handle.close()
+
+
+def ranged_file_response(request, file, filename: str, etag: Optional[str] = None,
+                         content_type: str = 'application/pdf') -> HttpResponse:
+    """
+    Serve a file as an attachment, honouring Range, If-Range and If-None-Match.
+
+    Args:
+        request: Django or DRF request
+        file: Path of the file on disk, or a file opened in binary mode (the
+            response takes ownership and closes it)
+        filename: Download filename for Content-Disposition
+        etag: Optional quoted ETag identifying the file content
+        content_type: Response content type
+
+    Returns:
+        200 FileResponse, 206 partial FileResponse, 304 or 416 response
+    """
+    handle = file if hasattr(file, 'read') else None
+    if etag and etag_matches(request, etag):
+        if handle is not None:
+            handle.close()
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    if handle is None:
+        handle = open(file, 'rb')
+    size = os.fstat(handle.fileno()).st_size
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+
+    # If-Range: only honour the range when the client's copy is current
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if byte_range is not None and if_range and if_range.strip() != etag:
+        byte_range = None
+
+    if byte_range == UNSATISFIABLE:
+        handle.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is not None:
+        start, end = byte_range
+        handle.seek(start)
+        response = FileResponse(
+            _RangeReader(handle, end - start + 1),
+            status=206,
+            content_type=content_type,
+            as_attachment=True,
+            filename=filename,
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(
+            handle,
+            content_type=content_type,
+            as_attachment=True,
+            filename=filename,
+        )
+
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+        response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
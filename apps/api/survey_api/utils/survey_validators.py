@@ -1,6 +1,7 @@
 """
 Survey file validation utilities.
 """
+import math
 from typing import Tuple, List, Dict, Any
 import logging
 
@@ -108,7 +109,7 @@ class SurveyFileValidator:
                 continue
 
             for idx, value in enumerate(data):
-                if value is None or (isinstance(value, float) and pd.isna(value)):
+                if value is None or (isinstance(value, float) and math.isnan(value)):
                     errors.append(
                         f"Missing value in {col_name} at row {idx + 1}"
                     )
@@ -221,14 +222,3 @@ class SurveyFileValidator:
                 pass  # Already caught in numeric validation
 
         return errors
-
-
-# Import pandas for isna check
-try:
-    import pandas as pd
-except ImportError:
-    # Fallback if pandas not available
-    class pd:
-        @staticmethod
-        def isna(value):
-            return value is None
@@ -0,0 +1,265 @@
+"""
+Vectorized Transverse Mercator projection (UTM) over NumPy arrays.
+
+Implements the Krüger series to sixth order in the third flattening
+(Karney 2011, "Transverse Mercator with an accuracy of a few nanometers"),
+accurate to well below a millimetre within 3,900 km of the central meridian:
+
+- forward: geographic latitude/longitude -> easting, northing, grid
+  convergence and point scale factor
+- inverse: easting/northing -> latitude, longitude, convergence and scale
+
+Every function takes scalars or arrays and broadcasts, so a whole field of
+locations or every station of a survey path converts in one call.
+
+Projections are on the ellipsoid of the location's geodetic datum; no datum
+shift is applied (results stay on the input datum).
+
+Convergence is the angle from true north to grid north, positive east of
+the central meridian in the northern hemisphere (degrees).
+
+Usage:
+    projection = TransverseMercator.utm(zone=40, south=False, ellipsoid=ellipsoid_for('PSD 93'))
+    easting, northing, convergence, scale = projection.forward(latitudes, longitudes)
+    latitudes, longitudes, _, _ = projection.inverse(eastings, northings)
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+UTM_SCALE_FACTOR = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+# Newton iterations of the inverse conformal latitude (converges in 2-3)
+INVERSE_ITERATIONS = 5
+
+
+class Ellipsoid(NamedTuple):
+    """Reference ellipsoid: semi-major axis (m) and flattening."""
+    name: str
+    a: float
+    f: float
+
+
+WGS84 = Ellipsoid('WGS84', 6378137.0, 1 / 298.257223563)
+GRS80 = Ellipsoid('GRS80', 6378137.0, 1 / 298.257222101)
+INTERNATIONAL_1924 = Ellipsoid('International 1924', 6378388.0, 1 / 297.0)
+CLARKE_1866 = Ellipsoid('Clarke 1866', 6378206.4, 1 / 294.978698214)
+CLARKE_1880_RGS = Ellipsoid('Clarke 1880 (RGS)', 6378249.145, 1 / 293.465)
+
+# Geodetic datum (normalized: upper case, no spaces/punctuation) -> ellipsoid
+DATUM_ELLIPSOIDS = {
+    'WGS84': WGS84,
+    'WGS1984': WGS84,
+    'UTM': WGS84,
+    'UNIVERSALTRANSVERSEMERCATOR': WGS84,
+    'GRS80': GRS80,
+    'NAD83': GRS80,
+    'ETRS89': GRS80,
+    'GDA94': GRS80,
+    'ED50': INTERNATIONAL_1924,
+    'INTERNATIONAL1924': INTERNATIONAL_1924,
+    'NAD27': CLARKE_1866,
+    'CLARKE1866': CLARKE_1866,
+    'PSD93': CLARKE_1880_RGS,
+    'CLARKE1880': CLARKE_1880_RGS,
+}
+
+# MGRS latitude bands south of the equator (N and S are read as hemispheres)
+SOUTHERN_BANDS = frozenset('CDEFGHJKLM')
+
+_ZONE_PATTERN = re.compile(r'(\d{1,2})\s*([A-Za-z])?')
+
+
+def ellipsoid_for(datum: Optional[str]) -> Ellipsoid:
+    """Ellipsoid of a geodetic datum or system name (WGS84 when unknown or empty)."""
+    key = re.sub(r'[^A-Z0-9]', '', (datum or '').upper())
+    return DATUM_ELLIPSOIDS.get(key, WGS84)
+
+
+def parse_zone(map_zone: Optional[str]) -> Tuple[Optional[int], Optional[bool]]:
+    """
+    Read a UTM zone identifier such as '15N', '56H' or 'Zone 40N(54E to 60E)'.
+
+    Returns:
+        (zone number or None, True for southern / False for northern hemisphere
+        or None when the identifier does not say)
+    """
+    match = _ZONE_PATTERN.search(map_zone or '')
+    if not match or not 1 <= int(match.group(1)) <= 60:
+        return None, None
+    letter = (match.group(2) or '').upper()
+    if letter == 'N':
+        return int(match.group(1)), False
+    if letter == 'S':
+        return int(match.group(1)), True
+    if letter:
+        return int(match.group(1)), letter in SOUTHERN_BANDS
+    return int(match.group(1)), None
+
+
+def utm_zone(latitude, longitude) -> np.ndarray:
+    """Standard UTM zone numbers (with the Norway and Svalbard exceptions)."""
+    lat = np.asarray(latitude, dtype=float)
+    lon = (np.asarray(longitude, dtype=float) + 180.0) % 360.0 - 180.0
+    zone = np.floor((lon + 180.0) / 6.0).astype(int) + 1
+    zone = np.where((lat >= 56) & (lat < 64) & (lon >= 3) & (lon < 12), 32, zone)
+    svalbard = (lat >= 72) & (lat < 84)
+    for lon_from, lon_to, svalbard_zone in ((0, 9, 31), (9, 21, 33), (21, 33, 35), (33, 42, 37)):
+        zone = np.where(svalbard & (lon >= lon_from) & (lon < lon_to), svalbard_zone, zone)
+    return np.minimum(zone, 60)
+
+
+def central_meridian(zone) -> np.ndarray:
+    """Central meridian (degrees) of UTM zones."""
+    return np.asarray(zone) * 6.0 - 183.0
+
+
+@lru_cache(maxsize=None)
+def _series(ellipsoid: Ellipsoid) -> Tuple[float, float, np.ndarray, np.ndarray]:
+    """Rectifying radius A, eccentricity and the Krüger alpha/beta coefficients."""
+    n = ellipsoid.f / (2 - ellipsoid.f)
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+    radius = ellipsoid.a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+    eccentricity = np.sqrt(ellipsoid.f * (2 - ellipsoid.f))
+    alpha = np.array([
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400,
+    ])
+    beta = np.array([
+        n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+        n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+        17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+        4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+        4583 * n5 / 161280 - 108847 * n6 / 3991680,
+        20648693 * n6 / 638668800,
+    ])
+    return radius, eccentricity, alpha, beta
+
+
+def _harmonics(xi: np.ndarray, eta: np.ndarray):
+    """sin/cos(2j xi) and sinh/cosh(2j eta) for j = 1..6, stacked on a leading axis."""
+    j2 = 2.0 * np.arange(1, 7).reshape((6,) + (1,) * xi.ndim)
+    return np.sin(j2 * xi), np.cos(j2 * xi), np.sinh(j2 * eta), np.cosh(j2 * eta), j2
+
+
+@dataclass(frozen=True)
+class TransverseMercator:
+    """A Transverse Mercator projection (central meridian, scale and false origin)."""
+    lon0: float
+    k0: float = UTM_SCALE_FACTOR
+    false_easting: float = UTM_FALSE_EASTING
+    false_northing: float = 0.0
+    ellipsoid: Ellipsoid = WGS84
+
+    @classmethod
+    def utm(cls, zone: int, south: bool = False, ellipsoid: Ellipsoid = WGS84) -> 'TransverseMercator':
+        """Projection of a UTM zone."""
+        return cls(
+            lon0=float(central_meridian(zone)),
+            false_northing=UTM_FALSE_NORTHING_SOUTH if south else 0.0,
+            ellipsoid=ellipsoid,
+        )
+
+    def forward(self, latitude, longitude) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Project geographic coordinates.
+
+        Args:
+            latitude: Latitudes (degrees)
+            longitude: Longitudes (degrees)
+
+        Returns:
+            (easting, northing, convergence in degrees, point scale factor)
+        """
+        radius, e, alpha, _ = _series(self.ellipsoid)
+        phi = np.radians(np.asarray(latitude, dtype=float))
+        lam = np.radians((np.asarray(longitude, dtype=float) - self.lon0 + 180.0) % 360.0 - 180.0)
+        phi, lam = np.broadcast_arrays(phi, lam)
+
+        cos_lam, sin_lam = np.cos(lam), np.sin(lam)
+        tau = np.tan(phi)
+        sigma = np.sinh(e * np.arctanh(e * tau / np.sqrt(1 + tau ** 2)))
+        tau_p = tau * np.sqrt(1 + sigma ** 2) - sigma * np.sqrt(1 + tau ** 2)
+
+        xi_p = np.arctan2(tau_p, cos_lam)
+        eta_p = np.arcsinh(sin_lam / np.sqrt(tau_p ** 2 + cos_lam ** 2))
+
+        sin2, cos2, sinh2, cosh2, j2 = _harmonics(xi_p, eta_p)
+        coefficients = alpha.reshape((6,) + (1,) * xi_p.ndim)
+        xi = xi_p + np.sum(coefficients * sin2 * cosh2, axis=0)
+        eta = eta_p + np.sum(coefficients * cos2 * sinh2, axis=0)
+
+        easting = self.k0 * radius * eta + self.false_easting
+        northing = self.k0 * radius * xi + self.false_northing
+
+        p = 1 + np.sum(j2 * coefficients * cos2 * cosh2, axis=0)
+        q = np.sum(j2 * coefficients * sin2 * sinh2, axis=0)
+        gamma = np.arctan(tau_p / np.sqrt(1 + tau_p ** 2) * np.tan(lam)) + np.arctan2(q, p)
+
+        sin_phi = np.sin(phi)
+        scale = (
+            self.k0
+            * np.sqrt(1 - e ** 2 * sin_phi ** 2) * np.sqrt(1 + tau ** 2) / np.sqrt(tau_p ** 2 + cos_lam ** 2)
+            * radius / self.ellipsoid.a * np.sqrt(p ** 2 + q ** 2)
+        )
+        return easting, northing, np.degrees(gamma), scale
+
+    def inverse(self, easting, northing) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert grid coordinates back to geographic coordinates.
+
+        Args:
+            easting: Eastings (m)
+            northing: Northings (m)
+
+        Returns:
+            (latitude, longitude in degrees, convergence in degrees, point scale factor)
+        """
+        radius, e, _, beta = _series(self.ellipsoid)
+        eta = (np.asarray(easting, dtype=float) - self.false_easting) / (self.k0 * radius)
+        xi = (np.asarray(northing, dtype=float) - self.false_northing) / (self.k0 * radius)
+        xi, eta = np.broadcast_arrays(xi, eta)
+
+        sin2, cos2, sinh2, cosh2, j2 = _harmonics(xi, eta)
+        coefficients = beta.reshape((6,) + (1,) * xi.ndim)
+        xi_p = xi - np.sum(coefficients * sin2 * cosh2, axis=0)
+        eta_p = eta - np.sum(coefficients * cos2 * sinh2, axis=0)
+
+        sinh_eta_p, sin_xi_p, cos_xi_p = np.sinh(eta_p), np.sin(xi_p), np.cos(xi_p)
+        tau_p = sin_xi_p / np.sqrt(sinh_eta_p ** 2 + cos_xi_p ** 2)
+
+        # Newton-Raphson for the geographic latitude whose conformal latitude is tau_p
+        tau = tau_p.copy()
+        for _ in range(INVERSE_ITERATIONS):
+            sigma = np.sinh(e * np.arctanh(e * tau / np.sqrt(1 + tau ** 2)))
+            tau_i = tau * np.sqrt(1 + sigma ** 2) - sigma * np.sqrt(1 + tau ** 2)
+            delta = ((tau_p - tau_i) / np.sqrt(1 + tau_i ** 2)
+                     * (1 + (1 - e ** 2) * tau ** 2) / ((1 - e ** 2) * np.sqrt(1 + tau ** 2)))
+            tau = tau + delta
+            if np.all(np.abs(delta) < 1e-12):
+                break
+
+        phi = np.arctan(tau)
+        lam = np.arctan2(sinh_eta_p, cos_xi_p)
+
+        p = 1 - np.sum(j2 * coefficients * cos2 * cosh2, axis=0)
+        q = np.sum(j2 * coefficients * sin2 * sinh2, axis=0)
+        gamma = np.arctan(np.tan(xi_p) * np.tanh(eta_p)) + np.arctan2(q, p)
+
+        sin_phi = np.sin(phi)
+        scale = (
+            self.k0
+            * np.sqrt(1 - e ** 2 * sin_phi ** 2) * np.sqrt(1 + tau ** 2) * np.sqrt(sinh_eta_p ** 2 + cos_xi_p ** 2)
+            * radius / self.ellipsoid.a / np.sqrt(p ** 2 + q ** 2)
+        )
+        longitude = (np.degrees(lam) + self.lon0 + 180.0) % 360.0 - 180.0
+        return np.degrees(phi), longitude, np.degrees(gamma), scale
@@ -12,14 +12,38 @@ from django.shortcuts import get_object_or_404
 
 from survey_api.models import SurveyData, CalculatedSurvey, InterpolatedSurvey
 from survey_api.serializers import (
+    BatchCalculationRequestSerializer,
     CalculationStatusSerializer,
     CalculatedSurveySerializer,
+    ClearanceRequestSerializer,
     InterpolatedSurveySerializer,
     InterpolationRequestSerializer,
     InterpolationResponseSerializer,
 )
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.clearance_service import ClearanceService
 from survey_api.services.interpolation_service import InterpolationService
-from survey_api.exceptions import WellengCalculationError, InsufficientDataError
+from survey_api.services.recalculation_service import recalculation
+from survey_api.services.single_flight import single_flight
+from survey_api.services.spatial_index_service import spatial_index
+from survey_api.services.survey_calculation_service import SurveyCalculationService, GEOGRAPHIC_COLUMNS
+from survey_api.services.uncertainty_service import UncertaintyService, ERROR_MODELS, UNCERTAINTY_COLUMNS
+from survey_api.exceptions import (
+    WellengCalculationError,
+    InsufficientDataError,
+    ComputeCapacityError,
+    ComputeTimeoutError,
+)
+from survey_api.utils.etags import (
+    conditional_response,
+    set_etag_headers,
+    calculation_results_etag,
+    geographic_coordinates_etag,
+    interpolation_list_etag,
+    interpolation_preview_etag,
+    uncertainty_etag,
+)
+from survey_api.utils.md_window import MDWindow
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +55,71 @@ class CalculationViewSet(viewsets.ViewSet):
     Endpoints:
     - GET /api/v1/surveys/{survey_id}/status/ - Get calculation status
     - GET /api/v1/surveys/{survey_id}/results/ - Get full calculation results
+    - POST /api/v1/calculations/batch/ - Recalculate a job, well or list of surveys
     """
 
     permission_classes = [IsAuthenticated]
 
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch_calculate(self, request):
+        """
+        Recalculate many surveys in one request (e.g. after a location or tie-on correction).
+
+        Contexts are loaded in one query, trajectories are computed in parallel
+        in the compute pool and all results are written in one transaction.
+
+        POST /api/v1/calculations/batch/
+
+        Request Body (exactly one of):
+        {
+            "job_id": "uuid",
+            "well_id": "uuid",
+            "survey_data_ids": ["uuid", ...]
+        }
+
+        Response:
+        {
+            "count": 3,
+            "calculated": 2,
+            "failed": 1,
+            "skipped": 0,
+            "duration": 1.234,
+            "results": [
+                {
+                    "survey_data_id": "uuid",
+                    "run_id": "uuid",
+                    "calculated_survey_id": "uuid",
+                    "status": "calculated" | "error" | "skipped",
+                    "calculation_duration": 0.412,
+                    "error_message": null
+                },
+                ...
+            ]
+        }
+        """
+        serializer = BatchCalculationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'error': 'ValidationError', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        selection = serializer.validated_data
+        survey_data_ids = BatchCalculationService.survey_data_ids(request.user, **selection)
+
+        requested = selection.get('survey_data_ids')
+        if requested is not None:
+            missing = sorted(str(survey_id) for survey_id in set(requested) - set(survey_data_ids))
+            if missing:
+                return Response(
+                    {'error': 'NotFound', 'message': 'Some surveys were not found or cannot be calculated', 'missing': missing},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+        logger.info(f"User {request.user.username} triggering batch calculation of {len(survey_data_ids)} surveys")
+        summary = BatchCalculationService.calculate_many(survey_data_ids)
+        return Response(summary, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['get'], url_path='status')
     def get_calculation_status(self, request, pk=None):
         """
@@ -105,16 +190,24 @@ class CalculationViewSet(viewsets.ViewSet):
 
         Returns complete position arrays and trajectory metrics.
 
+        Query Parameters:
+            - md_from, md_to: Optional inclusive MD window (adds the windowed ``md``)
+            - stride: Optional; every n-th station of the window
+
         Args:
             pk: SurveyData UUID
 
         Returns:
             200 OK with full results
+            304 Not Modified if If-None-Match matches the current ETag
+            400 Bad Request if the MD window is invalid
             404 Not Found if calculation doesn't exist
         """
-        # Get SurveyData
+        window = MDWindow.from_request(request)
+
+        # Get SurveyData (arrays deferred - only ownership is needed here)
         survey_data = get_object_or_404(
-            SurveyData.objects.select_related('survey_file__run'),
+            SurveyData.objects.select_related('survey_file__run').defer(*SurveyData.ARRAY_FIELDS),
             id=pk
         )
 
@@ -125,6 +218,14 @@ class CalculationViewSet(viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        # Results invalidated by a run input change are recalculated before the ETag is taken
+        recalculation.refresh_if_stale(survey_data.id)
+
+        etag = window.vary(calculation_results_etag(survey_data.id))
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+
         # Get CalculatedSurvey
         calculated_survey = get_object_or_404(
             CalculatedSurvey,
@@ -132,7 +233,276 @@ class CalculationViewSet(viewsets.ViewSet):
         )
 
         serializer = CalculatedSurveySerializer(calculated_survey)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if window.is_full:
+            data = serializer.data
+        else:
+            # Serialize metadata only; arrays are sliced against the survey's MD column
+            for name in CalculatedSurvey.ARRAY_FIELDS:
+                serializer.fields.pop(name)
+            data = serializer.data
+            md = survey_data.column_array('md_data')
+            md_window = window.locate(md)
+            data.update(window.take_columns(calculated_survey, md, CalculatedSurvey.ARRAY_FIELDS))
+            data['md'] = window.take(md, md_window, len(md))
+            data['window'] = window.describe(md_window, len(md))
+        return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
+
+    @action(detail=True, methods=['get'], url_path='geographic')
+    def get_geographic_coordinates(self, request, pk=None):
+        """
+        Get map grid and geographic coordinates of every station of a survey.
+
+        Derived from the calculated trajectory and the well location on first
+        request (or at calculation time when GEOGRAPHIC_COORDINATES_EAGER is set)
+        and stored until either changes.
+
+        Query Parameters:
+            - md_from, md_to: Optional inclusive MD window
+            - stride: Optional; every n-th station of the window
+
+        Args:
+            pk: SurveyData UUID
+
+        Returns:
+            200 OK with md, grid_easting, grid_northing, latitude, longitude and
+                the projection frame (zone, hemisphere, datum, north_reference,
+                convergence, scale_factor)
+            304 Not Modified if If-None-Match matches the current ETag
+            400 Bad Request if the MD window is invalid or the calculation is not complete
+            404 Not Found if the calculation or the well location doesn't exist
+        """
+        window = MDWindow.from_request(request)
+
+        survey_data = get_object_or_404(
+            SurveyData.objects.select_related('survey_file__run').defer(*SurveyData.ARRAY_FIELDS),
+            id=pk
+        )
+
+        if survey_data.survey_file.run.user != request.user:
+            return Response(
+                {'error': 'PermissionDenied', 'message': 'You do not have permission to view this survey.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        recalculation.refresh_if_stale(survey_data.id)
+
+        etag = window.vary(geographic_coordinates_etag(survey_data.id))
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+
+        calculated_survey = get_object_or_404(
+            CalculatedSurvey.objects.select_related('survey_data__survey_file__run').defer(
+                *(name for name in CalculatedSurvey.ARRAY_FIELDS if name not in ('easting', 'northing'))
+            ),
+            survey_data=survey_data
+        )
+        if calculated_survey.calculation_status != 'calculated':
+            return Response(
+                {'error': 'CalculationNotComplete', 'message': 'Survey calculation has not completed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        coordinates = SurveyCalculationService.geographic_coordinates(calculated_survey)
+        if coordinates is None:
+            return Response(
+                {'error': 'NotFound', 'message': 'No location is set for this survey\'s run or well.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        data = {'survey_data_id': str(survey_data.id), 'md': survey_data.column_array('md_data').tolist()}
+        data.update(coordinates)
+        window.apply(data, 'md', GEOGRAPHIC_COLUMNS)
+        return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
+
+    @action(detail=True, methods=['get'], url_path='uncertainty')
+    def get_uncertainty(self, request, pk=None):
+        """
+        Get the positional uncertainty (error ellipse) of every station of a survey.
+
+        Computed for the survey tool's error model on first request (or at
+        calculation time when UNCERTAINTY_EAGER is set) and stored until the
+        survey is recalculated; other error models are cached.
+
+        Query Parameters:
+            - error_model: Optional error model (MWD or Gyro; the survey tool's model by default)
+            - md_from, md_to: Optional inclusive MD window
+            - stride: Optional; every n-th station of the window
+
+        Args:
+            pk: SurveyData UUID
+
+        Returns:
+            200 OK with md, semi_major, semi_minor, ellipse_azimuth,
+                sigma_vertical and the north/east/vertical covariance terms
+                (cov_nn, cov_ne, cov_nv, cov_ee, cov_ev, cov_vv), all 1-sigma
+            304 Not Modified if If-None-Match matches the current ETag
+            400 Bad Request if a parameter is invalid or the calculation is not complete
+            404 Not Found if the calculation doesn't exist
+        """
+        window = MDWindow.from_request(request)
+        error_model = request.query_params.get('error_model') or None
+        if error_model is not None and error_model not in ERROR_MODELS:
+            return Response(
+                {'error': 'ValidationError',
+                 'details': {'error_model': [f"Must be one of {', '.join(ERROR_MODELS)}."]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        survey_data = get_object_or_404(
+            SurveyData.objects.select_related('survey_file__run').defer(*SurveyData.ARRAY_FIELDS),
+            id=pk
+        )
+
+        if survey_data.survey_file.run.user != request.user:
+            return Response(
+                {'error': 'PermissionDenied', 'message': 'You do not have permission to view this survey.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        recalculation.refresh_if_stale(survey_data.id)
+
+        etag = window.vary(uncertainty_etag(survey_data.id, error_model))
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+
+        calculated_survey = get_object_or_404(
+            CalculatedSurvey.objects.select_related('survey_data').defer(*CalculatedSurvey.ARRAY_FIELDS),
+            survey_data=survey_data
+        )
+        if calculated_survey.calculation_status != 'calculated':
+            return Response(
+                {'error': 'CalculationNotComplete', 'message': 'Survey calculation has not completed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        error_model, columns = UncertaintyService.uncertainty_columns(calculated_survey, error_model)
+
+        data = {
+            'survey_data_id': str(survey_data.id),
+            'error_model': error_model,
+            'sigma': 1,
+            'md': calculated_survey.survey_data.column_array('md_data').tolist(),
+        }
+        data.update({name: column.tolist() for name, column in columns.items()})
+        window.apply(data, 'md', UNCERTAINTY_COLUMNS)
+        return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
+
+    @action(detail=True, methods=['get'], url_path='nearest-offsets')
+    def get_nearest_offsets(self, request, pk=None):
+        """
+        Get the nearest offset wellbore of every station of a survey.
+
+        Query Parameters:
+            - md_from, md_to: Optional inclusive MD range of the stations to query
+            - radius: Optional search radius in metres (default SPATIAL_INDEX_SEARCH_RADIUS)
+
+        Args:
+            pk: SurveyData UUID
+
+        Returns:
+            200 OK with md and per-station offset_survey_data_id, distance and offset_md
+            400 Bad Request if a parameter is invalid or the survey has no located trajectory
+            404 Not Found if the survey doesn't exist
+        """
+        return self._proximity(
+            request, pk,
+            lambda survey_id, window: spatial_index.nearest_offsets(
+                survey_id, window.md_from, window.md_to, request.query_params.get('radius')
+            )
+        )
+
+    @action(detail=True, methods=['get'], url_path='offsets')
+    def get_offsets_within(self, request, pk=None):
+        """
+        Get the offset wellbores passing within a distance of a survey.
+
+        Query Parameters:
+            - distance: Required distance in metres
+            - md_from, md_to: Optional inclusive MD range of the stations to query
+
+        Args:
+            pk: SurveyData UUID
+
+        Returns:
+            200 OK with the offsets, closest first, and their closest approach
+            400 Bad Request if a parameter is invalid or the survey has no located trajectory
+            404 Not Found if the survey doesn't exist
+        """
+        return self._proximity(
+            request, pk,
+            lambda survey_id, window: spatial_index.within_distance(
+                survey_id, request.query_params.get('distance'), window.md_from, window.md_to
+            )
+        )
+
+    @action(detail=True, methods=['post'], url_path='clearance')
+    def clearance_scan(self, request, pk=None):
+        """
+        Scan a survey against offset wellbores for anti-collision.
+
+        POST /api/v1/calculations/{survey_data_id}/clearance/
+
+        Request Body (all optional):
+        {
+            "offset_survey_data_ids": ["uuid", ...],
+            "md_from": 500.0,
+            "md_to": 2500.0,
+            "screening_distance": 1000.0
+        }
+
+        Returns:
+            200 OK with per-station minimum separation factor and, per offset,
+                center-to-center distance and separation factor along the reference
+            400 Bad Request if the request is invalid or the survey has no located trajectory
+            404 Not Found if the survey doesn't exist
+            503/504 if the compute pool is busy or the scan timed out
+        """
+        serializer = ClearanceRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'error': 'ValidationError', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        options = serializer.validated_data
+
+        # Rendered as 503/504 by custom_exception_handler
+        return self._proximity(
+            request, pk,
+            lambda survey_id, window: ClearanceService.scan(
+                survey_id,
+                offset_survey_data_ids=options.get('offset_survey_data_ids'),
+                md_from=options.get('md_from'),
+                md_to=options.get('md_to'),
+                screening_distance=options.get('screening_distance'),
+            )
+        )
+
+    def _proximity(self, request, pk, query):
+        """Run a spatial index query for a survey the user owns."""
+        window = MDWindow.from_request(request)
+
+        survey_data = get_object_or_404(
+            SurveyData.objects.select_related('survey_file__run').defer(*SurveyData.ARRAY_FIELDS),
+            id=pk
+        )
+        if survey_data.survey_file.run.user != request.user:
+            return Response(
+                {'error': 'PermissionDenied', 'message': 'You do not have permission to view this survey.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        recalculation.refresh_if_stale(survey_data.id)
+
+        try:
+            data = query(survey_data.id, window)
+        except InsufficientDataError as e:
+            return Response(
+                {'error': 'InsufficientDataError', 'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='interpolate')
     def trigger_interpolation(self, request, pk=None):
@@ -239,6 +609,9 @@ class CalculationViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Unexpected error during interpolation: {type(e).__name__}: {str(e)}")
             return Response(
@@ -264,11 +637,19 @@ class CalculationViewSet(viewsets.ViewSet):
             },
             ...
         ]
+
+        Query Parameters:
+            - md_from, md_to, stride: Optional MD window applied to each interpolation
         """
+        window = MDWindow.from_request(request)
+
         try:
-            # Get calculated survey and check user ownership
+            # Get calculated survey and check user ownership (arrays deferred)
             calc_survey = get_object_or_404(
-                CalculatedSurvey.objects.select_related('survey_data__survey_file__run'),
+                CalculatedSurvey.objects.select_related('survey_data__survey_file__run').defer(
+                    *CalculatedSurvey.ARRAY_FIELDS,
+                    *(f'survey_data__{field}' for field in SurveyData.ARRAY_FIELDS)
+                ),
                 id=pk
             )
 
@@ -279,12 +660,20 @@ class CalculationViewSet(viewsets.ViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
+            etag = window.vary(interpolation_list_etag(pk))
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+
             # Get all interpolations
             interpolations = InterpolationService.list_interpolations(str(pk))
 
             serializer = InterpolatedSurveySerializer(interpolations, many=True)
+            data = serializer.data
+            for item in data:
+                window.apply(item, 'md_interpolated', InterpolatedSurvey.ARRAY_FIELDS)
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
 
         except Exception as e:
             logger.error(f"Error listing interpolations: {type(e).__name__}: {str(e)}")
@@ -300,12 +689,16 @@ class CalculationViewSet(viewsets.ViewSet):
         Does NOT return saved interpolation from database.
 
         This ensures BHC recalculation works correctly and users always see current data.
+        Responses carry an ETag derived from the calculated survey's updated_at and
+        the request parameters; a matching If-None-Match returns 304 without
+        recalculating. Concurrent identical requests share one calculation.
 
         GET /api/v1/calculations/{calculated_survey_id}/interpolation/{resolution}/?start_md=X&end_md=Y
 
         Query Parameters:
             - start_md: Optional start MD for custom range
             - end_md: Optional end MD for custom range
+            - md_from, md_to, stride: Optional MD window applied to the returned arrays
 
         Response:
         {
@@ -314,20 +707,13 @@ class CalculationViewSet(viewsets.ViewSet):
             "point_count": 750,
             "md_interpolated": [...],
             "is_saved": true/false,
-            "calculation_timestamp": "...",
             "bhc_enabled": true/false,
             ...
         }
         """
-        import datetime
-        request_time = datetime.datetime.now().isoformat()
-        print(f"\n{'#'*80}")
-        print(f"### GET INTERPOLATION ENDPOINT CALLED (CalculationViewSet) ###")
-        print(f"### Request Time: {request_time}")
-        print(f"### CalculatedSurvey ID: {pk}")
-        print(f"### Resolution: {resolution}")
-        print(f"### This endpoint ALWAYS recalculates - NO CACHED DATA")
-        print(f"{'#'*80}\n")
+        logger.debug(f"GET interpolation (CalculationViewSet): CalculatedSurvey {pk}, resolution={resolution}")
+
+        window = MDWindow.from_request(request)
 
         try:
             # Extract query parameters
@@ -336,9 +722,12 @@ class CalculationViewSet(viewsets.ViewSet):
             start_md_value = float(start_md) if start_md else None
             end_md_value = float(end_md) if end_md else None
 
-            # Get calculated survey and check user ownership
+            # Get calculated survey and check user ownership (arrays deferred)
             calc_survey = get_object_or_404(
-                CalculatedSurvey.objects.select_related('survey_data__survey_file__run'),
+                CalculatedSurvey.objects.select_related('survey_data__survey_file__run').defer(
+                    *CalculatedSurvey.ARRAY_FIELDS,
+                    *(f'survey_data__{field}' for field in SurveyData.ARRAY_FIELDS)
+                ),
                 id=pk
             )
 
@@ -349,66 +738,24 @@ class CalculationViewSet(viewsets.ViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            # Get BHC status from calculation context
-            bhc_enabled = calc_survey.calculation_context.get('bhc_enabled', False) if calc_survey.calculation_context else False
-            vertical_section_azimuth = float(calc_survey.vertical_section_azimuth) if calc_survey.vertical_section_azimuth is not None else None
-
-            print(f"\n{'='*80}")
-            print(f"[INTERPOLATION SETUP] BHC enabled: {bhc_enabled}")
-            print(f"[INTERPOLATION SETUP] Vertical section azimuth from DB: {vertical_section_azimuth}°")
-            print(f"{'='*80}\n")
-
-            # Prepare data for interpolation
-            from survey_api.services.welleng_service import WellengService
-            survey_data = calc_survey.survey_data
-            calculated_data = {
-                'md': survey_data.md_data,
-                'inc': survey_data.inc_data,
-                'azi': survey_data.azi_data,
-                'easting': calc_survey.easting,
-                'northing': calc_survey.northing,
-                'tvd': calc_survey.tvd,
-            }
-
-            # Implement BHC iterative calculation for interpolation
-            if bhc_enabled:
-                print(f"[INTERPOLATION BHC] Performing iterative BHC interpolation")
-                print(f"[INTERPOLATION BHC] Step 1: Initial interpolation with proposal_direction = 0°\n")
-
-                # Step 1: Initial interpolation
-                initial_result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=0.0
-                )
-
-                # Step 2: Get closure direction from last point
-                interpolated_closure_direction_last = initial_result['closure_direction'][-1]
-
-                print(f"\n[INTERPOLATION BHC] Step 2: Got closure direction = {interpolated_closure_direction_last:.6f}°")
-                print(f"[INTERPOLATION BHC] Step 3: Recalculating with that direction\n")
-
-                # Step 3: Recalculate with closure direction
-                result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=interpolated_closure_direction_last
-                )
-
-                print(f"[INTERPOLATION BHC] Completed - converged to {interpolated_closure_direction_last:.6f}°\n")
-            else:
-                # Non-BHC: single pass
-                result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=vertical_section_azimuth
-                )
+            if calc_survey.is_stale:
+                recalculation.refresh_if_stale(calc_survey.survey_data_id)
+
+            # The interpolation is deterministic in its inputs - skip the
+            # recalculation entirely when the client's copy is current
+            preview_etag = interpolation_preview_etag(pk, resolution, start_md_value, end_md_value)
+            etag = window.vary(preview_etag)
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+
+            # Concurrent viewers of the same preview share one calculation
+            result = single_flight.run(
+                f'interpolation-preview:{preview_etag}',
+                lambda: InterpolationService.preview_interpolation(pk, int(resolution), start_md_value, end_md_value),
+                operation='interpolation_preview',
+            )
+            bhc_enabled = result['bhc_enabled']
 
             # Check if saved in database
             saved_interpolation = InterpolatedSurvey.objects.filter(
@@ -416,8 +763,7 @@ class CalculationViewSet(viewsets.ViewSet):
                 resolution=int(resolution)
             ).first()
 
-            # Prepare response
-            calculation_timestamp = datetime.datetime.now().isoformat()
+            # Prepare response (no per-request values: the body must match its strong ETag)
             response_data = {
                 'id': str(saved_interpolation.id) if saved_interpolation else None,
                 'calculated_survey': str(pk),
@@ -435,20 +781,16 @@ class CalculationViewSet(viewsets.ViewSet):
                 'point_count': result['point_count'],
                 'interpolation_status': 'completed',
                 'is_saved': saved_interpolation is not None,
-                'calculation_timestamp': calculation_timestamp,
                 'bhc_enabled': bhc_enabled,
             }
 
-            print(f"[INTERPOLATION RESPONSE] Calculation timestamp: {calculation_timestamp}")
-            print(f"[INTERPOLATION RESPONSE] BHC enabled: {bhc_enabled}")
-            print(f"[INTERPOLATION RESPONSE] Last closure direction: {result['closure_direction'][-1]:.6f}°\n")
+            logger.debug(f"[INTERPOLATION RESPONSE] BHC enabled: {bhc_enabled}")
+            logger.debug(f"[INTERPOLATION RESPONSE] Last closure direction: {result['closure_direction'][-1]:.6f}°")
+
+            window.apply(response_data, 'md_interpolated', InterpolatedSurvey.ARRAY_FIELDS)
 
-            # Add cache-control headers
-            response = Response(response_data, status=status.HTTP_200_OK)
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-            return response
+            # Clients must revalidate with If-None-Match before reusing the body
+            return set_etag_headers(Response(response_data, status=status.HTTP_200_OK), etag)
 
         except InsufficientDataError as e:
             logger.error(f"InsufficientDataError: {str(e)}")
@@ -464,6 +806,9 @@ class CalculationViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Error retrieving interpolation: {type(e).__name__}: {str(e)}")
             return Response(
@@ -587,6 +932,9 @@ class CalculationViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Unexpected error saving interpolation: {type(e).__name__}: {str(e)}")
             return Response(
@@ -23,6 +23,8 @@ from survey_api.services.delta_calculation_service import DeltaCalculationServic
 from survey_api.services.excel_export_service import ExcelExportService
 from survey_api.permissions import IsComparisonOwner
 from survey_api.views.activity_log_viewset import log_activity
+from survey_api.utils.etags import conditional_response, set_etag_headers, comparison_etag
+from survey_api.utils.md_window import MDWindow
 
 logger = logging.getLogger(__name__)
 
@@ -367,12 +369,32 @@ def get_comparison_detail(request, comparison_id):
     URL Parameters:
         comparison_id: UUID of the comparison
 
+    Query Parameters:
+        md_from, md_to, stride: Optional MD window applied to every delta array
+
     Response:
         200 OK: ComparisonResult object with full delta data
+        304 Not Modified: If-None-Match matches the current ETag
+        400 Bad Request: Invalid MD window
         403 Forbidden: User doesn't own comparison
         404 Not Found: Comparison not found
     """
+    window = MDWindow.from_request(request)
+
     try:
+        # Revalidation check using only narrow columns; the activity log
+        # entry is written on the first full view, not on every 304 poll
+        owner_id = ComparisonResult.objects.filter(id=comparison_id).values_list(
+            'created_by_id', flat=True
+        ).first()
+        if owner_id is not None and owner_id == request.user.id:
+            etag = window.vary(comparison_etag(comparison_id))
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+        else:
+            etag = None
+
         comparison = get_object_or_404(
             ComparisonResult.objects.select_related(
                 'run',
@@ -416,7 +438,8 @@ def get_comparison_detail(request, comparison_id):
             logger.warning(f"Failed to log comparison view: {str(log_error)}")
 
         serializer = ComparisonResultSerializer(comparison)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = window.apply(serializer.data, 'md_data', ComparisonResult.ARRAY_FIELDS)
+        return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
 
     except ComparisonResult.DoesNotExist:
         return Response(
@@ -17,6 +17,7 @@ import io
 from survey_api.services.duplicate_survey_service import DuplicateSurveyService
 from survey_api.views.activity_log_viewset import log_activity
 from survey_api.models import SurveyData
+from survey_api.exceptions import ComputeCapacityError, ComputeTimeoutError
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +96,9 @@ class DuplicateSurveyViewSet(viewsets.ViewSet):
                 {'error': str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Duplicate survey calculation failed: {type(e).__name__}: {str(e)}")
             return Response(
@@ -295,6 +299,9 @@ class DuplicateSurveyViewSet(viewsets.ViewSet):
                 {'error': str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Duplicate survey export failed: {type(e).__name__}: {str(e)}")
             return Response(
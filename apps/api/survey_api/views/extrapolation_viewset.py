@@ -18,6 +18,7 @@ from survey_api.serializers import (
     ExtrapolationListSerializer,
 )
 from survey_api.views.activity_log_viewset import log_activity
+from survey_api.utils.md_window import MDWindow
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,24 @@ class ExtrapolationViewSet(viewsets.ModelViewSet):
             return CreateExtrapolationSerializer
         return ExtrapolationSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get one extrapolation.
+
+        Query Parameters:
+            md_from, md_to, stride: Optional MD window applied to each array group
+                (original, interpolated, extrapolated, combined) against its own MD
+        """
+        window = MDWindow.from_request(request)
+        data = self.get_serializer(self.get_object()).data
+        for group in Extrapolation.ARRAY_GROUPS:
+            window.apply(
+                data, f'{group}_md', [f'{group}_{suffix}' for suffix in Extrapolation.ARRAY_SUFFIXES]
+            )
+            if 'window' in data:
+                data[f'{group}_window'] = data.pop('window')
+        return Response(data)
+
     @action(detail=False, methods=['post'], url_path='calculate')
     def calculate(self, request):
         """
@@ -8,14 +8,27 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
-from survey_api.models import CalculatedSurvey, InterpolatedSurvey
+from survey_api.models import SurveyData, CalculatedSurvey, InterpolatedSurvey
 from survey_api.services.interpolation_service import InterpolationService
+from survey_api.services.single_flight import single_flight
 from survey_api.serializers import (
     InterpolatedSurveySerializer,
     InterpolationRequestSerializer,
     InterpolationResponseSerializer,
 )
-from survey_api.exceptions import WellengCalculationError, InsufficientDataError
+from survey_api.exceptions import (
+    WellengCalculationError,
+    InsufficientDataError,
+    ComputeCapacityError,
+    ComputeTimeoutError,
+)
+from survey_api.utils.etags import (
+    conditional_response,
+    set_etag_headers,
+    interpolation_list_etag,
+    interpolation_preview_etag,
+)
+from survey_api.utils.md_window import MDWindow
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +143,9 @@ class InterpolationViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Unexpected error during interpolation: {type(e).__name__}: {str(e)}")
             return Response(
@@ -155,11 +171,19 @@ class InterpolationViewSet(viewsets.ViewSet):
             },
             ...
         ]
+
+        Query Parameters:
+            - md_from, md_to, stride: Optional MD window applied to each interpolation
         """
+        window = MDWindow.from_request(request)
+
         try:
-            # Get calculated survey and check user ownership
+            # Get calculated survey and check user ownership (arrays deferred)
             calc_survey = get_object_or_404(
-                CalculatedSurvey.objects.select_related('survey_data__survey_file__run'),
+                CalculatedSurvey.objects.select_related('survey_data__survey_file__run').defer(
+                    *CalculatedSurvey.ARRAY_FIELDS,
+                    *(f'survey_data__{field}' for field in SurveyData.ARRAY_FIELDS)
+                ),
                 id=pk
             )
 
@@ -170,12 +194,20 @@ class InterpolationViewSet(viewsets.ViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
+            etag = window.vary(interpolation_list_etag(pk))
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+
             # Get all interpolations
             interpolations = InterpolationService.list_interpolations(str(pk))
 
             serializer = InterpolatedSurveySerializer(interpolations, many=True)
+            data = serializer.data
+            for item in data:
+                window.apply(item, 'md_interpolated', InterpolatedSurvey.ARRAY_FIELDS)
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
 
         except Exception as e:
             logger.error(f"Error listing interpolations: {type(e).__name__}: {str(e)}")
@@ -191,12 +223,16 @@ class InterpolationViewSet(viewsets.ViewSet):
         Does NOT return saved interpolation from database.
 
         This ensures BHC recalculation works correctly and users always see current data.
+        Responses carry an ETag derived from the calculated survey's updated_at and
+        the request parameters; a matching If-None-Match returns 304 without
+        recalculating. Concurrent identical requests share one calculation.
 
         GET /api/v1/calculations/{calculated_survey_id}/interpolation/{resolution}/?start_md=X&end_md=Y
 
         Query Parameters:
             - start_md: Optional start MD for custom range
             - end_md: Optional end MD for custom range
+            - md_from, md_to, stride: Optional MD window applied to the returned arrays
 
         Response:
         {
@@ -208,20 +244,17 @@ class InterpolationViewSet(viewsets.ViewSet):
             ...
         }
         """
-        import datetime
-        request_time = datetime.datetime.now().isoformat()
-        print(f"\n{'#'*80}")
-        print(f"### GET INTERPOLATION ENDPOINT CALLED ###")
-        print(f"### Request Time: {request_time}")
-        print(f"### CalculatedSurvey ID: {pk}")
-        print(f"### Resolution: {resolution}")
-        print(f"### This endpoint ALWAYS recalculates - NO CACHED DATA")
-        print(f"{'#'*80}\n")
+        logger.debug(f"GET interpolation: CalculatedSurvey {pk}, resolution={resolution}")
+
+        window = MDWindow.from_request(request)
 
         try:
-            # Get calculated survey and check user ownership
+            # Get calculated survey and check user ownership (arrays deferred)
             calc_survey = get_object_or_404(
-                CalculatedSurvey.objects.select_related('survey_data__survey_file__run'),
+                CalculatedSurvey.objects.select_related('survey_data__survey_file__run').defer(
+                    *CalculatedSurvey.ARRAY_FIELDS,
+                    *(f'survey_data__{field}' for field in SurveyData.ARRAY_FIELDS)
+                ),
                 id=pk
             )
 
@@ -239,110 +272,28 @@ class InterpolationViewSet(viewsets.ViewSet):
             start_md_value = float(start_md) if start_md else None
             end_md_value = float(end_md) if end_md else None
 
+            # The interpolation is deterministic in its inputs - skip the
+            # recalculation entirely when the client's copy is current
+            preview_etag = interpolation_preview_etag(pk, resolution, start_md_value, end_md_value)
+            etag = window.vary(preview_etag)
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+
             logger.info(
                 f"Triggering fresh interpolation for CalculatedSurvey {pk} "
                 f"at resolution={resolution}m (start_md={start_md_value}, end_md={end_md_value})"
             )
 
             # ALWAYS trigger fresh interpolation calculation (don't use saved data)
-            # This ensures BHC recalculation works correctly
-            from survey_api.services.welleng_service import WellengService
-
-            # Prepare data for interpolation
-            survey_data = calc_survey.survey_data
-            calculated_data = {
-                'md': survey_data.md_data,
-                'inc': survey_data.inc_data,
-                'azi': survey_data.azi_data,
-                'easting': calc_survey.easting,
-                'northing': calc_survey.northing,
-                'tvd': calc_survey.tvd,
-            }
-
-            # Get vertical section azimuth from calculated survey (important for BHC)
-            print(f"\n{'='*80}")
-            print(f"[INTERPOLATION SETUP] Retrieving vertical_section_azimuth from CalculatedSurvey")
-            print(f"[INTERPOLATION SETUP] CalculatedSurvey ID: {calc_survey.id}")
-            print(f"[INTERPOLATION SETUP] Raw vertical_section_azimuth from DB: {calc_survey.vertical_section_azimuth}")
-            print(f"[INTERPOLATION SETUP] Type: {type(calc_survey.vertical_section_azimuth)}")
-
-            vertical_section_azimuth = float(calc_survey.vertical_section_azimuth) if calc_survey.vertical_section_azimuth is not None else None
-
-            print(f"[INTERPOLATION SETUP] Converted to float: {vertical_section_azimuth}")
-
-            # Get calculation context to check BHC status
-            bhc_enabled = calc_survey.calculation_context.get('bhc_enabled', False) if calc_survey.calculation_context else False
-            proposal_direction = calc_survey.calculation_context.get('proposal_direction') if calc_survey.calculation_context else None
-
-            print(f"[INTERPOLATION SETUP] BHC enabled: {bhc_enabled}")
-            print(f"[INTERPOLATION SETUP] Proposal direction from context: {proposal_direction}")
-            print(f"[INTERPOLATION SETUP] Vertical section azimuth to use: {vertical_section_azimuth}°")
-
-            if bhc_enabled:
-                print(f"[INTERPOLATION SETUP] BHC is ENABLED - this azimuth is the BHC converged closure direction")
-                # Get the final closure direction from calculated survey for comparison
-                if calc_survey.closure_direction and len(calc_survey.closure_direction) > 0:
-                    final_closure = calc_survey.closure_direction[-1]
-                    print(f"[INTERPOLATION SETUP] Final closure direction from calculated: {final_closure}°")
-                    print(f"[INTERPOLATION SETUP] Match check: vertical_section_azimuth ({vertical_section_azimuth}) vs final_closure ({final_closure})")
-            else:
-                print(f"[INTERPOLATION SETUP] BHC is DISABLED - using standard proposal direction")
-
-            print(f"{'='*80}\n")
-
-            logger.info(
-                f"Interpolation setup: BHC enabled={bhc_enabled}, "
-                f"vertical_section_azimuth={vertical_section_azimuth}° from CalculatedSurvey"
+            # This ensures BHC recalculation works correctly. Concurrent viewers
+            # of the same preview share one calculation.
+            result = single_flight.run(
+                f'interpolation-preview:{preview_etag}',
+                lambda: InterpolationService.preview_interpolation(pk, int(resolution), start_md_value, end_md_value),
+                operation='interpolation_preview',
             )
-
-            # Implement BHC iterative calculation for interpolation (same as calculation)
-            if bhc_enabled:
-                print(f"\n{'='*80}")
-                print(f"[INTERPOLATION BHC] BHC is ENABLED - performing iterative interpolation")
-                print(f"[INTERPOLATION BHC] Step 1: Initial interpolation with proposal_direction = 0°")
-                print(f"{'='*80}\n")
-
-                # Step 1: Initial interpolation with proposal_direction = 0
-                initial_result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=0.0
-                )
-
-                # Get closure direction from last interpolated point
-                interpolated_closure_direction_last = initial_result['closure_direction'][-1]
-
-                print(f"\n{'='*80}")
-                print(f"[INTERPOLATION BHC] Step 2: Got closure direction from last interpolated point = {interpolated_closure_direction_last:.6f}°")
-                print(f"[INTERPOLATION BHC] Step 3: Recalculating interpolation with proposal_direction = {interpolated_closure_direction_last:.6f}°")
-                print(f"{'='*80}\n")
-
-                # Step 2: Recalculate interpolation with closure_direction as vertical_section_azimuth
-                result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=interpolated_closure_direction_last
-                )
-
-                print(f"\n{'='*80}")
-                print(f"[INTERPOLATION BHC] BHC interpolation completed - converged to {interpolated_closure_direction_last:.6f}°")
-                print(f"[INTERPOLATION BHC] Final interpolated closure direction: {result['closure_direction'][-1]:.6f}°")
-                print(f"{'='*80}\n")
-
-            else:
-                # Non-BHC: Use the vertical_section_azimuth from calculated survey (or None)
-                print(f"[INTERPOLATION] Non-BHC mode - using vertical_section_azimuth={vertical_section_azimuth}°")
-                result = WellengService.interpolate_survey(
-                    calculated_data,
-                    int(resolution),
-                    start_md=start_md_value,
-                    end_md=end_md_value,
-                    vertical_section_azimuth=vertical_section_azimuth
-                )
+            bhc_enabled = result['bhc_enabled']
 
             # Check if this interpolation is saved in database
             saved_interpolation = InterpolatedSurvey.objects.filter(
@@ -350,10 +301,7 @@ class InterpolationViewSet(viewsets.ViewSet):
                 resolution=int(resolution)
             ).first()
 
-            # Prepare response with fresh calculated data
-            import datetime
-            calculation_timestamp = datetime.datetime.now().isoformat()
-
+            # Prepare response (no per-request values: the body must match its strong ETag)
             response_data = {
                 'id': str(saved_interpolation.id) if saved_interpolation else None,
                 'calculated_survey': str(pk),
@@ -372,29 +320,22 @@ class InterpolationViewSet(viewsets.ViewSet):
                 'interpolation_status': 'completed',
                 'is_saved': saved_interpolation is not None,
                 'created_at': saved_interpolation.created_at if saved_interpolation else None,
-                'calculation_timestamp': calculation_timestamp,  # Timestamp to verify fresh calculation
                 'bhc_enabled': bhc_enabled,  # Include BHC status in response
             }
 
-            print(f"\n{'='*80}")
-            print(f"[INTERPOLATION RESPONSE] Returning fresh calculated data")
-            print(f"[INTERPOLATION RESPONSE] Calculation timestamp: {calculation_timestamp}")
-            print(f"[INTERPOLATION RESPONSE] BHC enabled: {bhc_enabled}")
-            print(f"[INTERPOLATION RESPONSE] Point count: {result['point_count']}")
-            print(f"[INTERPOLATION RESPONSE] First MD: {result['md'][0]}")
-            print(f"[INTERPOLATION RESPONSE] Last MD: {result['md'][-1]}")
-            print(f"[INTERPOLATION RESPONSE] Last closure direction: {result['closure_direction'][-1]:.6f}°")
-            print(f"[INTERPOLATION RESPONSE] Last vertical section: {result['vertical_section'][-1]:.2f}")
-            print(f"[INTERPOLATION RESPONSE] Is saved in DB: {saved_interpolation is not None}")
-            print(f"{'='*80}\n")
-
-            # Create response with cache-control headers to prevent caching
-            response = Response(response_data, status=status.HTTP_200_OK)
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-            return response
+            logger.debug(
+                f"[INTERPOLATION RESPONSE] BHC enabled: {bhc_enabled}, points: {result['point_count']}, "
+                f"saved: {saved_interpolation is not None}"
+            )
+
+            window.apply(response_data, 'md_interpolated', InterpolatedSurvey.ARRAY_FIELDS)
+
+            # Clients must revalidate with If-None-Match before reusing the body
+            return set_etag_headers(Response(response_data, status=status.HTTP_200_OK), etag)
 
+        except (ComputeCapacityError, ComputeTimeoutError):
+            # Rendered as 503/504 by custom_exception_handler
+            raise
         except Exception as e:
             logger.error(f"Error calculating interpolation: {type(e).__name__}: {str(e)}")
             return Response(
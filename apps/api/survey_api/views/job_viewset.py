@@ -14,8 +14,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import HttpResponse
 
 from survey_api.models import Customer, Client, Rig, Service, Well, Job
 from survey_api.serializers.job_serializers import (
@@ -39,6 +39,7 @@ from survey_api.serializers.job_serializers import (
     CreateJobSerializer,
     UpdateJobSerializer,
 )
+from survey_api.utils.ranged_file_response import ranged_file_response
 
 
 class CustomerViewSet(viewsets.ModelViewSet):
@@ -393,14 +394,12 @@ class JobViewSet(viewsets.ModelViewSet):
         job = self.get_object()
 
         try:
-            # Generate PDF
-            pdf_bytes = PrejobReportService.generate_prejob_report(job)
+            # Stored PDF for the job's current inputs (generated on first request)
+            artifact = PrejobReportService.get_report_artifact(job)
 
-            # Create response with PDF
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="Prejob_Report_{job.job_number}.pdf"'
-
-            return response
+            return ranged_file_response(
+                request, artifact.open(), f"Prejob_Report_{job.job_number}.pdf", etag=artifact.etag
+            )
 
         except Exception as e:
             return Response(
@@ -416,17 +415,45 @@ class JobViewSet(viewsets.ModelViewSet):
         job = self.get_object()
 
         try:
-            # Generate PDF
-            pdf_buffer = SOEReportService.generate_soe_report(str(job.id))
+            # Stored PDF for the job's current inputs (generated on first request)
+            artifact = SOEReportService.get_report_artifact(job)
 
-            # Create response with PDF
-            response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="SOE_Report_{job.job_number}.pdf"'
-
-            return response
+            return ranged_file_response(
+                request, artifact.open(), f"SOE_Report_{job.job_number}.pdf", etag=artifact.etag
+            )
 
         except Exception as e:
             return Response(
                 {'error': f'Failed to generate SOE report: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @action(detail=True, methods=['get'])
+    def report_bundle(self, request, pk=None):
+        """
+        Download every report for the job as one ZIP.
+
+        Reports are built in parallel and the archive is streamed as they finish.
+        Pass ``bundle_id`` to poll progress via report_bundle_status; otherwise one
+        is generated and returned in the X-Report-Bundle-Id header.
+        """
+        from survey_api.services.report_bundle_service import ReportBundleService
+
+        job = self.get_object()
+        bundle = ReportBundleService.plan(job, bundle_id=request.query_params.get('bundle_id'))
+
+        response = StreamingHttpResponse(ReportBundleService.stream(bundle), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{bundle.filename}"'
+        response['X-Report-Bundle-Id'] = bundle.bundle_id
+        return response
+
+    @action(detail=True, methods=['get'], url_path='report_bundle/(?P<bundle_id>[^/.]+)')
+    def report_bundle_status(self, request, pk=None, bundle_id=None):
+        """Progress of a report bundle download (total, completed, failed parts)."""
+        from survey_api.services.report_bundle_service import ReportBundleService
+
+        job = self.get_object()
+        progress = ReportBundleService.get_progress(bundle_id)
+        if progress is None or progress['job_id'] != str(job.pk):
+            return Response({'error': 'Report bundle not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(progress)
@@ -0,0 +1,36 @@
+"""
+Prometheus-compatible metrics endpoint.
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from survey_api.services.metrics_service import metrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Expose request, span and cache metrics in Prometheus text format.
+
+    GET /metrics
+
+    If settings.METRICS_TOKEN is set, the scraper must send
+    ``Authorization: Bearer <token>``; otherwise the endpoint is open
+    (restrict it at the proxy).
+
+    Returns:
+        200 OK: Prometheus exposition text
+        403 Forbidden: Token configured and missing/invalid
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied, token):
+            return HttpResponse('Forbidden', status=403, content_type='text/plain')
+
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -14,9 +14,10 @@ import os
 
 from survey_api.models import Run, QualityCheck, SurveyFile, SurveyData
 from survey_api.services.file_parser_service import FileParserService, FileParsingError
+from survey_api.services.qa_rescore_service import QARescoreService
 from survey_api.services.qa_service import QAService
 from survey_api.services.survey_calculation_service import SurveyCalculationService
-from survey_api.serializers import FileUploadSerializer
+from survey_api.serializers import FileUploadSerializer, QARescoreRequestSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -200,24 +201,7 @@ def upload_gtl_for_qa(request):
                 run=run,
                 survey_data=survey_data,
                 file_name=uploaded_file.name,
-                md_data=md_data,
-                inc_data=inc_data,
-                azi_data=azi_data,
-                gt_data=gt_data,
-                wt_data=wt_data,
-                g_t_difference_data=qa_results['g_t_difference_data'],
-                w_t_difference_data=qa_results['w_t_difference_data'],
-                g_t_status_data=qa_results['g_t_status_data'],
-                w_t_status_data=qa_results['w_t_status_data'],
-                overall_status_data=qa_results['overall_status_data'],
-                total_g_t_difference=qa_results['total_g_t_difference'],
-                total_w_t_difference=qa_results['total_w_t_difference'],
-                total_g_t_difference_pass=qa_results['total_g_t_difference_pass'],
-                total_w_t_difference_pass=qa_results['total_w_t_difference_pass'],
-                g_t_percentage=qa_results['g_t_percentage'],
-                w_t_percentage=qa_results['w_t_percentage'],
-                pass_count=qa_results['pass_count'],
-                remove_count=qa_results['remove_count'],
+                **QAService.quality_check_fields(qa_results, location_g_t, location_w_t),
                 status='pending'
             )
 
@@ -300,7 +284,7 @@ def save_qa_approved(request, qa_id):
     try:
         # Get QualityCheck record
         try:
-            quality_check = QualityCheck.objects.select_related('run__tieon').get(id=qa_id)
+            quality_check = QualityCheck.objects.select_related('run__tieon', 'survey_data').get(id=qa_id)
         except QualityCheck.DoesNotExist:
             return Response(
                 {"error": f"QA record with id {qa_id} does not exist"},
@@ -308,84 +292,31 @@ def save_qa_approved(request, qa_id):
             )
 
         # Get indices to keep from request (optional)
+        # If not provided, all PASS stations are kept
         indices_to_keep = request.data.get('indices_to_keep')
 
-        # If indices provided, filter by indices
-        # Otherwise, filter to keep only PASS stations
-        if indices_to_keep is not None:
-            filtered_data = QAService.filter_stations_by_indices(
-                md_data=quality_check.md_data,
-                inc_data=quality_check.inc_data,
-                azi_data=quality_check.azi_data,
-                gt_data=quality_check.gt_data,
-                wt_data=quality_check.wt_data,
-                indices_to_keep=indices_to_keep
-            )
-        else:
-            # Keep only PASS stations
-            filtered_data = QAService.filter_stations_by_status(
-                md_data=quality_check.md_data,
-                inc_data=quality_check.inc_data,
-                azi_data=quality_check.azi_data,
-                gt_data=quality_check.gt_data,
-                wt_data=quality_check.wt_data,
-                overall_status_data=quality_check.overall_status_data,
-                include_status='PASS'
-            )
-
         run = quality_check.run
         tie_on = run.tieon
 
-        # Get location data for score calculation
-        location = None
-        if hasattr(run, 'well') and run.well and hasattr(run.well, 'location'):
-            location = run.well.location
-
-        # Calculate scores on the filtered data before approval
-        if location:
-            location_g_t = float(location.g_t or 0)
-            location_w_t = float(location.w_t or 0)
-
-            # Recalculate QA metrics on filtered data to get scores
-            qa_results_filtered = QAService.calculate_qa_metrics(
-                md_data=filtered_data['md_data'],
-                inc_data=filtered_data['inc_data'],
-                azi_data=filtered_data['azi_data'],
-                gt_data=filtered_data['gt_data'],
-                wt_data=filtered_data['wt_data'],
-                location_g_t=location_g_t,
-                location_w_t=location_w_t
-            )
+        # Read before approval relinks the check to the new SurveyData
+        stations = quality_check.stations()
 
-            # Update QualityCheck with scores (saved to database)
-            quality_check.delta_wt_score = qa_results_filtered['delta_wt_score']
-            quality_check.delta_wt_percentage = qa_results_filtered['delta_wt_percentage']
-            quality_check.delta_gt_score = qa_results_filtered['delta_gt_score']
-            quality_check.delta_gt_percentage = qa_results_filtered['delta_gt_percentage']
-            quality_check.w_t_score_points = qa_results_filtered['w_t_score_points']
-            quality_check.g_t_score_points = qa_results_filtered['g_t_score_points']
-            quality_check.max_score = qa_results_filtered['max_score']
-            quality_check.total_rows = qa_results_filtered['total_rows']
-
-            logger.info(
-                f"Calculated scores for approval: "
-                f"Delta W(t): {quality_check.delta_wt_percentage}%, "
-                f"Delta G(t): {quality_check.delta_gt_percentage}%"
-            )
+        # Record the kept stations and scores; the station arrays are not rewritten
+        QAService.approve(quality_check, indices_to_keep)
 
         # Prepend tie-on values
         # Use location G(T) and W(T) for tie-on row (TieOn model doesn't have these)
-        tieon_g_t = location_g_t if location else 0
-        tieon_w_t = location_w_t if location else 0
+        tieon_g_t = quality_check.location_g_t
+        tieon_w_t = quality_check.location_w_t
 
         # CRITICAL FIX: Use ORIGINAL unfiltered data for SurveyData (like Gyro does)
         # This ensures all stations get calculated coordinates, matching Gyro behavior
-        # The filtered_data is only for QA score calculation above, not for trajectory calculations
-        md_data_with_tieon = [float(tie_on.md)] + quality_check.md_data
-        inc_data_with_tieon = [float(tie_on.inc)] + quality_check.inc_data
-        azi_data_with_tieon = [float(tie_on.azi)] + quality_check.azi_data
-        gt_data_with_tieon = [tieon_g_t] + quality_check.gt_data
-        wt_data_with_tieon = [tieon_w_t] + quality_check.wt_data
+        # The kept-station mask is only for QA scoring above, not for trajectory calculations
+        md_data_with_tieon = [float(tie_on.md)] + stations['md_data']
+        inc_data_with_tieon = [float(tie_on.inc)] + stations['inc_data']
+        azi_data_with_tieon = [float(tie_on.azi)] + stations['azi_data']
+        gt_data_with_tieon = [tieon_g_t] + stations['gt_data']
+        wt_data_with_tieon = [tieon_w_t] + stations['wt_data']
 
         row_count_with_tieon = len(md_data_with_tieon)
 
@@ -418,9 +349,9 @@ def save_qa_approved(request, qa_id):
                 validation_errors=None
             )
 
-            # Update QualityCheck status and link to SurveyData
-            quality_check.status = 'approved'
+            # Link QualityCheck (approved above) to SurveyData, which holds every station
             quality_check.survey_data = survey_data
+            quality_check.detached_stations = None
             quality_check.save()
 
         logger.info(f"Successfully saved QA-approved survey: SurveyData {survey_data.id}")
@@ -508,241 +439,44 @@ def delete_qa_record(request, qa_id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def approve_gtl_qa_temp(request, temp_qa_id):
+def rescore_qa(request, qa_id):
     """
-    Approve temporary GTL QA data and save to database with survey calculation.
+    Preview QA scores while the reviewer toggles stations.
 
-    This endpoint is called after user reviews QA results in the frontend.
-    It loads the temporary QA data, filters stations based on user selections,
-    creates all database records, and triggers survey calculation.
-
-    Args:
-        temp_qa_id: UUID of the temporary QA session
+    Only the stations toggled since the previous request are sent; the review
+    session keeps the kept-station selection and running totals (see
+    survey_api.services.qa_rescore_service).
 
     Request body:
-        - indices_to_keep: List of station indices to keep (optional)
-          If not provided, all PASS stations are kept.
+        - keep: Station indices to keep (optional)
+        - drop: Station indices to drop (optional)
+        - reset: Restart from the initial selection first (optional)
 
     Returns:
-        201 Created: Survey saved and calculation triggered
-        404 Not Found: Temporary QA data not found
-        500 Internal Server Error: Processing error
+        200 OK: Updated summary (pass/remove counts, scores, percentages)
+        400 Bad Request: Invalid or out-of-range indices
+        404 Not Found: QA record not found
     """
-    import json
-    import uuid
-
-    try:
-        # Load temporary metadata
-        temp_metadata_path = f"survey_files/qa_temp/{temp_qa_id}_metadata.json"
-
-        if not default_storage.exists(temp_metadata_path):
-            return Response(
-                {"error": "Temporary QA data not found or expired"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # Read metadata
-        with default_storage.open(temp_metadata_path, 'r') as f:
-            temp_metadata = json.load(f)
-
-        # Extract data from metadata
-        run_id = temp_metadata['run_id']
-        file_path = temp_metadata['file_path']
-        file_name = temp_metadata['file_name']
-        file_size = temp_metadata['file_size']
-        md_data = temp_metadata['md_data']
-        inc_data = temp_metadata['inc_data']
-        azi_data = temp_metadata['azi_data']
-        gt_data = temp_metadata['gt_data']
-        wt_data = temp_metadata['wt_data']
-        qa_results = temp_metadata['qa_results']
-        location_g_t = temp_metadata['location_g_t']
-        location_w_t = temp_metadata['location_w_t']
-
-        logger.info(f"Loaded temporary QA data for approval: {temp_qa_id}")
-
-        # Get indices to keep from request
-        indices_to_keep = request.data.get('indices_to_keep')
-
-        # Filter data based on indices
-        if indices_to_keep is not None:
-            filtered_data = QAService.filter_stations_by_indices(
-                md_data=md_data,
-                inc_data=inc_data,
-                azi_data=azi_data,
-                gt_data=gt_data,
-                wt_data=wt_data,
-                indices_to_keep=indices_to_keep
-            )
-        else:
-            # Keep only PASS stations
-            logger.info(f"[GTL QA] Original data: {len(md_data)} stations, MD range: {md_data[0]:.2f} to {md_data[-1]:.2f}")
-            logger.info(f"[GTL QA] PASS count: {qa_results['pass_count']}, REMOVE count: {qa_results['remove_count']}")
-
-            filtered_data = QAService.filter_stations_by_status(
-                md_data=md_data,
-                inc_data=inc_data,
-                azi_data=azi_data,
-                gt_data=gt_data,
-                wt_data=wt_data,
-                overall_status_data=qa_results['overall_status_data'],
-                include_status='PASS'
-            )
-
-            logger.info(f"[GTL QA] After filtering: {len(filtered_data['md_data'])} stations kept")
-            logger.info(f"[GTL QA] Filtered MD range: {filtered_data['md_data'][0]:.2f} to {filtered_data['md_data'][-1]:.2f}")
-            logger.info(f"[GTL QA] Last 3 MDs in filtered data: {filtered_data['md_data'][-3:]}")
-
-        # Get Run object
-        try:
-            run = Run.objects.select_related('tieon').get(id=run_id)
-        except Run.DoesNotExist:
-            return Response(
-                {"error": f"Run with id {run_id} does not exist"},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # Recalculate QA metrics on filtered data to get final scores
-        qa_results_filtered = QAService.calculate_qa_metrics(
-            md_data=filtered_data['md_data'],
-            inc_data=filtered_data['inc_data'],
-            azi_data=filtered_data['azi_data'],
-            gt_data=filtered_data['gt_data'],
-            wt_data=filtered_data['wt_data'],
-            location_g_t=location_g_t,
-            location_w_t=location_w_t
-        )
-
-        # Prepend tie-on values to ORIGINAL unfiltered data (for calculation - like Gyro)
-        # Use location G(T) and W(T) for tie-on row (TieOn model doesn't have these)
-        tie_on = run.tieon
-        # CRITICAL FIX: Use ORIGINAL unfiltered data for SurveyData (like Gyro does)
-        # This ensures all stations get calculated coordinates, matching Gyro behavior
-        md_data_with_tieon = [float(tie_on.md)] + md_data  # Original unfiltered
-        inc_data_with_tieon = [float(tie_on.inc)] + inc_data  # Original unfiltered
-        azi_data_with_tieon = [float(tie_on.azi)] + azi_data  # Original unfiltered
-        gt_data_with_tieon = [location_g_t] + gt_data  # Original unfiltered
-        wt_data_with_tieon = [location_w_t] + wt_data  # Original unfiltered
-
-        logger.info(f"[GTL QA FIX] Using ORIGINAL unfiltered data for SurveyData (like Gyro)")
-        logger.info(f"[GTL QA FIX] Total stations with tie-on: {len(md_data_with_tieon)}")
-        logger.info(f"[GTL QA FIX] MD range: {md_data_with_tieon[0]:.2f} to {md_data_with_tieon[-1]:.2f}")
-
-        # Create database records
-        with transaction.atomic():
-            # Create SurveyFile
-            survey_file = SurveyFile.objects.create(
-                run=run,
-                file_name=file_name,
-                file_path=file_path,
-                file_size=file_size,
-                survey_type='GTL',
-                processing_status='completed'
-            )
-
-            # Create SurveyData with ORIGINAL unfiltered data (like Gyro)
-            # This triggers automatic calculation via post-save signal
-            # All stations will get coordinates calculated
-            survey_data = SurveyData.objects.create(
-                survey_file=survey_file,
-                md_data=md_data_with_tieon,
-                inc_data=inc_data_with_tieon,
-                azi_data=azi_data_with_tieon,
-                wt_data=wt_data_with_tieon,
-                gt_data=gt_data_with_tieon,
-                row_count=len(md_data_with_tieon),
-                validation_status='valid',
-                validation_errors=None
-            )
-
-            # Create QualityCheck record
-            quality_check = QualityCheck.objects.create(
-                run=run,
-                survey_data=survey_data,
-                file_name=file_name,
-                md_data=filtered_data['md_data'],
-                inc_data=filtered_data['inc_data'],
-                azi_data=filtered_data['azi_data'],
-                gt_data=filtered_data['gt_data'],
-                wt_data=filtered_data['wt_data'],
-                g_t_difference_data=qa_results_filtered['g_t_difference_data'],
-                w_t_difference_data=qa_results_filtered['w_t_difference_data'],
-                g_t_status_data=qa_results_filtered['g_t_status_data'],
-                w_t_status_data=qa_results_filtered['w_t_status_data'],
-                overall_status_data=qa_results_filtered['overall_status_data'],
-                total_g_t_difference=qa_results_filtered['total_g_t_difference'],
-                total_w_t_difference=qa_results_filtered['total_w_t_difference'],
-                total_g_t_difference_pass=qa_results_filtered['total_g_t_difference_pass'],
-                total_w_t_difference_pass=qa_results_filtered['total_w_t_difference_pass'],
-                g_t_percentage=qa_results_filtered['g_t_percentage'],
-                w_t_percentage=qa_results_filtered['w_t_percentage'],
-                pass_count=qa_results_filtered['pass_count'],
-                remove_count=qa_results_filtered['remove_count'],
-                # Save scores to database
-                delta_wt_score=qa_results_filtered['delta_wt_score'],
-                delta_wt_percentage=qa_results_filtered['delta_wt_percentage'],
-                delta_gt_score=qa_results_filtered['delta_gt_score'],
-                delta_gt_percentage=qa_results_filtered['delta_gt_percentage'],
-                w_t_score_points=qa_results_filtered['w_t_score_points'],
-                g_t_score_points=qa_results_filtered['g_t_score_points'],
-                max_score=qa_results_filtered['max_score'],
-                total_rows=qa_results_filtered['total_rows'],
-                status='approved'
-            )
-
-        logger.info(f"Created SurveyFile {survey_file.id}, SurveyData {survey_data.id}, QualityCheck {quality_check.id}")
-
-        # IMPORTANT: Post-save signal won't fire until AFTER transaction commits
-        # Since SurveyData creation is inside transaction.atomic(), we must manually trigger calculation
-        # This ensures calculation uses the ORIGINAL unfiltered data we just saved
-        logger.info(f"[GTL QA FIX] Transaction committed, SurveyData saved with {len(survey_data.md_data)} stations")
-
-        # Trigger survey calculation manually after transaction completes
-        calculated_survey = None
-        calculation_error = None
-        try:
-            from survey_api.services.survey_calculation_service import SurveyCalculationService
-            logger.info(f"[GTL QA FIX] Manually triggering calculation for SurveyData {survey_data.id}")
-            calculated_survey = SurveyCalculationService.calculate(str(survey_data.id))
-            logger.info(f"[GTL QA FIX] ✓ Calculation completed: {calculated_survey.id}")
-            logger.info(f"[GTL QA FIX] ✓ Calculated {len(calculated_survey.northing)} coordinate points")
-            logger.info(f"[GTL QA FIX] ✓ Last 3 Northings: {calculated_survey.northing[-3:]}")
-            logger.info(f"[GTL QA FIX] ✓ Last 3 TVDs: {calculated_survey.tvd[-3:]}")
-        except Exception as e:
-            calculation_error = str(e)
-            logger.error(f"[GTL QA FIX] ✗ Calculation failed: {calculation_error}")
-            logger.exception(e)
-
-        # Clean up temporary files
-        try:
-            if default_storage.exists(temp_metadata_path):
-                default_storage.delete(temp_metadata_path)
-            # Note: The actual survey file is kept and linked to SurveyFile record
-        except Exception as cleanup_error:
-            logger.warning(f"Failed to clean up temporary files: {cleanup_error}")
-
-        response_data = {
-            "success": True,
-            "message": "QA approved, survey saved and calculation completed" if calculated_survey else "QA approved, survey saved but calculation failed",
-            "survey_data_id": str(survey_data.id),
-            "calculated_survey_id": str(calculated_survey.id) if calculated_survey else None
-        }
-
-        if calculation_error:
-            response_data["calculation_error"] = calculation_error
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
-
-    except Exception as e:
-        logger.exception(f"Error approving temporary GTL QA: {e}")
+    serializer = QARescoreRequestSerializer(data=request.data)
+    if not serializer.is_valid():
         return Response(
             {
-                "error": "Internal server error",
-                "details": [str(e)]
+                "error": "Invalid request data",
+                "details": serializer.errors
             },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            status=status.HTTP_400_BAD_REQUEST
         )
 
+    try:
+        result = QARescoreService.rescore(qa_id, **serializer.validated_data)
+    except QualityCheck.DoesNotExist:
+        return Response(
+            {"error": f"QA record with id {qa_id} does not exist"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response(result, status=status.HTTP_200_OK)
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -759,8 +493,8 @@ def download_qc_report(request, qa_id):
         400 Bad Request: QA not approved yet
         500 Internal Server Error: Report generation error
     """
-    from django.http import FileResponse
     from survey_api.services.qc_report_service import QCReportService
+    from survey_api.utils.ranged_file_response import ranged_file_response
 
     try:
         # Verify QA exists and is approved
@@ -778,24 +512,14 @@ def download_qc_report(request, qa_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        logger.info(f"Generating QC report for QA {qa_id}")
-
-        # Generate PDF
-        pdf_buffer = QCReportService.generate_qc_report(qa_id)
+        # Stored PDF for the QA check's current inputs (generated on first request)
+        artifact = QCReportService.get_report_artifact(qa_id)
 
         # Create filename
         filename = f"QC_Report_{qa_check.file_name.replace('.xlsx', '').replace('.csv', '')}.pdf"
 
-        # Return PDF as file response
-        response = FileResponse(
-            pdf_buffer,
-            content_type='application/pdf',
-            as_attachment=True,
-            filename=filename
-        )
-
-        logger.info(f"QC report generated successfully: {filename}")
-        return response
+        # Serve the stored file; supports Range and If-None-Match
+        return ranged_file_response(request, artifact.open(), filename, etag=artifact.etag)
 
     except Exception as e:
         logger.exception(f"Error generating QC report: {e}")
@@ -11,7 +11,6 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.http import HttpResponse
 
 from survey_api.models import Run
 from survey_api.serializers.run_serializer import RunSerializer, RunCreateSerializer
@@ -21,6 +20,8 @@ from survey_api.filters import RunFilter
 from survey_api.pagination import StandardResultsSetPagination
 from survey_api.exceptions import RunNotFoundError, UnauthorizedError
 from survey_api.views.activity_log_viewset import log_activity
+from survey_api.utils.etags import conditional_response, set_etag_headers, run_detail_etag
+from survey_api.utils.ranged_file_response import ranged_file_response
 
 
 class RunViewSet(viewsets.ModelViewSet):
@@ -171,11 +172,19 @@ class RunViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve a single run with all related data.
+
+        Supports conditional GET: a matching If-None-Match returns 304
+        without loading the run's nested relations or survey data.
         """
         try:
+            etag = run_detail_etag(kwargs['pk'])
+            cached = conditional_response(request, etag)
+            if cached is not None:
+                return cached
+
             instance = RunService.get_run(kwargs['pk'], request.user)
             serializer = self.get_serializer(instance)
-            return Response(serializer.data)
+            return set_etag_headers(Response(serializer.data), etag)
         except Run.DoesNotExist:
             raise RunNotFoundError("Run not found")
 
@@ -240,14 +249,12 @@ class RunViewSet(viewsets.ModelViewSet):
         run = self.get_object()
 
         try:
-            # Generate PDF
-            pdf_buffer = ServiceTicketReportService.generate_service_ticket(run)
+            # Stored PDF for the run's current inputs (generated on first request)
+            artifact = ServiceTicketReportService.get_report_artifact(run)
 
-            # Create response with PDF
-            response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="Service_Ticket_{run.run_number}.pdf"'
-
-            return response
+            return ranged_file_response(
+                request, artifact.open(), f"Service_Ticket_{run.run_number}.pdf", etag=artifact.etag
+            )
 
         except Exception as e:
             return Response(
@@ -270,14 +277,12 @@ class RunViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Generate PDF - returns bytes directly
-            pdf_bytes = PrejobReportService.generate_prejob_report(run.job, run)
+            # Stored PDF for the run's current inputs (generated on first request)
+            artifact = PrejobReportService.get_report_artifact(run.job, run)
 
-            # Create response with PDF
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="Prejob_Report_{run.run_number}.pdf"'
-
-            return response
+            return ranged_file_response(
+                request, artifact.open(), f"Prejob_Report_{run.run_number}.pdf", etag=artifact.etag
+            )
 
         except Exception as e:
             return Response(
@@ -293,14 +298,12 @@ class RunViewSet(viewsets.ModelViewSet):
         run = self.get_object()
 
         try:
-            # Generate PDF
-            pdf_buffer = CustomerSatisfactionReportService.generate_customer_satisfaction_report(run)
+            # Stored PDF for the run's current inputs (generated on first request)
+            artifact = CustomerSatisfactionReportService.get_report_artifact(run)
 
-            # Create response with PDF
-            response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="Customer_Satisfaction_Report_{run.run_number}.pdf"'
-
-            return response
+            return ranged_file_response(
+                request, artifact.open(), f"Customer_Satisfaction_Report_{run.run_number}.pdf", etag=artifact.etag
+            )
 
         except Exception as e:
             return Response(
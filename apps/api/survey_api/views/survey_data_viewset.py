@@ -5,15 +5,21 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import FileResponse
 from django.db import transaction
-from io import BytesIO
 import logging
 
 from survey_api.models import SurveyData, CalculatedSurvey, QualityCheck
-from survey_api.services.survey_calculation_report_service import generate_survey_calculation_report
+from survey_api.services.survey_calculation_report_service import get_survey_calculation_report_artifact
 from survey_api.services.survey_calculation_service import SurveyCalculationService
 from survey_api.services.qa_service import QAService
+from survey_api.services.recalculation_service import recalculation
+from survey_api.utils.etags import (
+    conditional_response,
+    set_etag_headers,
+    survey_data_detail_etag,
+)
+from survey_api.utils.md_window import MDWindow
+from survey_api.utils.ranged_file_response import ranged_file_response
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +30,35 @@ def get_survey_data_detail(request, survey_data_id):
     """
     Get complete survey data including raw data and calculated results.
 
+    Query Parameters:
+        md_from, md_to: Optional inclusive MD window; every station array
+            (raw, calculated and QA) is cut to the stations inside it
+        stride: Optional; return every n-th station of the window
+
     Args:
         survey_data_id: UUID of the SurveyData
 
     Returns:
         200 OK: Complete survey data with calculations
+        304 Not Modified: If-None-Match matches the current ETag
+        400 Bad Request: Invalid MD window
         404 Not Found: Survey not found
     """
+    window = MDWindow.from_request(request)
+
     try:
+        # Results invalidated by a run input change are recalculated before the ETag is taken
+        recalculation.refresh_if_stale(survey_data_id)
+
+        # Answer revalidation requests before loading any array columns
+        etag = window.vary(survey_data_detail_etag(survey_data_id))
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+
         survey_data = SurveyData.objects.select_related('survey_file').get(id=survey_data_id)
+        md = survey_data.column_array('md_data')
+        raw = window.take_columns(survey_data, md, SurveyData.ARRAY_FIELDS)
 
         # Try to get calculated survey data
         try:
@@ -46,6 +72,8 @@ def get_survey_data_detail(request, survey_data_id):
         # Try to get QA data (GTL surveys only)
         try:
             quality_check = QualityCheck.objects.get(survey_data=survey_data)
+            # The check reads its stations from this SurveyData
+            quality_check.survey_data = survey_data
             has_qa_data = True
         except QualityCheck.DoesNotExist:
             quality_check = None
@@ -68,30 +96,22 @@ def get_survey_data_detail(request, survey_data_id):
 
             # Raw survey data
             'survey_data': {
-                'md_data': survey_data.md_data,
-                'inc_data': survey_data.inc_data,
-                'azi_data': survey_data.azi_data,
-                'wt_data': survey_data.wt_data,
-                'gt_data': survey_data.gt_data,
+                **raw,
                 'row_count': survey_data.row_count,
             },
         }
+        if not window.is_full:
+            response_data['window'] = window.describe(window.locate(md), len(md))
 
         # Add calculated coordinates at root level (for frontend compatibility)
         if has_calculations:
             response_data['id'] = str(calculated.id)  # Use calculated survey ID as the main ID
-            response_data['northing'] = calculated.northing
-            response_data['easting'] = calculated.easting
-            response_data['tvd'] = calculated.tvd
-            response_data['dls'] = calculated.dls
-            response_data['build_rate'] = calculated.build_rate
-            response_data['turn_rate'] = calculated.turn_rate
-            response_data['vertical_section'] = calculated.vertical_section
-            response_data['closure_distance'] = calculated.closure_distance
-            response_data['closure_direction'] = calculated.closure_direction
+            # Calculated arrays are parallel to the survey MD column
+            response_data.update(window.take_columns(calculated, md, CalculatedSurvey.ARRAY_FIELDS))
             response_data['vertical_section_azimuth'] = float(calculated.vertical_section_azimuth) if calculated.vertical_section_azimuth else None
             response_data['calculation_duration'] = float(calculated.calculation_duration) if calculated.calculation_duration else None
             response_data['calculation_status'] = calculated.calculation_status
+            response_data['is_stale'] = calculated.is_stale
             response_data['survey_data_id'] = str(survey_data.id)  # Keep survey data ID for reference
         else:
             response_data['northing'] = []
@@ -105,32 +125,33 @@ def get_survey_data_detail(request, survey_data_id):
 
         # Add QA data if available (GTL surveys)
         if has_qa_data:
-            # Get location G(t) and W(t) from run
-            run = survey_data.survey_file.run
-            location = run.well.location if hasattr(run, 'well') and run.well and hasattr(run.well, 'location') else None
-            location_g_t = float(location.g_t) if location and location.g_t else 0.0
-            location_w_t = float(location.w_t) if location and location.w_t else 0.0
-
-            # Build station-level QA data
+            # Location G(t) and W(t) the stations were scored against
+            location_g_t = quality_check.location_g_t
+            location_w_t = quality_check.location_w_t
+
+            # Build station-level QA data (QA stations carry their own MD column).
+            # Pending checks list every station, approved ones the kept stations.
+            reviewed = quality_check.reviewed_stations()
+            qa_window = window.locate(reviewed['md_data'])
             stations = []
-            for i in range(len(quality_check.md_data)):
+            for i in range(len(reviewed['md_data']))[qa_window]:
                 stations.append({
-                    'index': i,
-                    'md': quality_check.md_data[i],
-                    'inc': quality_check.inc_data[i],
-                    'azi': quality_check.azi_data[i],
-                    'g_t': quality_check.gt_data[i],
-                    'w_t': quality_check.wt_data[i],
-                    'g_t_difference': quality_check.g_t_difference_data[i],
-                    'w_t_difference': quality_check.w_t_difference_data[i],
-                    'g_t_status': quality_check.g_t_status_data[i],
-                    'w_t_status': quality_check.w_t_status_data[i],
-                    'overall_status': quality_check.overall_status_data[i],
+                    'index': reviewed['index'][i],
+                    'md': reviewed['md_data'][i],
+                    'inc': reviewed['inc_data'][i],
+                    'azi': reviewed['azi_data'][i],
+                    'g_t': reviewed['gt_data'][i],
+                    'w_t': reviewed['wt_data'][i],
+                    'g_t_difference': reviewed['g_t_difference_data'][i],
+                    'w_t_difference': reviewed['w_t_difference_data'][i],
+                    'g_t_status': reviewed['g_t_status_data'][i],
+                    'w_t_status': reviewed['w_t_status_data'][i],
+                    'overall_status': reviewed['overall_status_data'][i],
                 })
 
             # Prepare summary with all fields
             summary = {
-                'total_stations': len(quality_check.md_data),
+                'total_stations': len(reviewed['md_data']),
                 'pass_count': int(quality_check.pass_count),
                 'remove_count': int(quality_check.remove_count),
                 'g_t_score': f"{float(quality_check.total_g_t_difference_pass):.2f} / {float(quality_check.total_g_t_difference):.2f}",
@@ -157,11 +178,7 @@ def get_survey_data_detail(request, survey_data_id):
                 # Calculate scores on-the-fly for pending QAs
                 try:
                     qa_results = QAService.calculate_qa_metrics(
-                        md_data=quality_check.md_data,
-                        inc_data=quality_check.inc_data,
-                        azi_data=quality_check.azi_data,
-                        gt_data=quality_check.gt_data,
-                        wt_data=quality_check.wt_data,
+                        **quality_check.stations(),
                         location_g_t=location_g_t,
                         location_w_t=location_w_t
                     )
@@ -186,7 +203,7 @@ def get_survey_data_detail(request, survey_data_id):
         else:
             response_data['qa_data'] = None
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return set_etag_headers(Response(response_data, status=status.HTTP_200_OK), etag)
 
     except SurveyData.DoesNotExist:
         return Response(
@@ -214,13 +231,18 @@ def generate_survey_report_view(request, survey_data_id):
     Args:
         survey_data_id: UUID of the SurveyData
 
+    Reports are stored per input version, so repeated downloads of an
+    unchanged survey are served from disk.
+
     Returns:
         200 OK: PDF file
+        206 Partial Content: Requested byte range of the PDF
+        304 Not Modified: If-None-Match matches the stored report
         404 Not Found: Survey not found
         500 Internal Server Error: Report generation failed
     """
     try:
-        from survey_api.services.interpolated_report_service import generate_interpolated_survey_report
+        from survey_api.services.interpolated_report_service import get_interpolated_survey_report_artifact
 
         survey_data = SurveyData.objects.select_related('survey_file__run__well').get(id=survey_data_id)
 
@@ -228,28 +250,20 @@ def generate_survey_report_view(request, survey_data_id):
         data_source = request.GET.get('data_source', 'calculated')
         resolution = int(request.GET.get('resolution', 5))
 
-        # Generate PDF report based on data source
+        # Fetch (or generate and store) the PDF report based on data source
         if data_source == 'interpolated':
             # Get calculated survey ID
             calculated_survey = CalculatedSurvey.objects.get(survey_data_id=survey_data_id)
-            pdf_bytes = generate_interpolated_survey_report(str(calculated_survey.id), resolution)
+            artifact = get_interpolated_survey_report_artifact(str(calculated_survey.id), resolution)
             filename_prefix = f"interpolated_survey_report_r{resolution}m"
         else:
             # Default to calculated report
-            pdf_bytes = generate_survey_calculation_report(survey_data_id)
+            artifact = get_survey_calculation_report_artifact(survey_data_id)
             filename_prefix = "survey_calculation_report"
 
-        # Create response with PDF
-        response = FileResponse(
-            BytesIO(pdf_bytes),
-            content_type='application/pdf'
-        )
-
-        # Set filename for download
+        # Serve the stored file; supports Range and If-None-Match
         filename = f"{filename_prefix}_{survey_data.survey_file.file_name.rsplit('.', 1)[0]}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return ranged_file_response(request, artifact.open(), filename, etag=artifact.etag)
 
     except SurveyData.DoesNotExist:
         return Response(
@@ -282,7 +296,7 @@ def approve_qa_and_calculate(request, survey_data_id):
     from survey_api.services.qa_service import QAService
 
     try:
-        survey_data = SurveyData.objects.select_related('survey_file__run__tieon', 'survey_file__run__well__location').get(id=survey_data_id)
+        survey_data = SurveyData.objects.select_related('survey_file__run__tieon').get(id=survey_data_id)
 
         # Get associated QualityCheck
         try:
@@ -297,101 +311,16 @@ def approve_qa_and_calculate(request, survey_data_id):
         indices_to_keep = request.data.get('indices_to_keep')
 
         with transaction.atomic():
-            # If pending_qa status, we need to filter data and add tie-on
+            # If pending_qa status, record the kept stations and add tie-on
             if survey_data.validation_status == 'pending_qa':
-                # Filter data based on indices
-                if indices_to_keep is not None:
-                    filtered_data = QAService.filter_stations_by_indices(
-                        md_data=quality_check.md_data,
-                        inc_data=quality_check.inc_data,
-                        azi_data=quality_check.azi_data,
-                        gt_data=quality_check.gt_data,
-                        wt_data=quality_check.wt_data,
-                        indices_to_keep=indices_to_keep
-                    )
-                else:
-                    # Keep only PASS stations
-                    filtered_data = QAService.filter_stations_by_status(
-                        md_data=quality_check.md_data,
-                        inc_data=quality_check.inc_data,
-                        azi_data=quality_check.azi_data,
-                        gt_data=quality_check.gt_data,
-                        wt_data=quality_check.wt_data,
-                        overall_status_data=quality_check.overall_status_data,
-                        include_status='PASS'
-                    )
-
-                # Get tie-on data and prepend it
-                run = survey_data.survey_file.run
-                tie_on = run.tieon
-
-                # Get location for G(T) and W(T) values
-                location = run.well.location if hasattr(run, 'well') and run.well and hasattr(run.well, 'location') else None
-                location_g_t = float(location.g_t or 0) if location else 0
-                location_w_t = float(location.w_t or 0) if location else 0
-
-                md_data_with_tieon = [float(tie_on.md)] + filtered_data['md_data']
-                inc_data_with_tieon = [float(tie_on.inc)] + filtered_data['inc_data']
-                azi_data_with_tieon = [float(tie_on.azi)] + filtered_data['azi_data']
-                gt_data_with_tieon = [location_g_t] + filtered_data['gt_data']
-                wt_data_with_tieon = [location_w_t] + filtered_data['wt_data']
-
-                # Update SurveyData with tie-on data
-                survey_data.md_data = md_data_with_tieon
-                survey_data.inc_data = inc_data_with_tieon
-                survey_data.azi_data = azi_data_with_tieon
-                survey_data.gt_data = gt_data_with_tieon
-                survey_data.wt_data = wt_data_with_tieon
-                survey_data.row_count = len(md_data_with_tieon)
-                survey_data.validation_status = 'valid'
+                # SurveyData becomes the tie-on plus the kept stations (the
+                # calculation input); the removed ones move to the QualityCheck
+                QAService.approve_pending_survey(
+                    quality_check, survey_data, survey_data.survey_file.run.tieon, indices_to_keep
+                )
                 survey_data.save()
 
-                # Recalculate QA metrics on filtered data to get final scores
-                location = run.well.location if hasattr(run, 'well') and run.well and hasattr(run.well, 'location') else None
-                if location:
-                    location_g_t = float(location.g_t or 0)
-                    location_w_t = float(location.w_t or 0)
-
-                    qa_results_filtered = QAService.calculate_qa_metrics(
-                        md_data=filtered_data['md_data'],
-                        inc_data=filtered_data['inc_data'],
-                        azi_data=filtered_data['azi_data'],
-                        gt_data=filtered_data['gt_data'],
-                        wt_data=filtered_data['wt_data'],
-                        location_g_t=location_g_t,
-                        location_w_t=location_w_t
-                    )
-
-                    # Update QualityCheck with filtered data and scores
-                    quality_check.md_data = filtered_data['md_data']
-                    quality_check.inc_data = filtered_data['inc_data']
-                    quality_check.azi_data = filtered_data['azi_data']
-                    quality_check.gt_data = filtered_data['gt_data']
-                    quality_check.wt_data = filtered_data['wt_data']
-                    quality_check.g_t_difference_data = qa_results_filtered['g_t_difference_data']
-                    quality_check.w_t_difference_data = qa_results_filtered['w_t_difference_data']
-                    quality_check.g_t_status_data = qa_results_filtered['g_t_status_data']
-                    quality_check.w_t_status_data = qa_results_filtered['w_t_status_data']
-                    quality_check.overall_status_data = qa_results_filtered['overall_status_data']
-                    quality_check.pass_count = qa_results_filtered['pass_count']
-                    quality_check.remove_count = qa_results_filtered['remove_count']
-                    quality_check.delta_wt_score = qa_results_filtered['delta_wt_score']
-                    quality_check.delta_wt_percentage = qa_results_filtered['delta_wt_percentage']
-                    quality_check.delta_gt_score = qa_results_filtered['delta_gt_score']
-                    quality_check.delta_gt_percentage = qa_results_filtered['delta_gt_percentage']
-                    quality_check.w_t_score_points = qa_results_filtered['w_t_score_points']
-                    quality_check.g_t_score_points = qa_results_filtered['g_t_score_points']
-                    quality_check.max_score = qa_results_filtered['max_score']
-                    quality_check.total_rows = qa_results_filtered['total_rows']
-
-                    logger.info(
-                        f"Updated QualityCheck with filtered data: "
-                        f"Delta W(t): {quality_check.delta_wt_percentage}%, "
-                        f"Delta G(t): {quality_check.delta_gt_percentage}%, "
-                        f"Stations: {quality_check.total_rows}"
-                    )
-
-            # Update QualityCheck status to approved
+            # Update QualityCheck status to approved (already-valid surveys keep their mask)
             quality_check.status = 'approved'
             quality_check.save()
 
@@ -411,22 +340,23 @@ def approve_qa_and_calculate(request, survey_data_id):
             except CalculatedSurvey.DoesNotExist:
                 logger.info("No existing CalculatedSurvey found - will create new")
 
-            # Trigger survey calculation
-            try:
-                calculated_survey = SurveyCalculationService.calculate(str(survey_data.id))
-                logger.info(f"Survey calculation completed - CalculatedSurvey ID: {calculated_survey.id}")
-            except Exception as calc_error:
-                logger.exception(f"Error during survey calculation: {calc_error}")
-                return Response(
-                    {'error': f'Survey calculation failed: {str(calc_error)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        # Calculate once the approval is committed, so the row locks are not
+        # held for the calculation and a failed calculation keeps the approval
+        try:
+            calculated_survey = SurveyCalculationService.calculate(str(survey_data.id))
+            logger.info(f"Survey calculation completed - CalculatedSurvey ID: {calculated_survey.id}")
+        except Exception as calc_error:
+            logger.exception(f"Error during survey calculation: {calc_error}")
+            return Response(
+                {'error': f'Survey calculation failed: {str(calc_error)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-            return Response({
-                'success': True,
-                'message': 'QA approved and survey calculation completed',
-                'calculated_survey_id': str(calculated_survey.id)
-            }, status=status.HTTP_200_OK)
+        return Response({
+            'success': True,
+            'message': 'QA approved and survey calculation completed',
+            'calculated_survey_id': str(calculated_survey.id)
+        }, status=status.HTTP_200_OK)
 
     except SurveyData.DoesNotExist:
         return Response(
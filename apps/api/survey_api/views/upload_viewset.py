@@ -229,19 +229,7 @@ def upload_survey_file(request):
                     azi_data=parsed_data['azi_data'],
                     gt_data=parsed_data.get('gt_data', []),
                     wt_data=parsed_data.get('wt_data', []),
-                    g_t_difference_data=qa_metrics['g_t_difference_data'],
-                    w_t_difference_data=qa_metrics['w_t_difference_data'],
-                    g_t_status_data=qa_metrics['g_t_status_data'],
-                    w_t_status_data=qa_metrics['w_t_status_data'],
-                    overall_status_data=qa_metrics['overall_status_data'],
-                    total_g_t_difference=qa_metrics['total_g_t_difference'],
-                    total_g_t_difference_pass=qa_metrics['total_g_t_difference_pass'],
-                    total_w_t_difference=qa_metrics['total_w_t_difference'],
-                    total_w_t_difference_pass=qa_metrics['total_w_t_difference_pass'],
-                    g_t_percentage=qa_metrics['g_t_percentage'],
-                    w_t_percentage=qa_metrics['w_t_percentage'],
-                    pass_count=qa_metrics['pass_count'],
-                    remove_count=qa_metrics['remove_count'],
+                    **QAService.quality_check_fields(qa_metrics, location_g_t, location_w_t),
                     status='pending'
                 )
 
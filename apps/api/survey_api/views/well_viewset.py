@@ -11,9 +11,14 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
-from survey_api.models import Well
-from survey_api.serializers.well_serializer import WellSerializer, WellListSerializer
+from django.shortcuts import get_object_or_404
+
+from survey_api.models import Well, WellPathComposite
+from survey_api.serializers.well_serializer import WellSerializer, WellListSerializer, WellPathCompositeSerializer
+from survey_api.services.well_path_service import WellPathService
 from survey_api.services.well_service import WellService
+from survey_api.utils.etags import conditional_response, set_etag_headers, well_path_etag
+from survey_api.utils.md_window import MDWindow
 from survey_api.permissions import IsAdminOrEngineer, IsViewerOrAbove
 from survey_api.pagination import StandardResultsSetPagination
 from django.core.exceptions import ValidationError
@@ -31,6 +36,7 @@ class WellViewSet(viewsets.ModelViewSet):
     - PATCH /api/v1/wells/{id}/ - Partially update a well
     - DELETE /api/v1/wells/{id}/ - Hard delete a well (CASCADE to SET_NULL on runs)
     - GET /api/v1/wells/statistics/ - Get well statistics
+    - GET /api/v1/wells/{id}/composite/ - Get the composite well path merged from its runs
 
     Permissions:
     - List/Retrieve: Authenticated users (all roles)
@@ -84,7 +90,7 @@ class WellViewSet(viewsets.ModelViewSet):
         - Safe methods (GET): All authenticated users
         - Unsafe methods (POST, PUT, PATCH, DELETE): Admin or Engineer only
         """
-        if self.action in ['list', 'retrieve', 'statistics']:
+        if self.action in ['list', 'retrieve', 'statistics', 'composite_path']:
             permission_classes = [IsAuthenticated, IsViewerOrAbove]
         else:
             permission_classes = [IsAuthenticated, IsAdminOrEngineer]
@@ -367,3 +373,51 @@ class WellViewSet(viewsets.ModelViewSet):
                 {'error': 'Failed to retrieve statistics', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @action(detail=True, methods=['get'], url_path='composite')
+    def composite_path(self, request, pk=None):
+        """
+        Get the definitive well path merged from the surveys of the well's runs.
+
+        Custom endpoint: GET /api/v1/wells/{id}/composite/
+
+        Overlapping runs are merged by MD with WELL_PATH_SOURCE_PRIORITY; the
+        path is updated from the first changed run downward when a run's
+        survey is added, replaced or removed.
+
+        Query Parameters:
+            - md_from, md_to: Optional inclusive MD window
+            - stride: Optional; every n-th station of the window
+
+        Returns:
+            200 OK with md, inc, azi, easting, northing, tvd, dls and the
+                source segments (survey, run and MD range of each)
+            304 Not Modified if If-None-Match matches the current ETag
+            400 Bad Request if the MD window is invalid or the well has no surveys
+            404 Not Found if the well doesn't exist
+        """
+        window = MDWindow.from_request(request)
+        well = get_object_or_404(Well, id=pk)
+
+        # Brought up to date before the ETag is taken (InsufficientDataError renders as 400)
+        composite = WellPathService.composite(well.id)
+
+        etag = window.vary(well_path_etag(well.id))
+        cached = conditional_response(request, etag)
+        if cached is not None:
+            return cached
+
+        composite = WellPathComposite.objects.get(pk=composite.pk)
+        serializer = WellPathCompositeSerializer(composite)
+        if window.is_full:
+            data = serializer.data
+        else:
+            # Serialize metadata only; arrays are sliced against the composite MD column
+            for name in WellPathComposite.ARRAY_FIELDS:
+                serializer.fields.pop(name)
+            data = serializer.data
+            md = composite.column_array('md')
+            md_window = window.locate(md)
+            data.update(window.take_columns(composite, md, WellPathComposite.ARRAY_FIELDS))
+            data['window'] = window.describe(md_window, len(md))
+        return set_etag_headers(Response(data, status=status.HTTP_200_OK), etag)
@@ -0,0 +1,174 @@
+"""
+Synthetic well trajectories for benchmarks and large-dataset tests.
+
+Each generator returns evenly spaced survey stations (MD in metres, Inc/Azi in
+degrees) for a classic well profile, plus G(t)/W(t) readings scattered around
+the given location values so GTL QA paths can be exercised. Generation is
+deterministic for a given (profile, station_count, seed).
+
+create_located_run/create_survey store wells in the test database for the
+spatial tests (proximity index, clearance scans).
+
+Usage:
+    well = generate_well('horizontal', 10000)
+    WellengService.calculate_survey(well['md'], well['inc'], well['azi'], ...)
+
+    run = create_located_run(user, 'OFFSET-1', easting=500020.0)
+    survey_data = create_survey(run, 'offset.csv')
+"""
+from typing import Dict, List
+
+import numpy as np
+
+PROFILES = ('vertical', 'build_hold', 's_curve', 'horizontal')
+
+# Nominal G(t) (mG) and W(t) (deg/hr) used for GTL readings
+DEFAULT_G_T = 1000.0
+DEFAULT_W_T = 15.0
+
+# Vertical well to 1000 m: every station sits directly below its wellhead
+VERTICAL_STATIONS = {
+    'md_data': [100.0 * i for i in range(11)],
+    'inc_data': [0.0] * 11,
+    'azi_data': [0.0] * 11,
+}
+
+
+def _build_section(md: np.ndarray, start_md: float, rate_per_30m: float,
+                   start_inc: float, target_inc: float) -> np.ndarray:
+    """Inclination along a constant build/drop section, clamped at the target."""
+    change = np.clip(md - start_md, 0.0, None) * rate_per_30m / 30.0
+    if target_inc >= start_inc:
+        return np.minimum(start_inc + change, target_inc)
+    return np.maximum(start_inc - change, target_inc)
+
+
+def _vertical(md: np.ndarray, rng: np.random.Generator):
+    inc = np.abs(rng.normal(0.3, 0.15, md.size))
+    azi = np.cumsum(rng.normal(0.0, 2.0, md.size)) % 360.0
+    return inc, azi
+
+
+def _build_hold(md: np.ndarray, rng: np.random.Generator):
+    td = md[-1]
+    inc = _build_section(md, 0.25 * td, 3.0, 0.0, 45.0)
+    azi = np.full(md.size, 135.0)
+    return inc, azi
+
+
+def _s_curve(md: np.ndarray, rng: np.random.Generator):
+    td = md[-1]
+    build = _build_section(md, 0.15 * td, 2.5, 0.0, 35.0)
+    drop_start = 0.6 * td
+    inc = np.where(md < drop_start, build, _build_section(md, drop_start, 2.0, 35.0, 5.0))
+    azi = np.full(md.size, 60.0)
+    return inc, azi
+
+
+def _horizontal(md: np.ndarray, rng: np.random.Generator):
+    td = md[-1]
+    inc = _build_section(md, 0.4 * td, 8.0, 0.0, 90.0)
+    # Gentle walk through the lateral
+    azi = 270.0 + np.clip(md - 0.4 * td, 0.0, None) * 0.002
+    return inc, azi % 360.0
+
+
+_GENERATORS = {
+    'vertical': (_vertical, 3000.0),
+    'build_hold': (_build_hold, 4000.0),
+    's_curve': (_s_curve, 4000.0),
+    'horizontal': (_horizontal, 6000.0),
+}
+
+
+def generate_well(
+    profile: str,
+    station_count: int,
+    seed: int = 0,
+    location_g_t: float = DEFAULT_G_T,
+    location_w_t: float = DEFAULT_W_T
+) -> Dict[str, List[float]]:
+    """
+    Generate a synthetic survey for one of the standard well profiles.
+
+    Args:
+        profile: One of PROFILES
+        station_count: Number of survey stations (>= 2), starting at MD 0
+        seed: Random seed for noise on Inc/Azi and G(t)/W(t)
+        location_g_t: Centre value for generated G(t) readings
+        location_w_t: Centre value for generated W(t) readings
+
+    Returns:
+        Dictionary with 'md', 'inc', 'azi', 'gt', 'wt' lists of equal length
+
+    Raises:
+        ValueError: If profile is unknown or station_count < 2
+    """
+    if profile not in _GENERATORS:
+        raise ValueError(f"Unknown profile '{profile}'. Expected one of {PROFILES}")
+    if station_count < 2:
+        raise ValueError("station_count must be at least 2")
+
+    generator, td = _GENERATORS[profile]
+    rng = np.random.default_rng(seed)
+
+    md = np.linspace(0.0, td, station_count)
+    inc, azi = generator(md, rng)
+    # Surface station is always vertical, as uploaded surveys are
+    inc[0] = 0.0
+    azi[0] = 0.0
+
+    gt = location_g_t + rng.normal(0.0, 1.5, station_count)
+    wt = location_w_t + rng.normal(0.0, 2.0, station_count)
+
+    return {
+        'md': np.round(md, 3).tolist(),
+        'inc': np.round(inc, 3).tolist(),
+        'azi': np.round(azi, 3).tolist(),
+        'gt': np.round(gt, 2).tolist(),
+        'wt': np.round(wt, 2).tolist(),
+    }
+
+
+def create_located_run(user, run_number: str, easting: float = 500000.0, northing: float = 2488000.0):
+    """
+    Create an MWD run with a grid-north wellhead location, depth reference and surface tie-on.
+
+    The wellhead is given in UTM zone 40N grid coordinates; runs with
+    different eastings/northings are laterally offset by the difference.
+    """
+    from survey_api.models import Depth, Location, Run, TieOn
+
+    run = Run.objects.create(run_number=run_number, run_name=run_number, survey_type='MWD', user=user)
+    Location.objects.create(
+        run=run, latitude=22.5, longitude=57.0, easting=easting, northing=northing,
+        geodetic_datum='WGS84', map_zone='Zone 40N(54E to 60E)', north_reference='Grid North'
+    )
+    Depth.objects.create(run=run, reference_height=30.0, reference_elevation=100.0)
+    TieOn.objects.create(
+        run=run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+        well_type='Oil', survey_interval_from=0.0, survey_interval_to=4000.0
+    )
+    return run
+
+
+def create_survey(run, file_name: str, stations: Dict[str, List[float]] = None):
+    """
+    Create a valid, not yet calculated survey for a run (VERTICAL_STATIONS by default).
+
+    Tests calculate it explicitly, e.g. with BatchCalculationService.calculate_many.
+    """
+    from survey_api.models import SurveyData, SurveyFile
+
+    stations = stations or VERTICAL_STATIONS
+    survey_file = SurveyFile.objects.create(
+        run=run, file_name=file_name, file_path=f'/synthetic/{file_name}',
+        file_size=1000, survey_type=run.survey_type, survey_role='reference'
+    )
+    # Created as pending_qa so the post_save auto-calculation does not run, then marked valid
+    survey_data = SurveyData.objects.create(
+        survey_file=survey_file, row_count=len(stations['md_data']), validation_status='pending_qa', **stations
+    )
+    SurveyData.objects.filter(id=survey_data.id).update(validation_status='valid')
+    survey_data.validation_status = 'valid'
+    return survey_data
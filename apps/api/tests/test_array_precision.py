@@ -0,0 +1,51 @@
+"""
+Tests for the survey array precision policy.
+"""
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from survey_api.models import CalculatedSurvey, InterpolatedSurvey, SurveyData
+from survey_api.utils.array_precision import ANGLE, POSITION, RAW, quantize, storage_dtype
+from survey_api.utils.array_store import ArrayStore
+
+
+class ArrayPrecisionTest(SimpleTestCase):
+    """Test cases for quantize and storage_dtype."""
+
+    def test_quantize_within_tolerance(self):
+        """Derived values move by at most the documented tolerance."""
+        values = [1234.56789, -0.00049, None, float('nan')]
+        quantized = quantize(values, POSITION)
+        self.assertEqual(quantized[:3], [1234.568, -0.0, None])
+        self.assertTrue(np.isnan(quantized[3]))
+        self.assertLessEqual(abs(quantized[0] - values[0]), POSITION.tolerance)
+        self.assertEqual(ANGLE.tolerance, 0.00005)
+
+    def test_raw_columns_untouched(self):
+        """RAW columns keep full precision."""
+        values = [1.23456789012345]
+        self.assertIs(quantize(values, RAW), values)
+
+    def test_large_values_keep_float64(self):
+        """Values beyond float32's safe range are stored as float64."""
+        self.assertEqual(storage_dtype(np.array([10.0, 20.0]), POSITION), '<f4')
+        self.assertEqual(storage_dtype(np.array([10.0, 250000.0]), POSITION), '<f8')
+        self.assertEqual(storage_dtype(np.array([250000.0]), RAW), '<f8')
+
+    def test_policy_covers_derived_columns_only(self):
+        """Every derived column has a policy; raw survey inputs have none."""
+        self.assertEqual(set(CalculatedSurvey.ARRAY_PRECISION), set(CalculatedSurvey.ARRAY_FIELDS))
+        self.assertEqual(set(InterpolatedSurvey.ARRAY_PRECISION), set(InterpolatedSurvey.ARRAY_FIELDS))
+        self.assertEqual(SurveyData.ARRAY_PRECISION, {})
+
+    def test_float32_store_round_trip(self):
+        """float32 columns read back at the policy's decimals."""
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SURVEY_ARRAY_STORE_DIR=tmp):
+            store = ArrayStore()
+            ref = store.write('calculated_surveys', 'abc', {'easting': [1234.567, 0.1, None]},
+                              precision={'easting': POSITION})
+            self.assertEqual(ref['columns']['easting']['dtype'], '<f4')
+            self.assertEqual(store.read_list(ref, 'easting'), [1234.567, 0.1, None])
+            self.assertEqual(store.read_window(ref, 'easting', slice(1, 2)), [0.1])
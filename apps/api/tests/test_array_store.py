@@ -0,0 +1,130 @@
+"""
+Tests for the on-disk survey array store.
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.exceptions import ArrayStoreIntegrityError
+from survey_api.models import Run, SurveyData, SurveyFile, Well
+from survey_api.models.survey_data import trigger_calculation
+from survey_api.utils.array_store import ArrayStore
+
+User = get_user_model()
+
+
+class ArrayStoreTest(SimpleTestCase):
+    """Test cases for ArrayStore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(SURVEY_ARRAY_STORE_DIR=self.tmp.name)
+        self.settings_override.enable()
+        self.store = ArrayStore()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmp.cleanup()
+
+    def test_round_trip_with_missing_values(self):
+        """Columns come back unchanged, with None for missing values."""
+        ref = self.store.write('survey_data', 'abc', {'md_data': [0.0, 10.0, 20.0], 'wt_data': [1.5, None, 2.5]})
+        self.assertEqual(self.store.read_list(ref, 'md_data'), [0.0, 10.0, 20.0])
+        self.assertEqual(self.store.read_list(ref, 'wt_data'), [1.5, None, 2.5])
+
+    def test_open_is_read_only_memmap(self):
+        """open() memory-maps the column without copying it."""
+        ref = self.store.write('survey_data', 'abc', {'md_data': np.arange(100.0)})
+        md = self.store.open(ref, 'md_data')
+        self.assertIsInstance(md, np.memmap)
+        self.assertFalse(md.flags.writeable)
+        self.assertEqual(md[40:43].tolist(), [40.0, 41.0, 42.0])
+
+    def test_checksum_detects_modification(self):
+        """A modified file fails read_list and verify."""
+        ref = self.store.write('survey_data', 'abc', {'md_data': [0.0, 10.0, 20.0]})
+        path = Path(self.tmp.name) / 'survey_data' / 'abc' / ref['columns']['md_data']['file']
+        np.save(path, np.array([0.0, 10.0, 99.0]))
+
+        with self.assertRaises(ArrayStoreIntegrityError):
+            self.store.read_list(ref, 'md_data')
+        self.assertEqual(self.store.verify(ref), ['md_data'])
+
+    def test_unchanged_columns_not_rewritten_and_old_files_pruned(self):
+        """Rewriting identical data keeps the file; prune drops superseded files."""
+        first = self.store.write('survey_data', 'abc', {'md_data': [0.0, 1.0]})
+        same = self.store.write('survey_data', 'abc', {'md_data': [0.0, 1.0]}, first)
+        self.assertEqual(first, same)
+
+        changed = self.store.write('survey_data', 'abc', {'md_data': [0.0, 2.0]}, first)
+        self.store.prune('survey_data', 'abc', changed)
+        files = [p.name for p in (Path(self.tmp.name) / 'survey_data' / 'abc').glob('*.npy')]
+        self.assertEqual(files, [changed['columns']['md_data']['file']])
+
+
+class StoredArraysModelTest(TestCase):
+    """Test offloading SurveyData arrays to the array store."""
+
+    def setUp(self):
+        # Cleanups rather than tearDown: they also run if setUp fails part way
+        post_save.disconnect(trigger_calculation, sender=SurveyData)
+        self.addCleanup(post_save.connect, trigger_calculation, sender=SurveyData)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            SURVEY_ARRAY_STORE_ENABLED=True, SURVEY_ARRAY_STORE_MIN_POINTS=3, SURVEY_ARRAY_STORE_DIR=self.tmp.name
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        well = Well.objects.create(well_name='Test Well', well_id='AS-001')
+        run = Run.objects.create(user=user, well=well, run_number='RUN-001', run_name='Test Run 001', run_type='MWD')
+        self.survey_file = SurveyFile.objects.create(
+            run=run, file_name='test.csv', file_path='/tmp/test.csv', file_size=1024,
+            survey_type='MWD', processing_status='completed'
+        )
+
+    def create(self, count):
+        return SurveyData.objects.create(
+            survey_file=self.survey_file,
+            md_data=[float(i * 10) for i in range(count)],
+            inc_data=[1.0] * count,
+            azi_data=[45.0] * count,
+            row_count=count,
+            validation_status='valid'
+        )
+
+    def test_large_rows_offloaded(self):
+        """The row holds placeholders; attribute access reads the files."""
+        survey_data = self.create(4)
+
+        row = SurveyData.objects.filter(pk=survey_data.pk).values('md_data', 'wt_data', 'array_ref').get()
+        self.assertEqual(row['md_data'], [])
+        self.assertIsNone(row['wt_data'])
+        self.assertIn('md_data', row['array_ref']['columns'])
+
+        loaded = SurveyData.objects.get(pk=survey_data.pk)
+        self.assertEqual(loaded.md_data, [0.0, 10.0, 20.0, 30.0])
+        self.assertIsNone(loaded.wt_data)
+        self.assertIsInstance(loaded.column_array('inc_data'), np.memmap)
+
+    def test_small_rows_stay_inline(self):
+        """Rows below SURVEY_ARRAY_STORE_MIN_POINTS keep their JSON arrays."""
+        survey_data = self.create(2)
+        row = SurveyData.objects.filter(pk=survey_data.pk).values('md_data', 'array_ref').get()
+        self.assertEqual(row['md_data'], [0.0, 10.0])
+        self.assertIsNone(row['array_ref'])
+
+    def test_update_rewrites_files(self):
+        """Saving changed arrays updates the stored columns."""
+        survey_data = self.create(4)
+        loaded = SurveyData.objects.get(pk=survey_data.pk)
+        loaded.inc_data = [2.0, 2.0, 2.0, 2.0]
+        loaded.save(update_fields=['inc_data'])
+
+        self.assertEqual(SurveyData.objects.get(pk=survey_data.pk).inc_data, [2.0, 2.0, 2.0, 2.0])
@@ -0,0 +1,154 @@
+"""
+Tests for batch recalculation of a job's surveys.
+"""
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from survey_api.exceptions import ComputeCapacityError, ValidationError
+from survey_api.models import (
+    CalculatedSurvey, Client, Customer, Depth, Job, Location, Rig, Run, Service,
+    SurveyData, SurveyFile, TieOn, User, Well,
+)
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.interpolation_service import InterpolationService
+from tests.synthetic_wells import generate_well
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False)
+class BatchCalculationServiceTest(TestCase):
+    """Test cases for BatchCalculationService."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='batch_user', email='batch@test.com', password='testpass123', role='engineer'
+        )
+        well = Well.objects.create(well_name='Batch Well', well_id='BATCH-001')
+        cls.job = Job.objects.create(
+            customer=Customer.objects.create(customer_name='Batch Customer'),
+            client=Client.objects.create(client_name='Batch Client'),
+            well=well,
+            rig=Rig.objects.create(rig_id='BATCH-RIG', rig_number='1'),
+            service=Service.objects.create(service_name='Batch Service'),
+        )
+        cls.run_with_tieon = cls._create_run('BATCH001', tieon=True)
+        cls.run_without_tieon = cls._create_run('BATCH002', tieon=False)
+
+        cls.first = cls._create_survey(cls.run_with_tieon, 'first.csv', seed=0)
+        cls.second = cls._create_survey(cls.run_with_tieon, 'second.csv', seed=1)
+        cls.missing_tieon = cls._create_survey(cls.run_without_tieon, 'third.csv', seed=2)
+
+        other_user = User.objects.create_user(
+            username='other_user', email='other@test.com', password='testpass123', role='engineer'
+        )
+        other_run = Run.objects.create(
+            run_number='OTHER001', run_name='Other Run', survey_type='MWD', job=cls.job, well=well, user=other_user
+        )
+        cls.foreign = cls._create_survey(other_run, 'foreign.csv', seed=3)
+
+    @classmethod
+    def _create_run(cls, run_number, tieon):
+        run = Run.objects.create(
+            run_number=run_number, run_name=run_number, survey_type='MWD',
+            job=cls.job, well=cls.job.well, user=cls.user
+        )
+        Location.objects.create(run=run, latitude=29.5, longitude=-95.5, easting=500000.0, northing=3264000.0)
+        Depth.objects.create(run=run, reference_height=30.0, reference_elevation=100.0)
+        if tieon:
+            TieOn.objects.create(
+                run=run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+                well_type='Oil', survey_interval_from=0.0, survey_interval_to=4000.0
+            )
+        return run
+
+    @classmethod
+    def _create_survey(cls, run, file_name, seed):
+        well = generate_well('build_hold', 50, seed=seed)
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name=file_name, file_path=f'/batch/{file_name}',
+            file_size=2000, survey_type='MWD', survey_role='reference'
+        )
+        # pending_qa skips the post_save auto-calculation
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file,
+            md_data=well['md'],
+            inc_data=well['inc'],
+            azi_data=well['azi'],
+            row_count=50,
+            validation_status='pending_qa'
+        )
+        SurveyData.objects.filter(id=survey_data.id).update(validation_status='valid')
+        return survey_data
+
+    def test_survey_data_ids_by_job_excludes_other_users(self):
+        """Job selection returns only the requesting user's surveys."""
+        ids = BatchCalculationService.survey_data_ids(self.user, job_id=self.job.id)
+        self.assertEqual(set(ids), {self.first.id, self.second.id, self.missing_tieon.id})
+
+        ids = BatchCalculationService.survey_data_ids(self.user, survey_data_ids=[self.first.id, self.foreign.id])
+        self.assertEqual(ids, [self.first.id])
+
+    def test_calculate_many_reports_per_survey_status(self):
+        """Each survey gets its own status; missing tie-on is an error record, not a batch failure."""
+        summary = BatchCalculationService.calculate_many([self.first.id, self.second.id, self.missing_tieon.id])
+
+        self.assertEqual((summary['count'], summary['calculated'], summary['failed']), (3, 2, 1))
+        statuses = {item['survey_data_id']: item for item in summary['results']}
+        self.assertEqual(statuses[str(self.first.id)]['status'], 'calculated')
+        self.assertIsNotNone(statuses[str(self.first.id)]['calculation_duration'])
+        self.assertIn('Tie-on', statuses[str(self.missing_tieon.id)]['error_message'])
+
+        calculated = CalculatedSurvey.objects.get(survey_data=self.first)
+        self.assertEqual(len(calculated.northing), 50)
+        self.assertEqual(
+            SurveyFile.objects.get(id=self.missing_tieon.survey_file_id).processing_status, 'failed'
+        )
+
+    def test_existing_calculations_are_updated_in_place(self):
+        """A second batch rewrites the existing CalculatedSurvey rows."""
+        BatchCalculationService.calculate_many([self.first.id])
+        original = CalculatedSurvey.objects.get(survey_data=self.first)
+
+        summary = BatchCalculationService.calculate_many([self.first.id])
+
+        updated = CalculatedSurvey.objects.get(survey_data=self.first)
+        self.assertEqual(summary['results'][0]['calculated_survey_id'], str(original.id))
+        self.assertEqual(updated.id, original.id)
+        self.assertGreater(updated.updated_at, original.updated_at)
+
+    def test_recalculation_flags_interpolations_stale(self):
+        """Interpolations of a rewritten calculation are flagged and recomputed on next request."""
+        BatchCalculationService.calculate_many([self.first.id])
+        calculated = CalculatedSurvey.objects.get(survey_data=self.first)
+        interpolation = InterpolationService.interpolate(str(calculated.id), 10)
+
+        BatchCalculationService.calculate_many([self.first.id])
+
+        interpolation.refresh_from_db()
+        self.assertTrue(interpolation.is_stale)
+        self.assertNotEqual(InterpolationService.interpolate(str(calculated.id), 10).id, interpolation.id)
+
+    @override_settings(GEOGRAPHIC_COORDINATES_EAGER=True, UNCERTAINTY_EAGER=True)
+    def test_eager_stages_run_for_batch_calculations(self):
+        """Geographic coordinates and uncertainty are stored as after a single calculation."""
+        BatchCalculationService.calculate_many([self.first.id])
+
+        calculated = CalculatedSurvey.objects.get(survey_data=self.first)
+        self.assertTrue(calculated.geographic_data)
+        self.assertTrue(calculated.uncertainty_data)
+
+    @override_settings(BATCH_CALCULATION_MAX_SURVEYS=1)
+    def test_batch_size_limit(self):
+        """Oversized batches are rejected before any work is done."""
+        with self.assertRaises(ValidationError):
+            BatchCalculationService.calculate_many([self.first.id, self.second.id])
+
+    def test_pool_unavailable_leaves_surveys_untouched(self):
+        """Surveys the pool could not run are skipped without writing error records."""
+        with mock.patch('survey_api.services.batch_calculation_service.compute_pool') as pool:
+            pool.imap_unordered.side_effect = ComputeCapacityError('busy')
+            summary = BatchCalculationService.calculate_many([self.first.id])
+
+        self.assertEqual(summary['skipped'], 1)
+        self.assertFalse(CalculatedSurvey.objects.filter(survey_data=self.first).exists())
@@ -0,0 +1,464 @@
+"""
+Benchmark suite for the numerical, export and report hot paths.
+
+Times each service against synthetic vertical, build-hold, S-curve and
+horizontal wells (see tests/synthetic_wells.py), tracks throughput
+(stations/second) and peak Python memory, and fails when a path regresses
+beyond BENCHMARK_TOLERANCE x its stored baseline in
+tests/fixtures/benchmark_baselines.json.
+
+Also verifies the SurveyCalculationService target of < 3 seconds for
+10,000 points.
+
+NOTE: These tests are SLOW (tens of minutes at the default sizes) and the
+baselines are wall-clock times from one machine, so they are skipped unless
+BENCHMARKS=1 is set. Record baselines on the machine that checks them.
+Run with: BENCHMARKS=1 python manage.py test tests.test_benchmarks --tag=benchmark --keepdb
+
+Environment:
+    BENCHMARKS=1: Run the benchmarks (skipped otherwise)
+    BENCHMARK_SIZES: Comma-separated station counts (default 100,1000,10000;
+        add 100000 for the full sweep)
+    BENCHMARK_TOLERANCE: Allowed slowdown/memory growth factor (default 1.5)
+    BENCHMARK_SLACK: Seconds allowed on top of the scaled time baseline, so
+        sub-second paths do not fail on timer noise (default 1.0)
+    BENCHMARK_UPDATE_BASELINES=1: Write measured values as the new baselines
+    BENCHMARK_RESULTS: Optional path to write this run's results as JSON
+
+The results table is logged at INFO level by the tests.test_benchmarks logger.
+"""
+import json
+import logging
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, tag
+
+from survey_api.models import (
+    Client,
+    Customer,
+    Depth,
+    Job,
+    Location,
+    QualityCheck,
+    Rig,
+    Run,
+    Service,
+    SurveyData,
+    SurveyFile,
+    TieOn,
+    Well,
+)
+from survey_api.services.customer_satisfaction_report_service import CustomerSatisfactionReportService
+from survey_api.services.delta_calculation_service import DeltaCalculationService
+from survey_api.services.duplicate_survey_service import DuplicateSurveyService
+from survey_api.services.excel_export_service import ExcelExportService
+from survey_api.services.extrapolation_service import ExtrapolationService
+from survey_api.services.interpolated_report_service import generate_interpolated_survey_report
+from survey_api.services.prejob_report_service import PrejobReportService
+from survey_api.services.qa_service import QAService
+from survey_api.services.qc_report_service import QCReportService
+from survey_api.services.service_ticket_report_service import ServiceTicketReportService
+from survey_api.services.soe_report_service import SOEReportService
+from survey_api.services.survey_calculation_report_service import generate_survey_calculation_report
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+from survey_api.services.welleng_service import WellengService
+from tests.synthetic_wells import PROFILES, DEFAULT_G_T, DEFAULT_W_T, generate_well
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+BASELINES_PATH = Path(__file__).parent / 'fixtures' / 'benchmark_baselines.json'
+
+# Documented target in SurveyCalculationService.calculate
+SURVEY_CALCULATION_BUDGET_SECONDS = 3.0
+SURVEY_CALCULATION_BUDGET_STATIONS = 10000
+
+# PDF rendering is dominated by page count; cap report sizes to keep the sweep usable
+MAX_REPORT_STATIONS = 10000
+
+
+def _benchmark_sizes():
+    raw = os.environ.get('BENCHMARK_SIZES', '100,1000,10000')
+    return sorted({int(size) for size in raw.split(',') if size.strip()})
+
+
+class BenchmarkRecorder:
+    """
+    Measures callables and compares them against stored baselines.
+
+    Wall time is the best of ``repeat`` untraced runs; peak memory comes from
+    one additional run under tracemalloc so tracing overhead never inflates
+    the timing.
+    """
+
+    def __init__(self, path: Path = BASELINES_PATH):
+        self.path = path
+        self.tolerance = float(os.environ.get('BENCHMARK_TOLERANCE', '1.5'))
+        self.slack = {'seconds': float(os.environ.get('BENCHMARK_SLACK', '1.0')), 'peak_mb': 0.0}
+        self.update = os.environ.get('BENCHMARK_UPDATE_BASELINES') == '1'
+        self.document = json.loads(path.read_text()) if path.exists() else {}
+        self.baselines = self.document.get('benchmarks', {})
+        self.results = {}
+
+    @staticmethod
+    def key(name: str, profile: str, stations: int) -> str:
+        return f'{name}[{profile}:{stations}]'
+
+    def measure(self, name: str, profile: str, stations: int, func, repeat: int = 1, trace_memory: bool = True):
+        """
+        Time ``func`` and record its result under name[profile:stations].
+
+        Returns:
+            The value returned by the last call of ``func``
+        """
+        best = None
+        value = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            value = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        peak_mb = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peak_mb = round(peak / (1 << 20), 2)
+
+        self.results[self.key(name, profile, stations)] = {
+            'seconds': round(best, 4),
+            'stations_per_second': round(stations / best, 1) if best and stations else None,
+            'peak_mb': peak_mb,
+        }
+        return value
+
+    def regressions(self, key: str):
+        """Describe how the result for ``key`` exceeds its baseline, if it does."""
+        result = self.results.get(key)
+        baseline = self.baselines.get(key)
+        if self.update or not result or not baseline:
+            return []
+
+        problems = []
+        for metric in ('seconds', 'peak_mb'):
+            measured, expected = result.get(metric), baseline.get(metric)
+            if measured is None or expected is None:
+                continue
+            if measured > expected * self.tolerance + self.slack[metric]:
+                problems.append(
+                    f'{key} {metric}: {measured} > {expected} x {self.tolerance} + {self.slack[metric]}'
+                )
+        return problems
+
+    def save(self):
+        """Persist results (and baselines when updating)."""
+        results_path = os.environ.get('BENCHMARK_RESULTS')
+        if results_path:
+            Path(results_path).write_text(json.dumps(self.results, indent=2, sort_keys=True))
+
+        if self.update and self.results:
+            merged = {**self.baselines}
+            for key, result in self.results.items():
+                merged[key] = {'seconds': result['seconds'], 'peak_mb': result['peak_mb']}
+            document = {**self.document, 'benchmarks': merged}
+            self.path.write_text(json.dumps(document, indent=2, sort_keys=True) + '\n')
+
+    def summary(self) -> str:
+        lines = [f"{'benchmark':<60} {'seconds':>9} {'stations/s':>12} {'peak MB':>9}"]
+        for key, result in sorted(self.results.items()):
+            lines.append(
+                f"{key:<60} {result['seconds']:>9.3f} "
+                f"{result['stations_per_second'] or 0:>12.0f} {result['peak_mb'] or 0:>9.1f}"
+            )
+        return '\n'.join(lines)
+
+
+@tag('slow', 'performance', 'benchmark')
+@skipUnless(os.environ.get('BENCHMARKS') == '1', 'Set BENCHMARKS=1 to run the benchmarks')
+class HotPathBenchmarkTest(TestCase):
+    """
+    Benchmarks for calculation, QA, comparison, export and report services.
+
+    Tagged as 'slow', 'performance' and 'benchmark' to allow selective execution.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Not in setUpTestData: its attributes are deep-copied for every test,
+        # so measurements recorded by the tests would never reach tearDownClass
+        cls.recorder = BenchmarkRecorder()
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create one run with location/depth/tie-on and, for every profile and
+        size, a reference and a comparison SurveyData. SurveyCalculationService
+        is timed here because every other benchmark needs its output.
+        """
+        cls.sizes = _benchmark_sizes()
+
+        cls.user = User.objects.create_user(
+            username='bench_user',
+            email='bench@test.com',
+            password='testpass123',
+            role='engineer'
+        )
+        well = Well.objects.create(well_name='Benchmark Well', well_id='BENCH-001')
+        cls.job = Job.objects.create(
+            customer=Customer.objects.create(customer_name='Benchmark Customer'),
+            client=Client.objects.create(client_name='Benchmark Client'),
+            well=well,
+            rig=Rig.objects.create(rig_id='BENCH-RIG', rig_number='1'),
+            service=Service.objects.create(service_name='Benchmark Service'),
+        )
+        cls.bench_run = Run.objects.create(
+            run_number='BENCH001',
+            run_name='Benchmark Run',
+            survey_type='GTL',
+            job=cls.job,
+            well=well,
+            user=cls.user
+        )
+        Location.objects.create(
+            run=cls.bench_run,
+            latitude=29.5,
+            longitude=-95.5,
+            easting=500000.0,
+            northing=3264000.0,
+            g_t=DEFAULT_G_T,
+            w_t=DEFAULT_W_T
+        )
+        Depth.objects.create(run=cls.bench_run, reference_height=30.0, reference_elevation=100.0)
+        TieOn.objects.create(
+            run=cls.bench_run,
+            md=0.0,
+            inc=0.0,
+            azi=0.0,
+            tvd=0.0,
+            latitude=0.0,
+            departure=0.0,
+            well_type='Oil',
+            survey_interval_from=0.0,
+            survey_interval_to=6000.0
+        )
+
+        cls.surveys = {}
+        for profile in PROFILES:
+            for size in cls.sizes:
+                reference = cls._create_survey(profile, size, seed=0, role='reference')
+                comparison = cls._create_survey(profile, size, seed=1, role='comparison')
+                calculated = cls.recorder.measure(
+                    'survey_calculation', profile, size,
+                    lambda: SurveyCalculationService.calculate(str(reference.id)),
+                    trace_memory=False
+                )
+                SurveyCalculationService.calculate(str(comparison.id))
+                cls.surveys[(profile, size)] = (reference, comparison, calculated)
+
+    @classmethod
+    def _create_survey(cls, profile, size, seed, role):
+        well = generate_well(profile, size, seed=seed)
+        survey_file = SurveyFile.objects.create(
+            run=cls.bench_run,
+            file_name=f'{profile}_{size}_{role}.csv',
+            file_path=f'/benchmarks/{profile}_{size}_{role}.csv',
+            file_size=size * 40,
+            survey_type='GTL',
+            survey_role=role
+        )
+        # pending_qa skips the post_save auto-calculation so it can be timed explicitly
+        return SurveyData.objects.create(
+            survey_file=survey_file,
+            md_data=well['md'],
+            inc_data=well['inc'],
+            azi_data=well['azi'],
+            gt_data=well['gt'],
+            wt_data=well['wt'],
+            row_count=size,
+            validation_status='pending_qa'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        logger.info('Benchmark results\n%s', cls.recorder.summary())
+        cls.recorder.save()
+        super().tearDownClass()
+
+    def _assert_no_regression(self, name, profile, size):
+        problems = self.recorder.regressions(self.recorder.key(name, profile, size))
+        self.assertFalse(problems, '\n'.join(problems))
+
+    def _cases(self, max_stations=None):
+        for profile in PROFILES:
+            for size in self.sizes:
+                if max_stations is None or size <= max_stations:
+                    yield profile, size, self.surveys[(profile, size)]
+
+    def test_survey_calculation(self):
+        """Full calculation path (load, welleng, save) meets the 10k-point target."""
+        for profile, size, _ in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self._assert_no_regression('survey_calculation', profile, size)
+                if size == SURVEY_CALCULATION_BUDGET_STATIONS:
+                    seconds = self.recorder.results[
+                        self.recorder.key('survey_calculation', profile, size)
+                    ]['seconds']
+                    self.assertLess(
+                        seconds, SURVEY_CALCULATION_BUDGET_SECONDS,
+                        f'{profile}: {size} stations took {seconds:.2f}s'
+                    )
+
+    def test_welleng_calculate_and_interpolate(self):
+        """WellengService.calculate_survey and interpolate_survey."""
+        tie_on = {'md': 0.0, 'inc': 0.0, 'azi': 0.0, 'tvd': 0.0, 'northing': 0.0, 'easting': 0.0}
+        location = {'latitude': 29.5, 'longitude': -95.5, 'easting': 500000.0,
+                    'northing': 3264000.0, 'geodetic_system': 'WGS84'}
+        for profile, size, (reference, _, _) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                calculated = self.recorder.measure(
+                    'welleng.calculate_survey', profile, size,
+                    lambda: WellengService.calculate_survey(
+                        reference.md_data, reference.inc_data, reference.azi_data, tie_on, location
+                    ),
+                    repeat=3
+                )
+                self._assert_no_regression('welleng.calculate_survey', profile, size)
+
+                calculated_data = {
+                    'md': reference.md_data,
+                    'inc': reference.inc_data,
+                    'azi': reference.azi_data,
+                    'easting': calculated['easting'],
+                    'northing': calculated['northing'],
+                    'tvd': calculated['tvd'],
+                }
+                self.recorder.measure(
+                    'welleng.interpolate_survey', profile, size,
+                    lambda: WellengService.interpolate_survey(calculated_data, resolution=10),
+                    repeat=3
+                )
+                self._assert_no_regression('welleng.interpolate_survey', profile, size)
+
+    def test_qa_metrics(self):
+        """QAService.calculate_qa_metrics over G(t)/W(t) readings."""
+        for profile, size, (reference, _, _) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'qa.calculate_metrics', profile, size,
+                    lambda: QAService.calculate_qa_metrics(
+                        reference.md_data, reference.inc_data, reference.azi_data,
+                        reference.gt_data, reference.wt_data, DEFAULT_G_T, DEFAULT_W_T
+                    ),
+                    repeat=3
+                )
+                self._assert_no_regression('qa.calculate_metrics', profile, size)
+
+    def test_delta_calculation(self):
+        """DeltaCalculationService.calculate_deltas between two surveys."""
+        for profile, size, (reference, comparison, _) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'comparison.calculate_deltas', profile, size,
+                    lambda: DeltaCalculationService.calculate_deltas(
+                        str(comparison.id), str(reference.id)
+                    )
+                )
+                self._assert_no_regression('comparison.calculate_deltas', profile, size)
+
+    def test_duplicate_survey(self):
+        """DuplicateSurveyService forward/inverse calculation."""
+        for profile, size, (reference, _, _) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'duplicate_survey.calculate', profile, size,
+                    lambda: DuplicateSurveyService.calculate_duplicate_survey(str(reference.id))
+                )
+                self._assert_no_regression('duplicate_survey.calculate', profile, size)
+
+    def test_extrapolation(self):
+        """ExtrapolationService.calculate_extrapolation beyond TD."""
+        for profile, size, (reference, _, _) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'extrapolation.calculate', profile, size,
+                    lambda: ExtrapolationService.calculate_extrapolation(
+                        str(reference.id), str(self.bench_run.id)
+                    )
+                )
+                self._assert_no_regression('extrapolation.calculate', profile, size)
+
+    def test_excel_export(self):
+        """ExcelExportService for calculated and freshly interpolated surveys."""
+        for profile, size, (_, _, calculated) in self._cases():
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'export.calculated_survey', profile, size,
+                    lambda: ExcelExportService.export_calculated_survey(str(calculated.id), 'excel')
+                )
+                self._assert_no_regression('export.calculated_survey', profile, size)
+
+                self.recorder.measure(
+                    'export.fresh_interpolation', profile, size,
+                    lambda: ExcelExportService.export_fresh_interpolation(str(calculated.id), 10)
+                )
+                self._assert_no_regression('export.fresh_interpolation', profile, size)
+
+    def test_station_reports(self):
+        """PDF reports whose size scales with station count."""
+        for profile, size, (reference, _, calculated) in self._cases(MAX_REPORT_STATIONS):
+            with self.subTest(profile=profile, stations=size):
+                self.recorder.measure(
+                    'report.survey_calculation', profile, size,
+                    lambda: generate_survey_calculation_report(str(reference.id))
+                )
+                self._assert_no_regression('report.survey_calculation', profile, size)
+
+                self.recorder.measure(
+                    'report.interpolated_survey', profile, size,
+                    lambda: generate_interpolated_survey_report(str(calculated.id), 10)
+                )
+                self._assert_no_regression('report.interpolated_survey', profile, size)
+
+                # Approved check over every station after the tie-on row
+                qa_results = QAService.calculate_qa_metrics(
+                    reference.md_data[1:], reference.inc_data[1:], reference.azi_data[1:],
+                    reference.gt_data[1:], reference.wt_data[1:], DEFAULT_G_T, DEFAULT_W_T
+                )
+                quality_check = QualityCheck.objects.create(
+                    run=self.bench_run,
+                    survey_data=reference,
+                    file_name=reference.survey_file.file_name,
+                    **QAService.quality_check_fields(qa_results, DEFAULT_G_T, DEFAULT_W_T),
+                    status='approved'
+                )
+                self.recorder.measure(
+                    'report.qc', profile, size,
+                    lambda: QCReportService.generate_qc_report(str(quality_check.id))
+                )
+                self._assert_no_regression('report.qc', profile, size)
+
+    def test_job_reports(self):
+        """Run/job level PDF reports (size depends on runs and files, not stations)."""
+        file_count = SurveyFile.objects.filter(run=self.bench_run).count()
+        reports = {
+            'report.customer_satisfaction':
+                lambda: CustomerSatisfactionReportService.generate_customer_satisfaction_report(self.bench_run),
+            'report.service_ticket': lambda: ServiceTicketReportService.generate_service_ticket(self.bench_run),
+            'report.prejob': lambda: PrejobReportService.generate_prejob_report(self.job, self.bench_run),
+            'report.soe': lambda: SOEReportService.generate_soe_report(str(self.job.id)),
+        }
+        for name, func in reports.items():
+            with self.subTest(report=name):
+                self.recorder.measure(name, 'job', file_count, func, repeat=3)
+                self._assert_no_regression(name, 'job', file_count)
@@ -0,0 +1,91 @@
+"""
+Tests for batched anti-collision clearance scans.
+"""
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.models import User
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.clearance_service import ClearanceService
+from survey_api.services.spatial_index_service import SpatialIndexService
+from survey_api.services.uncertainty_service import ERROR_MODELS, UncertaintyService
+from tests.synthetic_wells import VERTICAL_STATIONS, create_located_run, create_survey
+
+
+class ScanOffsetsTest(SimpleTestCase):
+    """Test cases for the vectorized closest-approach kernel."""
+
+    def test_closest_approach_per_offset(self):
+        points = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, -100.0]])
+        # Offset 0: vertical line 30 m east; offset 1: two horizontal segments at -100 m, 10 m north
+        start = np.array([[30.0, 0.0, 0.0], [-50.0, 10.0, -100.0], [0.0, 10.0, -100.0]])
+        end = np.array([[30.0, 0.0, -200.0], [0.0, 10.0, -100.0], [50.0, 10.0, -100.0]])
+        md_start = np.array([0.0, 0.0, 50.0])
+        md_end = np.array([200.0, 50.0, 100.0])
+
+        distance, offset_md = ClearanceService.scan_offsets(
+            points, start, end, md_start, md_end, np.array([0, 1]), max_pairs=2
+        )
+
+        np.testing.assert_allclose(distance, [[30.0, np.hypot(10.0, 100.0)], [30.0, 10.0]])
+        np.testing.assert_allclose(offset_md, [[0.0, 50.0], [100.0, 50.0]])
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False, CLEARANCE_SIGMA_SCALE=3.5)
+class ClearanceServiceTest(TestCase):
+    """Test cases for ClearanceService.scan."""
+
+    def setUp(self):
+        # Fresh process index for each test
+        patcher = mock.patch('survey_api.services.clearance_service.spatial_index', SpatialIndexService())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(
+            username='clearance_user', email='clearance@test.com', password='testpass123', role='engineer'
+        )
+        # Offset to the north: inclination errors of vertical wells move stations north/south
+        self.survey_a = self._create_well('CLEAR-A', 2488000.0)
+        self.survey_b = self._create_well('CLEAR-B', 2488020.0)
+        self.survey_c = self._create_well('CLEAR-C', 2488300.0)
+        BatchCalculationService.calculate_many([self.survey_a.id, self.survey_b.id, self.survey_c.id])
+
+    def _create_well(self, run_number, northing):
+        return create_survey(create_located_run(self.user, run_number, northing=northing), f'{run_number}.csv')
+
+    def test_scan_reports_distance_and_separation_factor(self):
+        result = ClearanceService.scan(self.survey_a.id)
+
+        self.assertEqual((result['scanned'], result['pruned']), (2, 0))
+        closest = result['offsets'][0]
+        self.assertEqual(closest['survey_data_id'], str(self.survey_b.id))
+        np.testing.assert_allclose(closest['center_to_center'], [20.0] * 11, atol=1e-3)
+        # Same error model on both wells: combined north sigma is sqrt(2) x each well's,
+        # in grid metres (scale factor 0.9996 on the zone's central meridian)
+        columns = UncertaintyService.compute(
+            VERTICAL_STATIONS['md_data'], VERTICAL_STATIONS['inc_data'], VERTICAL_STATIONS['azi_data'],
+            ERROR_MODELS['MWD'],
+        )
+        sigma_north = 0.9996 * np.sqrt(2 * columns[4])
+        self.assertAlmostEqual(closest['min_separation_factor'], 20.0 / (3.5 * sigma_north[-1]), places=3)
+        np.testing.assert_allclose(closest['separation_factor'][1:], 20.0 / (3.5 * sigma_north[1:]), rtol=1e-4)
+        self.assertEqual(closest['md_at_min_separation_factor'], 1000.0)
+        self.assertEqual(closest['status'], 'ok')
+        np.testing.assert_allclose(result['min_separation_factor'], closest['separation_factor'])
+
+    def test_bounding_box_prunes_distant_offsets(self):
+        result = ClearanceService.scan(self.survey_a.id, screening_distance=100.0, md_from=0, md_to=500)
+
+        self.assertEqual((result['scanned'], result['pruned']), (1, 1))
+        self.assertEqual(result['md'], [0.0, 100.0, 200.0, 300.0, 400.0, 500.0])
+
+    @override_settings(CLEARANCE_SIGMA_SCALE=10.0)
+    def test_selected_offsets_and_stop_status(self):
+        result = ClearanceService.scan(self.survey_a.id, offset_survey_data_ids=[self.survey_b.id, self.survey_a.id])
+
+        self.assertEqual([offset['survey_data_id'] for offset in result['offsets']], [str(self.survey_b.id)])
+        # The reference itself is not an offset
+        self.assertEqual(result['missing'], [str(self.survey_a.id)])
+        self.assertEqual(result['offsets'][0]['status'], 'stop')
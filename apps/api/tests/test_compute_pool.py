@@ -0,0 +1,91 @@
+"""
+Tests for the compute process pool.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from survey_api.exceptions import ComputeCapacityError, ComputeTimeoutError
+from survey_api.services.compute_pool import ComputePool
+
+
+@override_settings(COMPUTE_POOL_WORKERS=1, COMPUTE_POOL_MAX_PENDING=1, COMPUTE_POOL_ADMISSION_TIMEOUT=0)
+class ComputePoolTest(SimpleTestCase):
+    """Test cases for ComputePool."""
+
+    def setUp(self):
+        self.pool = ComputePool()
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    @override_settings(COMPUTE_POOL_ENABLED=False)
+    def test_disabled_pool_runs_inline(self):
+        """With the pool disabled tasks run in the calling process."""
+        self.assertEqual(self.pool.run(pow, 2, 10), 1024)
+        self.assertIsNone(self.pool._executor)
+
+    def test_runs_in_worker_process(self):
+        """Tasks run in the pool and return their result."""
+        self.assertEqual(self.pool.run(pow, 2, 10), 1024)
+        self.assertIsNotNone(self.pool._executor)
+
+    def test_task_exceptions_propagate(self):
+        """Exceptions raised by the task are re-raised to the caller."""
+        with self.assertRaises(ValueError):
+            self.pool.run(int, 'not a number')
+
+    def test_admission_control(self):
+        """Submissions beyond COMPUTE_POOL_MAX_PENDING are rejected."""
+        self.pool._get_executor()
+        self.pool._slots.acquire()
+        try:
+            with self.assertRaises(ComputeCapacityError):
+                self.pool.run(pow, 2, 10)
+        finally:
+            self.pool._slots.release()
+
+    def test_timeout_terminates_and_recovers(self):
+        """An overrunning task times out and the pool is rebuilt for the next task."""
+        # Warm the worker so the timeout applies to the task, not process start-up
+        self.pool.run(pow, 2, 1)
+        start = time.perf_counter()
+        with self.assertRaises(ComputeTimeoutError):
+            self.pool.run(time.sleep, 30, timeout=0.5)
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertEqual(self.pool.run(pow, 3, 2), 9)
+
+    @override_settings(COMPUTE_POOL_WORKERS=2, COMPUTE_POOL_MAX_PENDING=2)
+    def test_timeout_spares_other_tasks_in_flight(self):
+        """Retiring a pool after a timeout lets its other running tasks finish."""
+        self.pool.run_many(pow, [(2, 1), (2, 2)])
+        retired = self.pool._executor
+        with ThreadPoolExecutor(max_workers=1) as threads:
+            neighbour = threads.submit(self.pool.run, time.sleep, 2)
+            time.sleep(0.5)
+            with self.assertRaises(ComputeTimeoutError):
+                self.pool.run(time.sleep, 30, timeout=0.5)
+            self.assertIsNone(neighbour.result())
+
+        self.assertIsNot(self.pool._executor, retired)
+        self.assertEqual(self.pool.run(pow, 3, 2), 9)
+
+    def test_imap_unordered_yields_every_index(self):
+        """Results are yielded with the index of their argument tuple."""
+        results = dict(self.pool.imap_unordered(pow, [(2, 1), (2, 2), (2, 3)]))
+        self.assertEqual(results, {0: 2, 1: 4, 2: 8})
+
+    @override_settings(COMPUTE_POOL_WORKERS=2)
+    def test_imap_unordered_bounds_tasks_in_flight(self):
+        """With max_inflight, a call is only submitted once an earlier one has finished."""
+        executor = self.pool._get_executor()
+        with mock.patch.object(executor, 'submit', wraps=executor.submit) as submit:
+            results = self.pool.imap_unordered(pow, [(2, n) for n in range(5)], max_inflight=2)
+            first = [next(results)]
+            self.assertLessEqual(submit.call_count, 3)
+            results = dict(first + list(results))
+
+        self.assertEqual(submit.call_count, 5)
+        self.assertEqual(results, {0: 1, 1: 2, 2: 4, 3: 8, 4: 16})
@@ -0,0 +1,173 @@
+"""
+Tests for ETag / conditional GET support on survey resources.
+"""
+from django.test import TestCase, SimpleTestCase, RequestFactory
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from survey_api.models import Client, Customer, Job, Rig, Run, Service, Well
+from survey_api.utils.etags import (
+    compute_etag,
+    etag_matches,
+    conditional_response,
+    run_detail_etag,
+)
+
+User = get_user_model()
+
+
+class ETagHelperTest(SimpleTestCase):
+    """Test cases for the ETag helper functions."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_compute_etag_is_quoted_and_stable(self):
+        """Same parts produce the same strong ETag."""
+        etag = compute_etag('run', 1, ['a', 'b'])
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, compute_etag('run', 1, ['a', 'b']))
+
+    def test_compute_etag_changes_with_parts(self):
+        """Different versions produce different ETags."""
+        self.assertNotEqual(compute_etag('run', 1), compute_etag('run', 2))
+        self.assertNotEqual(compute_etag('ab', 'c'), compute_etag('a', 'bc'))
+
+    def test_etag_matches_list_and_weak(self):
+        """If-None-Match lists and weak validators are matched."""
+        etag = compute_etag('x')
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertTrue(etag_matches(request, etag))
+
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH='"other"')
+        self.assertFalse(etag_matches(request, etag))
+
+    def test_conditional_response_returns_304(self):
+        """A matching validator short-circuits with 304."""
+        etag = compute_etag('x')
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH=etag)
+        response = conditional_response(request, etag)
+        self.assertIsNotNone(response)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_conditional_response_ignores_missing_etag(self):
+        """No ETag (e.g. resource not found) never yields 304."""
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH='*')
+        self.assertIsNone(conditional_response(request, None))
+
+
+class RunDetailConditionalGetTest(TestCase):
+    """Test conditional GET on the run detail endpoint."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='etag_engineer',
+            email='etag@test.com',
+            password='engineer123',
+            role='engineer'
+        )
+        self.run = Run.objects.create(
+            run_number='ETAG001',
+            run_name='ETag Run',
+            survey_type='MWD',
+            user=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = f'/api/v1/runs/{self.run.id}/'
+
+    def test_retrieve_sets_etag(self):
+        """Run detail responses carry an ETag and revalidation headers."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], run_detail_etag(self.run.id))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_retrieve_not_modified(self):
+        """Matching If-None-Match returns 304 with no body."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+    def test_etag_changes_after_update(self):
+        """Updating the run invalidates the previous ETag."""
+        etag = self.client.get(self.url)['ETag']
+        self.run.run_name = 'ETag Run Renamed'
+        self.run.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_follows_the_runs_listed_under_the_well(self):
+        """Runs added to the well's jobs and user changes are part of the representation."""
+        well = Well.objects.create(well_name='ETag Well', well_id='ETAG-W1')
+        job = Job.objects.create(
+            customer=Customer.objects.create(customer_name='ETag Customer'),
+            client=Client.objects.create(client_name='ETag Client'),
+            well=well,
+            rig=Rig.objects.create(rig_id='ETAG-RIG', rig_number='1'),
+            service=Service.objects.create(service_name='ETag Service'),
+        )
+        Run.objects.filter(id=self.run.id).update(well=well, job=job)
+        etag = run_detail_etag(self.run.id)
+
+        sibling = Run.objects.create(
+            run_number='ETAG003', run_name='Sibling', survey_type='MWD', user=self.user, well=well, job=job
+        )
+        with_sibling = run_detail_etag(self.run.id)
+        self.assertNotEqual(with_sibling, etag)
+
+        sibling.delete()
+        self.assertEqual(run_detail_etag(self.run.id), etag)
+
+        self.user.email = 'etag-renamed@test.com'
+        self.user.save()
+        self.assertNotEqual(run_detail_etag(self.run.id), etag)
+
+
+class InterpolationPreviewConditionalGetTest(TestCase):
+    """Test that interpolation previews are byte-identical under one strong ETag."""
+
+    PREVIEW = {
+        'md': [0.0, 20.0], 'inc': [0.0, 1.0], 'azi': [0.0, 0.0], 'easting': [0.0, 0.0],
+        'northing': [0.0, 0.17], 'tvd': [0.0, 20.0], 'dls': [0.0, 1.5], 'vertical_section': [0.0, 0.17],
+        'closure_distance': [0.0, 0.17], 'closure_direction': [0.0, 0.0], 'point_count': 2, 'bhc_enabled': False,
+    }
+
+    def setUp(self):
+        from survey_api.models import CalculatedSurvey, SurveyData, SurveyFile
+
+        self.user = User.objects.create_user(
+            username='etag_preview', email='preview@test.com', password='engineer123', role='engineer'
+        )
+        run = Run.objects.create(run_number='ETAG002', run_name='ETag Preview', survey_type='MWD', user=self.user)
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='preview.csv', file_path='/etag/preview.csv', file_size=100, survey_type='MWD'
+        )
+        # pending_qa skips the post_save auto-calculation
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=[0.0, 20.0], inc_data=[0.0, 1.0], azi_data=[0.0, 0.0],
+            row_count=2, validation_status='pending_qa'
+        )
+        self.calculated = CalculatedSurvey.objects.create(
+            survey_data=survey_data, easting=[0.0, 0.0], northing=[0.0, 0.17], tvd=[0.0, 20.0],
+            calculation_status='calculated', calculation_duration=0.1, calculation_context={}
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_same_etag_same_body(self):
+        from unittest import mock
+        from survey_api.services.interpolation_service import InterpolationService
+
+        for url in (f'/api/v1/calculations/{self.calculated.id}/interpolation/20/',
+                    f'/api/v1/interpolations/{self.calculated.id}/interpolation/20/'):
+            with mock.patch.object(InterpolationService, 'preview_interpolation', return_value=self.PREVIEW):
+                first = self.client.get(url)
+                second = self.client.get(url)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.assertEqual(first['ETag'], second['ETag'])
+            self.assertEqual(first.content, second.content)
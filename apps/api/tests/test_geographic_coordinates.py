@@ -0,0 +1,120 @@
+"""
+Tests for per-station grid and geographic coordinates of calculated surveys.
+"""
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.models import CalculatedSurvey, Depth, Location, Run, SurveyData, SurveyFile, TieOn, User
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.location_service import LocationService
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+from tests.synthetic_wells import generate_well
+
+FRAME = {
+    'zone': 40, 'south': False, 'datum': 'WGS84', 'north_reference': 'Grid North',
+    'easting': 500000.0, 'northing': 2488000.0, 'convergence': 0.0, 'scale_factor': 0.9996,
+}
+
+
+class ComputeGeographicCoordinatesTest(SimpleTestCase):
+    """Test cases for the vectorized offset-to-grid conversion."""
+
+    def test_grid_north_offsets_are_scaled_onto_the_wellhead(self):
+        columns = SurveyCalculationService.compute_geographic_coordinates(
+            [0.0, 100.0, np.nan], [0.0, 200.0, np.nan], FRAME
+        )
+
+        np.testing.assert_allclose(columns[0][:2], [500000.0, 500099.96])
+        np.testing.assert_allclose(columns[1][:2], [2488000.0, 2488199.92])
+        self.assertTrue(np.isnan(columns[:, 2]).all())
+
+    def test_true_north_offsets_are_rotated_by_the_convergence(self):
+        frame = dict(FRAME, north_reference='True North', convergence=90.0, scale_factor=1.0)
+        columns = SurveyCalculationService.compute_geographic_coordinates([0.0], [100.0], frame)
+
+        # 100m true north is 100m grid west when grid north is 90 degrees east of true north
+        self.assertAlmostEqual(columns[0][0], 499900.0, places=6)
+        self.assertAlmostEqual(columns[1][0], 2488000.0, places=6)
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False)
+class GeographicCoordinatesTest(TestCase):
+    """Test cases for SurveyCalculationService.geographic_coordinates."""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username='geo_user', email='geo@test.com', password='testpass123', role='engineer'
+        )
+        self.run = Run.objects.create(run_number='GEO01', run_name='GEO01', survey_type='MWD', user=user)
+        self.location = Location.objects.create(
+            run=self.run, latitude=22.5, longitude=58.5, geodetic_datum='WGS84',
+            map_zone='Zone 40N(54E to 60E)', north_reference='True North'
+        )
+        Depth.objects.create(run=self.run, reference_height=30.0, reference_elevation=100.0)
+        TieOn.objects.create(
+            run=self.run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+            well_type='Oil', survey_interval_from=0.0, survey_interval_to=4000.0
+        )
+
+        well = generate_well('build_hold', 60, seed=3)
+        survey_file = SurveyFile.objects.create(
+            run=self.run, file_name='geo.csv', file_path='/geo/geo.csv',
+            file_size=2000, survey_type='MWD', survey_role='reference'
+        )
+        # pending_qa skips the post_save auto-calculation
+        self.survey = SurveyData.objects.create(
+            survey_file=survey_file, md_data=well['md'], inc_data=well['inc'], azi_data=well['azi'],
+            row_count=60, validation_status='pending_qa'
+        )
+        SurveyData.objects.filter(id=self.survey.id).update(validation_status='valid')
+        BatchCalculationService.calculate_many([self.survey.id])
+
+    def calculated(self):
+        return CalculatedSurvey.objects.select_related('survey_data__survey_file__run').get(
+            survey_data=self.survey
+        )
+
+    def test_stations_project_back_onto_their_grid_coordinates(self):
+        result = SurveyCalculationService.geographic_coordinates(self.calculated())
+
+        self.assertEqual(len(result['latitude']), 60)
+        self.assertEqual((result['zone'], result['hemisphere']), (40, 'N'))
+        forward = LocationService.derive_locations(
+            result['latitude'], result['longitude'], map_zones=['40N'] * 60, geodetic_datums=['WGS84'] * 60
+        )
+        np.testing.assert_allclose(forward['easting'], result['grid_easting'], atol=1e-6)
+        np.testing.assert_allclose(forward['northing'], result['grid_northing'], atol=1e-6)
+
+        # Rotation keeps horizontal distances; only the point scale factor applies
+        calculated = self.calculated()
+        offsets = np.hypot(calculated.column_array('easting'), calculated.column_array('northing'))
+        origin = LocationService.derive_locations([22.5], [58.5], geodetic_datums=['WGS84'])
+        grid = np.hypot(
+            np.asarray(result['grid_easting']) - float(self.location.easting or origin['easting'][0]),
+            np.asarray(result['grid_northing']) - float(self.location.northing or origin['northing'][0]),
+        )
+        np.testing.assert_allclose(grid, offsets * result['scale_factor'], atol=1e-6)
+
+    def test_coordinates_are_stored_until_the_location_changes(self):
+        first = SurveyCalculationService.geographic_coordinates(self.calculated())
+        stored = self.calculated()
+        self.assertTrue(stored.geographic_version)
+
+        with mock.patch.object(SurveyCalculationService, 'compute_geographic_coordinates') as compute:
+            self.assertEqual(SurveyCalculationService.geographic_coordinates(stored), first)
+        compute.assert_not_called()
+
+        self.location.north_reference = 'Grid North'
+        self.location.save()
+
+        second = SurveyCalculationService.geographic_coordinates(self.calculated())
+        self.assertNotEqual(second['grid_easting'][-1], first['grid_easting'][-1])
+        self.assertNotEqual(self.calculated().geographic_version, stored.geographic_version)
+
+    def test_run_without_location_has_no_coordinates(self):
+        self.location.delete()
+        calculated = self.calculated()
+
+        self.assertIsNone(SurveyCalculationService.geographic_coordinates(calculated))
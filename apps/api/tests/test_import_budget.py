@@ -0,0 +1,82 @@
+"""
+Import-time budget for worker boot.
+
+Loading the URLconf imports every view and service module. Heavy scientific
+libraries must stay behind survey_api.utils.lazy_imports so workers,
+management commands and the test suite don't pay for them at start-up.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from survey_api.utils.lazy_imports import lazy_import
+
+API_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just by loading the URLconf
+HEAVY_MODULES = ('matplotlib', 'welleng', 'scipy', 'pandas')
+
+# Wall-clock budget for django.setup() + URLconf import in a fresh interpreter
+IMPORT_BUDGET_SECONDS = float(os.environ.get('IMPORT_BUDGET_SECONDS', '3.0'))
+
+BOOT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+import survey_api.urls
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in %r if m in sys.modules)
+print(json.dumps({'seconds': elapsed, 'heavy': heavy}))
+""" % (HEAVY_MODULES,)
+
+
+class ImportBudgetTest(SimpleTestCase):
+    """Test that worker boot stays free of heavy scientific imports."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        env = {**os.environ}
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'survey_api.settings')
+        completed = subprocess.run(
+            [sys.executable, '-c', BOOT_SCRIPT],
+            cwd=API_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        if completed.returncode != 0:
+            raise AssertionError(f"URLconf import failed:\n{completed.stderr}")
+        cls.boot = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def test_heavy_modules_not_imported_at_boot(self):
+        """matplotlib, welleng, scipy and pandas load only when used."""
+        self.assertEqual(self.boot['heavy'], [])
+
+    def test_boot_within_budget(self):
+        """django.setup() plus URLconf import stays within the time budget."""
+        self.assertLess(
+            self.boot['seconds'], IMPORT_BUDGET_SECONDS,
+            f"Boot took {self.boot['seconds']:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+        )
+
+
+class LazyImportTest(SimpleTestCase):
+    """Test cases for the lazy module proxy."""
+
+    def test_imports_on_first_attribute_access(self):
+        """The real module is imported when an attribute is first used."""
+        calls = []
+        proxy = lazy_import('json', before_import=lambda: calls.append('hook'))
+        self.assertIn('not loaded', repr(proxy))
+        self.assertEqual(proxy.dumps([1]), '[1]')
+        self.assertEqual(calls, ['hook'])
+        proxy.loads('[]')
+        self.assertEqual(calls, ['hook'])
+        self.assertIn('(loaded)', repr(proxy))
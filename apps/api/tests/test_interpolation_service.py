@@ -1,9 +1,11 @@
 """
 Tests for interpolation service and welleng interpolation.
 """
+import threading
 import time
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.db.models.signals import post_save
 from unittest.mock import patch
 
@@ -439,3 +441,69 @@ class InterpolationServiceTest(TestCase):
         self.assertEqual(interp_survey.interpolation_status, 'completed')
         self.assertLess(duration, 2.0, f"Interpolation took {duration:.3f}s, expected < 2s")
         print(f"Performance: Interpolated {interp_survey.point_count} points in {duration:.3f}s")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ConcurrentInterpolationTest(TransactionTestCase):
+    """Test cases for an interpolation saved concurrently by another connection."""
+
+    def setUp(self):
+        post_save.disconnect(trigger_calculation, sender=SurveyData)
+        self.addCleanup(post_save.connect, trigger_calculation, sender=SurveyData)
+        user = User.objects.create_user(username='interp-race', password='testpass123')
+        run = Run.objects.create(run_number='RACE-1', run_name='Race', survey_type='MWD', user=user)
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='race.csv', file_path='/tmp/race.csv', file_size=1024,
+            survey_type='MWD', processing_status='completed'
+        )
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file,
+            md_data=[0.0, 100.0, 200.0, 300.0],
+            inc_data=[0.0, 5.0, 10.0, 15.0],
+            azi_data=[0.0, 45.0, 90.0, 135.0],
+            row_count=4,
+            validation_status='valid'
+        )
+        self.calc_survey = CalculatedSurvey.objects.create(
+            survey_data=survey_data,
+            easting=[0.0, 3.9, 15.5, 34.9],
+            northing=[0.0, 3.9, 15.5, 34.9],
+            tvd=[0.0, 99.9, 199.6, 298.9],
+            dls=[0.0, 2.87, 2.87, 2.87],
+            build_rate=[0.0, 2.87, 2.87, 2.87],
+            turn_rate=[0.0, 0.0, 0.0, 0.0],
+            calculation_status='calculated',
+            calculation_context={}
+        )
+
+    def test_returns_row_committed_while_inserting(self):
+        """A duplicate insert blocked on another transaction returns that transaction's row."""
+        inserted = threading.Event()
+        other = {}
+
+        def insert_and_commit_later():
+            try:
+                with transaction.atomic():
+                    other['row'] = InterpolatedSurvey.objects.create(
+                        calculated_survey_id=self.calc_survey.id, resolution=10,
+                        md_interpolated=[0.0], inc_interpolated=[0.0], azi_interpolated=[0.0],
+                        easting_interpolated=[0.0], northing_interpolated=[0.0], tvd_interpolated=[0.0],
+                        dls_interpolated=[0.0], point_count=1, interpolation_status='completed'
+                    )
+                    inserted.set()
+                    time.sleep(0.5)
+            finally:
+                inserted.set()
+                connection.close()
+
+        thread = threading.Thread(target=insert_and_commit_later)
+        thread.start()
+        self.assertTrue(inserted.wait(5))
+
+        # The caller's own transaction stays usable after the duplicate insert fails
+        with transaction.atomic():
+            interp_survey = InterpolationService.interpolate(str(self.calc_survey.id), resolution=10)
+            self.assertEqual(InterpolatedSurvey.objects.filter(calculated_survey=self.calc_survey).count(), 1)
+        thread.join()
+
+        self.assertEqual(interp_survey.id, other['row'].id)
@@ -353,3 +353,47 @@ class LocationServiceTest(TestCase):
         # Calculated values should be Decimal type
         self.assertIsInstance(result['easting'], Decimal)
         self.assertIsInstance(result['northing'], Decimal)
+
+    def test_derive_locations_matches_per_location_methods(self):
+        """The bulk pass reproduces the per-location results."""
+        latitudes = [29.7604, -33.8688, 23.5]
+        longitudes = [-95.3698, 151.2093, 57.1]
+        map_zones = ['15N', '56H', 'Zone 40N(54E to 60E)']
+        central_meridians = [-93.0, 153.0, 57.0]
+
+        derived = LocationService.derive_locations(
+            latitudes, longitudes, central_meridians=central_meridians, map_zones=map_zones
+        )
+
+        for index, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+            easting, northing = LocationService.calculate_utm_coordinates(
+                Decimal(str(latitude)), Decimal(str(longitude)), 'WGS84', map_zones[index]
+            )
+            self.assertAlmostEqual(float(easting), derived['easting'][index], places=3)
+            self.assertAlmostEqual(float(northing), derived['northing'][index], places=3)
+
+            grid_correction = LocationService.calculate_grid_correction(
+                Decimal(str(central_meridians[index])), Decimal(str(latitude)), Decimal(str(longitude))
+            )
+            self.assertAlmostEqual(float(grid_correction), derived['grid_correction'][index], places=6)
+
+            fields = LocationService.g_t_w_t_fields(derived['g_t'][index], derived['w_t'][index])
+            self.assertEqual(
+                fields,
+                LocationService.calculate_g_t_w_t(Decimal(str(latitude)), Decimal(str(longitude)), None, None)
+            )
+
+    def test_grid_to_geographic_inverts_survey_path(self):
+        """A whole path of grid positions converts back in one call."""
+        derived = LocationService.derive_locations([23.5, 23.501, 23.502], [57.1, 57.101, 57.102])
+
+        result = LocationService.grid_to_geographic(derived['easting'], derived['northing'], '40N')
+
+        for expected, actual in zip([23.5, 23.501, 23.502], result['latitude']):
+            self.assertAlmostEqual(expected, actual, places=9)
+        for expected, actual in zip([57.1, 57.101, 57.102], result['longitude']):
+            self.assertAlmostEqual(expected, actual, places=9)
+
+    def test_grid_to_geographic_requires_zone(self):
+        with self.assertRaises(ValueError):
+            LocationService.grid_to_geographic([500000.0], [0.0], 'Local grid')
@@ -0,0 +1,68 @@
+"""
+Tests for MD-window selection on survey array responses.
+"""
+import numpy as np
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.request import Request
+
+from survey_api.exceptions import ValidationError
+from survey_api.utils.md_window import MDWindow
+
+
+def window_for(query):
+    return MDWindow.from_request(Request(RequestFactory().get('/', query)))
+
+
+class MDWindowTest(SimpleTestCase):
+    """Test cases for MDWindow."""
+
+    def setUp(self):
+        self.md = [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+
+    def test_no_parameters_is_full(self):
+        """Without parameters the response is unchanged."""
+        window = window_for({})
+        self.assertTrue(window.is_full)
+        data = {'md': list(self.md), 'inc': [1.0] * 6}
+        self.assertEqual(window.apply(data, 'md', ['inc']), {'md': self.md, 'inc': [1.0] * 6})
+        self.assertEqual(window.vary('"e"'), '"e"')
+
+    def test_bounds_are_inclusive(self):
+        """Stations exactly on md_from and md_to are included."""
+        self.assertEqual(window_for({'md_from': '10', 'md_to': '30'}).locate(self.md), slice(1, 4, 1))
+        self.assertEqual(window_for({'md_from': '15', 'md_to': '35'}).locate(self.md), slice(2, 4, 1))
+        self.assertEqual(window_for({'md_from': '60'}).locate(self.md), slice(6, 6, 1))
+
+    def test_memmap_compatible_search(self):
+        """numpy columns are searched without conversion."""
+        window = window_for({'md_to': '20'})
+        self.assertEqual(window.locate(np.asarray(self.md)), slice(0, 3, 1))
+
+    def test_apply_slices_parallel_arrays(self):
+        """Parallel arrays share the slice; other lengths and None are untouched."""
+        data = {
+            'md': list(self.md),
+            'inc': [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+            'dls': None,
+            'summary': [1, 2],
+        }
+        window_for({'md_from': '10', 'md_to': '50', 'stride': '2'}).apply(data, 'md', ['inc', 'dls', 'summary'])
+        self.assertEqual(data['md'], [10.0, 30.0, 50.0])
+        self.assertEqual(data['inc'], [1.0, 3.0, 5.0])
+        self.assertIsNone(data['dls'])
+        self.assertEqual(data['summary'], [1, 2])
+        self.assertEqual(data['window']['start_index'], 1)
+        self.assertEqual(data['window']['total_points'], 6)
+
+    def test_window_changes_etag(self):
+        """Different windows produce different validators."""
+        etag = '"e"'
+        first = window_for({'md_from': '10'}).vary(etag)
+        self.assertNotEqual(first, etag)
+        self.assertNotEqual(first, window_for({'md_from': '20'}).vary(etag))
+
+    def test_invalid_parameters(self):
+        """Bad numbers, reversed bounds and non-positive strides are rejected."""
+        for query in ({'md_from': 'abc'}, {'md_from': '30', 'md_to': '10'}, {'stride': '0'}, {'md_to': 'nan'}):
+            with self.assertRaises(ValidationError):
+                window_for(query)
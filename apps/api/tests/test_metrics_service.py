@@ -0,0 +1,153 @@
+"""
+Tests for request instrumentation and the /metrics endpoint.
+"""
+from django.test import TestCase, SimpleTestCase, override_settings
+
+from survey_api.services.metrics_service import (
+    MetricsRegistry,
+    metrics,
+    span,
+    start_request,
+    end_request,
+    current_request_stats,
+)
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    """Test cases for the in-process metrics registry."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_render(self):
+        """Counters are rendered with TYPE line and labels."""
+        self.registry.inc('jobs_total', labels={'kind': 'qa'}, help_text='Jobs')
+        self.registry.inc('jobs_total', labels={'kind': 'qa'})
+        output = self.registry.render()
+        self.assertIn('# HELP jobs_total Jobs', output)
+        self.assertIn('# TYPE jobs_total counter', output)
+        self.assertIn('jobs_total{kind="qa"} 2.0', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets accumulate and +Inf equals the count."""
+        self.registry.observe('latency', 0.2, buckets=(0.1, 0.5, 1.0))
+        self.registry.observe('latency', 0.7, buckets=(0.1, 0.5, 1.0))
+        self.registry.observe('latency', 3.0, buckets=(0.1, 0.5, 1.0))
+        output = self.registry.render()
+        self.assertIn('latency_bucket{le="0.1"} 0', output)
+        self.assertIn('latency_bucket{le="0.5"} 1', output)
+        self.assertIn('latency_bucket{le="1.0"} 2', output)
+        self.assertIn('latency_bucket{le="+Inf"} 3', output)
+        self.assertIn('latency_count 3', output)
+
+    def test_label_values_are_escaped(self):
+        """Quotes and backslashes in label values are escaped."""
+        self.registry.inc('odd_total', labels={'view': 'a"b\\c'})
+        self.assertIn('odd_total{view="a\\"b\\\\c"} 1.0', self.registry.render())
+
+
+@override_settings(METRICS_REDIS_PREFIX='survey_api_metrics_test')
+class SharedMetricsRegistryTest(SimpleTestCase):
+    """Test cases for metrics aggregated across processes in Redis."""
+
+    def setUp(self):
+        # Two registries stand in for two gunicorn workers
+        self.worker_a = MetricsRegistry(shared=True)
+        self.worker_b = MetricsRegistry(shared=True)
+        self.worker_a.reset()
+        self.addCleanup(self.worker_a.reset)
+
+    def test_render_includes_other_workers(self):
+        """A scrape of either worker reports the totals of both."""
+        self.worker_a.inc('jobs_total', labels={'kind': 'qa'}, help_text='Jobs')
+        self.worker_b.inc('jobs_total', labels={'kind': 'qa'}, amount=2)
+        self.worker_a.observe('latency', 0.2, buckets=(0.1, 0.5))
+        self.worker_b.observe('latency', 0.7, buckets=(0.1, 0.5))
+        self.worker_b.flush()
+
+        output = self.worker_a.render()
+        self.assertIn('# HELP jobs_total Jobs', output)
+        self.assertIn('jobs_total{kind="qa"} 3.0', output)
+        self.assertIn('latency_bucket{le="0.5"} 1', output)
+        self.assertIn('latency_bucket{le="+Inf"} 2', output)
+        self.assertIn('latency_sum 0.9', output)
+        self.assertEqual(output, self.worker_b.render())
+
+    def test_flush_adds_only_new_increments(self):
+        """Flushing twice does not count the same increments again."""
+        self.worker_a.inc('jobs_total')
+        self.worker_a.flush()
+        self.worker_a.flush()
+        self.worker_a.inc('jobs_total')
+        self.worker_a.flush()
+        self.assertIn('jobs_total 2.0', self.worker_b.render())
+
+    @override_settings(METRICS_REDIS_URL='redis://127.0.0.1:1/0', METRICS_REDIS_TIMEOUT=0.2)
+    def test_unreachable_store_renders_this_process(self):
+        """Without the store, a worker reports its own values and keeps them for later."""
+        registry = MetricsRegistry(shared=True)
+        registry.inc('jobs_total')
+        with self.assertLogs('survey_api.services.metrics_service', 'WARNING'):
+            self.assertIn('jobs_total 1.0', registry.render())
+        self.assertEqual(registry._pending_counters['jobs_total'][()], 1.0)
+
+
+@override_settings(METRICS_REDIS_PREFIX='survey_api_metrics_test')
+class SpanTest(SimpleTestCase):
+    """Test cases for named operation spans."""
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_context_manager_records_duration(self):
+        """Span exposes its duration and records the histogram."""
+        with span('test.block') as timer:
+            pass
+        self.assertGreaterEqual(timer.duration, 0.0)
+        self.assertIn('span="test.block"', metrics.render())
+
+    def test_decorator_records_error_outcome(self):
+        """Exceptions propagate and are recorded with outcome=error."""
+        @span('test.failing')
+        def failing():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            failing()
+        self.assertIn('outcome="error",span="test.failing"', metrics.render())
+
+    def test_span_attached_to_current_request(self):
+        """Spans inside a request are collected for the slow-request log."""
+        token = start_request()
+        try:
+            with span('test.inner'):
+                pass
+            stats = current_request_stats()
+        finally:
+            end_request(token)
+        self.assertEqual([name for name, _ in stats.spans], ['test.inner'])
+        self.assertIsNone(current_request_stats())
+
+
+@override_settings(METRICS_REDIS_PREFIX='survey_api_metrics_test')
+class MetricsEndpointTest(TestCase):
+    """Test cases for RequestMetricsMiddleware and GET /metrics."""
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_requests_are_recorded_by_route(self):
+        """Requests are labelled by route pattern, not raw path."""
+        self.client.get('/api/v1/runs/')
+        output = self.client.get('/metrics').content.decode()
+        self.assertIn('survey_api_request_duration_seconds_count{method="GET",view="api/v1/runs/"}', output)
+        self.assertIn('survey_api_request_db_queries', output)
+        self.assertNotIn('view="metrics"', output)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_required_when_configured(self):
+        """A configured token must be supplied as a bearer token."""
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
@@ -0,0 +1,62 @@
+"""
+Tests for the report plot service.
+"""
+from datetime import datetime
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from survey_api.services.plot_service import PlotService, TRAJECTORY_SIZE, decimate_polyline
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class DecimatePolylineTest(SimpleTestCase):
+    """Test cases for polyline decimation."""
+
+    def test_short_lines_unchanged(self):
+        """Lines with fewer points than the resolution are returned whole."""
+        x, y = decimate_polyline(([0, 1, 2], [0, 1, 4]), 100)
+        self.assertEqual(list(x), [0, 1, 2])
+        self.assertEqual(list(y), [0, 1, 4])
+
+    def test_dense_line_reduced_to_resolution(self):
+        """A densely sampled line keeps about one point per cell and both end points."""
+        x = [i / 10 for i in range(10001)]
+        dx, dy = decimate_polyline((x, x), 100)
+        self.assertLessEqual(len(dx), 101)
+        self.assertEqual((dx[0], dx[-1]), (0.0, 1000.0))
+        self.assertEqual(len(dx), len(dy))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TrajectoryPlotCacheTest(SimpleTestCase):
+    """Test cases for trajectory image caching."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.data = ([0, 30, 60], [0, 30, 59.9], [0, 0.5, 2], [0, 0.1, 0.4], [])
+
+    def test_cache_key_depends_on_version_and_size(self):
+        """Keys change with updated_at and size."""
+        stamp = datetime(2026, 1, 1)
+        key = PlotService.cache_key(('id', stamp), 'trajectory', TRAJECTORY_SIZE)
+        self.assertEqual(key, PlotService.cache_key(('id', stamp), 'trajectory', TRAJECTORY_SIZE))
+        self.assertNotEqual(key, PlotService.cache_key(('id', datetime(2026, 1, 2)), 'trajectory', TRAJECTORY_SIZE))
+        self.assertNotEqual(key, PlotService.cache_key(('id', stamp), 'trajectory', (5, 4, 100)))
+
+    def test_rendered_once_per_source(self):
+        """The second request for the same calculation is served from the cache."""
+        with mock.patch('survey_api.services.plot_service.compute_pool.run', return_value=b'png') as run:
+            first = PlotService.trajectory_png(*self.data, source=('id', datetime(2026, 1, 1)))
+            second = PlotService.trajectory_png(*self.data, source=('id', datetime(2026, 1, 1)))
+        self.assertEqual((first, second), (b'png', b'png'))
+        self.assertEqual(run.call_count, 1)
+
+    def test_no_source_not_cached(self):
+        """Plots without a source identity are rendered every time."""
+        with mock.patch('survey_api.services.plot_service.compute_pool.run', return_value=b'png') as run:
+            PlotService.trajectory_png(*self.data)
+            PlotService.trajectory_png(*self.data)
+        self.assertEqual(run.call_count, 2)
@@ -0,0 +1,122 @@
+"""
+Tests for incremental QA re-scoring.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from survey_api.exceptions import ValidationError
+from survey_api.models import QualityCheck, Run, SurveyData, SurveyFile, User
+from survey_api.services.qa_rescore_service import QARescoreService
+from survey_api.services.qa_service import QAService
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+LOCATION_G_T = 1000.0
+LOCATION_W_T = 50.0
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class QARescoreServiceTest(TestCase):
+    """Test cases for QARescoreService."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='qa_rescore', email='rescore@test.com', password='testpass123')
+        run = Run.objects.create(run_number='RESCORE01', run_name='Rescore', survey_type='GTL', user=user)
+
+        count = 40
+        cls.stations = {
+            'md_data': [100.0 * (i + 1) for i in range(count)],
+            'inc_data': [float(i % 7) for i in range(count)],
+            'azi_data': [float(i * 3 % 360) for i in range(count)],
+            # Mix of high/good/low/n/c statuses and a missing value
+            'gt_data': [LOCATION_G_T + ((i * 1.37) % 14 - 7) if i != 5 else None for i in range(count)],
+            'wt_data': [LOCATION_W_T + ((i * 2.11) % 24 - 12) for i in range(count)],
+        }
+        qa_results = QAService.calculate_qa_metrics(
+            **cls.stations, location_g_t=LOCATION_G_T, location_w_t=LOCATION_W_T
+        )
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='rescore.csv', file_path='/tmp/rescore.csv', file_size=100,
+            survey_type='GTL', processing_status='pending_qa'
+        )
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file, row_count=count, validation_status='pending_qa', **cls.stations
+        )
+        cls.quality_check = QualityCheck.objects.create(
+            run=run,
+            survey_data=survey_data,
+            file_name='rescore.csv',
+            **QAService.quality_check_fields(qa_results, LOCATION_G_T, LOCATION_W_T),
+            status='pending'
+        )
+        cls.default_kept = QAService.select_kept_indices(qa_results['overall_status_data'])
+
+    def setUp(self):
+        cache.clear()
+
+    def expected(self, kept):
+        """Scores of a full recalculation over the kept stations."""
+        return QAService.calculate_qa_metrics(
+            **{name: [values[i] for i in sorted(kept)] for name, values in self.stations.items()},
+            location_g_t=LOCATION_G_T,
+            location_w_t=LOCATION_W_T
+        )
+
+    def assertSummaryMatches(self, summary, kept):
+        expected = self.expected(kept)
+        for field in ('pass_count', 'remove_count', 'total_rows', 'max_score'):
+            self.assertEqual(summary[field], expected[field], field)
+        for field in (
+            'delta_wt_score', 'delta_wt_percentage', 'delta_gt_score', 'delta_gt_percentage',
+            'w_t_score_points', 'g_t_score_points',
+        ):
+            self.assertAlmostEqual(summary[field], expected[field], places=6, msg=field)
+        self.assertAlmostEqual(summary['g_t_percentage'], round(expected['g_t_percentage'], 2), places=6)
+        self.assertAlmostEqual(summary['w_t_percentage'], round(expected['w_t_percentage'], 2), places=6)
+
+    def test_initial_scores_match_default_selection(self):
+        result = QARescoreService.rescore(self.quality_check.id)
+        self.assertEqual(result['total_stations'], 40)
+        self.assertEqual(result['changed'], 0)
+        self.assertSummaryMatches(result['summary'], self.default_kept)
+
+    def test_toggles_accumulate_across_requests(self):
+        """Each request applies only its toggles on top of the session state."""
+        removed = [i for i in range(40) if i not in self.default_kept][:3]
+        kept = set(self.default_kept)
+
+        result = QARescoreService.rescore(self.quality_check.id, keep=removed)
+        kept |= set(removed)
+        self.assertEqual(result['changed'], len(removed))
+        self.assertSummaryMatches(result['summary'], kept)
+
+        result = QARescoreService.rescore(self.quality_check.id, drop=[self.default_kept[0], removed[0]])
+        kept -= {self.default_kept[0], removed[0]}
+        self.assertSummaryMatches(result['summary'], kept)
+
+        # Repeated toggles are no-ops
+        result = QARescoreService.rescore(self.quality_check.id, drop=[removed[0]])
+        self.assertEqual(result['changed'], 0)
+        self.assertSummaryMatches(result['summary'], kept)
+
+    def test_station_missing_one_reading_adds_no_differences(self):
+        """A kept station without G(t) contributes to neither difference total."""
+        result = QARescoreService.rescore(self.quality_check.id, keep=[5])
+        self.assertEqual(result['changed'], 1)
+        self.assertSummaryMatches(result['summary'], set(self.default_kept) | {5})
+
+        initial = QARescoreService.rescore(self.quality_check.id, drop=[5])['summary']
+        for field in ('g_t_score', 'w_t_score'):
+            self.assertEqual(result['summary'][field], initial[field], field)
+
+    def test_reset_restores_initial_selection(self):
+        QARescoreService.rescore(self.quality_check.id, drop=self.default_kept[:5])
+        result = QARescoreService.rescore(self.quality_check.id, reset=True)
+        self.assertSummaryMatches(result['summary'], self.default_kept)
+
+    def test_invalid_indices_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            QARescoreService.rescore(self.quality_check.id, keep=[40])
+        with self.assertRaises(ValidationError):
+            QARescoreService.rescore(self.quality_check.id, keep=[1], drop=[1])
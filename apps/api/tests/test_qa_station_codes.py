@@ -0,0 +1,200 @@
+"""
+Tests for the compact QA station encoding and the kept-station mask.
+"""
+import importlib
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from survey_api.models import CalculatedSurvey, QualityCheck, Run, SurveyData, SurveyFile, TieOn, User
+from survey_api.services.qa_service import QAService
+from survey_api.utils.qa_station_codes import decode_stations, encode_stations, pack_mask, unpack_mask
+
+LOCATION_G_T = 1000.0
+LOCATION_W_T = 50.0
+
+
+class StationCodesTest(SimpleTestCase):
+    """Test cases for survey_api.utils.qa_station_codes."""
+
+    def test_statuses_round_trip(self):
+        """Every status combination survives encoding."""
+        g = ['high', 'good', 'low', 'n/c', 'high']
+        w = ['n/c', 'low', 'good', 'high', 'high']
+        overall = ['REMOVE', 'PASS', 'PASS', 'REMOVE', 'PASS']
+
+        codes = encode_stations(g, w, overall)
+
+        self.assertEqual(len(codes), 5)
+        self.assertEqual(decode_stations(codes), (g, w, overall))
+
+    def test_mask_round_trip(self):
+        """Masks keep exactly the given in-range indices."""
+        mask = pack_mask([0, 3, 9, 12], 10)
+        self.assertEqual(len(mask), 2)
+        self.assertEqual(unpack_mask(mask, 10), [0, 3, 9])
+        self.assertEqual(unpack_mask(memoryview(pack_mask([], 4)), 4), [])
+
+
+class QualityCheckMaskTest(SimpleTestCase):
+    """Test cases for lazily derived QualityCheck results and QAService.approve."""
+
+    def setUp(self):
+        self.md = [100.0, 200.0, 300.0, 400.0]
+        self.gt = [1000.5, 1020.0, None, 998.0]
+        # Station 2 has W(t) but no G(t): neither difference is scored
+        self.wt = [50.0, 49.0, 51.0, 70.0]
+        qa_results = QAService.calculate_qa_metrics(
+            self.md, [1.0] * 4, [10.0] * 4, self.gt, self.wt, LOCATION_G_T, LOCATION_W_T
+        )
+        self.qa_results = qa_results
+        self.survey_data = SurveyData(
+            md_data=list(self.md),
+            inc_data=[1.0] * 4,
+            azi_data=[10.0] * 4,
+            gt_data=list(self.gt),
+            wt_data=list(self.wt),
+            row_count=4,
+            validation_status='pending_qa'
+        )
+        self.quality_check = QualityCheck(
+            survey_data=self.survey_data,
+            file_name='gtl.csv',
+            **QAService.quality_check_fields(qa_results, LOCATION_G_T, LOCATION_W_T),
+            status='pending'
+        )
+
+    def test_results_match_calculated_metrics(self):
+        """Decoded statuses and recomputed differences equal the QA calculation."""
+        for name in (
+            'g_t_difference_data', 'w_t_difference_data',
+            'g_t_status_data', 'w_t_status_data', 'overall_status_data',
+        ):
+            self.assertEqual(getattr(self.quality_check, name), self.qa_results[name], name)
+        self.assertEqual(self.quality_check.w_t_difference_data[2], 0.0)
+
+    def test_pending_check_reviews_every_station(self):
+        """Without a mask all stations are listed."""
+        self.assertIsNone(self.quality_check.kept_mask)
+        self.assertEqual(self.quality_check.reviewed_stations()['index'], [0, 1, 2, 3])
+
+    def test_approve_keeps_pass_stations_and_last_station(self):
+        """Default approval keeps PASS stations plus the final depth without rewriting arrays."""
+        kept = QAService.approve(self.quality_check)
+
+        self.assertEqual(self.quality_check.status, 'approved')
+        self.assertEqual(kept['md_data'], [100.0, 400.0])
+        self.assertEqual(self.quality_check.stations()['md_data'], self.md)
+        reviewed = self.quality_check.reviewed_stations()
+        self.assertEqual(reviewed['index'], [0, 3])
+        self.assertEqual(reviewed['overall_status_data'], ['PASS', 'REMOVE'])
+        self.assertEqual(self.quality_check.total_rows, 2)
+
+    def test_approve_with_explicit_indices(self):
+        """Reviewer selections are de-duplicated and clipped to the station range."""
+        kept = QAService.approve(self.quality_check, [2, 1, 1, 9])
+
+        self.assertEqual(kept['md_data'], [200.0, 300.0])
+        self.assertEqual(self.quality_check.kept_indices, [1, 2])
+
+    def test_approve_pending_survey_stores_each_station_once(self):
+        """SurveyData becomes the tie-on plus the kept stations; the removed ones are detached."""
+        tie_on = TieOn(md=50.0, inc=0.5, azi=5.0)
+        QAService.approve_pending_survey(self.quality_check, self.survey_data, tie_on, [1, 3])
+
+        self.assertEqual(self.survey_data.validation_status, 'valid')
+        self.assertEqual(self.survey_data.md_data, [50.0, 200.0, 400.0])
+        self.assertEqual(self.survey_data.gt_data, [LOCATION_G_T, 1020.0, 998.0])
+        self.assertEqual(self.survey_data.row_count, 3)
+        self.assertEqual(self.quality_check.detached_stations['md_data'], [100.0, 300.0])
+
+        stations = self.quality_check.stations()
+        self.assertEqual(stations['md_data'], self.md)
+        self.assertEqual(stations['gt_data'], self.gt)
+        reviewed = self.quality_check.reviewed_stations()
+        self.assertEqual(reviewed['index'], [1, 3])
+        self.assertEqual(reviewed['wt_data'], [49.0, 70.0])
+        self.assertEqual(reviewed['w_t_difference_data'], [1.0, -20.0])
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, REPORT_PREGENERATE=False)
+class ApproveQAAndCalculateTest(TestCase):
+    """Test cases for the approve_qa_and_calculate endpoint."""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username='qa_approve', email='approve@test.com', password='testpass123', role='engineer'
+        )
+        run = Run.objects.create(run_number='APPROVE01', run_name='Approve', survey_type='GTL', user=user)
+        TieOn.objects.create(
+            run=run, md=50.0, inc=0.5, azi=5.0, tvd='50.000', latitude=0.0, departure=0.0,
+            well_type='Oil', survey_interval_from=50.0, survey_interval_to=400.0
+        )
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='gtl.csv', file_path='/tmp/gtl.csv', file_size=100,
+            survey_type='GTL', processing_status='pending_qa'
+        )
+        self.md = [100.0, 200.0, 300.0, 400.0]
+        self.survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=self.md, inc_data=[1.0] * 4, azi_data=[10.0] * 4,
+            gt_data=[1000.5, 1020.0, 999.0, 998.0], wt_data=[50.0, 49.0, 51.0, 70.0],
+            row_count=4, validation_status='pending_qa'
+        )
+        qa_results = QAService.calculate_qa_metrics(
+            self.md, [1.0] * 4, [10.0] * 4, self.survey_data.gt_data, self.survey_data.wt_data,
+            LOCATION_G_T, LOCATION_W_T
+        )
+        self.quality_check = QualityCheck.objects.create(
+            run=run, survey_data=self.survey_data, file_name='gtl.csv',
+            **QAService.quality_check_fields(qa_results, LOCATION_G_T, LOCATION_W_T), status='pending'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+    def test_approval_calculates_the_kept_stations(self):
+        response = self.client.post(
+            reverse('approve_qa_and_calculate', args=[self.survey_data.id]),
+            {'indices_to_keep': [0, 3]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.survey_data.refresh_from_db()
+        self.assertEqual(self.survey_data.md_data, [50.0, 100.0, 400.0])
+        self.assertEqual(self.survey_data.survey_file.processing_status, 'completed')
+        calculated = CalculatedSurvey.objects.get(survey_data=self.survey_data)
+        self.assertEqual(str(calculated.id), response.data['calculated_survey_id'])
+        self.assertEqual(len(calculated.northing), 3)
+
+        quality_check = QualityCheck.objects.get(id=self.quality_check.id)
+        self.assertEqual(quality_check.status, 'approved')
+        self.assertEqual(quality_check.detached_stations['md_data'], [200.0, 300.0])
+        self.assertEqual(quality_check.stations()['md_data'], self.md)
+        self.assertEqual(quality_check.reviewed_stations()['md_data'], [100.0, 400.0])
+
+
+class StationCodesMigrationTest(SimpleTestCase):
+    """Test cases for the location reference recovered by migration 0045."""
+
+    def setUp(self):
+        self.location = importlib.import_module(
+            'survey_api.migrations.0045_quality_check_station_codes'
+        )._location
+        self.values = [1000.5, 1020.0, None, 998.0, 1003.0]
+        self.others = [50.0, 49.0, 50.0, None, 51.0]
+
+    def differences(self, reference):
+        return [
+            round(reference - value, 2) if value is not None and other is not None else 0.0
+            for value, other in zip(self.values, self.others)
+        ]
+
+    def test_run_location_is_kept_when_it_reproduces_the_differences(self):
+        differences = self.differences(1000.123456)
+        self.assertEqual(self.location(self.values, self.others, differences, '1000.123456'), 1000.123456)
+
+    def test_recovered_reference_reproduces_the_stored_differences(self):
+        differences = self.differences(1000.123456)
+        for reference in (None, 999.0):
+            recovered = self.location(self.values, self.others, differences, reference)
+            self.assertEqual(self.differences(recovered), differences)
@@ -0,0 +1,94 @@
+"""
+Tests for the orphaned GTL QA temp file sweeper.
+"""
+import io
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from survey_api.models import QualityCheck, Run, SurveyData, SurveyFile, User
+from survey_api.services.qa_service import QAService
+from survey_api.services.qa_temp_files import QATempFiles, TEMP_DIR
+
+
+class QATempFilesTest(TestCase):
+    """Test cases for QATempFiles.sweep."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='qa_sweep', email='sweep@test.com', password='testpass123')
+        self.run = Run.objects.create(run_number='SWEEP01', run_name='Sweep', survey_type='GTL', user=self.user)
+
+    def _pending_upload(self, name, age):
+        """A GTL upload awaiting QA approval, as created by upload_gtl_for_qa, ``age`` seconds old."""
+        path = default_storage.save(f'{TEMP_DIR}/{name}', ContentFile(b'q' * 10))
+        created = time.time() - age
+        os.utime(default_storage.path(path), (created, created))
+
+        md, gt, wt = [100.0, 200.0], [1000.0, 1001.0], [50.0, 50.5]
+        survey_file = SurveyFile.objects.create(
+            run=self.run, file_name=name, file_path=path, file_size=10,
+            survey_type='GTL', processing_status='pending_qa'
+        )
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=md, inc_data=[1.0, 1.0], azi_data=[10.0, 10.0],
+            gt_data=gt, wt_data=wt, row_count=2, validation_status='pending_qa'
+        )
+        qa_results = QAService.calculate_qa_metrics(md, [1.0, 1.0], [10.0, 10.0], gt, wt, 1000.0, 50.0)
+        QualityCheck.objects.create(
+            run=self.run, survey_data=survey_data, file_name=name,
+            **QAService.quality_check_fields(qa_results, 1000.0, 50.0), status='pending'
+        )
+        SurveyFile.objects.filter(id=survey_file.id).update(created_at=timezone.now() - timedelta(seconds=age))
+        return survey_file, path
+
+    def test_sweep_expires_stale_pending_uploads(self):
+        """A pending upload past the TTL loses its rows and its file; a recent one is kept."""
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            stale, stale_path = self._pending_upload('stale.csv', 3600)
+            fresh, fresh_path = self._pending_upload('fresh.csv', 60)
+
+            result = QATempFiles().sweep(max_age=600)
+
+            self.assertEqual(result, {'expired': 1, 'deleted': 1, 'bytes': 10})
+            self.assertFalse(SurveyFile.objects.filter(id=stale.id).exists())
+            self.assertFalse(SurveyData.objects.filter(survey_file_id=stale.id).exists())
+            self.assertFalse(QualityCheck.objects.filter(file_name='stale.csv').exists())
+            self.assertFalse(default_storage.exists(stale_path))
+
+            self.assertTrue(SurveyData.objects.filter(survey_file=fresh).exists())
+            self.assertTrue(QualityCheck.objects.filter(file_name='fresh.csv').exists())
+            self.assertTrue(default_storage.exists(fresh_path))
+
+    def test_sweep_deletes_only_old_unreferenced_files(self):
+        """Referenced and recent files survive the sweep."""
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            old_orphan = default_storage.save(f'{TEMP_DIR}/orphan.csv', ContentFile(b'x' * 10))
+            old_linked = default_storage.save(f'{TEMP_DIR}/linked.csv', ContentFile(b'y' * 10))
+            recent = default_storage.save(f'{TEMP_DIR}/recent.csv', ContentFile(b'z' * 10))
+            an_hour_ago = time.time() - 3600
+            for path in (old_orphan, old_linked):
+                os.utime(default_storage.path(path), (an_hour_ago, an_hour_ago))
+
+            SurveyFile.objects.create(
+                run=self.run, file_name='linked.csv', file_path=old_linked, file_size=10, survey_type='GTL'
+            )
+
+            result = QATempFiles().sweep(max_age=600)
+
+            self.assertEqual(result, {'expired': 0, 'deleted': 1, 'bytes': 10})
+            self.assertFalse(default_storage.exists(old_orphan))
+            self.assertTrue(default_storage.exists(old_linked))
+            self.assertTrue(default_storage.exists(recent))
+
+    def test_sweep_command_without_temp_dir(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            out = io.StringIO()
+            call_command('sweep_qa_temp_files', stdout=out)
+        self.assertIn('Expired 0 pending QA uploads; deleted 0 temporary QA files (0 bytes)', out.getvalue())
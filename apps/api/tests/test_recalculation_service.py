@@ -0,0 +1,117 @@
+"""
+Tests for dependency-tracked recalculation after run input changes.
+"""
+from django.test import TestCase, override_settings
+
+from survey_api.models import (
+    CalculatedSurvey, Depth, Extrapolation, InterpolatedSurvey, Location, Run,
+    SurveyData, SurveyFile, TieOn, User,
+)
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.recalculation_service import RecalculationService
+from tests.synthetic_wells import generate_well
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False)
+class RecalculationServiceTest(TestCase):
+    """Test cases for RecalculationService."""
+
+    def setUp(self):
+        self.service = RecalculationService()
+        user = User.objects.create_user(
+            username='recalc_user', email='recalc@test.com', password='testpass123', role='engineer'
+        )
+        self.run = self._create_run('RECALC01', user)
+        self.other_run = self._create_run('RECALC02', user)
+        self.survey = self._create_survey(self.run, 'first.csv', seed=0)
+        self.other_survey = self._create_survey(self.other_run, 'second.csv', seed=1)
+        BatchCalculationService.calculate_many([self.survey.id, self.other_survey.id])
+
+        calculated = CalculatedSurvey.objects.get(survey_data=self.survey)
+        self.interpolation = InterpolatedSurvey.objects.create(
+            calculated_survey=calculated, resolution=10, md_interpolated=[], inc_interpolated=[],
+            azi_interpolated=[], easting_interpolated=[], northing_interpolated=[], tvd_interpolated=[],
+            dls_interpolated=[], point_count=0, interpolation_status='completed'
+        )
+
+    @staticmethod
+    def _create_run(run_number, user):
+        run = Run.objects.create(run_number=run_number, run_name=run_number, survey_type='MWD', user=user)
+        Location.objects.create(run=run, latitude=29.5, longitude=-95.5, easting=500000.0, northing=3264000.0)
+        Depth.objects.create(run=run, reference_height=30.0, reference_elevation=100.0)
+        TieOn.objects.create(
+            run=run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+            well_type='Oil', survey_interval_from=0.0, survey_interval_to=4000.0
+        )
+        return run
+
+    @staticmethod
+    def _create_survey(run, file_name, seed):
+        well = generate_well('build_hold', 50, seed=seed)
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name=file_name, file_path=f'/recalc/{file_name}',
+            file_size=2000, survey_type='MWD', survey_role='reference'
+        )
+        # pending_qa skips the post_save auto-calculation
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=well['md'], inc_data=well['inc'], azi_data=well['azi'],
+            row_count=50, validation_status='pending_qa'
+        )
+        SurveyData.objects.filter(id=survey_data.id).update(validation_status='valid')
+        return survey_data
+
+    def test_unchanged_inputs_are_not_invalidated(self):
+        """Saving an input without changing it leaves the results current."""
+        self.run.tieon.save()
+
+        self.assertEqual(self.service.invalidate_run(self.run.id), [])
+        self.assertFalse(CalculatedSurvey.objects.get(survey_data=self.survey).is_stale)
+
+    def test_changed_input_flags_only_the_runs_descendants(self):
+        TieOn.objects.filter(run=self.run).update(tvd=25.0, departure=12.0)
+        extrapolation = Extrapolation.objects.create(
+            survey_data=self.survey, run=self.run, extrapolation_length=10.0,
+            extrapolation_step=1.0, interpolation_step=1.0, extrapolation_method='Constant',
+            original_md=[], original_inc=[], original_azi=[], original_north=[], original_east=[], original_tvd=[],
+            interpolated_md=[], interpolated_inc=[], interpolated_azi=[], interpolated_north=[],
+            interpolated_east=[], interpolated_tvd=[], extrapolated_md=[], extrapolated_inc=[],
+            extrapolated_azi=[], extrapolated_north=[], extrapolated_east=[], extrapolated_tvd=[],
+            combined_md=[], combined_inc=[], combined_azi=[], combined_north=[], combined_east=[], combined_tvd=[],
+        )
+
+        stale = self.service.invalidate_run(self.run.id)
+
+        self.assertEqual(stale, [self.survey.id])
+        self.assertTrue(CalculatedSurvey.objects.get(survey_data=self.survey).is_stale)
+        self.assertTrue(InterpolatedSurvey.objects.get(id=self.interpolation.id).is_stale)
+        self.assertTrue(Extrapolation.objects.get(id=extrapolation.id).is_stale)
+        self.assertFalse(CalculatedSurvey.objects.get(survey_data=self.other_survey).is_stale)
+
+    def test_refresh_recalculates_in_place_with_current_inputs(self):
+        before = CalculatedSurvey.objects.get(survey_data=self.survey)
+        TieOn.objects.filter(run=self.run).update(tvd=25.0)
+        self.service.invalidate_run(self.run.id)
+
+        self.assertTrue(self.service.refresh_if_stale(self.survey.id))
+
+        after = CalculatedSurvey.objects.get(survey_data=self.survey)
+        self.assertEqual(after.id, before.id)
+        self.assertFalse(after.is_stale)
+        self.assertEqual(after.calculation_context['tieon']['tvd'], 25.0)
+        self.assertAlmostEqual(after.tvd[0] - before.tvd[0], 25.0, places=2)
+        # The stale interpolation was recomputed (replaced) from the new trajectory
+        self.assertFalse(InterpolatedSurvey.objects.filter(id=self.interpolation.id).exists())
+        self.assertFalse(InterpolatedSurvey.objects.get(calculated_survey=after, resolution=10).is_stale)
+
+        # Nothing left to do on the next read
+        self.assertFalse(self.service.refresh_if_stale(self.survey.id))
+
+    def test_removed_tieon_invalidates_and_refresh_records_the_error(self):
+        TieOn.objects.filter(run=self.run).delete()
+
+        self.assertEqual(self.service.invalidate_run(self.run.id), [self.survey.id])
+        self.service.refresh([self.survey.id])
+
+        calculated = CalculatedSurvey.objects.get(survey_data=self.survey)
+        self.assertEqual(calculated.calculation_status, 'error')
+        self.assertFalse(calculated.is_stale)
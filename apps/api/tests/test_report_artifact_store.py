@@ -0,0 +1,218 @@
+"""
+Tests for the report artifact store and ranged file responses.
+"""
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from survey_api.models import Run, RunActivityLog, SurveyFile, User
+from survey_api.services.report_artifact_store import ReportArtifactStore, ReportInputs
+from survey_api.utils.ranged_file_response import UNSATISFIABLE, parse_range, ranged_file_response
+
+
+class ReportArtifactStoreTest(SimpleTestCase):
+    """Test cases for ReportArtifactStore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(REPORT_ARTIFACT_DIR=self.tmp.name, REPORT_ARTIFACT_MAX_BYTES=1000)
+        self.settings_override.enable()
+        self.store = ReportArtifactStore()
+        self.versions = [('Run', '1', datetime(2026, 1, 1))]
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmp.cleanup()
+
+    def test_generated_once_per_input_version(self):
+        """Unchanged inputs are served from disk; changed inputs regenerate."""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return b'%PDF-1'
+
+        first = self.store.get_or_create('qc', self.versions, generate)
+        second = self.store.get_or_create('qc', self.versions, generate)
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(first.path.read_bytes(), b'%PDF-1')
+        self.assertEqual(len(calls), 1)
+
+        changed = [('Run', '1', datetime(2026, 1, 2))]
+        self.store.get_or_create('qc', changed, generate)
+        self.assertEqual(len(calls), 2)
+
+    def test_evicted_file_is_regenerated_on_open(self):
+        """A file evicted between lookup and open is generated again; open handles outlive eviction."""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return b'%PDF-1'
+
+        artifact = self.store.get_or_create('qc', self.versions, generate)
+        with artifact.open() as handle:
+            artifact.path.unlink()
+            self.assertEqual(handle.read(), b'%PDF-1')
+
+        with self.store.get_or_create('qc', self.versions, generate).open() as handle:
+            self.assertEqual(handle.read(), b'%PDF-1')
+        self.assertEqual(len(calls), 2)
+
+        looked_up = self.store.get_or_create('qc', self.versions, generate)
+        looked_up.path.unlink()
+        with looked_up.open() as handle:
+            self.assertEqual(handle.read(), b'%PDF-1')
+        self.assertEqual(len(calls), 3)
+
+    def test_key_depends_on_type_and_params(self):
+        """Report type and parameters are part of the key."""
+        key = ReportArtifactStore.key('qc', self.versions)
+        self.assertNotEqual(key, ReportArtifactStore.key('soe', self.versions))
+        self.assertNotEqual(key, ReportArtifactStore.key('qc', self.versions, params=(5,)))
+
+    def test_least_recently_used_evicted(self):
+        """Once over the size limit the least recently read artifacts are removed."""
+        old = self.store.put('qc', 'a', b'x' * 400)
+        used = self.store.put('qc', 'b', b'x' * 400)
+        os.utime(old.path, (1, 1))
+        os.utime(used.path, (2, 2))
+        self.store.get('qc', 'b')  # refreshes b
+
+        self.store.put('qc', 'c', b'x' * 400)
+
+        self.assertIsNone(self.store.get('qc', 'a'))
+        self.assertIsNotNone(self.store.get('qc', 'b'))
+        self.assertIsNotNone(self.store.get('qc', 'c'))
+
+
+_pregenerated = []
+_both_pregenerated = threading.Event()
+
+
+def _record_pregeneration(report_id):
+    _pregenerated.append(report_id)
+    if len(_pregenerated) >= 2:
+        _both_pregenerated.set()
+
+
+@override_settings(REPORT_PREGENERATE=True, REPORT_PREGENERATE_DELAY=0.3, COMPUTE_POOL_ENABLED=False)
+class ReportPregenerationTest(TestCase):
+    """Test cases for debounced report pre-generation."""
+
+    def setUp(self):
+        _pregenerated.clear()
+        _both_pregenerated.clear()
+        self.store = ReportArtifactStore()
+
+    def test_repeated_changes_generate_once_per_report(self):
+        """Saves in quick succession render each report once, after the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self.store.pregenerate(_record_pregeneration, 'qc-1')
+            self.store.pregenerate(_record_pregeneration, 'qc-2')
+            self.assertEqual(self.store._pending, {})
+
+        self.assertEqual(len(self.store._pending), 2)
+        self.assertTrue(_both_pregenerated.wait(5))
+        self.assertEqual(sorted(_pregenerated), ['qc-1', 'qc-2'])
+
+    @override_settings(REPORT_PREGENERATE=False)
+    def test_disabled(self):
+        """Nothing is scheduled when REPORT_PREGENERATE is off."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.store.pregenerate(_record_pregeneration, 'qc-1')
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.store._pending, {})
+
+
+class ReportInputsTest(TestCase):
+    """Test cases for ReportInputs.collect."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='inputs_user', email='inputs@test.com', password='testpass123')
+        self.run = Run.objects.create(run_number='INPUTS01', run_name='Inputs', survey_type='GTL', user=self.user)
+        self.survey_file = SurveyFile.objects.create(
+            run=self.run, file_name='inputs.csv', file_path='/inputs/inputs.csv', file_size=100, survey_type='GTL'
+        )
+
+    def key(self, **kwargs):
+        return ReportArtifactStore.key('soe', ReportInputs.collect(run_ids=[self.run.pk], **kwargs))
+
+    def test_survey_file_processing_status_changes_the_key(self):
+        before = self.key()
+        self.survey_file.processing_status = 'completed'
+        self.survey_file.save()
+        self.assertNotEqual(self.key(), before)
+
+    def test_activity_logs_change_the_key_when_collected(self):
+        before, before_with_logs = self.key(), self.key(activity_logs=True)
+        RunActivityLog.objects.create(
+            run=self.run, user=self.user, activity_type='run_updated', description='Run renamed'
+        )
+        self.assertEqual(self.key(), before)
+        self.assertNotEqual(self.key(activity_logs=True), before_with_logs)
+
+
+class RangedFileResponseTest(SimpleTestCase):
+    """Test cases for Range support."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as f:
+            f.write(b'0123456789')
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_parse_range(self):
+        """Single ranges are parsed; multi-range and malformed headers are ignored."""
+        self.assertEqual(parse_range('bytes=2-5', 10), (2, 5))
+        self.assertEqual(parse_range('bytes=7-', 10), (7, 9))
+        self.assertEqual(parse_range('bytes=-3', 10), (7, 9))
+        self.assertEqual(parse_range('bytes=4-100', 10), (4, 9))
+        self.assertEqual(parse_range('bytes=10-', 10), UNSATISFIABLE)
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+        self.assertIsNone(parse_range(None, 10))
+
+    def test_partial_content(self):
+        """A Range request returns 206 with only the requested bytes."""
+        request = self.factory.get('/', HTTP_RANGE='bytes=2-5')
+        response = ranged_file_response(request, self.path, 'report.pdf', etag='"k"')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+
+    def test_full_and_not_modified(self):
+        """Without Range the whole file is served; a matching ETag returns 304."""
+        response = ranged_file_response(self.factory.get('/'), self.path, 'report.pdf', etag='"k"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('report.pdf', response['Content-Disposition'])
+
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH='"k"')
+        self.assertEqual(ranged_file_response(request, self.path, 'report.pdf', etag='"k"').status_code, 304)
+
+    def test_open_file_is_served(self):
+        """An already open file is served without reopening its path."""
+        handle = open(self.path, 'rb')
+        os.unlink(self.path)
+        response = ranged_file_response(self.factory.get('/', HTTP_RANGE='bytes=2-4'), handle, 'report.pdf')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+        response.close()
+        self.assertTrue(handle.closed)
+        open(self.path, 'wb').close()
+
+    def test_unsatisfiable_range(self):
+        """A range past the end of the file returns 416."""
+        request = self.factory.get('/', HTTP_RANGE='bytes=20-')
+        response = ranged_file_response(request, self.path, 'report.pdf')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
@@ -0,0 +1,64 @@
+"""
+Tests for the report asset registry.
+"""
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+from pypdf import PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from survey_api.services.report_assets import ReportAssetRegistry
+
+
+def write_pdf(path, pages):
+    pdf = canvas.Canvas(path, pagesize=A4)
+    for number in range(pages):
+        pdf.drawString(72, 720, f"Template page {number + 1}")
+        pdf.showPage()
+    pdf.save()
+
+
+class ReportAssetRegistryTest(SimpleTestCase):
+    """Test cases for ReportAssetRegistry."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'template.pdf')
+        write_pdf(self.path, 2)
+        self.registry = ReportAssetRegistry()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_template_parsed_once(self):
+        """Repeated lookups return the same parsed template."""
+        first = self.registry.pdf_template(self.path)
+        self.assertIs(first, self.registry.pdf_template(self.path))
+        self.assertEqual(first.page_count, 2)
+
+    def test_template_reloaded_when_modified(self):
+        """A changed mtime reloads the template."""
+        first = self.registry.pdf_template(self.path)
+        write_pdf(self.path, 3)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = self.registry.pdf_template(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.page_count, 3)
+
+    def test_append_leaves_shared_pages_untouched(self):
+        """Each report gets its own copy of the template pages."""
+        template = self.registry.pdf_template(self.path)
+        for _ in range(2):
+            writer = PdfWriter()
+            template.append_to(writer)
+            self.assertEqual(len(writer.pages), 2)
+        self.assertEqual(template.page_count, 2)
+
+    def test_missing_file(self):
+        """Missing assets raise FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            self.registry.pdf_template(os.path.join(self.tmp.name, 'missing.pdf'))
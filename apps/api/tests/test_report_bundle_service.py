@@ -0,0 +1,105 @@
+"""
+Tests for the job report bundle service.
+"""
+import io
+import os
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from survey_api.services.compute_pool import compute_pool
+from survey_api.services.report_bundle_service import BundlePart, ReportBundle, ReportBundleService
+
+
+def fake_imap_unordered(func, arg_tuples, timeout=None, max_inflight=None):
+    for index, args in enumerate(arg_tuples):
+        yield index, func(*args)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ReportBundleServiceTest(SimpleTestCase):
+    """Test cases for ReportBundleService.stream."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = {}
+        for name in ('a', 'b'):
+            path = os.path.join(self.tmp.name, f'{name}.pdf')
+            with open(path, 'wb') as f:
+                f.write(f'%PDF-{name}'.encode())
+            self.paths[name] = path
+
+        self.bundle = ReportBundle(bundle_id='bundle-1', job_id='job-1', filename='bundle.zip', parts=[
+            BundlePart('SOE_Report_1.pdf', 'a', '1'),
+            BundlePart('Run_1/Service_Ticket_1.pdf', 'b', '2'),
+            BundlePart('Run_1/QC_Report_x.pdf', 'missing', '3'),
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build_part(self, kind, object_id):
+        if kind in self.paths:
+            return self.paths[kind], None
+        return None, 'boom'
+
+    def stream(self):
+        with mock.patch.object(ReportBundleService, '_build_part', side_effect=self.build_part), \
+                mock.patch('survey_api.services.report_bundle_service.compute_pool') as pool:
+            pool.imap_unordered.side_effect = fake_imap_unordered
+            return b''.join(ReportBundleService.stream(self.bundle))
+
+    def test_streamed_zip_contains_parts_and_manifest(self):
+        """Built parts are stored under their arcnames; failures are listed in the manifest."""
+        archive = zipfile.ZipFile(io.BytesIO(self.stream()))
+        self.assertEqual(archive.read('SOE_Report_1.pdf'), b'%PDF-a')
+        self.assertEqual(archive.read('Run_1/Service_Ticket_1.pdf'), b'%PDF-b')
+        self.assertNotIn('Run_1/QC_Report_x.pdf', archive.namelist())
+        self.assertIn('FAILED  Run_1/QC_Report_x.pdf: boom', archive.read('MANIFEST.txt').decode())
+
+    def test_progress_recorded(self):
+        """Progress reports every part once the bundle has finished."""
+        self.stream()
+        progress = ReportBundleService.get_progress('bundle-1')
+        self.assertEqual(progress['status'], 'completed')
+        self.assertEqual(progress['total'], 3)
+        self.assertEqual(progress['completed'], 3)
+        self.assertEqual(progress['failed'], ['Run_1/QC_Report_x.pdf'])
+        self.assertIsNone(ReportBundleService.get_progress('unknown'))
+
+    def test_evicted_part_is_rebuilt(self):
+        """A part whose file was evicted before it was zipped is built again."""
+        evicted = os.path.join(self.tmp.name, 'evicted.pdf')
+        results = iter([(evicted, None), (self.paths['a'], None)])
+        self.bundle.parts = self.bundle.parts[:1]
+
+        with mock.patch.object(ReportBundleService, '_build_part', side_effect=lambda *args: next(results)), \
+                mock.patch('survey_api.services.report_bundle_service.compute_pool') as pool:
+            pool.imap_unordered.side_effect = fake_imap_unordered
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(ReportBundleService.stream(self.bundle))))
+
+        self.assertEqual(archive.read('SOE_Report_1.pdf'), b'%PDF-a')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    COMPUTE_POOL_WORKERS=1, COMPUTE_POOL_ENABLED=True,
+)
+class ReportBundlePoolTest(SimpleTestCase):
+    """Test ReportBundleService.stream against the real compute pool."""
+
+    def test_parts_are_built_in_pool_workers_one_per_worker(self):
+        bundle = ReportBundle(bundle_id='bundle-2', job_id='job-2', filename='bundle.zip', parts=[
+            BundlePart(f'Part_{index}.pdf', 'unknown', str(index)) for index in range(3)
+        ])
+
+        with mock.patch.object(compute_pool, 'imap_unordered', wraps=compute_pool.imap_unordered) as imap:
+            archive = zipfile.ZipFile(io.BytesIO(b''.join(ReportBundleService.stream(bundle))))
+
+        self.assertEqual(imap.call_args.kwargs['max_inflight'], 1)
+        manifest = archive.read('MANIFEST.txt').decode()
+        for index in range(3):
+            self.assertIn(f'FAILED  Part_{index}.pdf: Unknown report type unknown', manifest)
+        self.assertEqual(ReportBundleService.get_progress('bundle-2')['completed'], 3)
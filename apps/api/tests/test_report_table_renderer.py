@@ -0,0 +1,63 @@
+"""
+Tests for the report data table renderer.
+"""
+from django.test import SimpleTestCase, override_settings
+
+from survey_api.services.report_table_renderer import (
+    ROWS_PER_PAGE, PAGES_PER_CHUNK, ReportTableRenderer, format_column, merge_pdfs, pdf_page_count
+)
+
+
+class FormatColumnTest(SimpleTestCase):
+    """Test cases for vectorized column formatting."""
+
+    def test_formats_two_decimals(self):
+        """Numbers and numeric strings are formatted to two decimals."""
+        self.assertEqual(list(format_column([1, 2.346, '3.5'], 3)), ['1.00', '2.35', '3.50'])
+
+    def test_pads_and_truncates_to_length(self):
+        """Short columns are padded with the missing text; long ones truncated."""
+        self.assertEqual(list(format_column([1.0], 3, missing='None')), ['1.00', 'None', 'None'])
+        self.assertEqual(list(format_column([1.0, 2.0, 3.0], 2)), ['1.00', '2.00'])
+
+    def test_invalid_entries(self):
+        """None and non-numeric entries use the invalid text."""
+        self.assertEqual(list(format_column([None, 'x', 4], 3, invalid='0.00')), ['0.00', '0.00', '4.00'])
+
+
+class ReportTableRendererTest(SimpleTestCase):
+    """Test cases for ReportTableRenderer."""
+
+    def test_build_rows_matches_report_conventions(self):
+        """V.S. is blank when absent and DLS shows 'None' when missing."""
+        rows = ReportTableRenderer.build_rows(
+            [0, 30], [0, 1.5], [0, 90], [0, 29.99], [], [0, 0.2], [0, 0.39], [None]
+        )
+        self.assertEqual(rows.shape, (2, 8))
+        self.assertEqual(list(rows[1]), ['30.00', '1.50', '90.00', '29.99', '', '0.20', '0.39', 'None'])
+        self.assertEqual(rows[0][7], 'None')
+
+    def test_build_rows_empty(self):
+        """A survey without stations has no rows and no data pages."""
+        rows = ReportTableRenderer.build_rows([], [], [], [], [], [], [], [])
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(ReportTableRenderer.render(rows, ('Title', 'date', 'run')), [])
+
+    @override_settings(COMPUTE_POOL_ENABLED=False)
+    def test_render_splits_into_page_ranges(self):
+        """Large tables render as ranges that concatenate to the full page count."""
+        count = ROWS_PER_PAGE * PAGES_PER_CHUNK + 1
+        md = [float(i) for i in range(count)]
+        rows = ReportTableRenderer.build_rows(md, md, md, md, md, md, md, md)
+
+        pages = []
+        parts = ReportTableRenderer.render(
+            rows, ('Gyroscopic Survey Report', '01-Jan-2026', 'RUN-1'),
+            first_page_number=2, total_pages=PAGES_PER_CHUNK + 3,
+            footer=lambda canvas_obj, doc, page_num, total: pages.append((page_num, total))
+        )
+
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(pdf_page_count(merge_pdfs(parts)), PAGES_PER_CHUNK + 1)
+        self.assertEqual(pages[0], (2, PAGES_PER_CHUNK + 3))
+        self.assertEqual(pages[-1], (PAGES_PER_CHUNK + 2, PAGES_PER_CHUNK + 3))
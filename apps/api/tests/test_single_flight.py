@@ -0,0 +1,153 @@
+"""
+Tests for single-flight coalescing of concurrent computations.
+"""
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.models import Run, SurveyData, SurveyFile, TieOn, User
+from survey_api.services.single_flight import SingleFlight, single_flight
+from survey_api.services.survey_calculation_service import SurveyCalculationService
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, SINGLE_FLIGHT_WAIT_TIMEOUT=5)
+class SingleFlightTest(SimpleTestCase):
+    """Test cases for SingleFlight.run."""
+
+    def setUp(self):
+        cache.clear()
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    def run_concurrently(self, compute, count=4):
+        """Start ``count`` callers of the same key while the first one is computing."""
+        started = threading.Event()
+        release = threading.Event()
+        outcomes = [None] * count
+
+        def leader_compute():
+            started.set()
+            release.wait(5)
+            return compute()
+
+        def call(index, fn):
+            try:
+                outcomes[index] = ('ok', self.flight.run('key', fn, operation='test'))
+            except Exception as e:
+                outcomes[index] = ('error', e)
+
+        threads = [threading.Thread(target=call, args=(0, leader_compute))]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=call, args=(i, compute)) for i in range(1, count)]
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        return outcomes
+
+    def compute(self):
+        self.calls += 1
+        return {'points': [1.0, 2.0]}
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Only the leader computes; every caller gets its result."""
+        outcomes = self.run_concurrently(self.compute)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(outcomes, [('ok', {'points': [1.0, 2.0]})] * 4)
+
+    def test_errors_are_shared(self):
+        """Followers re-raise the leader's exception instead of retrying."""
+        def failing():
+            self.calls += 1
+            raise ValueError('bad survey')
+
+        outcomes = self.run_concurrently(failing, count=3)
+        self.assertEqual(self.calls, 1)
+        for kind, error in outcomes:
+            self.assertEqual(kind, 'error')
+            self.assertIsInstance(error, ValueError)
+
+    def test_sequential_calls_recompute(self):
+        """Finished flights are not reused as a cache."""
+        self.flight.run('key', self.compute)
+        self.flight.run('key', self.compute)
+        self.assertEqual(self.calls, 2)
+        self.assertIsNone(cache.get('single-flight:key:lock'))
+
+    def test_follower_reads_result_published_by_other_process(self):
+        """A caller that finds the lock taken waits for the holder's published result."""
+        cache.set('single-flight:key:lock', 'other', 60)
+
+        def publish():
+            cache.set('single-flight:key:result:other', ('ok', 'shared'), 60)
+            cache.delete('single-flight:key:lock')
+
+        timer = threading.Timer(0.1, publish)
+        timer.start()
+        try:
+            self.assertEqual(self.flight.run('key', self.compute), 'shared')
+        finally:
+            timer.cancel()
+        self.assertEqual(self.calls, 0)
+
+    def test_abandoned_lock_is_taken_over(self):
+        """If the holder releases its lock without a result the waiter computes."""
+        cache.set('single-flight:key:lock', 'other', 60)
+        timer = threading.Timer(0.1, cache.delete, args=('single-flight:key:lock',))
+        timer.start()
+        try:
+            self.assertEqual(self.flight.run('key', self.compute), {'points': [1.0, 2.0]})
+        finally:
+            timer.cancel()
+        self.assertEqual(self.calls, 1)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.2)
+    def test_wait_timeout_falls_back_to_computing(self):
+        """A stuck holder does not block callers past the wait timeout."""
+        cache.set('single-flight:key:lock', 'stuck', 60)
+        self.assertEqual(self.flight.run('key', self.compute), {'points': [1.0, 2.0]})
+        self.assertEqual(self.calls, 1)
+
+
+class CalculationFlightKeyTest(TestCase):
+    """Test the single-flight key of SurveyCalculationService.calculate."""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username='flight_user', email='flight@test.com', password='testpass123', role='engineer'
+        )
+        run = Run.objects.create(run_number='FLIGHT-1', run_name='Flight', survey_type='MWD', user=user)
+        self.tieon = TieOn.objects.create(
+            run=run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+            well_type='Oil', survey_interval_from=0.0, survey_interval_to=1000.0
+        )
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='flight.csv', file_path='/flight/flight.csv', file_size=100, survey_type='MWD'
+        )
+        # pending_qa skips the post_save auto-calculation
+        self.survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=[0.0, 100.0], inc_data=[0.0, 1.0], azi_data=[0.0, 0.0],
+            row_count=2, validation_status='pending_qa'
+        )
+
+    def flight_key(self):
+        with mock.patch.object(single_flight, 'run', side_effect=RuntimeError('stop')) as run:
+            with self.assertRaises(RuntimeError):
+                SurveyCalculationService.calculate(self.survey_data.id)
+        return run.call_args.args[0]
+
+    def test_key_changes_with_the_run_tie_on(self):
+        """Editing the tie-on starts a new flight instead of joining one computed from the old tie-on."""
+        key = self.flight_key()
+        self.assertEqual(key, self.flight_key())
+
+        self.tieon.inc = 5.0
+        self.tieon.save()
+
+        self.assertNotEqual(key, self.flight_key())
@@ -0,0 +1,76 @@
+"""
+Tests for the field-wide trajectory proximity index.
+"""
+from django.test import TestCase, override_settings
+
+from survey_api.exceptions import InsufficientDataError, ValidationError
+from survey_api.models import User
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.spatial_index_service import SpatialIndexService
+from tests.synthetic_wells import create_located_run, create_survey
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False)
+class SpatialIndexServiceTest(TestCase):
+    """Test cases for SpatialIndexService."""
+
+    def setUp(self):
+        self.index = SpatialIndexService()
+        self.user = User.objects.create_user(
+            username='spatial_user', email='spatial@test.com', password='testpass123', role='engineer'
+        )
+        self.run_a, self.survey_a = self._create_well('SPATIAL-A', 500000.0)
+        self.run_b, self.survey_b = self._create_well('SPATIAL-B', 500020.0)
+        self.run_c, self.survey_c = self._create_well('SPATIAL-C', 500300.0)
+        # A second survey of run A is the same wellbore, not an offset
+        self.survey_a2 = create_survey(self.run_a, 'a2.csv')
+        BatchCalculationService.calculate_many(
+            [self.survey_a.id, self.survey_b.id, self.survey_c.id, self.survey_a2.id]
+        )
+
+    def _create_well(self, run_number, easting):
+        run = create_located_run(self.user, run_number, easting=easting)
+        return run, create_survey(run, f'{run_number}.csv')
+
+    def test_nearest_offset_per_station(self):
+        result = self.index.nearest_offsets(self.survey_a.id, md_from=200, md_to=500)
+
+        self.assertEqual(result['md'], [200.0, 300.0, 400.0, 500.0])
+        self.assertEqual(set(result['offset_survey_data_id']), {str(self.survey_b.id)})
+        for distance, offset_md, md in zip(result['distance'], result['offset_md'], result['md']):
+            self.assertAlmostEqual(distance, 20.0, places=3)
+            self.assertAlmostEqual(offset_md, md, places=3)
+        self.assertEqual(result['offsets'][0]['run_number'], 'SPATIAL-B')
+
+    def test_within_distance_lists_offsets_closest_first(self):
+        self.assertEqual(
+            [offset['survey_data_id'] for offset in self.index.within_distance(self.survey_a.id, 100)['offsets']],
+            [str(self.survey_b.id)]
+        )
+
+        offsets = self.index.within_distance(self.survey_a.id, 400)['offsets']
+        self.assertEqual([offset['run_number'] for offset in offsets], ['SPATIAL-B', 'SPATIAL-C'])
+        self.assertAlmostEqual(offsets[1]['min_distance'], 300.0, places=3)
+        self.assertEqual(offsets[1]['stations'], 11)
+
+    def test_only_changed_surveys_are_reloaded(self):
+        self.assertEqual(self.index.sync(), {'loaded': 4, 'removed': 0})
+        self.assertEqual(self.index.sync(), {'loaded': 0, 'removed': 0})
+
+        location = self.run_b.location
+        location.easting = 500050.0
+        location.save()
+
+        self.assertEqual(self.index.sync(), {'loaded': 1, 'removed': 0})
+        result = self.index.nearest_offsets(self.survey_a.id, md_from=0, md_to=0)
+        self.assertAlmostEqual(result['distance'][0], 50.0, places=3)
+
+        self.survey_b.delete()
+        self.assertEqual(self.index.sync(), {'loaded': 0, 'removed': 1})
+
+    def test_survey_without_location_and_invalid_distance(self):
+        self.run_c.location.delete()
+        with self.assertRaises(InsufficientDataError):
+            self.index.nearest_offsets(self.survey_c.id)
+        with self.assertRaises(ValidationError):
+            self.index.within_distance(self.survey_a.id, 0)
@@ -0,0 +1,68 @@
+"""
+Tests for the vectorized Transverse Mercator projection.
+"""
+import numpy as np
+from django.test import SimpleTestCase
+
+from survey_api.utils.transverse_mercator import (
+    TransverseMercator,
+    ellipsoid_for,
+    parse_zone,
+    utm_zone,
+)
+
+
+class TransverseMercatorTest(SimpleTestCase):
+    """Test cases for the UTM forward and inverse series."""
+
+    # (latitude, longitude, zone, south, easting, northing) - published UTM references
+    REFERENCE_POINTS = [
+        (48.8582, 2.2945, 31, False, 448251.795, 5411932.678),     # Eiffel Tower
+        (-33.8688, 151.2093, 56, True, 334368.634, 6250948.345),   # Sydney
+        (0.0, 0.0, 31, False, 166021.443, 0.0),                    # Equator, 3 deg from CM
+    ]
+
+    def test_forward_matches_reference_points(self):
+        for latitude, longitude, zone, south, easting, northing in self.REFERENCE_POINTS:
+            e, n, _, _ = TransverseMercator.utm(zone, south).forward(latitude, longitude)
+            self.assertAlmostEqual(float(e), easting, places=2)
+            self.assertAlmostEqual(float(n), northing, places=2)
+
+    def test_inverse_round_trips_arrays(self):
+        projection = TransverseMercator.utm(40, ellipsoid=ellipsoid_for('PSD 93'))
+        rng = np.random.default_rng(0)
+        latitude = rng.uniform(0, 80, 10000)
+        longitude = 57 + rng.uniform(-3, 3, 10000)
+
+        easting, northing, convergence, scale = projection.forward(latitude, longitude)
+        lat_back, lon_back, convergence_back, scale_back = projection.inverse(easting, northing)
+
+        self.assertLess(np.abs(lat_back - latitude).max(), 1e-9)
+        self.assertLess(np.abs(lon_back - longitude).max(), 1e-9)
+        self.assertLess(np.abs(convergence_back - convergence).max(), 1e-9)
+        self.assertLess(np.abs(scale_back - scale).max(), 1e-12)
+
+    def test_convergence_and_scale_on_central_meridian(self):
+        _, _, convergence, scale = TransverseMercator.utm(40).forward(25.0, 57.0)
+        self.assertAlmostEqual(float(convergence), 0.0, places=12)
+        self.assertAlmostEqual(float(scale), 0.9996, places=12)
+
+    def test_convergence_sign_follows_side_of_central_meridian(self):
+        _, _, convergence, _ = TransverseMercator.utm(40).forward([25.0, 25.0], [55.0, 59.0])
+        self.assertLess(convergence[0], 0)
+        self.assertGreater(convergence[1], 0)
+
+    def test_parse_zone(self):
+        self.assertEqual(parse_zone('Zone 40N(54E to 60E)'), (40, False))
+        self.assertEqual(parse_zone('56H'), (56, True))
+        self.assertEqual(parse_zone('15'), (15, None))
+        self.assertEqual(parse_zone(''), (None, None))
+        self.assertEqual(parse_zone('Zone 61N'), (None, None))
+
+    def test_utm_zone_exceptions(self):
+        np.testing.assert_array_equal(utm_zone([29.76, 60.0, 78.0], [-95.37, 5.0, 15.0]), [15, 32, 33])
+
+    def test_unknown_datum_uses_wgs84(self):
+        self.assertEqual(ellipsoid_for('Universal Transverse Mercator').name, 'WGS84')
+        self.assertEqual(ellipsoid_for('PSD 93').name, 'Clarke 1880 (RGS)')
+        self.assertEqual(ellipsoid_for(None).name, 'WGS84')
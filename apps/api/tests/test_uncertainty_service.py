@@ -0,0 +1,115 @@
+"""
+Tests for per-station positional uncertainty of calculated surveys.
+"""
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.exceptions import ValidationError
+from survey_api.models import CalculatedSurvey, Depth, Location, Run, SurveyData, SurveyFile, TieOn, User
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.uncertainty_service import ErrorSource, UncertaintyService, UNCERTAINTY_COLUMNS
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+MD = [100.0 * i for i in range(11)]
+
+
+def compute(inc, azi, *sources):
+    """Uncertainty columns by name for a straight well with constant attitude."""
+    columns = UncertaintyService.compute(MD, [inc] * len(MD), [azi] * len(MD), sources)
+    return dict(zip(UNCERTAINTY_COLUMNS, columns))
+
+
+class ComputeUncertaintyTest(SimpleTestCase):
+    """Test cases for the vectorized error propagation."""
+
+    def test_vertical_well(self):
+        # Azimuth errors don't move a vertical well; a depth scale error grows with MD
+        result = compute(0.0, 0.0, ErrorSource('AZ', 'azi', 1.0, 'const', True),
+                         ErrorSource('DSFS', 'md', 1e-3, 'md', True))
+
+        np.testing.assert_allclose(result['semi_major'], 0.0, atol=1e-12)
+        np.testing.assert_allclose(result['sigma_vertical'], np.asarray(MD) * 1e-3)
+
+    def test_systematic_errors_add_linearly_and_random_errors_in_quadrature(self):
+        # Horizontal well heading north: inclination errors are vertical
+        systematic = compute(90.0, 0.0, ErrorSource('INC', 'inc', 1.0, 'const', True))
+        random = compute(90.0, 0.0, ErrorSource('INC', 'inc', 1.0, 'const', False))
+
+        np.testing.assert_allclose(systematic['sigma_vertical'], np.radians(1.0) * np.asarray(MD), atol=1e-9)
+        # Half legs at the tie-on and at the station itself, full legs between
+        self.assertAlmostEqual(random['sigma_vertical'][10], np.radians(1.0) * 100.0 * np.sqrt(9.5), places=9)
+        np.testing.assert_allclose(systematic['semi_major'], 0.0, atol=1e-9)
+
+    def test_ellipse_is_across_the_well_for_azimuth_errors(self):
+        north = compute(90.0, 0.0, ErrorSource('AZ', 'azi', 1.0, 'const', True))
+        north_east = compute(90.0, 45.0, ErrorSource('AZ', 'azi', 1.0, 'const', True))
+
+        self.assertAlmostEqual(north['ellipse_azimuth'][10], 90.0, places=6)
+        self.assertAlmostEqual(north_east['ellipse_azimuth'][10], 135.0, places=6)
+        self.assertAlmostEqual(north['semi_major'][10], np.radians(1.0) * 1000.0, places=6)
+        self.assertAlmostEqual(north['semi_minor'][10], 0.0, places=6)
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False, CACHES=LOCMEM_CACHE)
+class UncertaintyColumnsTest(TestCase):
+    """Test cases for UncertaintyService.uncertainty_columns."""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(
+            username='unc_user', email='unc@test.com', password='testpass123', role='engineer'
+        )
+        run = Run.objects.create(run_number='UNC01', run_name='UNC01', survey_type='Gyro', user=user)
+        Location.objects.create(run=run, latitude=22.5, longitude=57.0, geodetic_datum='WGS84')
+        Depth.objects.create(run=run, reference_height=30.0, reference_elevation=100.0)
+        TieOn.objects.create(
+            run=run, md=0.0, inc=0.0, azi=0.0, tvd=0.0, latitude=0.0, departure=0.0,
+            well_type='Oil', survey_interval_from=0.0, survey_interval_to=4000.0
+        )
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name='unc.csv', file_path='/unc/unc.csv',
+            file_size=1000, survey_type='Gyro', survey_role='reference'
+        )
+        # pending_qa skips the post_save auto-calculation
+        self.survey = SurveyData.objects.create(
+            survey_file=survey_file, md_data=MD, inc_data=[10.0 * i for i in range(11)],
+            azi_data=[45.0] * 11, row_count=11, validation_status='pending_qa'
+        )
+        SurveyData.objects.filter(id=self.survey.id).update(validation_status='valid')
+        BatchCalculationService.calculate_many([self.survey.id])
+
+    def calculated(self):
+        return CalculatedSurvey.objects.select_related('survey_data').get(survey_data=self.survey)
+
+    def test_tool_model_is_stored_with_the_calculation(self):
+        error_model, first = UncertaintyService.uncertainty_columns(self.calculated())
+        stored = self.calculated()
+
+        self.assertEqual(error_model, 'Gyro')
+        self.assertTrue(stored.uncertainty_version.startswith('Gyro:'))
+        self.assertEqual(len(first['semi_major']), 11)
+        self.assertEqual(first['semi_major'][0], 0.0)
+
+        with mock.patch.object(UncertaintyService, 'compute') as compute_mock:
+            _, second = UncertaintyService.uncertainty_columns(stored)
+        compute_mock.assert_not_called()
+        np.testing.assert_array_equal(second['semi_major'], first['semi_major'])
+
+    def test_other_models_are_cached(self):
+        _, gyro = UncertaintyService.uncertainty_columns(self.calculated())
+        _, mwd = UncertaintyService.uncertainty_columns(self.calculated(), 'MWD')
+
+        # A magnetic tool is less accurate than the gyro the survey was run with
+        self.assertGreater(mwd['semi_major'][-1], gyro['semi_major'][-1])
+        self.assertTrue(self.calculated().uncertainty_version.startswith('Gyro:'))
+        with mock.patch.object(UncertaintyService, 'compute') as compute_mock:
+            UncertaintyService.uncertainty_columns(self.calculated(), 'MWD')
+        compute_mock.assert_not_called()
+
+    def test_unknown_error_model(self):
+        with self.assertRaises(ValidationError):
+            UncertaintyService.uncertainty_columns(self.calculated(), 'SuperGyro')
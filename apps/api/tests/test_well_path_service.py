@@ -0,0 +1,133 @@
+"""
+Tests for composite well paths merged from several runs.
+"""
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from survey_api.exceptions import InsufficientDataError
+from survey_api.models import Run, SurveyData, SurveyFile, TieOn, User, Well, WellPathComposite
+from survey_api.services.batch_calculation_service import BatchCalculationService
+from survey_api.services.well_path_service import WellPathService
+
+COS_30 = np.cos(np.radians(30.0))
+
+
+class MinimumCurvatureTest(SimpleTestCase):
+    """Test cases for the vectorized minimum curvature positions."""
+
+    def test_constant_build_follows_a_circular_arc(self):
+        md = np.linspace(0.0, 900.0, 31)
+        inc = md / 10.0
+        radius = 30.0 / np.radians(3.0)
+
+        northing, easting, tvd, dls = WellPathService.minimum_curvature(md, inc, np.zeros(31), (10.0, 0.0, 5.0))
+
+        np.testing.assert_allclose(tvd, 5.0 + radius * np.sin(np.radians(inc)), atol=1e-9)
+        np.testing.assert_allclose(northing, 10.0 + radius * (1 - np.cos(np.radians(inc))), atol=1e-9)
+        np.testing.assert_allclose(easting, 0.0, atol=1e-9)
+        np.testing.assert_allclose(dls, [0.0] + [3.0] * 30)
+
+
+@override_settings(COMPUTE_POOL_ENABLED=False, RECALCULATION_EAGER=False)
+class WellPathServiceTest(TestCase):
+    """Test cases for WellPathService.composite."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='path_user', email='path@test.com', password='testpass123', role='engineer'
+        )
+        self.well = Well.objects.create(well_name='Composite Well', well_id='CW-001')
+        self.gyro = self._create_survey('PATH-1', 'Gyro', 0.0, 1000.0)
+        self.mwd = self._create_survey('PATH-2', 'MWD', 900.0, 3000.0)
+
+    def _create_survey(self, run_number, survey_type, md_from, md_to):
+        run = Run.objects.create(
+            run_number=run_number, run_name=run_number, survey_type=survey_type, user=self.user, well=self.well
+        )
+        TieOn.objects.create(
+            run=run, md=md_from, inc=30.0, azi=0.0, tvd=f'{md_from * COS_30:.3f}', latitude=md_from * 0.5, departure=0.0,
+            well_type='Oil', survey_interval_from=md_from, survey_interval_to=md_to
+        )
+        survey_file = SurveyFile.objects.create(
+            run=run, file_name=f'{run_number}.csv', file_path=f'/path/{run_number}.csv',
+            file_size=1000, survey_type=survey_type, survey_role='primary'
+        )
+        md = np.arange(md_from, md_to + 1.0, 100.0).tolist()
+        # pending_qa skips the post_save auto-calculation
+        survey_data = SurveyData.objects.create(
+            survey_file=survey_file, md_data=md, inc_data=[30.0] * len(md), azi_data=[0.0] * len(md),
+            row_count=len(md), validation_status='pending_qa'
+        )
+        SurveyData.objects.filter(id=survey_data.id).update(validation_status='valid')
+        BatchCalculationService.calculate_many([survey_data.id])
+        return survey_data
+
+    def assert_straight_hold(self, composite):
+        md = composite.column_array('md')
+        np.testing.assert_allclose(composite.column_array('tvd'), md * COS_30, atol=2e-3)
+        np.testing.assert_allclose(composite.column_array('northing'), md * 0.5, atol=2e-3)
+
+    def test_overlap_is_taken_from_the_higher_priority_survey(self):
+        composite = WellPathService.composite(self.well.id)
+
+        self.assertEqual(composite.station_count, 31)
+        self.assertEqual(
+            [(segment['run_number'], segment['md_from'], segment['md_to']) for segment in composite.segments],
+            [('PATH-1', 0.0, 1000.0), ('PATH-2', 1100.0, 3000.0)]
+        )
+        self.assertIsNone(composite.recomputed_from_md)
+        self.assert_straight_hold(composite)
+
+        # Unchanged surveys: the stored path is served as is
+        self.assertEqual(WellPathService.composite(self.well.id).updated_at, composite.updated_at)
+
+    @override_settings(WELL_PATH_SOURCE_PRIORITY=['MWD', 'Gyro'])
+    def test_priority_is_configurable(self):
+        composite = WellPathService.composite(self.well.id)
+
+        self.assertEqual(
+            [(segment['run_number'], segment['md_from']) for segment in composite.segments],
+            [('PATH-1', 0.0), ('PATH-2', 900.0)]
+        )
+
+    def test_added_run_recalculates_from_its_tie_on_downward(self):
+        WellPathService.composite(self.well.id)
+        self._create_survey('PATH-3', 'MWD', 2900.0, 4000.0)
+
+        with mock.patch.object(WellPathService, '_stations', wraps=WellPathService._stations) as stations:
+            composite = WellPathService.composite(self.well.id)
+
+        # The gyro run only contributes above the change and is not reloaded
+        self.assertEqual(
+            sorted(call.args[0] for call in stations.call_args_list),
+            sorted([str(self.mwd.id), str(SurveyData.objects.get(survey_file__run__run_number='PATH-3').id)])
+        )
+        self.assertEqual(composite.recomputed_from_md, 2900.0)
+        self.assertEqual(composite.station_count, 41)
+        self.assertEqual(composite.segments[-1]['md_from'], 2900.0)
+        self.assert_straight_hold(composite)
+
+        # Same path as a full rebuild
+        incremental = {name: composite.column_array(name) for name in WellPathComposite.ARRAY_FIELDS}
+        composite.delete()
+        rebuilt = WellPathService.composite(self.well.id)
+        for name, values in incremental.items():
+            np.testing.assert_allclose(rebuilt.column_array(name), values, atol=1e-3)
+
+    def test_replaced_shallow_survey_rebuilds_the_whole_path(self):
+        WellPathService.composite(self.well.id)
+        self.gyro.azi_data = [90.0] * len(self.gyro.md_data)
+        self.gyro.save()
+
+        composite = WellPathService.composite(self.well.id)
+
+        self.assertIsNone(composite.recomputed_from_md)
+        self.assertAlmostEqual(composite.column_array('easting')[10], 500.0, places=2)
+
+    def test_well_without_surveys(self):
+        empty = Well.objects.create(well_name='Empty Well', well_id='CW-002')
+
+        with self.assertRaises(InsufficientDataError):
+            WellPathService.composite(empty.id)
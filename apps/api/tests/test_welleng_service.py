@@ -51,6 +51,20 @@ class WellengServiceTest(TestCase):
         self.assertEqual(len(result['northing']), 3)
         self.assertEqual(len(result['tvd']), 3)
 
+    def test_calculate_survey_vertical_turn_rate(self):
+        """Test that an undefined turn rate near vertical is stored as null"""
+        result = WellengService.calculate_survey(
+            md=[0, 100, 200, 300],
+            inc=[0, 0, 0.1, 0],
+            azi=[0, 30, 60, 90],
+            tie_on_data=self.basic_tie_on,
+            location_data=self.basic_location,
+            survey_type='Type 2 - Gyro'
+        )
+
+        self.assertEqual(result['status'], 'success')
+        self.assertIsNone(result['turn_rate'][-1])
+
     def test_calculate_survey_with_tie_on_offset(self):
         """Test calculation with tie-on MD offset"""
         tie_on_with_offset = {
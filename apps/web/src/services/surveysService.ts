@@ -272,7 +272,6 @@ class SurveysService {
       const response = await this.api.get(url);
 
       console.log(`[FETCH INTERPOLATION] Response received:`, {
-        calculation_timestamp: response.data.calculation_timestamp,
         bhc_enabled: response.data.bhc_enabled,
         point_count: response.data.point_count,
         is_saved: response.data.is_saved